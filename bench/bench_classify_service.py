@@ -0,0 +1,156 @@
+"""
+상주 분류 서비스 벤치마크 (crawler/classify_service.py)
+
+    python bench/bench_classify_service.py [--requests 3000] [--concurrency 1,8,32] [--max-batch 64]
+                                           [--max-wait 0] [--body 800] [--model crawler/model.pkl] [--json]
+
+- 동시 호출자 수별로 요청 1건 = 공지 1건을 보내고 처리량(건/s)과 요청 지연 p50/p95/p99 를 잰다.
+    inprocess  호출자 스레드들이 프로세스 안의 분류기 1개에 classify() (기존 경로)
+    service-1  분류 서비스, 마이크로 배치 없음 (max_batch=1)
+    service    분류 서비스, 마이크로 배치 (--max-batch / --max-wait)
+- 서비스는 별도 프로세스로 띄운다 (호출자와 GIL 을 나눠 쓰지 않음, 크롤러 워커 여러 개가 붙는 배치와 같음).
+- 서비스 결과가 프로세스 안 분류 결과와 같은지 먼저 검증한다.
+- --model 이 없으면 bench_startup 과 같은 임시 모델을 학습해 ML 단계까지 탄다 (sklearn 필요).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# OpenAI 계층/분류 캐시 없이 (서비스 프로세스도 같은 환경)
+os.environ.update(OPENAI_API_KEY="", CLASSIFY_CACHE="0")
+
+from bench.bench_startup import train_model  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+
+
+def serve_child(max_batch: int, max_wait: float):
+    """서비스 프로세스 - 주소를 한 줄 출력하고 stdin 이 닫힐 때까지 실행"""
+    from crawler.classify_service import ClassifyService
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = ClassifyService(port=0, max_batch=max_batch, max_wait=max_wait)
+    print(json.dumps({"url": service.url}), flush=True)
+    sys.stdin.read()
+    service.close()
+
+
+@contextlib.contextmanager
+def service_process(max_batch: int, max_wait: float):
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--max-batch", str(max_batch),
+                             "--max-wait", str(max_wait)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        url = json.loads(proc.stdout.readline())["url"]
+        yield url
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=30)
+
+
+def load(call: Callable[[str, str], tuple], items: List[Tuple[str, str]], concurrency: int) -> Dict:
+    """concurrency 개 스레드가 items 를 나눠 한 건씩 호출"""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    cursor = iter(range(len(items)))
+
+    def caller():
+        mine = []
+        while True:
+            with lock:
+                i = next(cursor, None)
+            if i is None:
+                break
+            t = time.perf_counter()
+            call(*items[i])
+            mine.append(time.perf_counter() - t)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=caller) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    pct = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+    return {"per_s": round(len(items) / elapsed, 1), "p50_ms": pct(0.5), "p95_ms": pct(0.95), "p99_ms": pct(0.99),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000, help="동시성 수준마다 보낼 요청 수")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=0.0)
+    parser.add_argument("--body", type=int, default=800, help="공지 본문 길이(자)")
+    parser.add_argument("--model", help="model.pkl / 아티팩트 경로 (없으면 임시 모델 학습)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_child(args.max_batch, args.max_wait)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.model:
+            args.model = os.path.join(tmp, "model.pkl")
+            train_model(args.model)
+        os.environ["CLASSIFIER_MODEL_PATH"] = args.model
+        run_bench(args)
+
+
+def run_bench(args):
+    from crawler.classify_service import ClassifyClient
+    from crawler.text_classifier import get_classifier
+
+    items = make_corpus(args.requests, args.body, seed=11)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    with contextlib.redirect_stdout(io.StringIO()):
+        classifier = get_classifier()
+        expected = [classifier.classify(t, c) for t, c in items[:300]]
+    ml_share = sum(1 for label in expected if label[2].startswith(classifier.model_version)) / len(expected)
+
+    results: Dict = {"inprocess": {}, "service-1": {}, "service": {}}
+    for n in levels:
+        results["inprocess"][n] = load(classifier.classify, items, n)
+    for kind, max_batch in (("service-1", 1), ("service", args.max_batch)):
+        with service_process(max_batch, args.max_wait) as url:
+            client = ClassifyClient(url, pool_size=max(levels))
+            got = client.classify_batch(items[:300])
+            assert [(c, round(p, 6), v) for c, p, v in got] == [(c, round(p, 6), v) for c, p, v in expected], \
+                f"{kind} 결과가 프로세스 안 분류와 다름"
+            for n in levels:
+                results[kind][n] = load(client.classify, items, n)
+            results[kind]["batching"] = client.health()["stats"]
+            client.close()
+
+    if args.json:
+        print(json.dumps({"requests": args.requests, "body": args.body, "ml_share": ml_share,
+                          "max_batch": args.max_batch, "max_wait": args.max_wait, "results": results}, indent=2))
+        return
+    print(f"requests={args.requests} body={args.body}자 ML 단계 비율={ml_share:.0%} "
+          f"max_batch={args.max_batch} max_wait={args.max_wait * 1000:g}ms cpus={os.cpu_count()}")
+    print(f"{'kind':<10} {'callers':>7} {'req/s':>9} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}")
+    for kind, rows in results.items():
+        for n in levels:
+            r = rows[n]
+            print(f"{kind:<10} {n:>7} {r['per_s']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}")
+        if "batching" in rows:
+            print(f"{'':<10} batches={rows['batching']['batches']} avg_batch={rows['batching']['avg_batch_items']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+키워드 분류 마이크로 벤치마크
+
+    python bench/bench_keywords.py [--n 200] [--lengths 2000,10000,50000]
+
+- 기존 구현(카테고리 x 키워드마다 제목/본문 전체 부분 문자열 검사)과
+  컴파일된 KeywordScorer 의 백엔드별 공지 1건당 지연을 비교한다.
+- 모든 코퍼스에 대해 점수/결과가 기존 구현과 동일한지 먼저 검증한다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.corpus import make_corpus  # noqa: E402
+from crawler import classifier_stub  # noqa: E402
+from crawler.keyword_matcher import KeywordScorer, ahocorasick  # noqa: E402
+from crawler.text_classifier import TextClassifier  # noqa: E402
+
+
+def legacy_scores(keyword_categories, title, content):
+    """변경 전 predict_with_keywords 의 점수 계산"""
+    title_text = (title or "").lower()
+    content_text = (content or "").lower()
+    category_scores = {}
+    for category_id, keywords in keyword_categories.items():
+        score = 0
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword in title_text:
+                score += 3
+            if keyword in content_text:
+                score += 1
+        if score > 0:
+            category_scores[category_id] = score
+    return category_scores
+
+
+def legacy_stub_classify(title, content):
+    """변경 전 classifier_stub.classify"""
+    t = (title or "").lower()
+    c = (content or "").lower()
+    for cat, keys in classifier_stub.RULES:
+        if any(k.lower() in t for k in keys):
+            return (cat, 0.88, "stub-0.2")
+    for cat, keys in classifier_stub.RULES:
+        if any(k.lower() in c for k in keys):
+            return (cat, 0.72, "stub-0.2")
+    return (classifier_stub.CODES["SPECIAL_LECTURE"], 0.51, "stub-0.2")
+
+
+def per_notice_us(fn, corpus, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for title, content in corpus:
+            fn(title, content)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--lengths", default="2000,10000,50000")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    clf = TextClassifier()
+    table = clf.keyword_categories
+    backends = ["scan", "python"] + (["c"] if ahocorasick is not None else [])
+    scorers = {b: KeywordScorer(table, backend=b) for b in backends}
+
+    results = []
+    for length in [int(x) for x in args.lengths.split(",")]:
+        corpus = make_corpus(args.n, body_chars=length)
+
+        # 동일성 검증
+        for title, content in corpus:
+            expected = legacy_scores(table, title, content)
+            for b, scorer in scorers.items():
+                got = scorer.score(title.lower(), content.lower())
+                assert got == expected and list(got) == list(expected), (b, title)
+            assert classifier_stub.classify(title, content) == legacy_stub_classify(title, content)
+
+        row = {"body_chars": length, "legacy_us": per_notice_us(lambda t, c: legacy_scores(table, t, c), corpus)}
+        for b, scorer in scorers.items():
+            row[f"{b}_us"] = per_notice_us(lambda t, c, s=scorer: s.score(t.lower(), c.lower()), corpus)
+        row["predict_with_keywords_us"] = per_notice_us(clf.predict_with_keywords, corpus)
+        row["stub_legacy_us"] = per_notice_us(legacy_stub_classify, corpus)
+        row["stub_us"] = per_notice_us(classifier_stub.classify, corpus)
+        results.append(row)
+
+    if args.json:
+        print(json.dumps({"default_backend": clf._keyword_scorer().matcher.backend, "results": results}, indent=2))
+        return
+    print(f"default backend: {clf._keyword_scorer().matcher.backend} (pyahocorasick {'있음' if ahocorasick else '없음'})")
+    for row in results:
+        cols = " ".join(f"{k}={v:.1f}" for k, v in row.items() if k != "body_chars")
+        print(f"body={row['body_chars']:>6} chars  {cols}")
+
+
+if __name__ == "__main__":
+    main()
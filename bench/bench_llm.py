@@ -0,0 +1,86 @@
+"""
+OpenAI 백업 분류 계층 벤치마크 (로컬 대역 서버 사용, 외부 호출 없음)
+
+    python bench/bench_llm.py [--n 40] [--latency 0.3] [--inflight 1,4,8] [--error-rate 0.0]
+
+- 기존 방식(호출마다 OpenAI 클라이언트 생성, 한 건씩 순차 요청)과
+  OpenAITier(클라이언트 재사용, 동시 요청)의 처리 시간을 비교한다.
+- 오류가 없을 때는 두 방식의 분류 결과가 같은지 먼저 검증한다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.corpus import make_notice  # noqa: E402
+from bench.fake_openai import start  # noqa: E402
+from crawler.text_classifier import TextClassifier  # noqa: E402
+
+
+def legacy_predict(clf, base_url, title, content):
+    """변경 전 predict_with_openai (요청마다 클라이언트 생성, 순차 호출)"""
+    from openai import OpenAI
+
+    try:
+        client = OpenAI(api_key="local", base_url=base_url)
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=clf._openai_messages(title, content),
+            max_tokens=10,
+            temperature=0.1,
+        )
+        return clf._parse_openai_category(response.choices[0].message.content.strip())
+    except Exception:
+        return 12, 0.2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--inflight", default="1,4,8")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    server, base_url = start(latency=args.latency, error_rate=args.error_rate)
+    rng = random.Random(7)
+    items = [make_notice(rng, 600) for _ in range(args.n)]
+
+    results = []
+    clf = TextClassifier(api_config={"api_key": "local", "base_url": base_url, "max_retries": 0})
+    t0 = time.perf_counter()
+    expected = [legacy_predict(clf, base_url, title, content) for title, content in items]
+    results.append({"mode": "legacy", "seconds": time.perf_counter() - t0})
+
+    for inflight in [int(x) for x in args.inflight.split(",")]:
+        clf = TextClassifier(api_config={
+            "api_key": "local", "base_url": base_url, "max_inflight": inflight,
+            "backoff": 0.05, "max_retries": 3,
+        })
+        t0 = time.perf_counter()
+        got = clf.predict_with_openai_many(items)
+        row = {"mode": f"tier(inflight={inflight})", "seconds": time.perf_counter() - t0, **clf.api_stats()}
+        if args.error_rate == 0:
+            assert got == expected, row["mode"]
+        results.append(row)
+        clf._llm.close()
+
+    if args.json:
+        print(json.dumps({"n": args.n, "latency": args.latency, "results": results}, indent=2))
+        return
+    print(f"n={args.n} latency={args.latency}s error_rate={args.error_rate} "
+          f"(server max_concurrent={server.stats['max_concurrent']})")
+    base = results[0]["seconds"]
+    for row in results:
+        extra = " ".join(f"{k}={v}" for k, v in row.items() if k not in ("mode", "seconds"))
+        print(f"{row['mode']:<20} {row['seconds']:.2f}s (x{base / row['seconds']:.1f}) {extra}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+근사 중복 탐지 벤치마크 (crawler/near_dup.py, DB 없음)
+
+    python bench/bench_near_dup.py [--notices 100000] [--dup-rate 0.05] [--body 1000] [--linear 300] [--json]
+
+- 합성 공지(bench/corpus.py) 에 dup-rate 비율로 사본을 심는다
+  (공백/줄바꿈 변경, "[재공지]" 머리말, 단어 하나 교체 중 하나 - 게시판마다 조금씩 다른 재게시)
+- 공지 1건당 지문 계산 시간, 색인 구성 시간, 조회 1회 p50/p95, 조회당 후보 수
+- 같은 지문으로 전체를 훑는 선형 해밍 거리 비교(--linear 건)와 결과가 같은지 검증하고 시간 비교
+- 심은 사본 검출률(recall), 사본이 아닌 공지가 중복으로 잡힌 수(false positive)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_pipeline import latency_stats  # noqa: E402
+from bench.corpus import FILLER, TOPICS, make_corpus  # noqa: E402
+from crawler.near_dup import MAX_DISTANCE, MIN_TOKENS, SimHashIndex, simhash  # noqa: E402
+
+
+def mutate(rng: random.Random, content: str) -> Tuple[str, str]:
+    """(변형 종류, 사본 본문)"""
+    kind = rng.choice(("whitespace", "prefix", "swap"))
+    if kind == "whitespace":
+        return kind, "\n\n".join(line.strip() for line in content.split("\n")) + "  \n"
+    if kind == "prefix":
+        return kind, "[재공지] " + content
+    words = content.split(" ")
+    i = rng.randrange(len(words))
+    words[i] = rng.choice(TOPICS + FILLER)
+    return kind, " ".join(words)
+
+
+def make_dataset(n: int, dup_rate: float, body: int, seed: int = 7) -> Tuple[List[str], Dict[int, Tuple[int, str]]]:
+    """(본문 목록, 사본 위치 -> (원본 위치, 변형 종류)) - 사본은 원본보다 뒤에 온다"""
+    n_dups = int(n * dup_rate)
+    originals = [content for _, content in make_corpus(n - n_dups, body, seed=seed)]
+    rng = random.Random(seed)
+    # (본문, 원본 번호, 변형 종류) - 사본의 사본은 만들지 않는다
+    items = [(content, i, None) for i, content in enumerate(originals)]
+    for source in rng.sample(range(len(originals)), n_dups):
+        kind, copy = mutate(rng, originals[source])
+        items.append((copy, source, kind))
+    rng.shuffle(items)
+    position = {source: i for i, (_, source, kind) in enumerate(items) if kind is None}
+    for i, (_, source, kind) in enumerate(items):
+        if kind is not None and position[source] > i:  # 원본이 먼저 오도록 자리를 바꾼다
+            j = position[source]
+            items[i], items[j] = items[j], items[i]
+            position[source] = i
+    planted = {i: (position[source], kind) for i, (_, source, kind) in enumerate(items) if kind is not None}
+    return [content for content, _, _ in items], planted
+
+
+def linear_find(hashes: List[Tuple[int, int]], h: int, max_distance: int) -> Optional[Tuple[int, int]]:
+    """색인 없이 전체 지문과 해밍 거리 비교 (비교 기준)"""
+    best = None
+    for key, other in hashes:
+        distance = (other ^ h).bit_count()
+        if distance <= max_distance and (best is None or distance < best[1]):
+            best = (key, distance)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--notices", type=int, default=100000)
+    parser.add_argument("--dup-rate", type=float, default=0.05)
+    parser.add_argument("--body", type=int, default=1000, help="공지 본문 길이(자)")
+    parser.add_argument("--max-distance", type=int, default=MAX_DISTANCE)
+    parser.add_argument("--linear", type=int, default=300, help="선형 비교로 검증/측정할 조회 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    contents, planted = make_dataset(args.notices, args.dup_rate, args.body)
+
+    started = time.perf_counter()
+    hashes = [simhash(content, MIN_TOKENS) for content in contents]
+    fingerprint_s = time.perf_counter() - started
+
+    # 파이프라인과 같은 순서: 조회해서 없으면 대표로 색인에 넣는다
+    index = SimHashIndex(args.max_distance)
+    samples, found_at = [], {}
+    started = time.perf_counter()
+    for i, h in enumerate(hashes):
+        if h is None:
+            continue
+        t = time.perf_counter()
+        found = index.find(h)
+        samples.append(time.perf_counter() - t)
+        if found is None:
+            index.add(i, h)
+        else:
+            found_at[i] = found
+    build_s = time.perf_counter() - started
+
+    # 다 채운 색인에서 선형 비교와 같은 결과인지 (원본이 먼저 들어가므로 같은 거리면 작은 id)
+    rng = random.Random(3)
+    indexed = [(key, h) for key, h in enumerate(hashes) if key in index]
+    probes = [hashes[i] for i in rng.sample(sorted(planted), min(args.linear // 2, len(planted)))]
+    probes += [h for h in rng.sample(hashes, args.linear - len(probes)) if h is not None]
+    linear_samples, full_samples = [], []
+    for h in probes:
+        t = time.perf_counter()
+        expected = linear_find(indexed, h, args.max_distance)
+        linear_samples.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        got = index.find(h)
+        full_samples.append(time.perf_counter() - t)
+        assert (got and got[1]) == (expected and expected[1]), f"결과 불일치 {got} != {expected}"
+
+    detected = {kind: [0, 0] for kind in ("whitespace", "prefix", "swap")}
+    for position, (source, kind) in planted.items():
+        detected[kind][1] += 1
+        if found_at.get(position, (None,))[0] == source:
+            detected[kind][0] += 1
+    recall = sum(hit for hit, _ in detected.values()) / max(len(planted), 1)
+    false_positives = sum(1 for i in found_at if i not in planted)
+
+    lookups = index.stats["lookups"]
+    result = {
+        "notices": len(contents),
+        "planted": len(planted),
+        "fingerprint_ms_per_notice": round(fingerprint_s * 1000 / len(contents), 4),
+        "no_fingerprint": sum(1 for h in hashes if h is None),
+        "build_s": round(build_s, 3),
+        "lookup": latency_stats(samples),
+        "lookup_full_index": latency_stats(full_samples),
+        "linear": latency_stats(linear_samples),
+        "avg_candidates": round(index.stats["candidates"] / lookups, 2) if lookups else 0.0,
+        "indexed": len(index),
+        "recall": round(recall, 4),
+        "recall_by_kind": {kind: round(hit / total, 4) if total else None for kind, (hit, total) in detected.items()},
+        "false_positives": false_positives,
+    }
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    print(f"notices={result['notices']} planted={result['planted']} body={args.body}자 "
+          f"max_distance={args.max_distance}")
+    print(f"fingerprint {result['fingerprint_ms_per_notice']}ms/건 (지문 없음 {result['no_fingerprint']}건)")
+    print(f"index build={result['build_s']}s lookup p50={result['lookup']['p50_ms']}ms "
+          f"p95={result['lookup']['p95_ms']}ms avg_candidates={result['avg_candidates']} indexed={result['indexed']}")
+    full, linear = result["lookup_full_index"], result["linear"]
+    print(f"full index p50={full['p50_ms']}ms vs linear p50={linear['p50_ms']}ms "
+          f"(x{linear['p50_ms'] / max(full['p50_ms'], 1e-6):.0f}, {linear['n']}건 결과 일치)")
+    print(f"recall={result['recall']} {result['recall_by_kind']} false_positives={false_positives}")
+
+
+if __name__ == "__main__":
+    main()
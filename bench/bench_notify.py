@@ -0,0 +1,145 @@
+"""
+알림 fan-out 매칭 벤치마크 (crawler/notify.py, DB 없음)
+
+    python bench/bench_notify.py [--users 10000] [--keywords 50000] [--notices 200] [--naive 20]
+                                 [--backends c,python] [--json]
+
+- 합성 사용자(관심 카테고리 1~3개, 키워드 CONTAINS 80% / EXACT 20%)와 합성 공지로
+  InterestIndex 구성 시간, 공지 1건당 매칭 p50/p95, 대상 사용자 수를 잰다.
+- 기존 방식(사용자마다 키워드를 하나씩 본문에서 찾기)과 결과가 같은지 --naive 건으로
+  검증하고 1건당 시간을 비교한다.
+- 설정 변경 반영: 사용자 100명의 키워드를 새 키워드로 바꾸는 update_users 시간
+  (오토마톤 재컴파일 없음) 과 재컴파일이 일어나는 만큼 바꿨을 때의 시간.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_pipeline import latency_stats, timed  # noqa: E402
+from bench.corpus import TOPICS, make_corpus  # noqa: E402
+from crawler.keyword_matcher import ahocorasick  # noqa: E402
+from crawler.notify import REBUILD_PENDING, InterestIndex  # noqa: E402
+
+_WORD_RE = re.compile(r"\w+")
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+
+
+def make_users(n_users: int, n_keywords: int, seed: int = 11) -> Tuple[List[Dict], List[Dict]]:
+    """(interests 행, keywords 행) - fetch_user_interests / fetch_user_keywords 와 같은 형태"""
+    rng = random.Random(seed)
+    # 실제 키워드처럼 자주 쓰는 주제어 + 드문 합성 단어가 섞이도록
+    rare = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(n_keywords // 5)]
+    common = list(dict.fromkeys(TOPICS))
+    interests, keywords = [], []
+    per_user = max(1, n_keywords // n_users)
+    for user_id in range(1, n_users + 1):
+        for category_id in rng.sample(range(1, 13), rng.randint(1, 3)):
+            interests.append({"user_id": user_id, "category_id": category_id, "weight": 1})
+        for _ in range(per_user):
+            word = rng.choice(common) if rng.random() < 0.3 else rng.choice(rare)
+            keywords.append({"user_id": user_id, "keyword": word,
+                             "match_type": "EXACT" if rng.random() < 0.2 else "CONTAINS"})
+    return interests, keywords
+
+
+def naive_match(interests: List[Dict], keywords: List[Dict], title: str, content: str,
+                category_id: int) -> Dict[int, str]:
+    """색인 없이 사용자마다 설정을 하나씩 확인 (비교 기준)"""
+    text = f"{title}\n{content}".lower()
+    words = set(_WORD_RE.findall(text))
+    targets = {row["user_id"]: "category" for row in interests if row["category_id"] == category_id}
+    for row in keywords:
+        kw = row["keyword"].lower()
+        hit = kw in words if row["match_type"] == "EXACT" else kw in text
+        if hit:
+            targets.setdefault(row["user_id"], "keyword")
+    return targets
+
+
+def bench_backend(backend: str, interests, keywords, notices, args) -> Dict:
+    index = InterestIndex(backend)
+    build = timed(index.load_rows, interests, keywords)
+    rng = random.Random(3)
+    categories = [rng.randint(1, 12) for _ in notices]
+    samples, targets = [], 0
+    for (title, content), category_id in zip(notices, categories):
+        started = time.perf_counter()
+        found = index.match(title, content, category_id)
+        samples.append(time.perf_counter() - started)
+        targets += len(found)
+
+    for i in range(args.naive):
+        title, content = notices[i]
+        assert index.match(title, content, categories[i]) == naive_match(
+            interests, keywords, title, content, categories[i]), f"결과 불일치 notice={i}"
+
+    # 설정 변경 반영 - 100명 (새 키워드는 오토마톤 밖에서 검사), 재컴파일될 만큼
+    def changes(user_ids):
+        ids = set(user_ids)
+        rows = [{"user_id": u, "keyword": f"새키워드{u}", "match_type": "CONTAINS"} for u in user_ids]
+        return user_ids, [r for r in interests if r["user_id"] in ids], rows
+
+    compiles = index.compiles
+    small = timed(index.update_users, *changes(list(range(1, 101))))
+    assert index.compiles == compiles
+    large = timed(index.update_users, *changes(list(range(101, 101 + REBUILD_PENDING))))
+    assert index.compiles == compiles + 1
+    return {
+        "build_s": round(build, 3),
+        "match": latency_stats(samples),
+        "targets_per_notice": round(targets / len(notices), 1),
+        "update_100_users_ms": round(small * 1000, 2),
+        f"update_{REBUILD_PENDING}_users_recompile_ms": round(large * 1000, 2),
+        **index.snapshot(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--keywords", type=int, default=50000)
+    parser.add_argument("--notices", type=int, default=200)
+    parser.add_argument("--body", type=int, default=2000, help="공지 본문 길이(자)")
+    parser.add_argument("--naive", type=int, default=20, help="기존 방식으로 검증/측정할 공지 수")
+    parser.add_argument("--backends", default="c,python" if ahocorasick is not None else "python")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    interests, keywords = make_users(args.users, args.keywords)
+    notices = make_corpus(args.notices, args.body, seed=5)
+    rng = random.Random(3)
+    naive_samples = []
+    for title, content in notices[:args.naive]:
+        category_id = rng.randint(1, 12)
+        naive_samples.append(timed(naive_match, interests, keywords, title, content, category_id))
+
+    results = {"naive": latency_stats(naive_samples)}
+    for backend in args.backends.split(","):
+        results[backend] = bench_backend(backend, interests, keywords, notices, args)
+
+    if args.json:
+        print(json.dumps({"users": args.users, "keywords": len(keywords), "notices": args.notices,
+                          "results": results}, ensure_ascii=False, indent=2))
+        return
+    print(f"users={args.users} keywords={len(keywords)} notices={args.notices} body={args.body}자")
+    naive = results["naive"]
+    print(f"{'naive':<8} match p50={naive['p50_ms']}ms p95={naive['p95_ms']}ms ({naive['n']}건)")
+    for backend in args.backends.split(","):
+        r = results[backend]
+        print(f"{backend:<8} build={r['build_s']}s match p50={r['match']['p50_ms']}ms p95={r['match']['p95_ms']}ms "
+              f"(x{naive['p50_ms'] / max(r['match']['p50_ms'], 1e-6):.0f}) per_s={r['match']['per_s']} "
+              f"targets/notice={r['targets_per_notice']} "
+              f"update100={r['update_100_users_ms']}ms "
+              f"update{REBUILD_PENDING}+compile={r[f'update_{REBUILD_PENDING}_users_recompile_ms']}ms "
+              f"keywords={r['contains_keywords']}+{r['exact_keywords']}")
+
+
+if __name__ == "__main__":
+    main()
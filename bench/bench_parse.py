@@ -0,0 +1,166 @@
+"""
+HTML 파싱/본문 추출 벤치마크
+
+    python bench/bench_parse.py [--repeat 20] [--json]
+
+- bench/fixtures/ 의 목록/상세 페이지로 기존 구현(html.parser 전체 파싱 +
+  트리 수정 후 get_text)과 현재 어댑터(parse_list / parse_detail)를 비교한다.
+- 기본 파서(extract.PARSER)의 추출 결과가 기존과 바이트 단위로 같은지 먼저
+  검증하고, 페이지 1건당 처리 시간을 출력한다. 그 밖의 사용 가능한 파서(lxml)는
+  결과가 달라지는 fixture 수를 함께 보고한다.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import extract  # noqa: E402
+from crawler.pipeline import BoardAdapter, RecruitAdapter  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _legacy_text(area):
+    for br in area.find_all("br"):
+        br.replace_with("\n")
+    for p in area.find_all("p"):
+        p.insert_before("\n")
+        p.insert_after("\n")
+    return area.get_text().strip()
+
+
+def _legacy_date(info):
+    if info:
+        m = re.search(r"\d{4}-\d{2}-\d{2}", info.get_text(" ", strip=True))
+        if m:
+            return m.group(0)
+    return None
+
+
+def legacy_board_list(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [(a.get_text(strip=True), a.get("href")) for a in soup.select("td.title a") if a.get("href")]
+
+
+def legacy_recruit_list(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [(a.get_text(strip=True), a.get("href"))
+            for a in soup.select("td.title a, .title a, .subject a") if a.get("href")]
+
+
+def legacy_board_detail(html):
+    soup = BeautifulSoup(html, "html.parser")
+    detail_div = soup.find("div", class_="board_viewDetail")
+    content = _legacy_text(detail_div) if detail_div else ""
+    info = soup.select_one(".board_view .top_info, .view_info, .board_view .viewtop, .board_view .info")
+    return content, _legacy_date(info)
+
+
+def legacy_recruit_detail(html):
+    soup = BeautifulSoup(html, "html.parser")
+    content_area = soup.select_one(".board_viewDetail, .view_con, .content, .bbs_view")
+    content = _legacy_text(content_area) if content_area else ""
+    info = soup.select_one(".board_view .top_info, .bbs_view .info, .view_info, .meta")
+    return content, _legacy_date(info)
+
+
+# kind: (기존 구현, 현재 구현, 기존 결과 보정 - 목록은 절대 URL 로 변환)
+CASES = {
+    "board_list": (legacy_board_list,
+                   lambda h: [(t, u) for t, u in BoardAdapter.parse_list(h)],
+                   lambda pairs: [(t, urljoin(BoardAdapter.BASE, h)) for t, h in pairs]),
+    "recruit_list": (legacy_recruit_list,
+                     lambda h: [(t, u) for t, u in RecruitAdapter.parse_list(h)],
+                     lambda pairs: [(t, urljoin(RecruitAdapter.BASE, h)) for t, h in pairs]),
+    "board_view": (legacy_board_detail, BoardAdapter.parse_detail, None),
+    "recruit_view": (legacy_recruit_detail, RecruitAdapter.parse_detail, None),
+}
+
+
+def load_fixtures():
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        name = os.path.basename(path)
+        kind = next(k for k in CASES if name.startswith(k))
+        with open(path, encoding="utf-8") as f:
+            fixtures.append((name, kind, f.read()))
+    return fixtures
+
+
+def per_page_ms(fn, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(pages) * 1e3
+
+
+def available_parsers():
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    default_parser = extract.PARSER
+    results = []
+    try:
+        for kind, (legacy, current, normalize) in CASES.items():
+            pages = [html for _, k, html in fixtures if k == kind]
+            if not pages:
+                continue
+            row = {"kind": kind, "pages": len(pages), "legacy_ms": per_page_ms(legacy, pages, args.repeat)}
+            for name in available_parsers():
+                extract.PARSER = name
+                # 동일성 검증
+                mismatched = []
+                for fixture_name, k, html in fixtures:
+                    if k != kind:
+                        continue
+                    expected = legacy(html)
+                    if normalize:
+                        expected = normalize(expected)
+                    if current(html) != expected:
+                        mismatched.append(fixture_name)
+                if name == default_parser and mismatched:
+                    raise SystemExit(f"[FAIL] parser={name} 기존과 결과가 다른 fixture: {mismatched}")
+                row[f"{name}_ms"] = per_page_ms(current, pages, args.repeat)
+                if mismatched:
+                    row[f"{name}_mismatch"] = mismatched
+            results.append(row)
+    finally:
+        extract.PARSER = default_parser
+
+    if args.json:
+        print(json.dumps({"default_parser": default_parser, "results": results}, indent=2))
+        return
+    print(f"default parser: {default_parser} (fixtures {len(fixtures)}개, 결과 동일성 확인)")
+    for row in results:
+        cols = " ".join(f"{k}={v:.2f}" for k, v in row.items() if k.endswith("_ms"))
+        speedup = row["legacy_ms"] / row[f"{default_parser}_ms"]
+        diff = " ".join(f"{k}={','.join(v)}" for k, v in row.items() if k.endswith("_mismatch"))
+        print(f"{row['kind']:<13} {cols}  (x{speedup:.1f}){'  ' + diff if diff else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+오프라인 벤치마크 모음 (외부 사이트/DB 호출 없음, 결과는 JSON 으로 비교 가능)
+
+    python bench/bench_pipeline.py [--pages 3] [--latency 0.05] [--error-rate 0.0] [--retry-after 1]
+                                   [--db memory|mysql] [--sections pipeline,adapters,classify,db]
+                                   [--out result.json] [--compare before.json]
+
+구간 (각각 별도 프로세스에서 실행 - 최대 RSS 가 서로 섞이지 않음)
+    pipeline  pipeline.run() 전체: pages/s, notices/s, 단계별 handler p50/p95, 최대 RSS
+              (bench/fixture_server.py 대역 서버 + CNU_BASE_URL)
+    adapters  BoardAdapter / RecruitAdapter 목록/상세 파싱 1건당 p50/p95
+    classify  TextClassifier.classify 1건당 p50/p95, classify_batch 처리량
+    db        NoticeWriter 배치 저장 (카테고리가 바뀐 공지 재저장 포함 - 분류 행 1개인지 확인), fetch_known_hashes 1회당 p50/p95
+
+DB 대상
+    memory    bench/memory_db.py (DB 비용 제외, 크롤러 쪽 처리량 상한)
+    mysql     일회용 MySQL 컨테이너 - docker compose --profile bench up -d mysql-bench
+              BENCH_DB_HOST/PORT/USER/PASSWORD/NAME (기본 127.0.0.1:3307 root/bench cnu_info)
+              실행 전에 notice / notice_category 를 비운다.
+
+HTTP 응답 캐시와 분류 캐시는 끄고 잰다.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SECTIONS = ("pipeline", "adapters", "classify", "db")
+
+BENCH_DB = {
+    "DB_HOST": os.getenv("BENCH_DB_HOST", "127.0.0.1"),
+    "DB_PORT": os.getenv("BENCH_DB_PORT", "3307"),
+    "DB_USER": os.getenv("BENCH_DB_USER", "root"),
+    "DB_PASSWORD": os.getenv("BENCH_DB_PASSWORD", "bench"),
+    "DB_NAME": os.getenv("BENCH_DB_NAME", "cnu_info"),
+}
+
+
+# ---------------------------------------------------------
+# 공통
+# ---------------------------------------------------------
+def peak_rss_mb() -> float:
+    """현재 프로세스 최대 RSS(MB) - /proc 의 VmHWM (없으면 ru_maxrss)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        return 0.0
+
+
+def latency_stats(samples: List[float]) -> Dict:
+    """초 단위 표본 -> {'n', 'p50_ms', 'p95_ms', 'per_s'}"""
+    from crawler.stages import percentile
+
+    total = sum(samples)
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "per_s": round(len(samples) / total, 1) if total else 0.0,
+    }
+
+
+def timed(fn: Callable, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def db_target(kind: str):
+    """(conn_factory, 초기화 함수)"""
+    if kind == "memory":
+        from bench.memory_db import MemoryDB
+
+        return MemoryDB().connect, lambda: None
+
+    from crawler.db import get_conn
+
+    def reset():
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM notice_category")
+            cur.execute("DELETE FROM notice")
+            cur.execute("DELETE FROM crawl_progress")
+            cur.execute("DELETE FROM crawl_retry")
+
+    return get_conn, reset
+
+
+# ---------------------------------------------------------
+# 구간별 측정 (자식 프로세스)
+# ---------------------------------------------------------
+def bench_pipeline(args) -> Dict:
+    from bench.fixture_server import start
+
+    server, base_url = start(latency=args.latency, error_rate=args.error_rate, retry_after=args.retry_after)
+    os.environ["CNU_BASE_URL"] = base_url
+    from crawler import pipeline
+
+    conn_factory, reset = db_target(args.db)
+    reset()
+    log = io.StringIO()
+    started = time.perf_counter()
+    # 대역 서버는 상세 본문 몇 개를 돌려 쓰므로 근사 중복 판별을 켜면 대부분 사본으로 묶인다
+    # (분류/알림 건수가 달라져 이전 결과와 비교되지 않음) - bench/bench_near_dup.py 에서 따로 잰다
+    with contextlib.redirect_stdout(log):
+        summary = pipeline.run(pages=args.pages, workers=args.workers, rps=0,
+                               parse_workers=args.parse_workers, queue_log_interval=0,
+                               conn_factory=conn_factory, near_dup=False)
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    notices = server.stats["detail"]
+    return {
+        "seconds": round(elapsed, 3),
+        "pages": server.stats["list"],
+        "notices": notices,
+        "pages_per_s": round(server.stats["list"] / elapsed, 2),
+        "notices_per_s": round(notices / elapsed, 2),
+        "http_errors": server.stats["errors"],
+        "summary": {k: v for k, v in summary.items() if k not in ("stages", "metrics")},
+        "metrics": summary["metrics"],
+        "stages": {name: {k: s[k] for k in ("processed", "errors", "p50_ms", "p95_ms")}
+                   for name, s in summary["stages"].items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_adapters(args) -> Dict:
+    from crawler.pipeline import BoardAdapter, RecruitAdapter
+
+    results = {}
+    for kind, adapter in (("board", BoardAdapter), ("recruit", RecruitAdapter)):
+        with open(os.path.join(FIXTURE_DIR, f"{kind}_list.html"), encoding="utf-8") as f:
+            list_html = f.read()
+        views = []
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{kind}_view_*.html"))):
+            with open(path, encoding="utf-8") as f:
+                views.append(f.read())
+        results[f"{kind}.parse_list"] = latency_stats(
+            [timed(lambda h: list(adapter.parse_list(h)), list_html) for _ in range(args.repeat)])
+        results[f"{kind}.parse_detail"] = latency_stats(
+            [timed(adapter.parse_detail, html) for _ in range(args.repeat) for html in views])
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def bench_classify(args) -> Dict:
+    from bench.corpus import make_corpus
+    from crawler.text_classifier import get_classifier
+
+    # 파이프라인과 같은 분류기 (모델 경로: CLASSIFIER_MODEL_PATH > crawler/model/ > crawler/model.pkl)
+    clf = get_classifier()
+    items = make_corpus(args.notices, 2000, seed=7)
+    clf.classify(*items[0])   # 매처 컴파일 / 모델 로드는 제외
+
+    single = [timed(clf.classify, title, content) for title, content in items]
+    batches = [items[i:i + 32] for i in range(0, len(items), 32)]
+    batch_seconds = sum(timed(clf.classify_batch, batch) for batch in batches)
+    return {
+        "classify": latency_stats(single),
+        "classify_batch32_per_s": round(len(items) / batch_seconds, 1) if batch_seconds else 0.0,
+        "model": clf.model_version if clf.model is not None else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_db(args) -> Dict:
+    from crawler.db import NoticeWriter, fetch_known_hashes, fetch_notice_categories
+
+    conn_factory, reset = db_target(args.db)
+    results = {}
+    rng = random.Random(5)
+    body = "".join(rng.choice("가나다라마바사아자차카타파하 ") for _ in range(2000))
+    for batch_size in (1, 100):
+        reset()
+        n = args.notices if batch_size > 1 else min(args.notices, 200)
+        flushes = []
+        # 자동 저장은 끄고 batch_size 행마다 직접 flush 해서 배치 1회 시간을 잰다
+        writer = NoticeWriter(batch_size=n + 1, flush_interval=3600, conn_factory=conn_factory)
+        for i in range(n):
+            writer.add(1 + i % 5, f"http://bench.local/{batch_size}/{i}", f"제목 {i}", body,
+                       None, f"{i:064x}", 1 + i % 12, 0.9, "bench")
+            if (i + 1) % batch_size == 0 or i == n - 1:
+                flushes.append(timed(writer.flush))
+        writer.close()
+        stats = latency_stats(flushes)
+        stats["rows_per_s"] = round(n / sum(flushes), 1)
+        results[f"writer.batch{batch_size}"] = stats
+
+    # 내용이 바뀌어 카테고리가 달라진 공지: 다시 저장한 뒤 notice_category 행이 새 카테고리 1개뿐이어야 함
+    changed = min(args.notices, 500)
+    flushes = []
+    with NoticeWriter(batch_size=changed + 1, flush_interval=3600, conn_factory=conn_factory) as writer:
+        saved: Dict[str, int] = {}
+        for i in range(changed):
+            writer.add(1 + i % 5, f"http://bench.local/100/{i}", f"제목 {i} (수정)", body + " 수정",
+                       None, f"{i + 1:064x}"[::-1], 1 + (i + 1) % 12, 0.9, "bench")
+            if (i + 1) % 100 == 0 or i == changed - 1:
+                flushes.append(timed(lambda: saved.update(writer.flush())))
+    with conn_factory() as conn, conn.cursor() as cur:
+        labels = fetch_notice_categories(cur, list(saved.values()))
+    for i in range(changed):
+        found = labels.get(saved[f"http://bench.local/100/{i}"])
+        assert found == [1 + (i + 1) % 12], f"카테고리가 바뀐 공지의 분류 행: {found}"
+    results["writer.changed_batch100"] = latency_stats(flushes)
+
+    urls = [f"http://bench.local/100/{i}" for i in range(args.notices)]
+    pages = [urls[i:i + 15] for i in range(0, len(urls), 15)]
+    with conn_factory() as conn, conn.cursor() as cur:
+        results["fetch_known_hashes"] = latency_stats([timed(fetch_known_hashes, cur, p) for p in pages])
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+BENCHES = {"pipeline": bench_pipeline, "adapters": bench_adapters, "classify": bench_classify, "db": bench_db}
+
+
+# ---------------------------------------------------------
+# 실행 / 출력 / 비교
+# ---------------------------------------------------------
+def run_section(section: str, argv: List[str], db: str) -> Dict:
+    env = dict(os.environ, HTTP_CACHE="0", CLASSIFY_CACHE="0")
+    if db == "mysql":
+        env.update(BENCH_DB)
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--section", section] + argv,
+                         capture_output=True, text=True, env=env)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _flatten(data: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(before: Dict, after: Dict):
+    """두 결과 파일의 같은 지표를 나란히 출력 (처리량은 높을수록, 지연/RSS 는 낮을수록 좋음)"""
+    old, new = _flatten(before["results"]), _flatten(after["results"])
+    print(f"\ncompare {before['meta'].get('git')} -> {after['meta'].get('git')}")
+    for key in sorted(set(old) & set(new)):
+        if not key.endswith(("per_s", "_ms", "rss_mb", "seconds")) or not old[key]:
+            continue
+        ratio = new[key] / old[key]
+        print(f"  {key:<45} {old[key]:>10} -> {new[key]:>10} (x{ratio:.2f})")
+
+
+def print_report(report: Dict):
+    meta = report["meta"]
+    print(f"git={meta['git']} python={meta['python']} db={meta['db']} pages={meta['pages']} "
+          f"latency={meta['latency']}s error_rate={meta['error_rate']}")
+    for section, result in report["results"].items():
+        print(f"\n[{section}]")
+        if "error" in result:
+            print(f"  error: {result['error']}")
+            continue
+        for key, value in result.items():
+            if key == "metrics":   # 전체 지표는 JSON 결과에만
+                continue
+            if isinstance(value, dict) and "p50_ms" in value:
+                extra = f" per_s={value['per_s']}" if "per_s" in value else ""
+                print(f"  {key:<28} p50={value['p50_ms']}ms p95={value['p95_ms']}ms{extra}")
+            elif isinstance(value, dict):
+                for name, sub in value.items():
+                    print(f"  {key}.{name:<22} {sub}")
+            else:
+                print(f"  {key:<28} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", default=",".join(SECTIONS))
+    parser.add_argument("--pages", type=int, default=3, help="소스별 목록 페이지 수")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0.05, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 503 응답 비율")
+    parser.add_argument("--retry-after", type=int, default=None, help="대역 서버 503 응답의 Retry-After(초)")
+    parser.add_argument("--db", choices=("memory", "mysql"), default="memory")
+    parser.add_argument("--repeat", type=int, default=20, help="adapters 반복 횟수")
+    parser.add_argument("--notices", type=int, default=500, help="classify/db 표본 수")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="이전 결과 JSON 과 비교")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--section", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.section:
+        print(json.dumps(BENCHES[args.section](args), ensure_ascii=False))
+        return
+
+    argv = ["--pages", str(args.pages), "--workers", str(args.workers), "--latency", str(args.latency),
+            "--error-rate", str(args.error_rate), "--db", args.db, "--repeat", str(args.repeat),
+            "--notices", str(args.notices)]
+    if args.retry_after is not None:
+        argv += ["--retry-after", str(args.retry_after)]
+    if args.parse_workers is not None:
+        argv += ["--parse-workers", str(args.parse_workers)]
+    report = {
+        "meta": {
+            "git": _git_revision(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "db": args.db,
+            "pages": args.pages,
+            "workers": args.workers,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "retry_after": args.retry_after,
+        },
+        "results": {s: run_section(s, argv, args.db) for s in args.sections.split(",")},
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
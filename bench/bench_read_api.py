@@ -0,0 +1,339 @@
+"""
+읽기 API 부하 테스트 (crawler/read_api.py)
+
+    docker compose --profile bench up -d mysql-bench
+    python bench/bench_read_api.py [--db mysql|memory] [--notices 50000] [--users 2000] [--connections 32]
+                                   [--duration 10] [--write-interval 1.0] [--ttl 0,30] [--json]
+
+- API 는 별도 프로세스로 띄우고 (--db memory 면 메모리 DB 도 그 프로세스 안), 이 프로세스에서
+  keep-alive 연결 --connections 개로 --duration 초 동안 요청을 보낸다.
+    category  카테고리 피드 첫 페이지 (12개 중 무작위)                40%
+    user      사용자 피드 첫 페이지 (앞쪽 사용자에 몰림)                25%
+    notice    공지 상세 (최근 공지 2000 건에 80%)                       15%
+    paging    카테고리 피드를 next_cursor 로 2~5페이지까지 (페이지마다 1요청)  20%
+- --ttl 값마다 (0 = 캐시 끔) 요청/s 와 경로별 p50/p99 를 잰다.
+- 부하 중에도 API 프로세스가 --write-interval 마다 NoticeWriter 로 새 공지를 저장한다 (feed_epoch 증가 -> 캐시 무효화).
+- 마지막으로 새 공지를 저장한 뒤 카테고리 피드 첫 페이지에 나오기까지 걸린 시간을 잰다 (캐시 켠 설정).
+
+--db mysql 은 BENCH_DB_* (bench_pipeline.py 와 같음), 실행 전에 notice / notice_category / bench 사용자를 비운다.
+--db memory 는 bench/memory_db.py (DB 비용 없음 - API/캐시/HTTP 쪽 상한).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.bench_pipeline import BENCH_DB  # noqa: E402
+from bench.corpus import make_notice  # noqa: E402
+
+CATEGORIES = list(range(1, 13))
+BENCH_EMAIL = "bench-read-api-{}@example.test"
+START_DAY = datetime.datetime(2023, 1, 1)
+MIX = (("category", 0.40), ("user", 0.25), ("notice", 0.15), ("paging", 0.20))
+
+
+# ---------------------------------------------------------
+# 데이터 (API 프로세스에서 실행)
+# ---------------------------------------------------------
+def seed(conn_factory, db, n: int, users: int, copy_rate: float = 0.02, body: int = 300):
+    """공지 n 건 (카테고리/게시일 무작위, copy_rate 는 근사 중복 사본) + 사용자별 관심 카테고리 1~4개"""
+    from crawler.db import NoticeWriter
+    from crawler.hashing import make_hash
+
+    rng = random.Random(5)
+    if db is None:
+        with conn_factory() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM notice_category")
+            cur.execute("DELETE FROM notification")
+            cur.execute("UPDATE notice SET canonical_id = NULL")
+            cur.execute("DELETE FROM notice")
+            cur.execute("DELETE FROM app_user WHERE email LIKE %s", (BENCH_EMAIL.format("%"),))
+    with NoticeWriter(batch_size=1000, flush_interval=3600, conn_factory=conn_factory, classifier_rev="bench") as writer:
+        for i in range(1, n + 1):
+            title, content = make_notice(rng, body)
+            posted_at = START_DAY + datetime.timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+            canonical_url = f"https://example.test/read/{rng.randint(1, i - 1)}" if i > 1 and rng.random() < copy_rate \
+                else None
+            writer.add(rng.randint(1, 5), f"https://example.test/read/{i}", title, content,
+                       posted_at.strftime("%Y-%m-%d %H:%M:%S"), make_hash(title, content), rng.choice(CATEGORIES),
+                       0.9, "ml-bench", canonical_url=canonical_url)
+    interests = {u: rng.sample(CATEGORIES, rng.randint(1, 4)) for u in range(1, users + 1)}
+    if db is not None:
+        db.interests = {u: [(c, 1) for c in cats] for u, cats in interests.items()}
+        return list(interests)
+    with conn_factory(autocommit=False) as conn, conn.cursor() as cur:
+        user_ids = []
+        for u in interests:
+            cur.execute("INSERT INTO app_user (email, password_hash) VALUES (%s, 'x')", (BENCH_EMAIL.format(u),))
+            user_ids.append(cur.lastrowid)
+        rows = [(user_id, c) for user_id, u in zip(user_ids, interests) for c in interests[u]]
+        for i in range(0, len(rows), 1000):
+            chunk = rows[i:i + 1000]
+            cur.execute("INSERT INTO user_interest_category (user_id, category_id) VALUES "
+                        + ",".join(["(%s, %s)"] * len(chunk)), [v for row in chunk for v in row])
+        conn.commit()
+    return user_ids
+
+
+class NewNotices:
+    """카테고리 1 에 지금 게시된 공지를 하나씩 저장 (부하 중 쓰기 / 반영 시간 측정)"""
+
+    def __init__(self, conn_factory):
+        self.conn_factory = conn_factory
+        self.lock = threading.Lock()
+        self.seq = 0
+
+    def write(self) -> int:
+        from crawler.db import NoticeWriter
+
+        with self.lock:
+            self.seq += 1
+            url = f"https://example.test/new/{time.time_ns()}-{self.seq}"
+            with NoticeWriter(conn_factory=self.conn_factory, classifier_rev="bench") as writer:
+                writer.add(1, url, f"[새 공지 {self.seq}]", "본문", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                           f"h{self.seq}", 1, 0.9, "ml-bench")
+                return writer.flush()[url]
+
+
+def serve_child(args):
+    """API 프로세스 - 시드 후 {"url", "users", "ids"} 한 줄 출력, stdin 의 "write" 마다 새 공지 id 출력"""
+    from crawler.read_api import serve
+
+    if args.db == "memory":
+        from bench.memory_db import MemoryDB
+
+        db = MemoryDB()
+        conn_factory = db.connect
+    else:
+        os.environ.update(BENCH_DB)
+        from crawler.db import get_conn
+
+        db, conn_factory = None, get_conn
+    users = seed(conn_factory, db, args.notices, args.users) if args.seed else None
+    if db is not None:
+        ids = [1, len(db.by_id)]
+    else:
+        with conn_factory() as conn, conn.cursor() as cur:
+            cur.execute("SELECT MIN(id) AS lo, MAX(id) AS hi FROM notice")
+            row = cur.fetchone()
+            ids = [row["lo"], row["hi"]]
+    new_notices = NewNotices(conn_factory)
+    stop = threading.Event()
+
+    def background_writes():
+        while not stop.wait(args.write_interval):
+            new_notices.write()
+
+    def commands():
+        for line in sys.stdin:
+            if line.strip() == "write":
+                print(json.dumps({"written": new_notices.write()}), flush=True)
+        stop.set()
+        loop.call_soon_threadsafe(task.cancel)
+
+    def ready(url: str):
+        print(json.dumps({"url": url, "users": users, "ids": ids}), flush=True)
+        if args.write_interval > 0:
+            threading.Thread(target=background_writes, daemon=True).start()
+        threading.Thread(target=commands, daemon=True).start()
+
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve("127.0.0.1", 0, conn_factory=conn_factory, pool_size=args.pool_size,
+                                  cache_ttl=args.serve_ttl, epoch_poll_interval=args.epoch_poll, ready=ready))
+    try:
+        loop.run_until_complete(task)
+    except asyncio.CancelledError:
+        pass
+
+
+# ---------------------------------------------------------
+# 부하 (이 프로세스)
+# ---------------------------------------------------------
+class Client:
+    """keep-alive 연결 1개로 GET 을 순서대로"""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, path: str) -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, await self.reader.readexactly(length)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_load(url: str, users: List[int], ids: List[int], connections: int, duration: float, seed: int = 1) -> Dict:
+    host, port = url.split("//")[1].split(":")
+    latencies: Dict[str, List[float]] = {kind: [] for kind, _ in MIX}
+    errors = {"n": 0}
+    deadline = time.perf_counter() + duration
+    kinds = [kind for kind, _ in MIX]
+    weights = [w for _, w in MIX]
+
+    async def worker(i: int):
+        rng = random.Random(seed * 1000 + i)
+        client = Client(host, int(port))
+        try:
+            while time.perf_counter() < deadline:
+                kind = rng.choices(kinds, weights)[0]
+                if kind == "category":
+                    paths = [f"/feed/category/{rng.choice(CATEGORIES)}"]
+                elif kind == "user":
+                    paths = [f"/feed/user/{users[min(int(rng.expovariate(1 / 50)), len(users) - 1)]}"]
+                elif kind == "notice":
+                    recent = rng.random() < 0.8
+                    notice_id = rng.randint(max(ids[0], ids[1] - 2000), ids[1]) if recent else rng.randint(*ids)
+                    paths = [f"/notices/{notice_id}"]
+                else:
+                    paths = [f"/feed/category/{rng.choice(CATEGORIES)}"]
+                for page in range(rng.randint(2, 5) if kind == "paging" else 1):
+                    t = time.perf_counter()
+                    status, body = await client.get(paths[-1])
+                    latencies[kind].append(time.perf_counter() - t)
+                    if status not in (200, 404):
+                        errors["n"] += 1
+                        break
+                    if kind != "paging":
+                        break
+                    cursor = json.loads(body).get("next_cursor")
+                    if not cursor:
+                        break
+                    paths.append(f"{paths[0]}?cursor={cursor}")
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    everything = sorted(x for samples in latencies.values() for x in samples)
+    pct = lambda s, q: round(s[min(len(s) - 1, int(q * len(s)))] * 1000, 2) if s else 0.0
+    routes = {kind: {"n": len(s), "p50_ms": pct(sorted(s), 0.5), "p99_ms": pct(sorted(s), 0.99)}
+              for kind, s in latencies.items()}
+    return {"requests": len(everything), "per_s": round(len(everything) / elapsed, 1), "errors": errors["n"],
+            "p50_ms": pct(everything, 0.5), "p99_ms": pct(everything, 0.99), "routes": routes}
+
+
+async def freshness(url: str, child: subprocess.Popen, timeout: float = 10.0) -> float:
+    """새 공지 저장 -> 카테고리 1 피드 첫 페이지에 나올 때까지 (ms, 부하 중 쓰기가 더 새 공지를 얹을 수 있어 포함 여부로 본다)"""
+    host, port = url.split("//")[1].split(":")
+    client = Client(host, int(port))
+    await client.get("/feed/category/1")      # 캐시에 올려 둔다
+    child.stdin.write("write\n")
+    child.stdin.flush()
+    line = child.stdout.readline()
+    while not line.startswith("{"):
+        line = child.stdout.readline()
+    written = json.loads(line)["written"]
+    started = time.perf_counter()
+    try:
+        while time.perf_counter() - started < timeout:
+            _, body = await client.get("/feed/category/1")
+            items = json.loads(body)["items"]
+            if any(item["id"] == written for item in items):
+                return round((time.perf_counter() - started) * 1000, 1)
+            await asyncio.sleep(0.01)
+        return -1.0
+    finally:
+        client.close()
+
+
+def start_child(args, ttl: float, seed_data: bool) -> tuple:
+    argv = [sys.executable, os.path.abspath(__file__), "--serve", "--db", args.db, "--notices", str(args.notices),
+            "--users", str(args.users), "--serve-ttl", str(ttl), "--pool-size", str(args.pool_size),
+            "--write-interval", str(args.write_interval), "--epoch-poll", str(args.epoch_poll)]
+    if seed_data:
+        argv.append("--seed")
+    child = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    while True:
+        line = child.stdout.readline()
+        if not line:
+            raise RuntimeError("API 프로세스가 시작하지 못했습니다")
+        if line.startswith("{"):
+            return child, json.loads(line)
+
+
+def stop_child(child: subprocess.Popen):
+    child.stdin.close()
+    child.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", choices=("mysql", "memory"), default="mysql")
+    parser.add_argument("--notices", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="설정마다 부하 시간(초)")
+    parser.add_argument("--write-interval", type=float, default=1.0, help="부하 중 새 공지 저장 주기(초, 0 이면 안 씀)")
+    parser.add_argument("--ttl", default="0,30", help="응답 캐시 TTL 목록 (0 = 캐시 끔)")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--epoch-poll", type=float, default=1.0, help="API 의 feed_epoch 확인 주기(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serve-ttl", type=float, default=30.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_child(args)
+        return
+
+    results: Dict = {}
+    fresh_ms = None
+    users = None
+    for n, ttl in enumerate(float(t) for t in args.ttl.split(",")):
+        # mysql 은 처음 한 번만 적재, memory 는 API 프로세스마다 새로 적재
+        child, info = start_child(args, ttl, seed_data=args.db == "memory" or n == 0)
+        users = info["users"] or users
+        try:
+            results[f"ttl={ttl:g}"] = asyncio.run(run_load(info["url"], users, info["ids"], args.connections,
+                                                           args.duration))
+            if ttl > 0 and fresh_ms is None:
+                fresh_ms = asyncio.run(freshness(info["url"], child))
+        finally:
+            stop_child(child)
+
+    if args.json:
+        print(json.dumps({"db": args.db, "notices": args.notices, "users": args.users, "connections": args.connections,
+                          "duration": args.duration, "write_interval": args.write_interval,
+                          "results": results, "freshness_ms": fresh_ms}, ensure_ascii=False, indent=2))
+        return
+    print(f"db={args.db} notices={args.notices} users={args.users} connections={args.connections} "
+          f"duration={args.duration:g}s write_interval={args.write_interval:g}s pool={args.pool_size}")
+    print(f"{'config':<8} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8} {'errors':>6}   "
+          + "  ".join(f"{kind} p50/p99" for kind, _ in MIX))
+    for config, r in results.items():
+        routes = "  ".join(f"{r['routes'][kind]['p50_ms']}/{r['routes'][kind]['p99_ms']}" for kind, _ in MIX)
+        print(f"{config:<8} {r['per_s']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8} {r['errors']:>6}   {routes}")
+    if fresh_ms is not None:
+        print(f"새 공지 반영: 저장 후 {fresh_ms}ms 에 피드 첫 페이지에 나옴 (feed_epoch 확인 주기 {args.epoch_poll:g}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+재분류 job 벤치마크 (crawler/reclassify.py, 메모리 DB)
+
+    python bench/bench_reclassify.py [--notices 100000] [--copies 0.02] [--workers 0,1,2,4] [--naive 2000]
+                                     [--model crawler/model.pkl] [--json]
+
+- 합성 공지를 NoticeWriter 로 저장 (예전 revision 으로 분류된 상태, copies 비율은 근사 중복 사본)
+- 이어받기: to_id 로 앞 절반만 처리 -> 범위 없이 다시 실행하면 나머지만 -> 한 번 더 실행하면 0건
+- 처리량: 워커 수별 force 실행 notices/s (결과가 워커 수와 무관하게 같은지 검증)
+- 비교 기준: 한 건씩 classify + 교체 + 커밋 (--naive 건)
+- --model 이 없으면 bench_startup 과 같은 임시 모델을 학습해 ML 단계까지 탄다 (sklearn 필요)
+- 메모리 DB 라 DB 비용은 거의 0 - 분류/스트리밍/프로세스 풀 쪽 처리량 상한
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# OpenAI 계층/분류 캐시 없이 (스폰된 워커도 같은 환경)
+os.environ.update(OPENAI_API_KEY="", CLASSIFY_CACHE="0")
+
+from bench.bench_startup import train_model  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+from bench.memory_db import MemoryDB  # noqa: E402
+from crawler.db import NoticeWriter, open_reclassify_stream, replace_notice_labels  # noqa: E402
+from crawler.reclassify import reclassify  # noqa: E402
+from crawler.text_classifier import configure_classifier  # noqa: E402
+
+
+def make_db(n: int, copy_rate: float, body: int) -> MemoryDB:
+    """예전 revision("old") 으로 분류된 공지 n 건 (copy_rate 비율은 앞쪽 공지의 사본)"""
+    db = MemoryDB()
+    rng = random.Random(5)
+    corpus = make_corpus(n, body, seed=9)
+    with NoticeWriter(batch_size=1000, flush_interval=3600, conn_factory=db.connect, classifier_rev="old") as writer:
+        for i, (title, content) in enumerate(corpus, start=1):
+            canonical_id = rng.randint(1, i - 1) if i > 1 and rng.random() < copy_rate else None
+            writer.add(1, f"https://example.test/{i}", title, content, None, f"h{i}", 12, 0.1, "keyword-final",
+                       canonical_id=canonical_id)
+    # 사본의 사본은 없도록 (대표를 가리키는 사본만)
+    for row in db.notices.values():
+        canonical = db.by_id.get(row["canonical_id"]) if row["canonical_id"] else None
+        if canonical is not None and canonical["canonical_id"] is not None:
+            db._set_canonical(row, None)
+    return db
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def naive(db: MemoryDB, limit: int) -> Dict:
+    """한 건씩 분류하고 한 건씩 교체/커밋"""
+    classifier = quiet(configure_classifier)
+    classifier.cache = None
+    rev = classifier.revision_tag
+    conn = db.connect(autocommit=False)
+    with db.connect() as stream_conn:
+        cur = open_reclassify_stream(stream_conn, None)
+        rows = cur.fetchmany(limit)
+    started = time.perf_counter()
+    for row in rows:
+        cat_id, conf, ver = classifier.classify(row["title"], row["content"])
+        with conn.cursor() as wcur:
+            replace_notice_labels(wcur, [(row["id"], cat_id, conf, ver, rev)])
+        conn.commit()
+    elapsed = time.perf_counter() - started
+    return {"scanned": len(rows), "seconds": round(elapsed, 3), "notices_per_s": round(len(rows) / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--notices", type=int, default=100000)
+    parser.add_argument("--copies", type=float, default=0.02, help="근사 중복 사본 비율")
+    parser.add_argument("--body", type=int, default=1000, help="공지 본문 길이(자)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", default="0,1,2,4")
+    parser.add_argument("--naive", type=int, default=2000, help="한 건씩 처리로 잴 공지 수")
+    parser.add_argument("--model", help="model.pkl / 아티팩트 경로 (없으면 임시 모델 학습)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.model:
+            args.model = os.path.join(tmp, "model.pkl")
+            train_model(args.model)
+        os.environ["CLASSIFIER_MODEL_PATH"] = args.model
+        run_bench(args)
+
+
+def run_bench(args):
+    db = make_db(args.notices, args.copies, args.body)
+    copies = sum(len(ids) for ids in db.copies.values())
+    canonical = args.notices - copies
+    results: Dict = {"notices": args.notices, "copies": copies}
+
+    # 이어받기 - 절반 / 나머지 / 다시 실행하면 0건
+    first = quiet(reclassify, db.connect, to_id=args.notices // 2, batch_size=args.batch_size, workers=0)
+    rest = quiet(reclassify, db.connect, batch_size=args.batch_size, workers=0)
+    again = quiet(reclassify, db.connect, batch_size=args.batch_size, workers=0)
+    assert first["scanned"] + rest["scanned"] == canonical, (first, rest, canonical)
+    assert again["scanned"] == 0, again
+    rev = first["classifier_rev"]
+    assert all(label[3] == rev for label in db.categories.values()), "revision 이 갱신되지 않은 행"
+    for canonical_id, ids in db.copies.items():
+        for notice_id in ids:
+            assert db.categories[notice_id] == db.categories[canonical_id], "사본 결과가 대표와 다름"
+    expected = dict(db.categories)
+    results["resume"] = {"first_half": first["scanned"], "rest": rest["scanned"], "rerun": again["scanned"],
+                         "copies_updated": first["copies"] + rest["copies"]}
+
+    results["naive"] = naive(db, args.naive)
+    results["workers"] = {}
+    for workers in [int(w) for w in args.workers.split(",")]:
+        run = quiet(reclassify, db.connect, batch_size=args.batch_size, workers=workers, force=True)
+        assert run["scanned"] == canonical and db.categories == expected, f"workers={workers} 결과 불일치"
+        results["workers"][workers] = {"seconds": run["seconds"], "notices_per_s": run["notices_per_s"]}
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"notices={args.notices} copies={copies} body={args.body}자 batch={args.batch_size}")
+    r = results["resume"]
+    print(f"resume: to_id={args.notices // 2} -> {r['first_half']}건, 이어서 {r['rest']}건, 재실행 {r['rerun']}건 "
+          f"(사본 {r['copies_updated']}건 갱신)")
+    base = results["naive"]["notices_per_s"]
+    print(f"{'naive':<10} {base}/s ({results['naive']['scanned']}건)")
+    for workers, r in results["workers"].items():
+        print(f"workers={workers:<3} {r['notices_per_s']}/s ({r['seconds']}s, x{r['notices_per_s'] / base:.1f})")
+
+
+if __name__ == "__main__":
+    main()
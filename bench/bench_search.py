@@ -0,0 +1,295 @@
+"""
+공지 검색 지연 벤치마크 (crawler/search.py, 일회용 MySQL 필요)
+
+    docker compose --profile bench up -d mysql-bench
+    python bench/bench_search.py [--notices 100000] [--body 1000] [--repeat 20] [--like-repeat 3]
+                                 [--reuse] [--json]
+
+- 합성 공지 --notices 건(bench/corpus.py + 드문 합성 단어, 카테고리/소스/게시일 무작위)을 넣는다.
+  FULLTEXT 인덱스는 적재 전에 내리고 적재 뒤 다시 만들어 적재 시간과 인덱스 생성 시간을 따로 잰다.
+  (--reuse: 이미 같은 수만큼 있으면 적재 생략)
+- 질의 종류별(흔한 단어 / 두 단어 AND / 드문 단어 / 영어 / 제외어 / 카테고리 필터 / 최신순)로
+    search() 첫 페이지(발췌/카테고리 포함), 5페이지 SQL 을 keyset 커서 / OFFSET 방식으로 읽을 때의 p50/p95 와
+    기존 방식(LIKE '%..%' 전체 스캔)의 시간을 비교한다.
+- FULLTEXT 결과 집합이 LIKE 부분 문자열 결과와 같은지 질의마다 검증한다.
+- 증분 반영: NoticeWriter(upsert_notice 와 같은 UPSERT)로 새 공지/제목 수정을 저장한 직후
+  검색에 바로 나오는지 확인한다.
+
+BENCH_DB_* 설정은 bench_pipeline.py 와 같음. 실행 전에 notice / notice_category 를 비운다 (--reuse 제외).
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_pipeline import BENCH_DB, latency_stats, timed  # noqa: E402
+from bench.corpus import make_notice  # noqa: E402
+
+os.environ.update(BENCH_DB)
+
+from crawler.db import NoticeWriter, get_conn, search_notices  # noqa: E402
+from crawler.hashing import make_hash  # noqa: E402
+from crawler.search import boolean_query, decode_cursor, parse_query, search  # noqa: E402
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+FULLTEXT_INDEXES = {
+    "ftx_notice_title": "(title)",
+    "ftx_notice_title_content": "(title, content)",
+}
+LOAD_CHUNK = 500
+PAGE = 20
+DEEP_PAGE = 5
+
+
+# ---------------------------------------------------------
+# 적재
+# ---------------------------------------------------------
+def _fulltext_indexes(cur) -> List[str]:
+    cur.execute(
+        """
+        SELECT DISTINCT index_name AS name FROM information_schema.statistics
+         WHERE table_schema = DATABASE() AND table_name = 'notice' AND index_type = 'FULLTEXT'
+        """
+    )
+    return [row["name"] for row in cur.fetchall()]
+
+
+def _add_fulltext(cur) -> float:
+    existing = set(_fulltext_indexes(cur))
+    started = time.perf_counter()
+    for name, columns in FULLTEXT_INDEXES.items():
+        if name not in existing:
+            # InnoDB 는 FULLTEXT 인덱스를 ALTER 한 번에 하나씩만 추가할 수 있다
+            cur.execute(f"ALTER TABLE notice ADD FULLTEXT INDEX {name} {columns} WITH PARSER ngram")
+    return time.perf_counter() - started
+
+
+def load(n: int, body: int, rare_words: List[str], seed: int = 7) -> Dict:
+    rng = random.Random(seed)
+    start_day = datetime.datetime(2023, 1, 1)
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM notice_category")
+        cur.execute("DELETE FROM notice")
+        for name in _fulltext_indexes(cur):
+            cur.execute(f"ALTER TABLE notice DROP INDEX {name}")
+
+        started = time.perf_counter()
+        for offset in range(0, n, LOAD_CHUNK):
+            rows, categories = [], []
+            for i in range(offset, min(n, offset + LOAD_CHUNK)):
+                title, content = make_notice(rng, body)
+                if rng.random() < 0.05:
+                    content += " " + rng.choice(rare_words)
+                posted = start_day + datetime.timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                rows.append((1 + i % 5, f"http://bench.local/search/{i}", title, content, posted,
+                             make_hash(title, content)))
+            cur.execute(
+                "INSERT INTO notice (source_id, url, title, content, posted_at, hash) VALUES "
+                + ",".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows)),
+                [v for row in rows for v in row],
+            )
+            first_id = cur.lastrowid   # 다중 행 INSERT 는 첫 행 id (innodb_autoinc_lock_mode 기본값에서 연속)
+            for j in range(len(rows)):
+                categories.append((first_id + j, rng.randint(1, 12), 0.9, "bench"))
+            cur.execute(
+                "INSERT INTO notice_category (notice_id, category_id, confidence, model_version) VALUES "
+                + ",".join(["(%s, %s, %s, %s)"] * len(categories)),
+                [v for row in categories for v in row],
+            )
+        load_s = time.perf_counter() - started
+        index_s = _add_fulltext(cur)
+        cur.execute("ANALYZE TABLE notice")
+        cur.fetchall()
+    return {"load_s": round(load_s, 1), "index_build_s": round(index_s, 1)}
+
+
+# ---------------------------------------------------------
+# 질의
+# ---------------------------------------------------------
+def _like_where(terms: Dict[str, List[str]]):
+    """기존 방식 - 검색어마다 제목/본문 LIKE '%..%' (인덱스 없이 전체 스캔)"""
+    where, args = [], []
+    for term in terms["include"]:
+        where.append("(n.title LIKE %s OR n.content LIKE %s)")
+        args += [f"%{term}%", f"%{term}%"]
+    for term in terms["exclude"]:
+        where.append("NOT (n.title LIKE %s OR n.content LIKE %s)")
+        args += [f"%{term}%", f"%{term}%"]
+    return " AND ".join(where), args
+
+
+def _filter_sql(spec: Dict):
+    where, args = [], []
+    if spec.get("categories"):
+        where.append("EXISTS (SELECT 1 FROM notice_category nc WHERE nc.notice_id = n.id AND nc.category_id IN ("
+                     + ",".join(["%s"] * len(spec["categories"])) + "))")
+        args += spec["categories"]
+    return where, args
+
+
+def like_page(cur, spec: Dict) -> List[int]:
+    like, args = _like_where(parse_query(spec["q"]))
+    extra, extra_args = _filter_sql(spec)
+    cur.execute(f"SELECT n.id FROM notice n WHERE {' AND '.join([like] + extra)}"
+                " ORDER BY n.posted_at DESC, n.id DESC LIMIT %s", args + extra_args + [PAGE])
+    return [row["id"] for row in cur.fetchall()]
+
+
+def match_sets(cur, spec: Dict):
+    """(FULLTEXT 일치 id 집합, LIKE 일치 id 집합)"""
+    terms = parse_query(spec["q"])
+    extra, extra_args = _filter_sql(spec)
+    cur.execute(f"SELECT n.id FROM notice n WHERE {' AND '.join(['MATCH(n.title, n.content) AGAINST (%s IN BOOLEAN MODE)'] + extra)}",
+                [boolean_query(terms)] + extra_args)
+    fulltext = {row["id"] for row in cur.fetchall()}
+    like, args = _like_where(terms)
+    cur.execute(f"SELECT n.id FROM notice n WHERE {' AND '.join([like] + extra)}", args + extra_args)
+    return fulltext, {row["id"] for row in cur.fetchall()}
+
+
+def _search(cur, spec: Dict, cursor: Optional[str] = None) -> Dict:
+    return search(cur, spec["q"], categories=spec.get("categories"), sort=spec.get("sort", "relevance"),
+                  limit=PAGE, cursor=cursor)
+
+
+def deep_cursor(cur, spec: Dict) -> Optional[str]:
+    """DEEP_PAGE 페이지를 여는 커서 (앞 페이지를 차례로 넘겨 얻는다, 결과가 모자라면 None)"""
+    cursor = None
+    for _ in range(DEEP_PAGE - 1):
+        cursor = _search(cur, spec, cursor)["next_cursor"]
+        if cursor is None:
+            return None
+    return cursor
+
+
+def deep_keyset(cur, spec: Dict, after: tuple) -> List[int]:
+    """DEEP_PAGE 페이지를 keyset 으로 - 직전 페이지 마지막 행 뒤의 PAGE 행만 정렬"""
+    rows = search_notices(cur, boolean_query(parse_query(spec["q"])), sort=spec.get("sort", "relevance"),
+                          after=after, limit=PAGE, categories=spec.get("categories"))
+    return [row["id"] for row in rows]
+
+
+def deep_offset(cur, spec: Dict) -> List[int]:
+    """같은 위치를 OFFSET 방식으로 - 앞 페이지 행까지 상위 PAGE * DEEP_PAGE 행을 정렬해 건너뜀"""
+    rows = search_notices(cur, boolean_query(parse_query(spec["q"])), sort=spec.get("sort", "relevance"),
+                          limit=PAGE * DEEP_PAGE, categories=spec.get("categories"))
+    return [row["id"] for row in rows[-PAGE:]]
+
+
+def bench_queries(specs: List[Dict], repeat: int, like_repeat: int) -> List[Dict]:
+    results = []
+    with get_conn() as conn, conn.cursor() as cur:
+        for spec in specs:
+            _search(cur, spec)  # 준비
+            first = [timed(_search, cur, spec) for _ in range(repeat)]
+            cursor = deep_cursor(cur, spec)
+            after = decode_cursor(cursor, spec.get("sort", "relevance")) if cursor else None
+            if after is not None:
+                assert deep_keyset(cur, spec, after) == deep_offset(cur, spec), f"페이지 불일치 {spec['name']}"
+            keyset = [timed(deep_keyset, cur, spec, after) for _ in range(repeat)] if after else []
+            offset = [timed(deep_offset, cur, spec) for _ in range(repeat)]
+            like = [timed(like_page, cur, spec) for _ in range(like_repeat)]
+            fulltext_ids, like_ids = match_sets(cur, spec)
+            results.append({
+                "name": spec["name"],
+                "q": spec["q"],
+                "matches": len(fulltext_ids),
+                "same_as_like": fulltext_ids == like_ids,
+                "like_only": len(like_ids - fulltext_ids),
+                "fulltext_only": len(fulltext_ids - like_ids),
+                "first_page": latency_stats(first),
+                f"page{DEEP_PAGE}_keyset": latency_stats(keyset),
+                f"page{DEEP_PAGE}_offset": latency_stats(offset),
+                "like_scan": latency_stats(like),
+            })
+    return results
+
+
+def bench_incremental(n: int = 200) -> Dict:
+    """NoticeWriter 로 저장(커밋)한 직후 검색 결과에 나오는지"""
+    token = "증분" + "".join(random.choice(SYLLABLES) for _ in range(4))
+    writer = NoticeWriter(batch_size=n + 1, flush_interval=3600, conn_factory=get_conn)
+    for i in range(n):
+        title, content = f"{token} 신규 공지 {i}", f"본문 {i} {token}"
+        writer.add(1 + i % 5, f"http://bench.local/search-new/{token}/{i}", title, content,
+                   None, make_hash(title, content), 1 + i % 12, 0.9, "bench")
+    write_s = timed(writer.flush)
+    writer.close()
+    with get_conn() as conn, conn.cursor() as cur:
+        started = time.perf_counter()
+        found, cursor = 0, None
+        while True:
+            page = search(cur, token, limit=100, cursor=cursor)
+            found += len(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        search_s = time.perf_counter() - started
+        # 제목 수정(UPSERT 갱신)도 바로 반영되는지
+        renamed = token + "수정"
+        cur.execute("SELECT id, url, content, hash FROM notice WHERE url = %s",
+                    (f"http://bench.local/search-new/{token}/0",))
+        row = cur.fetchone()
+    writer = NoticeWriter(batch_size=2, flush_interval=3600, conn_factory=get_conn)
+    writer.add(1, row["url"], renamed, row["content"], None, make_hash(renamed, row["content"]), 1, 0.9, "bench")
+    writer.flush()
+    writer.close()
+    with get_conn() as conn, conn.cursor() as cur:
+        updated = [item["id"] for item in search(cur, renamed)["items"]]
+    return {"written": n, "write_s": round(write_s, 3), "found_after_commit": found,
+            "search_all_s": round(search_s, 3), "title_update_found": updated == [row["id"]]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--notices", type=int, default=100000)
+    parser.add_argument("--body", type=int, default=1000, help="공지 본문 길이(자)")
+    parser.add_argument("--repeat", type=int, default=20, help="FULLTEXT 질의 반복 수")
+    parser.add_argument("--like-repeat", type=int, default=3, help="LIKE 전체 스캔 반복 수")
+    parser.add_argument("--reuse", action="store_true", help="이미 같은 수의 공지가 있으면 적재 생략")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    rare_words = ["".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(2000)]
+    loaded = {"load_s": None, "index_build_s": None}
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS n FROM notice")
+        existing = cur.fetchone()["n"]
+    if not (args.reuse and existing == args.notices):
+        loaded = load(args.notices, args.body, rare_words)
+    specs = [
+        {"name": "common", "q": "장학금"},
+        {"name": "and2", "q": "채용 면접"},
+        {"name": "rare", "q": rare_words[0]},
+        {"name": "english", "q": "workshop"},
+        {"name": "exclude", "q": "특강 -세미나"},
+        {"name": "category", "q": "데이터", "categories": [5]},
+        {"name": "recent", "q": "인턴", "sort": "recent"},
+    ]
+    results = bench_queries(specs, args.repeat, args.like_repeat)
+    incremental = bench_incremental()
+
+    if args.json:
+        print(json.dumps({"notices": args.notices, "body": args.body, **loaded, "queries": results,
+                          "incremental": incremental}, ensure_ascii=False, indent=2, default=str))
+        return
+    print(f"notices={args.notices} body={args.body}자 load={loaded['load_s']}s index_build={loaded['index_build_s']}s")
+    for r in results:
+        print(f"{r['name']:<9} q={r['q']!r:<14} matches={r['matches']:<6} same_as_like={r['same_as_like']} "
+              f"first p50={r['first_page']['p50_ms']}ms p95={r['first_page']['p95_ms']}ms | "
+              f"page{DEEP_PAGE} keyset p50={r[f'page{DEEP_PAGE}_keyset']['p50_ms']}ms "
+              f"offset p50={r[f'page{DEEP_PAGE}_offset']['p50_ms']}ms | "
+              f"LIKE p50={r['like_scan']['p50_ms']}ms (x{r['like_scan']['p50_ms'] / max(r['first_page']['p50_ms'], 1e-6):.0f})")
+    print(f"incremental written={incremental['written']} write={incremental['write_s']}s "
+          f"found_after_commit={incremental['found_after_commit']} title_update_found={incremental['title_update_found']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+분류기 시작 비용 벤치마크 (model.pkl vs mmap 아티팩트)
+
+    python bench/bench_startup.py [--model crawler/model.pkl] [--repeat 5]
+
+- 새 프로세스마다 아래 구간을 잰다 (이전 실행의 import 캐시 영향 없음).
+    import     text_classifier 모듈 import
+    init       TextClassifier(model_path=...) 생성
+    first_kw   키워드만으로 끝나는 첫 분류 (모델 로드 안 함)
+    first_ml   ML 단계까지 가는 첫 분류 (모델 로드 포함)
+- --model 이 없으면 bench 코퍼스로 임시 모델을 학습한다 (sklearn 필요).
+- pickle 과 아티팩트의 분류 결과가 같은지 먼저 검증한다.
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.corpus import make_corpus, make_notice  # noqa: E402
+
+# 자식 프로세스에서 실행 (구간별 ms 를 JSON 한 줄로 출력)
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+t0 = time.perf_counter()
+from crawler.text_classifier import TextClassifier
+t1 = time.perf_counter()
+clf = TextClassifier(model_path=sys.argv[2], confidence_threshold=0.7)
+t2 = time.perf_counter()
+clf.classify("AI 개발자 채용 공고", "인공지능 백엔드 개발자 채용 채용 인턴 모집")
+t3 = time.perf_counter()
+clf.classify("일정 안내", "자세한 사항은 첨부 파일을 참고하시기 바랍니다")
+t4 = time.perf_counter()
+# 최대 RSS(MB) - ru_maxrss 는 fork 한 부모 값을 물려받으므로 /proc 의 VmHWM 사용
+rss = 0
+try:
+    with open("/proc/self/status") as f:
+        rss = next(int(line.split()[1]) // 1024 for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    pass
+ms = lambda a, b: round((b - a) * 1000, 1)
+print(json.dumps({"import": ms(t0, t1), "init": ms(t1, t2), "first_kw": ms(t2, t3),
+                  "first_ml": ms(t3, t4), "loaded": clf.model is not None, "rss_mb": rss}))
+"""
+
+PHASES = ("import", "init", "first_kw", "first_ml")
+
+
+def train_model(path: str):
+    """bench 코퍼스로 TF-IDF + LogisticRegression 학습 (라벨은 키워드 분류 + 잡음)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    from crawler.text_classifier import TextClassifier
+
+    clf = TextClassifier()
+    rng = random.Random(3)
+    corpus = make_corpus(600, 800, seed=7)
+    texts = [clf.preprocess_text(t, c) for t, c in corpus]
+    labels = [clf.predict_with_keywords(t, c)[0] if rng.random() < 0.7 else rng.randint(1, 12)
+              for t, c in corpus]
+    vectorizer = TfidfVectorizer(max_features=5000)
+    model = LogisticRegression(random_state=42, max_iter=500).fit(vectorizer.fit_transform(texts), labels)
+    with open(path, "wb") as f:
+        pickle.dump({"model": model, "vectorizer": vectorizer, "version": "ml-bench"}, f)
+
+
+def check_equal(pickle_path: str, artifact_dir: str, n: int = 300):
+    from crawler.text_classifier import TextClassifier
+
+    rng = random.Random(11)
+    items = [make_notice(rng, 400) for _ in range(n)]
+    expected = TextClassifier(model_path=pickle_path).classify_batch(items)
+    got = TextClassifier(model_path=artifact_dir).classify_batch(items)
+    for (c1, p1, v1), (c2, p2, v2) in zip(expected, got):
+        assert c1 == c2 and v1 == v2 and abs(p1 - p2) < 1e-9, ((c1, p1, v1), (c2, p2, v2))
+
+
+def measure(model_path: str, repeat: int):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", CHILD, ROOT, model_path],
+                             capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    row = {phase: statistics.median(r[phase] for r in runs) for phase in PHASES}
+    row["rss_mb"] = statistics.median(r["rss_mb"] for r in runs)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", help="model.pkl 경로 (없으면 임시 모델 학습)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    from crawler.model_artifact import convert_pickle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = args.model
+        if not pickle_path:
+            pickle_path = os.path.join(tmp, "model.pkl")
+            train_model(pickle_path)
+        artifact_dir = os.path.join(tmp, "model")
+        convert_pickle(pickle_path, artifact_dir)
+        check_equal(pickle_path, artifact_dir)
+
+        results = {"pickle": measure(pickle_path, args.repeat),
+                   "artifact": measure(artifact_dir, args.repeat)}
+
+    if args.json:
+        print(json.dumps({"repeat": args.repeat, "results": results}, indent=2))
+        return
+    print(f"median of {args.repeat} runs (ms)")
+    print(f"{'format':<10}" + "".join(f"{p:>10}" for p in PHASES) + f"{'rss_mb':>8}")
+    for name, row in results.items():
+        print(f"{name:<10}" + "".join(f"{row[p]:>10.1f}" for p in PHASES) + f"{row['rss_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
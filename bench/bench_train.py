@@ -0,0 +1,179 @@
+"""
+ML 계층 스트리밍 학습 벤치마크 (crawler/train.py)
+
+    python bench/bench_train.py [--sizes 10000,50000,100000] [--baseline-max 50000] [--body 800] [--json]
+
+- 공지 수별로 새 프로세스에서 학습하고 학습 rows/s, 검증 정확도, 최대 RSS 를 잰다.
+    stream    train() - 서버 측 커서 대역(행을 그때그때 생성, 보관하지 않음) + 해시 특징 + SGD partial_fit
+    baseline  기존 방식 - 전체를 리스트로 읽어 TfidfVectorizer + LogisticRegression 한 번에 학습
+              (--baseline-max 이하 크기만)
+- 라벨: 키워드 분류 결과 + 잡음 10% (bench_startup.train_model 과 같은 방식), 검증 행은 id % 10 == 0
+- 스트리밍 학습 아티팩트를 TextClassifier 로 읽어 분류되는지 확인한다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.bench_pipeline import peak_rss_mb  # noqa: E402
+from bench.corpus import make_notice  # noqa: E402
+
+HOLDOUT_EVERY = 10
+
+
+def labeled_row(notice_id: int, body: int, keyword_label) -> Dict:
+    """id 로 정해지는 공지 1건 (같은 id 면 항상 같은 행)"""
+    rng = random.Random(notice_id)
+    title, content = make_notice(rng, body)
+    label = keyword_label(title, content)[0] if rng.random() < 0.9 else rng.randint(1, 12)
+    return {"id": notice_id, "title": title, "content": content, "category_id": label}
+
+
+class SyntheticStream:
+    """open_training_stream / fetch_label_classes 가 보내는 문장만 흉내 내는 연결 (행을 보관하지 않음)"""
+
+    def __init__(self, n: int, body: int):
+        from crawler.text_classifier import TextClassifier
+
+        self.n = n
+        self.body = body
+        self.keyword_label = TextClassifier().predict_with_keywords
+
+    def connect(self, autocommit: bool = True):
+        return self
+
+    def cursor(self, cursor=None):
+        return _SyntheticCursor(self)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+class _SyntheticCursor:
+    def __init__(self, source: SyntheticStream):
+        self.source = source
+        self._ids = iter(())
+        self._rows: List[Dict] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def execute(self, sql: str, args=None):
+        if "DISTINCT" in sql:
+            self._rows = [{"category_id": c} for c in range(1, 13)]
+        elif "MOD" in sql:
+            *_, every, holdout = args
+            self._ids = (i for i in range(1, self.source.n + 1) if (i % every == 0) == bool(holdout))
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchmany(self, size: int):
+        rows = []
+        for notice_id in self._ids:
+            rows.append(labeled_row(notice_id, self.source.body, self.source.keyword_label))
+            if len(rows) >= size:
+                break
+        return rows
+
+    def close(self):
+        self._ids = iter(())
+
+
+def child_stream(n: int, body: int) -> Dict:
+    from crawler.text_classifier import TextClassifier
+    from crawler.train import train
+
+    source = SyntheticStream(n, body)
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = train(source.connect, out_root=tmp, version="ml-hash-bench", progress_interval=0)
+            elapsed = time.perf_counter() - started
+            clf = TextClassifier(model_path=summary["path"], confidence_threshold=0.99)
+            label = clf.classify("인공지능 개발 인턴 채용", "데이터 개발 인턴 채용 면접 일정 안내")
+        assert label[2].startswith("ml-hash-bench") or label[2] in ("keyword-final", "default-fallback"), label
+        assert clf.model is not None, "아티팩트 로드 실패"
+    return {"seconds": round(elapsed, 2), "rows_per_s": summary["rows_per_s"], "accuracy": summary["accuracy"],
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def child_baseline(n: int, body: int) -> Dict:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    from crawler.text_classifier import TextClassifier
+
+    clf = TextClassifier()
+    started = time.perf_counter()
+    rows = [labeled_row(i, body, clf.predict_with_keywords) for i in range(1, n + 1)]
+    train_rows = [r for r in rows if r["id"] % HOLDOUT_EVERY]
+    test_rows = [r for r in rows if r["id"] % HOLDOUT_EVERY == 0]
+    vectorizer = TfidfVectorizer(max_features=5000)
+    x = vectorizer.fit_transform([clf.preprocess_text(r["title"], r["content"]) for r in train_rows])
+    model = LogisticRegression(random_state=42, max_iter=500).fit(x, [r["category_id"] for r in train_rows])
+    elapsed = time.perf_counter() - started
+    predicted = model.predict(vectorizer.transform([clf.preprocess_text(r["title"], r["content"]) for r in test_rows]))
+    accuracy = sum(int(p == r["category_id"]) for p, r in zip(predicted, test_rows)) / len(test_rows)
+    return {"seconds": round(elapsed, 2), "rows_per_s": round(len(train_rows) / elapsed, 1),
+            "accuracy": round(accuracy, 4), "peak_rss_mb": peak_rss_mb()}
+
+
+def run_child(kind: str, n: int, body: int) -> Dict:
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", kind, "--sizes", str(n),
+                          "--body", str(body)], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,50000,100000")
+    parser.add_argument("--baseline-max", type=int, default=50000, help="기존 방식으로도 학습할 최대 공지 수")
+    parser.add_argument("--body", type=int, default=800, help="공지 본문 길이(자)")
+    parser.add_argument("--child", choices=("stream", "baseline"), help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    if args.child:
+        fn = child_stream if args.child == "stream" else child_baseline
+        print(json.dumps(fn(sizes[0], args.body)))
+        return
+
+    results = {}
+    for n in sizes:
+        results[n] = {"stream": run_child("stream", n, args.body)}
+        if n <= args.baseline_max:
+            results[n]["baseline"] = run_child("baseline", n, args.body)
+
+    if args.json:
+        print(json.dumps({"body": args.body, "results": results}, indent=2))
+        return
+    print(f"body={args.body}자 holdout=id%{HOLDOUT_EVERY}")
+    print(f"{'notices':>8} {'kind':<9} {'rows/s':>9} {'accuracy':>9} {'peak_rss_mb':>12} {'seconds':>8}")
+    for n, row in results.items():
+        for kind, r in row.items():
+            print(f"{n:>8} {kind:<9} {r['rows_per_s']:>9} {r['accuracy']:>9} {r['peak_rss_mb']:>12} {r['seconds']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+작업 큐 워커 수별 처리량 벤치마크 (crawler/work_queue.py, 외부 사이트/DB 호출 없음)
+
+    python bench/bench_workers.py [--procs 1,2,4] [--pages 3] [--workers 4] [--latency 0.5]
+                                  [--db memory|mysql] [--crash] [--lease 3] [--json]
+
+- 같은 batch 를 워커 프로세스 1/2/4개로 처리하고 걸린 시간과 속도 향상을 비교한다.
+  (대역 서버: bench/fixture_server.py, 프로세스마다 workers 개의 동시 요청, rps 제한 없음)
+- 워커 프로세스는 import / 분류기 로드를 마친 뒤 동시에 시작하고, 시간은 시작부터
+  모든 워커가 종료할 때까지 잰다.
+- memory: bench/memory_db.py 공유 메모리 DB (SKIP LOCKED 를 연결별 행 잠금으로 흉내)
+  mysql:  일회용 MySQL 컨테이너 (BENCH_DB_* 설정, bench_pipeline.py 와 같음) - 실행 전에 notice 를 비운다.
+- --crash: 워커가 2개 이상이면 첫 워커를 처리 도중 강제 종료(SIGKILL)한다.
+  잡고 있던 작업은 lease(--lease 초) 만료 뒤 다른 워커가 다시 처리해야 하며,
+  결과 줄의 tasks[DONE=..] 와 notices 가 강제 종료 없는 실행과 같아야 한다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_pipeline import BENCH_DB  # noqa: E402
+from bench.fixture_server import start  # noqa: E402
+from bench.memory_db import serve_shared  # noqa: E402
+
+
+def _worker(index: int, args: Dict, address, events, go):
+    """워커 프로세스 (spawn) - 준비가 끝나면 ready 를 알리고 go 를 기다렸다가 run_worker 실행"""
+    from crawler import work_queue
+    from crawler.text_classifier import get_classifier
+
+    get_classifier().classify("준비", "분류기 로드")
+    if args["db"] == "memory":
+        from bench.memory_db import connect_remote
+
+        conn_factory, _ = connect_remote(address)
+    else:
+        from crawler.db import get_conn as conn_factory
+    events.put(("ready", index, None))
+    go.wait()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = work_queue.run_worker(args["batch"], workers=args["workers"], rps=0, parse_workers=0,
+                                       conn_factory=conn_factory, lease_seconds=args["lease"],
+                                       poll_interval=0.2, queue_log_interval=0)
+    events.put(("done", index, {k: result[k] for k in ("saved", "unchanged", "skipped", "failed", "tasks")}))
+
+
+def _mysql_reset():
+    from crawler.db import get_conn
+
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM notice_category")
+        cur.execute("DELETE FROM notice")
+
+
+def _mysql_counts(batch: str) -> Dict:
+    from crawler.db import get_conn, count_tasks
+
+    with get_conn() as conn, conn.cursor() as cur:
+        tasks = count_tasks(cur, batch)
+        cur.execute("SELECT COUNT(*) AS n FROM notice")
+        return {"notices": cur.fetchone()["n"], "tasks": tasks}
+
+
+def run_once(procs: int, args) -> Dict:
+    server, base_url = start(latency=args.latency)
+    os.environ["CNU_BASE_URL"] = base_url
+    batch = f"bench-{procs}-{int(time.time() * 1000)}"
+    manager, address, db = None, None, None
+    if args.db == "memory":
+        from bench.memory_db import connect_remote
+
+        manager, address = serve_shared()
+        conn_factory, db = connect_remote(address)
+    else:
+        from crawler.db import get_conn as conn_factory
+
+        _mysql_reset()
+
+    from crawler.work_queue import TaskQueue
+
+    ctx = multiprocessing.get_context("spawn")
+    events, go = ctx.Queue(), ctx.Event()
+    worker_args = {"batch": batch, "workers": args.workers, "lease": args.lease, "db": args.db}
+    workers = [ctx.Process(target=_worker, args=(i, worker_args, address, events, go)) for i in range(procs)]
+    for p in workers:
+        p.start()
+    for _ in workers:
+        events.get()
+
+    seeder = TaskQueue(batch, conn_factory=conn_factory)
+    seeder.seed(args.pages)
+    seeder.close()
+    started = time.perf_counter()
+    go.set()
+    crashed = False
+    if args.crash and procs > 1:
+        time.sleep(args.crash_after)
+        workers[0].kill()
+        crashed = True
+    for p in workers:
+        p.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    results = []
+    while not events.empty():
+        kind, index, result = events.get()
+        if kind == "done":
+            results.append(result)
+    if db is not None:
+        snapshot = db.snapshot()
+        state = {"notices": snapshot["notices"], "tasks": snapshot["tasks"]}
+        manager.shutdown()
+    else:
+        state = _mysql_counts(batch)
+    return {
+        "procs": procs,
+        "seconds": round(elapsed, 3),
+        "list_requests": server.stats["list"],
+        "detail_requests": server.stats["detail"],
+        "notices_per_s": round(server.stats["detail"] / elapsed, 2),
+        "saved": sum(r["saved"] for r in results),
+        "crashed": crashed,
+        **state,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--procs", default="1,2,4", help="워커 프로세스 수 목록")
+    parser.add_argument("--pages", type=int, default=3, help="소스별 목록 페이지 수")
+    parser.add_argument("--workers", type=int, default=4, help="프로세스당 동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--db", choices=("memory", "mysql"), default="memory")
+    parser.add_argument("--lease", type=float, default=10.0, help="작업 lease(초)")
+    parser.add_argument("--crash", action="store_true", help="첫 워커를 처리 도중 강제 종료")
+    parser.add_argument("--crash-after", type=float, default=1.0, help="강제 종료 시점(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    os.environ.update(HTTP_CACHE="0", CLASSIFY_CACHE="0")
+    if args.db == "mysql":
+        os.environ.update(BENCH_DB)
+    rows: List[Dict] = [run_once(int(n), args) for n in args.procs.split(",")]
+
+    if args.json:
+        print(json.dumps({"pages": args.pages, "workers": args.workers, "latency": args.latency,
+                          "db": args.db, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"pages={args.pages} workers/proc={args.workers} latency={args.latency}s db={args.db} "
+          f"lease={args.lease}s{' crash' if args.crash else ''}")
+    base = rows[0]["seconds"]
+    for row in rows:
+        tasks = " ".join(f"{k}={v}" for k, v in sorted(row["tasks"].items()))
+        print(f"procs={row['procs']:<2} {row['seconds']:>7.2f}s (x{base / row['seconds']:.2f}) "
+              f"notices/s={row['notices_per_s']:<7} requests list={row['list_requests']} "
+              f"detail={row['detail_requests']} notices={row['notices']} tasks[{tasks}]"
+              f"{' (worker 0 killed)' if row['crashed'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
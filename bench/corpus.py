@@ -0,0 +1,44 @@
+import random
+from typing import List, Tuple
+
+# ---------------------------------------------------------
+# 벤치마크용 합성 공지 코퍼스
+#  - 실제 공지와 비슷하게 일반 문장 속에 키워드가 드문드문 섞이도록 생성
+#  - seed 가 같으면 항상 같은 코퍼스
+# ---------------------------------------------------------
+FILLER = (
+    "충남대학교 학생 여러분께 안내 드립니다 신청 기간 내에 접수 바랍니다 장소 및 일정은 아래와 같습니다 "
+    "문의 사항은 담당 부서로 연락 주시기 바랍니다 참가 대상 재학생 휴학생 대학원생 제출 서류 "
+    "선발 인원 결과 발표 개별 통보 예정 관련 자료 첨부 파일 참조 온라인 오프라인 병행 운영 "
+    "please contact the office for details registration deadline schedule location applicants"
+).split()
+
+TOPICS = (
+    "특강 세미나 워크샵 채용 인턴 면접 봉사 자원봉사 개발 프로그래밍 ai 데이터 스터디 튜터링 "
+    "디자인 ui ux 창업 스타트업 투자 영상 유튜브 편집 서포터즈 기자단 홍보대사 학사 수강 성적 졸업 "
+    "장학금 등록금 마케팅 브랜딩 캠페인 recruit workshop seminar startup design video"
+).split()
+
+TITLES = [
+    "{a} 참가자 모집 안내", "{a} 및 {b} 프로그램 안내", "20{y}학년도 {a} 신청 안내",
+    "[{a}] {b} 관련 공지", "{a} 운영 결과 및 {b} 일정 안내",
+]
+
+
+def make_notice(rng: random.Random, body_chars: int, keyword_rate: float = 0.03) -> Tuple[str, str]:
+    a, b = rng.choice(TOPICS), rng.choice(TOPICS)
+    title = rng.choice(TITLES).format(a=a, b=b, y=rng.randint(20, 25))
+    words: List[str] = []
+    size = 0
+    while size < body_chars:
+        word = rng.choice(TOPICS) if rng.random() < keyword_rate else rng.choice(FILLER)
+        words.append(word)
+        size += len(word) + 1
+        if rng.random() < 0.08:
+            words.append("\n")
+    return title, " ".join(words)[:body_chars]
+
+
+def make_corpus(n: int, body_chars: int = 2000, seed: int = 42, keyword_rate: float = 0.03) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    return [make_notice(rng, body_chars, keyword_rate) for _ in range(n)]
@@ -0,0 +1,115 @@
+"""
+OpenAI chat completions 로컬 대역 서버 (테스트/벤치마크용)
+
+    python bench/fake_openai.py [--port 18080] [--latency 0.3] [--error-rate 0.05]
+
+- POST /v1/chat/completions 에 프롬프트 해시로 정한 카테고리 번호(1~12)를 응답한다.
+  같은 프롬프트에는 항상 같은 번호를 돌려준다.
+- latency: 응답 지연(초, ±20% 지터), error_rate: 429/503 응답 비율
+- 분류기에서는 api_config 의 base_url 또는 OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 로 사용
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+def answer_for(prompt: str) -> str:
+    return str(int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % 12 + 1)
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.3, error_rate: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "max_concurrent": 0}
+        self._concurrent = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server: FakeOpenAIServer = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+
+        with server.lock:
+            server.stats["requests"] += 1
+            server._concurrent += 1
+            server.stats["max_concurrent"] = max(server.stats["max_concurrent"], server._concurrent)
+            fail = server.rng.random() < server.error_rate
+            jitter = server.rng.uniform(0.8, 1.2)
+        try:
+            time.sleep(server.latency * jitter)
+            if fail:
+                with server.lock:
+                    server.stats["errors"] += 1
+                status = 429 if server.stats["errors"] % 2 else 503
+                self._send(status, {"error": {"message": "stand-in error", "type": "server_error"}})
+                return
+            prompt = request.get("messages", [{}])[-1].get("content", "")
+            self._send(200, {
+                "id": "chatcmpl-local",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4o-mini"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer_for(prompt)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": len(prompt), "completion_tokens": 1, "total_tokens": len(prompt) + 1},
+            })
+        finally:
+            with server.lock:
+                server._concurrent -= 1
+
+
+def start(port: int = 0, latency: float = 0.3, error_rate: float = 0.0) -> Tuple[FakeOpenAIServer, str]:
+    """백그라운드 스레드로 서버 시작 -> (server, base_url)"""
+    server = FakeOpenAIServer(("127.0.0.1", port), latency=latency, error_rate=error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeOpenAIServer(("127.0.0.1", args.port), latency=args.latency, error_rate=args.error_rate)
+    print(f"fake OpenAI: http://127.0.0.1:{args.port}/v1 (latency={args.latency}s error_rate={args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+plus.cnu.ac.kr 로컬 대역 서버 (bench/fixtures 의 기록된 페이지 응답, 외부 호출 없음)
+
+    python bench/fixture_server.py [--port 18081] [--latency 0.05] [--error-rate 0.0] [--retry-after 1]
+
+- GET /_prog/_board/, /_prog/recruit/ 의 목록(GotoPage)과 상세(mode=V&no=..) 요청에 응답한다.
+- 목록 페이지의 링크는 요청한 menu_dvs_cd/code/GotoPage 에 맞게 바꾸고 글 번호를
+  페이지마다 다르게 매겨, 소스/페이지별로 서로 다른 상세 url 이 나오게 한다
+  (상단 고정 공지는 실제 사이트처럼 모든 페이지에 반복).
+- 상세 페이지는 글 번호로 fixture 하나를 골라 응답한다.
+- latency: 응답 지연(초, ±20% 지터), error_rate: 503 응답 비율 (retry_after 를 주면 Retry-After 헤더 포함)
+- 크롤러에서는 CNU_BASE_URL=http://127.0.0.1:<port> 로 사용
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 상단 고정 공지 글 번호 (페이지가 바뀌어도 그대로 둠)
+PINNED_NO = 9000000
+_NO_RE = re.compile(r"no=(\d+)")
+
+
+def _read(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.05, error_rate: float = 0.0, seed: int = 0,
+                 retry_after: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"list": 0, "detail": 0, "errors": 0, "bytes": 0}
+        self.lists: Dict[str, str] = {"board": _read("board_list.html"), "recruit": _read("recruit_list.html")}
+        self.views: Dict[str, List[str]] = {
+            kind: [_read(os.path.basename(p))
+                   for p in sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{kind}_view_*.html")))]
+            for kind in ("board", "recruit")
+        }
+
+    def list_page(self, kind: str, query: Dict[str, str]) -> str:
+        page = int(query.get("GotoPage", "1") or 1)
+        menu = query.get("menu_dvs_cd", "")
+        code = query.get("code", "")
+
+        def renumber(m):
+            no = int(m.group(1))
+            return f"no={no if no >= PINNED_NO else no + (page - 1) * 100}"
+
+        def rewrite(m):
+            href = _NO_RE.sub(renumber, m.group(0))
+            href = re.sub(r"menu_dvs_cd=\w*", f"menu_dvs_cd={menu}", href)
+            if code:
+                href = re.sub(r"code=\w*", f"code={code}", href)
+            return href.replace("GotoPage=1", f"GotoPage={page}")
+
+        return re.sub(r'href="\?mode=V[^"]*"', rewrite, self.lists[kind])
+
+    def detail_page(self, kind: str, query: Dict[str, str]) -> str:
+        views = self.views[kind]
+        return views[int(query.get("no", "0") or 0) % len(views)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문을 따로 쓰므로 Nagle 을 끄지 않으면 keep-alive 요청마다 ACK 지연(~40ms)이 붙는다
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, headers: Optional[Dict[str, str]] = None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: FixtureServer = self.server
+        parts = urlsplit(self.path)
+        kind = {"/_prog/_board/": "board", "/_prog/recruit/": "recruit"}.get(parts.path)
+        if kind is None:
+            self._send(404, "not found")
+            return
+        query = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        is_detail = query.get("mode") == "V"
+
+        with server.lock:
+            fail = server.rng.random() < server.error_rate
+            jitter = server.rng.uniform(0.8, 1.2)
+        time.sleep(server.latency * jitter)
+        if fail:
+            with server.lock:
+                server.stats["errors"] += 1
+            retry_after = server.retry_after
+            self._send(503, "stand-in error", {"Retry-After": str(retry_after)} if retry_after is not None else None)
+            return
+
+        body = server.detail_page(kind, query) if is_detail else server.list_page(kind, query)
+        with server.lock:
+            server.stats["detail" if is_detail else "list"] += 1
+            server.stats["bytes"] += len(body)
+        self._send(200, body)
+
+
+def start(port: int = 0, latency: float = 0.05, error_rate: float = 0.0,
+          retry_after: Optional[int] = None) -> Tuple[FixtureServer, str]:
+    """백그라운드 스레드로 서버 시작 -> (server, base_url)"""
+    server = FixtureServer(("127.0.0.1", port), latency=latency, error_rate=error_rate, retry_after=retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18081)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, help="503 응답에 넣을 Retry-After(초)")
+    args = parser.parse_args()
+    server = FixtureServer(("127.0.0.1", args.port), latency=args.latency, error_rate=args.error_rate,
+                           retry_after=args.retry_after)
+    print(f"fixture server: CNU_BASE_URL=http://127.0.0.1:{args.port} "
+          f"(latency={args.latency}s error_rate={args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
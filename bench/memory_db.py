@@ -0,0 +1,419 @@
+"""
+메모리 DB 대역 (벤치마크에서 MySQL 없이 파이프라인을 돌릴 때 사용)
+
+pymysql DictCursor 연결처럼 동작하며, 크롤러가 보내는 notice / notice_category
+UPSERT/교체 (기본 키 (notice_id, category_id) 그대로), url 조회, 근사 중복 지문/분류 조회, 재분류 스트림/분류 교체, crawl_job / crawl_progress / crawl_retry / crawl_task 기록,
+읽기 API 의 피드/상세/관심 카테고리/feed_epoch 조회만 해석한다.
+그 밖의 문장은 실행 횟수만 세고 빈 결과를 돌려준다.
+DB 자체 비용은 0 에 가까우므로 크롤러 쪽 처리량 상한을 재는 용도이고,
+실제 저장 비용은 --db mysql (docker compose --profile bench) 로 측정한다.
+
+여러 프로세스가 같은 DB 를 써야 하면 (작업 큐 벤치마크) serve_shared() 로
+manager 프로세스에 띄우고 각 프로세스에서 connect_remote(address, authkey) 를 쓴다.
+crawl_task 의 SELECT ... FOR UPDATE SKIP LOCKED 는 연결(session)별 행 잠금으로 흉내 낸다.
+"""
+import bisect
+import datetime
+import re
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Callable, Dict, List, Optional, Tuple
+
+_IN_RE = re.compile(r"WHERE\s+url\s+IN", re.IGNORECASE)
+_CATEGORY_IN_RE = re.compile(r"category_id IN \(([^)]*)\)")
+_FEED_FIELDS = ("id", "source_id", "title", "url", "posted_at", "feed_at")
+_TASK_FIELDS = ("id", "kind", "source_id", "page", "max_page", "url", "title", "attempts")
+
+
+class MemoryDB:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.notices: Dict[str, Dict] = {}
+        # notice_category: notice_id -> {category_id: (category_id, confidence, model_version, classifier_rev)}
+        # (MySQL 과 같이 기본 키가 (notice_id, category_id) 라 공지 하나에 여러 행이 남을 수 있다)
+        self.labels: Dict[int, Dict[int, tuple]] = {}
+        self.by_id: Dict[int, Dict] = {}
+        self.copies: Dict[int, set] = {}        # 대표 공지 id -> 근사 중복 사본 id
+        self.crawl_jobs: Dict[int, Dict] = {}
+        self.progress: Dict[int, Dict] = {}
+        self.retries: Dict[str, Dict] = {}
+        self.tasks: Dict[int, Dict] = {}
+        self.task_keys: Dict[str, int] = {}
+        self.row_locks: Dict[int, int] = {}     # crawl_task.id -> session
+        self.interests: Dict[int, List[tuple]] = {}   # user_id -> [(category_id, weight)]
+        self.feed_epoch = 0
+        self._feed_keys: Optional[List[tuple]] = None   # 대표 공지 (feed_at, id) 오름차순 (바뀌면 None)
+        self.statements: Dict[str, int] = {}
+        self.commits = 0
+        self._sessions = 0
+
+    def connect(self, autocommit: bool = True) -> "_Connection":
+        """get_conn 과 같은 형태의 연결 생성 함수"""
+        return _Connection(self)
+
+    # ---- 연결(_Connection) 이 부르는 메서드 (manager 프록시로도 호출) ----
+    def new_session(self) -> int:
+        with self.lock:
+            self._sessions += 1
+            return self._sessions
+
+    def commit(self, session: int):
+        with self.lock:
+            self.commits += 1
+            self._release(session)
+
+    def rollback(self, session: int):
+        with self.lock:
+            self._release(session)
+
+    def _release(self, session: int):
+        for task_id in [t for t, s in self.row_locks.items() if s == session]:
+            del self.row_locks[task_id]
+
+    def snapshot(self) -> Dict:
+        """벤치마크 결과 확인용 요약"""
+        with self.lock:
+            statuses: Dict[str, int] = {}
+            for task in self.tasks.values():
+                statuses[task["status"]] = statuses.get(task["status"], 0) + 1
+            return {"notices": len(self.notices), "categories": sum(map(len, self.labels.values())),
+                    "tasks": statuses, "commits": self.commits}
+
+    def execute(self, session: int, sql: str, args=None) -> Tuple[List[Dict], Optional[int], int]:
+        """문장 1개 실행 -> (결과 행, lastrowid, rowcount)"""
+        args = list(args or [])
+        words = sql.split()
+        key = " ".join(words[:3]).upper()
+        rows: List[Dict] = []
+        lastrowid = None
+        rowcount = 0
+        with self.lock:
+            self.statements[key] = self.statements.get(key, 0) + 1
+            if key == "INSERT INTO NOTICE":
+                for i in range(0, len(args), 8):
+                    source_id, url, title, content, posted_at, hash_, simhash, canonical_id = args[i:i + 8]
+                    row = self.notices.get(url)
+                    if row is None:
+                        row = self.notices[url] = {"id": len(self.notices) + 1, "url": url,
+                                                   "scraped_at": datetime.datetime.now().replace(microsecond=0),
+                                                   "deadline_at": None}
+                        self.by_id[row["id"]] = row
+                    row.update(source_id=source_id, title=title, content=content,
+                               posted_at=posted_at, hash=hash_, simhash=simhash)
+                    row["feed_at"] = _as_datetime(posted_at) or row["scraped_at"]
+                    self._set_canonical(row, canonical_id)
+                    lastrowid = row["id"]
+                rowcount = len(args) // 8
+            elif key == "UPDATE NOTICE SET" and "canonical_id" in sql:
+                canonical_id, notice_id = args
+                if notice_id in self.by_id:
+                    self._set_canonical(self.by_id[notice_id], canonical_id)
+                    rowcount = 1
+            elif key == "INSERT INTO NOTICE_CATEGORY" and "SELECT" in sql:
+                # 근사 중복 사본에 대표 공지 결과 복사 (args: 대표 id 목록)
+                for canonical_id in args:
+                    labels = self.labels.get(canonical_id, {})
+                    for notice_id in self.copies.get(canonical_id, ()):
+                        target = self.labels.setdefault(notice_id, {})
+                        for label in labels.values():
+                            if label[0] in target:
+                                raise ValueError(f"Duplicate entry '{notice_id}-{label[0]}' for key 'PRIMARY'")
+                            target[label[0]] = label
+                            rowcount += 1
+            elif key == "INSERT INTO NOTICE_CATEGORY":
+                upsert = "ON DUPLICATE KEY" in sql.upper()
+                for i in range(0, len(args), 5):
+                    target = self.labels.setdefault(args[i], {})
+                    if args[i + 1] in target and not upsert:
+                        raise ValueError(f"Duplicate entry '{args[i]}-{args[i + 1]}' for key 'PRIMARY'")
+                    target[args[i + 1]] = tuple(args[i + 1:i + 5])
+                rowcount = len(args) // 5
+            elif key == "DELETE FROM NOTICE_CATEGORY":
+                for notice_id in args:
+                    rowcount += len(self.labels.pop(notice_id, {}))
+            elif key == "DELETE C FROM":
+                for canonical_id in args:
+                    for notice_id in self.copies.get(canonical_id, ()):
+                        rowcount += len(self.labels.pop(notice_id, {}))
+            elif key == "UPDATE FEED_EPOCH SET":
+                self.feed_epoch += 1
+                rowcount = 1
+            elif key == "INSERT INTO CRAWL_JOB":
+                lastrowid = len(self.crawl_jobs) + 1
+                self.crawl_jobs[lastrowid] = {"source_id": args[0], "status": "RUNNING"}
+                rowcount = 1
+            elif key == "UPDATE CRAWL_JOB SET":
+                status, error_msg, stats, job_id = args
+                self.crawl_jobs[job_id].update(status=status, error_msg=error_msg, stats=stats)
+                rowcount = 1
+            elif key == "INSERT INTO CRAWL_PROGRESS":
+                source_id, last_page, status, job_id = args
+                self.progress[source_id] = {"last_page": last_page, "status": status, "job_id": job_id}
+                rowcount = 1
+            elif key == "INSERT INTO CRAWL_RETRY":
+                source_id, url, title, page, error_msg = args
+                row = self.retries.setdefault(url, {"source_id": source_id, "url": url, "title": title,
+                                                    "page": page, "attempts": 0})
+                row.update(attempts=row["attempts"] + 1, last_error=error_msg)
+                rowcount = 1
+            elif key == "DELETE FROM CRAWL_RETRY":
+                rowcount = 1 if self.retries.pop(args[0], None) else 0
+            elif "crawl_task" in sql:
+                rows, rowcount = self._crawl_task(session, sql, args)
+            elif words[0].upper() == "SELECT" and "FROM crawl_progress" in sql:
+                row = self.progress.get(args[0])
+                rows = [dict(row)] if row else []
+            elif words[0].upper() == "SELECT" and "FROM crawl_retry" in sql:
+                source_id, max_attempts, limit = args
+                found = [r for r in self.retries.values()
+                         if r["source_id"] == source_id and r["attempts"] < max_attempts]
+                rows = [{k: r[k] for k in ("url", "title", "page", "attempts")} for r in found[:limit]]
+            elif words[0].upper() == "SELECT" and "simhash IS NOT NULL" in sql:
+                after_id, limit = args
+                found = sorted((r for r in self.notices.values()
+                                if r["id"] > after_id and r.get("simhash") is not None and r.get("canonical_id") is None),
+                               key=lambda r: r["id"])
+                rows = [{"id": r["id"], "simhash": r["simhash"]} for r in found[:limit]]
+            elif words[0].upper() == "SELECT" and "prev_category_id" in sql:
+                # 재분류 스트림: (from_id, to_id] 대표 공지 중 classifier_rev 가 다른 것
+                from_id, to_id = args[0], args[1]
+                rev = args[2] if len(args) > 2 else None
+                found = sorted((r for r in self.notices.values()
+                                if from_id < r["id"] <= to_id and r.get("canonical_id") is None
+                                and (rev is None
+                                     or all(label[3] != rev for label in self.labels.get(r["id"], {}).values()))),
+                               key=lambda r: r["id"])
+                rows = [{"id": r["id"], "title": r["title"], "content": r["content"],
+                         "prev_category_id": min(self.labels.get(r["id"]) or [None])} for r in found]
+            elif words[0].upper() == "SELECT" and "n.feed_at DESC" in sql:
+                rows = self._feed(sql, args)
+            elif words[0].upper() == "SELECT" and "WHERE n.id = %s" in sql:
+                row = self.by_id.get(args[0])
+                rows = [{k: row.get(k) for k in _FEED_FIELDS + ("content", "deadline_at", "canonical_id")}] if row else []
+            elif words[0].upper() == "SELECT" and "FROM feed_epoch" in sql:
+                rows = [{"epoch": self.feed_epoch}]
+            elif words[0].upper() == "SELECT" and "FROM user_interest_category WHERE user_id = %s" in sql:
+                rows = [{"category_id": c} for c, _ in sorted(self.interests.get(args[0], ()), key=lambda r: (-r[1], r[0]))]
+            elif words[0].upper() == "SELECT" and "FROM notice_category" in sql:
+                rows = [{"notice_id": i, "category_id": label[0], "confidence": label[1], "model_version": label[2]}
+                        for i in dict.fromkeys(args) for label in self.labels.get(i, {}).values()]
+            elif words[0].upper() == "SELECT" and "FROM notice" in sql and _IN_RE.search(sql):
+                columns = [c.strip(",") for c in words[1:words.index("FROM")]]
+                rows = [{c: self.notices[u][c] for c in columns}
+                        for u in dict.fromkeys(args) if u in self.notices]
+                rowcount = len(rows)
+        return rows, lastrowid, rowcount
+
+    def _feed(self, sql: str, args: List) -> List[Dict]:
+        """fetch_feed: 카테고리 중 하나로 분류된 대표 공지를 (feed_at, id) 내림차순으로"""
+        n_categories = _CATEGORY_IN_RE.search(sql).group(1).count("%s")
+        categories = set(args[:n_categories])
+        rest = args[n_categories:]
+        limit = rest[-1]
+        if self._feed_keys is None:
+            self._feed_keys = sorted((r["feed_at"], r["id"]) for r in self.by_id.values() if r["canonical_id"] is None)
+        end = len(self._feed_keys)
+        if len(rest) == 4:
+            end = bisect.bisect_left(self._feed_keys, (_as_datetime(rest[0]), rest[2]))
+        rows = []
+        for i in range(end - 1, -1, -1):
+            notice_id = self._feed_keys[i][1]
+            if categories.intersection(self.labels.get(notice_id, ())):
+                row = self.by_id[notice_id]
+                rows.append({k: row[k] for k in _FEED_FIELDS})
+                if len(rows) >= limit:
+                    break
+        return rows
+
+    @property
+    def categories(self) -> Dict[int, tuple]:
+        """공지별 분류 결과 (행이 정확히 1개인 공지만 - 여러 개면 저장 오류이므로 확인용으로 labels 를 볼 것)"""
+        return {notice_id: next(iter(rows.values())) for notice_id, rows in self.labels.items() if len(rows) == 1}
+
+    def _set_canonical(self, row: Dict, canonical_id: Optional[int]):
+        self._feed_keys = None
+        previous = row.get("canonical_id")
+        if previous is not None:
+            self.copies.get(previous, set()).discard(row["id"])
+        if canonical_id is not None:
+            self.copies.setdefault(canonical_id, set()).add(row["id"])
+        row["canonical_id"] = canonical_id
+
+    def _crawl_task(self, session: int, sql: str, args: List) -> Tuple[List[Dict], int]:
+        now = time.time()
+        if sql.split()[0].upper() == "INSERT":
+            inserted = 0
+            for i in range(0, len(args), 8):
+                task_key, batch, kind, source_id, page, max_page, url, title = args[i:i + 8]
+                if task_key in self.task_keys:
+                    continue
+                task_id = len(self.tasks) + 1
+                self.task_keys[task_key] = task_id
+                self.tasks[task_id] = {
+                    "id": task_id, "batch": batch, "kind": kind, "source_id": source_id, "page": page,
+                    "max_page": max_page, "url": url, "title": title, "status": "PENDING", "attempts": 0,
+                    "lease_owner": None, "lease_until": None, "available_at": now, "last_error": None,
+                }
+                inserted += 1
+            return [], inserted
+        if "SKIP LOCKED" in sql:
+            batch, max_attempts, limit = args
+            found = []
+            ordered = sorted(self.tasks.values(), key=lambda t: (t["kind"] != "LIST", t["id"]))
+            for task in ordered:
+                if len(found) >= limit:
+                    break
+                claimable = task["status"] == "PENDING" or (
+                    task["status"] == "LEASED" and task["lease_until"] < now)
+                if (claimable and task["batch"] == batch and task["available_at"] <= now
+                        and task["attempts"] < max_attempts
+                        and self.row_locks.get(task["id"], session) == session):
+                    self.row_locks[task["id"]] = session
+                    found.append({k: task[k] for k in _TASK_FIELDS})
+            return found, len(found)
+        if "COUNT(*)" in sql:
+            counts: Dict[str, int] = {}
+            for task in self.tasks.values():
+                if task["batch"] == args[0]:
+                    counts[task["status"]] = counts.get(task["status"], 0) + 1
+            return [{"status": s, "n": n} for s, n in counts.items()], len(counts)
+
+        changed = 0
+        if "status = 'LEASED', lease_owner" in sql:
+            owner, lease_seconds, *ids = args
+            for task_id in ids:
+                self.tasks[task_id].update(status="LEASED", lease_owner=owner, lease_until=now + lease_seconds,
+                                           attempts=self.tasks[task_id]["attempts"] + 1)
+                changed += 1
+        elif "SET lease_until" in sql:
+            lease_seconds, owner = args
+            for task in self.tasks.values():
+                if task["lease_owner"] == owner and task["status"] == "LEASED":
+                    task["lease_until"] = now + lease_seconds
+                    changed += 1
+        elif "status = 'DONE'" in sql:
+            *ids, owner = args
+            for task_id in ids:
+                task = self.tasks[task_id]
+                if task["lease_owner"] == owner:
+                    task.update(status="DONE", lease_owner=None, lease_until=None)
+                    changed += 1
+        elif "IF(attempts" in sql:
+            max_attempts, retry_in, error_msg, task_id, owner = args
+            task = self.tasks[task_id]
+            if task["lease_owner"] == owner:
+                task.update(status="FAILED" if task["attempts"] >= max_attempts else "PENDING",
+                            lease_owner=None, lease_until=None, available_at=now + retry_in, last_error=error_msg)
+                changed = 1
+        elif "status = 'FAILED'" in sql:
+            (max_attempts,) = args
+            for task in self.tasks.values():
+                if task["status"] == "LEASED" and task["lease_until"] < now and task["attempts"] >= max_attempts:
+                    task.update(status="FAILED", lease_owner=None, last_error="lease expired")
+                    changed += 1
+        return [], changed
+
+
+def _as_datetime(value) -> Optional[datetime.datetime]:
+    """DATETIME 칼럼에 들어오는 값 ('YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS', datetime) -> datetime"""
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(str(value))
+
+
+class _Connection:
+    def __init__(self, db: MemoryDB):
+        self.db = db
+        self.session = db.new_session()
+
+    def cursor(self, cursor=None):
+        return _Cursor(self.db, self.session)
+
+    def commit(self):
+        self.db.commit(self.session)
+
+    def rollback(self):
+        self.db.rollback(self.session)
+
+    def ping(self, reconnect: bool = True):
+        pass
+
+    def close(self):
+        self.db.rollback(self.session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _Cursor:
+    def __init__(self, db: MemoryDB, session: int):
+        self.db = db
+        self.session = session
+        self._rows: List[Dict] = []
+        self.lastrowid: Optional[int] = None
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def execute(self, sql: str, args=None):
+        self._rows, lastrowid, self.rowcount = self.db.execute(self.session, sql, args)
+        if lastrowid is not None:
+            self.lastrowid = lastrowid
+        return self.rowcount
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchmany(self, size: int):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        self._rows = []
+
+
+# ---------------------------------------------------------
+# 여러 프로세스가 공유하는 메모리 DB (multiprocessing manager)
+# ---------------------------------------------------------
+_shared: Optional[MemoryDB] = None
+
+
+def _shared_db() -> MemoryDB:
+    global _shared
+    if _shared is None:
+        _shared = MemoryDB()
+    return _shared
+
+
+class _Manager(BaseManager):
+    pass
+
+
+_Manager.register("get_db", callable=_shared_db,
+                  exposed=("new_session", "commit", "rollback", "execute", "snapshot"))
+
+
+def serve_shared(authkey: bytes = b"bench") -> Tuple[_Manager, Tuple[str, int]]:
+    """manager 프로세스에 공유 메모리 DB 시작 -> (manager, address)  (끝나면 manager.shutdown())"""
+    manager = _Manager(address=("127.0.0.1", 0), authkey=authkey)
+    manager.start()
+    return manager, manager.address
+
+
+def connect_remote(address: Tuple[str, int], authkey: bytes = b"bench") -> Tuple[Callable, object]:
+    """공유 메모리 DB 에 붙는 (conn_factory, db 프록시)"""
+    manager = _Manager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    db = manager.get_db()
+    return (lambda autocommit=True: _Connection(db)), db
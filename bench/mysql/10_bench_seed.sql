@@ -0,0 +1,18 @@
+-- 벤치마크 전용 DB (docker compose --profile bench up mysql-bench) 시드
+-- pipeline.SOURCES 의 source_id 와 분류기 카테고리 1~12 를 FK 가 통과하도록 채운다.
+USE cnu_info;
+
+INSERT IGNORE INTO source(id, name, base_url, type) VALUES
+ (1, '메인-0704',   'http://127.0.0.1/_prog/_board/',  'MAIN'),
+ (2, '메인-0709',   'http://127.0.0.1/_prog/_board/',  'MAIN'),
+ (3, '메인-0705',   'http://127.0.0.1/_prog/_board/',  'MAIN'),
+ (4, '메인-070808', 'http://127.0.0.1/_prog/_board/',  'MAIN'),
+ (5, '리크루트-07080401', 'http://127.0.0.1/_prog/recruit/', 'MAIN');
+
+INSERT IGNORE INTO category(id, code, name) VALUES
+ (1, 'SPECIAL_LECTURE', '특강'), (2, 'PLANNING_MARKETING', '기획/마케팅'),
+ (3, 'JOB_INTERNSHIP', '취업/인턴십'), (4, 'VOLUNTEER', '봉사 활동'),
+ (5, 'IT_SW', 'IT/SW'), (6, 'STUDY', '스터디'), (7, 'DESIGN', '디자인'),
+ (8, 'STARTUP', '창업'), (9, 'VIDEO_CONTENT', '영상/콘텐츠'),
+ (10, 'SUPPORTERS_PRESS', '서포터즈/기자단'), (11, 'ACADEMIC_INFO', '학사 안내'),
+ (12, 'ETC_BENCH', '기타');
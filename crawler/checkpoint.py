@@ -0,0 +1,140 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+try:
+    from .db import get_conn, load_progress, save_progress, fetch_retries, add_retry, delete_retry
+    from .metrics import counter
+except ImportError:
+    from db import get_conn, load_progress, save_progress, fetch_retries, add_retry, delete_retry
+    from metrics import counter
+
+# ---------------------------------------------------------
+# 체크포인트 / 재시도 목록
+#  - 소스별로 "1..last_page 페이지의 모든 항목이 커밋되었거나 재시도 목록에 있음"
+#    위치를 crawl_progress 에 기록한다. 페이지는 순서 없이 끝나므로 연속으로
+#    끝난 페이지까지만 위치를 올린다.
+#  - 실행이 중간에 죽으면 (status=RUNNING 으로 남음) 다음 실행은 last_page + 1 부터,
+#    소스를 끝까지 마쳤으면 (DONE) 1페이지부터 시작한다.
+#  - 상세 요청 실패/처리 예외/중단으로 보내지 못한 url 은 crawl_retry 에 남기고
+#    다음 실행에서 목록보다 먼저 처리한다 (성공하면 삭제).
+#  - 기록 실패는 경고만 출력하고 크롤링은 계속한다.
+# ---------------------------------------------------------
+RETRY_MAX_ATTEMPTS = int(os.getenv("CRAWL_RETRY_MAX_ATTEMPTS", "5"))   # 이 횟수만큼 실패한 url 은 더 시도 안 함
+RETRY_BATCH = int(os.getenv("CRAWL_RETRY_BATCH", "500"))                # 실행당 소스별 재시도 url 상한
+
+CHECKPOINTS = counter("crawler_checkpoints_total", "crawl_progress 기록 횟수")
+RETRY_EVENTS = counter("crawler_retry_total", "재시도 목록 변경 수 (event: queued/cleared)", ("event",))
+
+
+class CrawlCheckpoint:
+    def __init__(self, conn_factory: Callable = get_conn, max_attempts: int = RETRY_MAX_ATTEMPTS):
+        """
+        Args:
+            conn_factory: autocommit 인자를 받는 연결 생성 함수 (연결 1개를 계속 사용)
+            max_attempts: 재시도 목록에서 꺼낼 url 의 최대 실패 횟수
+        """
+        self._conn_factory = conn_factory
+        self.max_attempts = max_attempts
+        self._conn = None
+        # DB 연결과 진행 위치는 여러 단계 스레드에서 함께 쓰므로 lock 하나로 보호
+        self._lock = threading.Lock()
+        self._sources: Dict[int, Dict] = {}
+        self.stats = {"checkpoints": 0, "queued": 0, "cleared": 0, "errors": 0}
+
+    # ---- 진행 위치 ----
+    def resume_page(self, source_id: int, job_id: Optional[int] = None, resume: bool = True) -> int:
+        """
+        이번 실행의 시작 페이지 (이전 실행이 중간에 끝났으면 last_page + 1)
+        resume=False 이면 기록을 무시하고 1페이지부터 (기록은 새로 남김)
+        """
+        row = self._execute(lambda cur: load_progress(cur, source_id)) if resume else None
+        last_page = row["last_page"] if row and row["status"] == "RUNNING" else 0
+        with self._lock:
+            self._sources[source_id] = {"last_page": last_page, "done": set(), "job_id": job_id}
+        self._execute(lambda cur: save_progress(cur, source_id, last_page, "RUNNING", job_id))
+        return last_page + 1
+
+    def page_done(self, source_id: int, page: int):
+        """목록 페이지의 모든 항목이 끝남 - 연속으로 끝난 페이지까지 위치를 올려 기록"""
+        with self._lock:
+            state = self._sources.get(source_id)
+            if state is None or page <= state["last_page"]:
+                return
+            done: Set[int] = state["done"]
+            done.add(page)
+            last_page = state["last_page"]
+            while last_page + 1 in done:
+                last_page += 1
+                done.discard(last_page)
+            if last_page == state["last_page"]:
+                return
+            state["last_page"] = last_page
+            self._save_locked(source_id, last_page, "RUNNING", state["job_id"])
+
+    def source_done(self, source_id: int):
+        """소스를 끝까지 마침 - 다음 실행은 1페이지부터"""
+        with self._lock:
+            state = self._sources.get(source_id)
+            if state is None:
+                return
+            self._save_locked(source_id, state["last_page"], "DONE", state["job_id"])
+
+    def last_page(self, source_id: int) -> int:
+        with self._lock:
+            state = self._sources.get(source_id)
+            return state["last_page"] if state else 0
+
+    def _save_locked(self, source_id: int, last_page: int, status: str, job_id: Optional[int]):
+        if self._execute_locked(lambda cur: save_progress(cur, source_id, last_page, status, job_id)) is not False:
+            self.stats["checkpoints"] += 1
+            CHECKPOINTS.inc()
+
+    # ---- 재시도 목록 ----
+    def pending_retries(self, source_id: int, limit: int = RETRY_BATCH) -> List[Dict]:
+        return self._execute(lambda cur: fetch_retries(cur, source_id, self.max_attempts, limit)) or []
+
+    def retry_later(self, source_id: int, url: str, title: str, page: int, reason: str):
+        if self._execute(lambda cur: add_retry(cur, source_id, url, title, page, reason)) is not False:
+            with self._lock:
+                self.stats["queued"] += 1
+            RETRY_EVENTS.inc(event="queued")
+
+    def retry_done(self, url: str):
+        if self._execute(lambda cur: delete_retry(cur, url)) is not False:
+            with self._lock:
+                self.stats["cleared"] += 1
+            RETRY_EVENTS.inc(event="cleared")
+
+    # ---- 연결 ----
+    def _execute(self, fn):
+        with self._lock:
+            return self._execute_locked(fn)
+
+    def _execute_locked(self, fn):
+        """fn(cur) 실행 (연결 오류면 재연결 후 1회 재시도, 그래도 실패하면 False)"""
+        for attempt in range(2):
+            try:
+                if self._conn is None:
+                    self._conn = self._conn_factory(autocommit=True)
+                with self._conn.cursor() as cur:
+                    return fn(cur)
+            except Exception as e:
+                self._reset()
+                if attempt:
+                    self.stats["errors"] += 1
+                    print(f"[WARN] 체크포인트 기록 실패 err={e}")
+                    return False
+        return False
+
+    def _reset(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def close(self):
+        with self._lock:
+            self._reset()
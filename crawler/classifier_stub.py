@@ -49,8 +49,12 @@ RULES = [
     ]),
 ]
 
+# 키워드 소문자 변환은 로드 시 한 번만
+# (규칙 순서상 첫 매치에서 바로 멈추므로 전체를 한 번에 훑는 오토마톤보다 키워드별 검사가 빠름)
+_RULES_LOWER = [(cat, tuple(dict.fromkeys(k.lower() for k in keys))) for cat, keys in RULES]
+
 def _contains_any(text: str, keywords) -> bool:
-    return any(k.lower() in text for k in keywords)
+    return any(k in text for k in keywords)
 
 def classify(title: str, content: str) -> Tuple[int, float, str]:
     """
@@ -62,12 +66,12 @@ def classify(title: str, content: str) -> Tuple[int, float, str]:
     c = (content or "").lower()
 
     # 제목 우선 탐지
-    for cat, keys in RULES:
+    for cat, keys in _RULES_LOWER:
         if _contains_any(t, keys):
             return (cat, 0.88, "stub-0.2")
 
     # 본문 보조 탐지
-    for cat, keys in RULES:
+    for cat, keys in _RULES_LOWER:
         if _contains_any(c, keys):
             return (cat, 0.72, "stub-0.2")
 
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .hashing import make_hash
+except ImportError:
+    from hashing import make_hash
+
+# ---------------------------------------------------------
+# 분류 결과 캐시
+#  - 키: make_hash(title, content) + 분류기 revision
+#    (revision = 모델 버전/지문 + 임계값 + 키워드 표 + API 사용 여부)
+#  - 1차: 프로세스 내 LRU, 2차: 로컬 SQLite 파일 (행 수 상한, LRU 제거)
+#  - 모델이 다시 로드되면 revision 이 바뀌므로 이전 결과는 자동으로 무효화
+# ---------------------------------------------------------
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "classify_cache.sqlite3")
+
+Label = Tuple[int, float, str]
+
+
+class ClassificationCache:
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, memory_size: int = 10000,
+                 max_rows: int = 200000):
+        """
+        Args:
+            path: SQLite 파일 경로 (None 이면 메모리 LRU 만 사용)
+            memory_size: 프로세스 내 LRU 항목 수
+            max_rows: 영속 캐시 최대 행 수
+        """
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self._memory: "OrderedDict[str, Label]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS label (
+                  key         TEXT PRIMARY KEY,
+                  revision    TEXT NOT NULL,
+                  category_id INTEGER NOT NULL,
+                  confidence  REAL NOT NULL,
+                  version     TEXT NOT NULL,
+                  last_access REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_label_access ON label (last_access)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_label_revision ON label (revision)")
+            self._rows = self._db.execute("SELECT COUNT(*) FROM label").fetchone()[0]
+
+    @staticmethod
+    def make_key(title: str, content: str, revision: str) -> str:
+        return f"{make_hash(title or '', content)}:{revision}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, Label]:
+        """캐시에 있는 항목만 {key: label} 로 반환"""
+        found: Dict[str, Label] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                label = self._memory.get(key)
+                if label is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = label
+
+            if missing and self._db is not None:
+                placeholders = ",".join(["?"] * len(missing))
+                rows = self._db.execute(
+                    f"SELECT key, category_id, confidence, version FROM label WHERE key IN ({placeholders})",
+                    missing,
+                ).fetchall()
+                if rows:
+                    self._db.execute(
+                        f"UPDATE label SET last_access = ? WHERE key IN ({','.join(['?'] * len(rows))})",
+                        [time.time()] + [r[0] for r in rows],
+                    )
+                for key, category_id, confidence, version in rows:
+                    label = (category_id, confidence, version)
+                    found[key] = label
+                    self._remember(key, label)
+
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, Label], revision: str):
+        if not entries:
+            return
+        with self._lock:
+            for key, label in entries.items():
+                self._remember(key, label)
+            if self._db is None:
+                return
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO label (key, revision, category_id, confidence, version, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, revision, c, conf, ver, now) for key, (c, conf, ver) in entries.items()],
+            )
+            # 미스만 저장하므로 대부분 새 행 - 상한을 넘었을 때만 정확히 다시 센다
+            self._rows += len(entries)
+            if self._rows > self.max_rows:
+                self._rows = self._db.execute("SELECT COUNT(*) FROM label").fetchone()[0]
+                if self._rows > self.max_rows:
+                    self._evict()
+
+    def invalidate(self, keep_revision: str):
+        """현재 revision 이 아닌 항목 삭제 (모델 교체 시)"""
+        with self._lock:
+            self._memory = OrderedDict((k, v) for k, v in self._memory.items() if k.endswith(":" + keep_revision))
+            if self._db is not None:
+                self._db.execute("DELETE FROM label WHERE revision != ?", (keep_revision,))
+                self._rows = self._db.execute("SELECT COUNT(*) FROM label").fetchone()[0]
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def stats_since(self, start: Dict[str, int]) -> Dict:
+        """start(실행 시작 시 stats 복사본) 이후의 hits / misses / hit_rate - 실행별 요약용"""
+        with self._lock:
+            hits = self.stats["hits"] - start.get("hits", 0)
+            misses = self.stats["misses"] - start.get("misses", 0)
+        return {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0}
+
+    def _remember(self, key: str, label: Label):
+        self._memory[key] = label
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """행 수가 상한의 90% 가 되도록 오래 안 쓴 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        target = int(self.max_rows * 0.9)
+        self._db.execute(
+            "DELETE FROM label WHERE key IN (SELECT key FROM label ORDER BY last_access LIMIT ?)",
+            (self._rows - target,),
+        )
+        self._rows = self._db.execute("SELECT COUNT(*) FROM label").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# 전역 캐시 인스턴스 (분류기를 다시 만들어도 공유)
+_cache: Optional[ClassificationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> Optional[ClassificationCache]:
+    """환경변수 설정에 따른 전역 분류 캐시 반환 (CLASSIFY_CACHE=0 이면 None)"""
+    global _cache
+    if os.getenv("CLASSIFY_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            path = os.getenv("CLASSIFY_CACHE_PATH", DEFAULT_CACHE_PATH)
+            _cache = ClassificationCache(
+                path=None if path == ":memory:" else path,
+                memory_size=int(os.getenv("CLASSIFY_CACHE_MEMORY", "10000")),
+                max_rows=int(os.getenv("CLASSIFY_CACHE_MAX_ROWS", "200000")),
+            )
+        return _cache
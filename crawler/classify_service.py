@@ -0,0 +1,369 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .text_classifier import configure_classifier, get_classifier
+    from .metrics import REGISTRY, counter, histogram
+except ImportError:
+    from text_classifier import configure_classifier, get_classifier
+    from metrics import REGISTRY, counter, histogram
+
+# ---------------------------------------------------------
+# 상주 분류 서비스 (마이크로 배치)
+#  - 모델을 한 번 로드한 프로세스가 HTTP 로 분류 요청을 받는다
+#    (크롤러/작업 큐 워커/재분류마다 모델을 따로 올리지 않음)
+#  - 동시에 들어온 요청을 모아 최대 MAX_BATCH 건 (첫 요청 후 MAX_WAIT 초까지) classify_batch 1회로 처리
+#    -> ML 벡터화/predict_proba 가 요청마다가 아니라 묶음마다 1회
+#    MAX_WAIT 기본값 0 은 앞 묶음을 처리하는 동안 쌓인 요청만 모은다 (한가할 때 지연 추가 없음,
+#    bench/bench_classify_service.py 에서 5ms 대기는 호출자 1~8 에서 처리량/지연 모두 나빴음)
+#  - 분류기는 배치 스레드 하나만 사용하므로 TextClassifier 를 여러 스레드가 동시에 부르지 않는다
+#  - 크롤러 쪽은 ClassifyClient (CLASSIFY_SERVICE_URL 이 있으면 pipeline.run / run_worker 가 사용)
+#    호출자가 요청한 분류기 설정(임계값/OpenAI)이 서비스와 다르면 시작할 때 실패 (check_config)
+#  - OpenAI 요청 수 상한은 상주 프로세스라 BUDGET_WINDOW 초마다 다시 채운다
+#
+#  POST /classify  {"items": [[title, content], ...]} -> {"labels": [[category_id, confidence, version], ...],
+#                                                         "revision_tag": ...}
+#  GET  /health    {"revision_tag", "model_version", "confidence_threshold", "api_model", "stats"}
+#  GET  /metrics   Prometheus 텍스트 (서비스 프로세스의 분류 계층/배치 지표)
+# ---------------------------------------------------------
+SERVICE_HOST = os.getenv("CLASSIFY_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("CLASSIFY_SERVICE_PORT", "8765"))
+SERVICE_URL = os.getenv("CLASSIFY_SERVICE_URL", "")           # 비어 있으면 프로세스 안에서 분류
+MAX_BATCH = int(os.getenv("CLASSIFY_SERVICE_MAX_BATCH", "64"))
+MAX_WAIT = float(os.getenv("CLASSIFY_SERVICE_MAX_WAIT", "0"))
+REQUEST_TIMEOUT = float(os.getenv("CLASSIFY_SERVICE_TIMEOUT", "30"))
+BUDGET_WINDOW = float(os.getenv("CLASSIFY_SERVICE_BUDGET_WINDOW", "3600"))   # 0 이면 서비스 수명 전체
+
+SERVICE_BATCH_ITEMS = histogram("crawler_classify_service_batch_items", "마이크로 배치 1회 항목 수",
+                                buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+SERVICE_QUEUE_SECONDS = histogram("crawler_classify_service_queue_seconds", "요청이 배치에 들어가기까지 대기(초)")
+SERVICE_REQUESTS = counter("crawler_classify_service_requests_total", "분류 서비스 요청 수 (outcome: ok/error)",
+                           ("outcome",))
+
+
+class MicroBatcher:
+    """
+    여러 스레드의 분류 요청을 모아 classify_fn 을 한 스레드에서 묶음 단위로 호출
+
+    첫 요청이 들어오면 max_wait 동안(또는 max_batch 건이 찰 때까지) 뒤따르는 요청을
+    더 모은다 (0 이면 이미 큐에 있는 요청만). 요청 하나가 max_batch 보다 크면 그 요청만
+    한 묶음으로 처리한다.
+    """
+
+    def __init__(self, classify_fn: Callable[[List[Tuple[str, str]]], List[tuple]],
+                 max_batch: int = MAX_BATCH, max_wait: float = MAX_WAIT):
+        self.classify_fn = classify_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "items": 0, "batches": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="classify-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: List[Tuple[str, str]]) -> Future:
+        future: Future = Future()
+        if not items:
+            future.set_result([])
+        else:
+            self._queue.put((items, future, time.perf_counter()))
+        return future
+
+    def classify_batch(self, items: List[Tuple[str, str]], timeout: Optional[float] = None) -> List[tuple]:
+        return self.submit(items).result(timeout)
+
+    def _collect(self, first) -> Tuple[list, bool]:
+        batch, size = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            size += len(request[0])
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            now = time.perf_counter()
+            for _, _, queued_at in batch:
+                SERVICE_QUEUE_SECONDS.observe(now - queued_at)
+            items = [item for request_items, _, _ in batch for item in request_items]
+            SERVICE_BATCH_ITEMS.observe(len(items))
+            try:
+                labels = self.classify_fn(items)
+            except Exception as e:
+                with self._lock:
+                    self.stats["errors"] += len(batch)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            with self._lock:
+                self.stats["requests"] += len(batch)
+                self.stats["items"] += len(items)
+                self.stats["batches"] += 1
+            offset = 0
+            for request_items, future, _ in batch:
+                future.set_result(labels[offset:offset + len(request_items)])
+                offset += len(request_items)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["avg_batch_items"] = round(stats["items"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+    def close(self):
+        """남은 요청까지 처리한 뒤 배치 스레드 종료"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+# ---------------------------------------------------------
+# HTTP 서버
+# ---------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"    # keep-alive (클라이언트가 연결을 재사용)
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문을 따로 쓰므로 Nagle 을 끄지 않으면 keep-alive 요청마다 ACK 지연(~40ms)이 붙는다
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, content_type: str = "application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service: ClassifyService = self.server.service
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._send(200, json.dumps(service.health(), ensure_ascii=False))
+        elif path == "/metrics":
+            self._send(200, REGISTRY.render(), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send(404, json.dumps({"error": "not found"}))
+
+    def do_POST(self):
+        service: ClassifyService = self.server.service
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path.split("?")[0] != "/classify":
+            self._send(404, json.dumps({"error": "not found"}))
+            return
+        try:
+            items = [(str(title), str(content or "")) for title, content in json.loads(body)["items"]]
+        except (ValueError, KeyError, TypeError) as e:
+            SERVICE_REQUESTS.inc(outcome="error")
+            self._send(400, json.dumps({"error": f"잘못된 요청: {e}"}, ensure_ascii=False))
+            return
+        try:
+            labels = service.batcher.classify_batch(items, timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            SERVICE_REQUESTS.inc(outcome="error")
+            self._send(500, json.dumps({"error": str(e)}, ensure_ascii=False))
+            return
+        SERVICE_REQUESTS.inc(outcome="ok")
+        self._send(200, json.dumps({"labels": labels, "revision_tag": service.revision_tag}, ensure_ascii=False))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128     # 기본값(5)이면 호출자가 많을 때 연결이 거부/리셋된다
+
+
+class ClassifyService:
+    """분류기 1개 + MicroBatcher + HTTP 서버 (serve_forever 는 백그라운드 스레드)"""
+
+    def __init__(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, max_batch: int = MAX_BATCH,
+                 max_wait: float = MAX_WAIT, confidence_threshold: float = 0.7, api_config: Optional[Dict] = None,
+                 llm_budget: Optional[int] = None, budget_window: float = BUDGET_WINDOW):
+        """
+        Args:
+            host / port: 바인드 주소 (port 0 이면 빈 포트, 실제 값은 self.url)
+            max_batch: 마이크로 배치 1회 최대 항목 수
+            max_wait: 첫 요청 후 다른 요청을 더 기다리는 시간(초)
+            confidence_threshold / api_config: 분류기 설정 (configure_classifier 와 같음)
+            llm_budget: budget_window 마다의 OpenAI 요청 수 상한 (None 이면 설정값)
+            budget_window: 예산을 다시 채우는 간격(초, 0 이면 서비스 수명 전체에 한 번)
+        """
+        if api_config or confidence_threshold != 0.7:
+            configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
+        self.classifier = get_classifier()
+        self.llm_budget = llm_budget
+        self.budget_window = max(0.0, budget_window)
+        self.classifier.reset_api_budget(llm_budget)
+        self._budget_started = time.monotonic()
+        self.classifier._ensure_model()     # 첫 요청에서 로드 시간이 tail latency 로 잡히지 않도록 미리
+        self.revision_tag = self.classifier.revision_tag
+        self.batcher = MicroBatcher(self._classify, max_batch, max_wait)
+        self.server = _Server((host, port), _Handler)
+        self.server.service = self
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, name="classify-http", daemon=True)
+        self._thread.start()
+
+    def _classify(self, items: List[Tuple[str, str]]) -> List[tuple]:
+        # 배치 스레드에서만 불리므로 예산 창 교체와 분류가 겹치지 않는다
+        if self.budget_window and time.monotonic() - self._budget_started >= self.budget_window:
+            self.classifier.reset_api_budget(self.llm_budget)
+            self._budget_started = time.monotonic()
+        return self.classifier.classify_batch(items)
+
+    def health(self) -> Dict:
+        return {"revision_tag": self.revision_tag, "model_version": self.classifier.model_version,
+                "model_loaded": self.classifier.model is not None,
+                "confidence_threshold": self.classifier.confidence_threshold,
+                "api_model": _api_model(self.classifier.api_config),
+                "budget_window": self.budget_window, "stats": self.batcher.snapshot()}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _api_model(api_config: Optional[Dict]) -> Optional[str]:
+    """OpenAI 백업에 쓰는 모델 이름 (API 키가 없으면 None)"""
+    if not api_config or not api_config.get("api_key"):
+        return None
+    return api_config.get("model", "gpt-4o-mini")
+
+
+# ---------------------------------------------------------
+# 클라이언트 (classify_batch 와 같은 형태)
+# ---------------------------------------------------------
+class ClassifyClient:
+    """
+    분류 서비스 클라이언트 - keep-alive Session 하나를 여러 스레드가 공유
+
+    서비스에 연결할 수 없거나 오류 응답이면 예외를 그대로 올린다
+    (파이프라인에서는 분류 단계 오류로 처리되어 crawl_retry 로 넘어감).
+    """
+
+    def __init__(self, url: str = SERVICE_URL, timeout: float = REQUEST_TIMEOUT, pool_size: int = 8):
+        if not url:
+            raise ValueError("분류 서비스 주소가 없습니다 (CLASSIFY_SERVICE_URL)")
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._revision_tag: Optional[str] = None
+
+    def health(self) -> Dict:
+        response = self.session.get(f"{self.url}/health", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def check_config(self, confidence_threshold: float = 0.7, api_config: Optional[Dict] = None):
+        """
+        호출자가 요청한 분류기 설정이 서비스와 같은지 확인 (다르면 ValueError)
+
+        api_config 가 None 이면 프로세스 안 분류(get_classifier)와 같이 OPENAI_API_KEY/OPENAI_MODEL 을 본다.
+        """
+        if api_config is None and os.getenv("OPENAI_API_KEY"):
+            api_config = {"api_key": os.getenv("OPENAI_API_KEY"), "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")}
+        requested = {"confidence_threshold": confidence_threshold, "api_model": _api_model(api_config)}
+        health = self.health()
+        service = {key: health.get(key) for key in requested}
+        if service != requested:
+            raise ValueError(f"분류 서비스 설정이 요청과 다릅니다 - 요청 {requested}, 서비스 {service} "
+                             f"(서비스를 같은 설정으로 다시 띄우거나 CLASSIFY_SERVICE_URL 을 비우세요)")
+
+    @property
+    def revision_tag(self) -> str:
+        """서비스 분류기의 revision_tag (NoticeWriter 의 classifier_rev)"""
+        if self._revision_tag is None:
+            self._revision_tag = self.health()["revision_tag"]
+        return self._revision_tag
+
+    def classify_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[int, float, str]]:
+        if not items:
+            return []
+        response = self.session.post(f"{self.url}/classify", json={"items": items}, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"분류 서비스 오류 status={response.status_code} {response.text[:200]}")
+        data = response.json()
+        if self._revision_tag is not None and data["revision_tag"] != self._revision_tag:
+            # 서비스가 다른 모델/설정으로 재시작됨 - 저장할 classifier_rev 가 맞지 않으므로 중단
+            raise RuntimeError(f"분류 서비스 revision 변경 {self._revision_tag} -> {data['revision_tag']}")
+        return [tuple(label) for label in data["labels"]]
+
+    def classify(self, title: str, content: str) -> Tuple[int, float, str]:
+        return self.classify_batch([(title, content)])[0]
+
+    def close(self):
+        self.session.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="상주 분류 서비스 (모델 1회 로드 + 마이크로 배치)")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait", type=float, default=MAX_WAIT, help="배치를 모으는 최대 대기(초)")
+    parser.add_argument("--threshold", type=float, default=0.7,
+                        help="confidence_threshold (크롤러와 같은 값 - 다르면 크롤러가 시작할 때 실패)")
+    parser.add_argument("--llm-budget", type=int, help="창마다의 OpenAI 요청 수 상한 (기본: OPENAI_CALL_BUDGET)")
+    parser.add_argument("--budget-window", type=float, default=BUDGET_WINDOW,
+                        help="OpenAI 예산을 다시 채우는 간격(초, 0 이면 수명 전체)")
+    args = parser.parse_args(argv)
+
+    api_config = None
+    if os.getenv("OPENAI_API_KEY"):
+        api_config = {"api_key": os.getenv("OPENAI_API_KEY"), "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")}
+    service = ClassifyService(args.host, args.port, args.max_batch, args.max_wait,
+                              confidence_threshold=args.threshold, api_config=api_config,
+                              llm_budget=args.llm_budget, budget_window=args.budget_window)
+    print(f"[CLASSIFY SERVICE] {service.url} rev={service.revision_tag} model={service.classifier.model_version} "
+          f"api={_api_model(api_config) or '미설정'} max_batch={args.max_batch} max_wait={args.max_wait}s")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        print(f"[CLASSIFY SERVICE] stopped {service.batcher.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
+import json
 import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence
 import pymysql
 from dotenv import load_dotenv
 
+try:
+    from .metrics import counter, histogram
+    from .text_classifier import is_provisional
+except ImportError:
+    from metrics import counter, histogram
+    from text_classifier import is_provisional
+
 load_dotenv()
 
-def get_conn():
+def get_conn(autocommit: bool = True):
     conn = pymysql.connect(
         host=os.getenv("DB_HOST", "127.0.0.1"),
         port=int(os.getenv("DB_PORT", "3306")),
@@ -12,7 +23,7 @@ def get_conn():
         password=os.getenv("DB_PASSWORD"),
         db=os.getenv("DB_NAME"),
         charset="utf8mb4",
-        autocommit=True,
+        autocommit=autocommit,
         cursorclass=pymysql.cursors.DictCursor,
     )
     # 연결 유지를 위해 즉시 ping (이미 끊겨있을 경우 재연결)
@@ -56,4 +67,763 @@ def insert_notice_category(cur, notice_id, category_id, conf, model_ver):
         confidence = VALUES(confidence),
         model_version = VALUES(model_version)
     """
-    cur.execute(sql, (notice_id, category_id, conf, model_ver))
\ No newline at end of file
+    cur.execute(sql, (notice_id, category_id, conf, model_ver))
+
+
+def fetch_known_hashes(cur, urls):
+    """
+    - 이미 저장된 url 의 {url: {"id": ..., "hash": ...}} 반환 (목록 페이지당 1회 조회)
+    - idx_notice_url_hash (url, hash) 커버링 인덱스만으로 처리됨
+    - 증분 크롤링에서는 반환된 url 집합을 소스별 high-water mark 대신 사용
+    """
+    urls = list(urls)
+    if not urls:
+        return {}
+    placeholders = ",".join(["%s"] * len(urls))
+    cur.execute(f"SELECT id, url, hash FROM notice WHERE url IN ({placeholders})", urls)
+    return {row["url"]: {"id": row["id"], "hash": row["hash"]} for row in cur.fetchall()}
+
+
+def start_crawl_job(cur, source_id) -> Optional[int]:
+    """소스별 실행 기록 시작 (status=RUNNING) -> crawl_job.id"""
+    cur.execute("INSERT INTO crawl_job (source_id, status) VALUES (%s, 'RUNNING')", (source_id,))
+    return cur.lastrowid
+
+
+def finish_crawl_job(cur, job_id, status: str, error_msg: Optional[str] = None, stats: Optional[Dict] = None):
+    """
+    - status: SUCCESS | FAILED
+    - stats: 소스별 처리 수/단계 시간 등 (crawl_job.stats JSON 컬럼)
+    """
+    cur.execute(
+        """
+        UPDATE crawl_job
+           SET finished_at = NOW(), status = %s, error_msg = %s, stats = %s
+         WHERE id = %s
+        """,
+        (status, error_msg, json.dumps(stats, ensure_ascii=False) if stats is not None else None, job_id),
+    )
+
+
+# ---------------------------------------------------------
+# 체크포인트 (crawl_progress) / 상세 요청 재시도 목록 (crawl_retry)
+# ---------------------------------------------------------
+def load_progress(cur, source_id) -> Optional[Dict]:
+    """소스의 마지막 진행 위치 {"last_page", "status", "job_id"} (기록 없으면 None)"""
+    cur.execute("SELECT last_page, status, job_id FROM crawl_progress WHERE source_id = %s", (source_id,))
+    return cur.fetchone()
+
+
+def save_progress(cur, source_id, last_page: int, status: str = "RUNNING", job_id=None):
+    """
+    - last_page: 이 페이지까지(1..last_page) 모든 항목이 커밋되었거나 재시도 목록에 있음
+    - status: RUNNING (이어받을 위치) | DONE (소스 완료, 다음 실행은 1페이지부터)
+    - PK 한 행 UPSERT 라 페이지마다 기록해도 부담이 작다
+    """
+    cur.execute(
+        """
+        INSERT INTO crawl_progress (source_id, last_page, status, job_id)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+          last_page = VALUES(last_page),
+          status = VALUES(status),
+          job_id = VALUES(job_id)
+        """,
+        (source_id, last_page, status, job_id),
+    )
+
+
+def fetch_retries(cur, source_id, max_attempts: int, limit: int = 500) -> List[Dict]:
+    """재시도할 상세 url [{"url", "title", "page", "attempts"}] (오래된 순)"""
+    cur.execute(
+        """
+        SELECT url, title, page, attempts FROM crawl_retry
+         WHERE source_id = %s AND attempts < %s
+         ORDER BY updated_at
+         LIMIT %s
+        """,
+        (source_id, max_attempts, limit),
+    )
+    return list(cur.fetchall())
+
+
+def add_retry(cur, source_id, url, title, page: int, error_msg: Optional[str] = None):
+    """실패한 상세 url 기록 (이미 있으면 attempts + 1)"""
+    cur.execute(
+        """
+        INSERT INTO crawl_retry (source_id, url, title, page, attempts, last_error)
+        VALUES (%s, %s, %s, %s, 1, %s)
+        ON DUPLICATE KEY UPDATE
+          attempts = attempts + 1,
+          last_error = VALUES(last_error)
+        """,
+        (source_id, url, title, page, (error_msg or "")[:500]),
+    )
+
+
+def delete_retry(cur, url):
+    cur.execute("DELETE FROM crawl_retry WHERE url = %s", (url,))
+
+
+# ---------------------------------------------------------
+# 작업 큐 (crawl_task) - 여러 크롤러 프로세스/호스트가 목록/상세 작업을 나눠 처리
+#  - claim: SELECT ... FOR UPDATE SKIP LOCKED 로 다른 워커가 잡고 있는 행은 건너뛰고
+#           같은 트랜잭션에서 LEASED + lease_until 로 표시 (호출한 쪽이 커밋)
+#  - lease_until 이 지난 LEASED 작업은 다른 워커가 다시 가져간다 (워커 비정상 종료 대비)
+# ---------------------------------------------------------
+TASK_COLUMNS = "id, kind, source_id, page, max_page, url, title, attempts"
+
+
+def enqueue_tasks(cur, tasks: List[Dict]) -> int:
+    """
+    - tasks: [{"task_key", "batch", "kind", "source_id", "page", "max_page", "url", "title"}]
+    - 같은 task_key 가 이미 있으면 건너뜀 (여러 워커가 같은 작업을 넣어도 한 번만 등록)
+    """
+    if not tasks:
+        return 0
+    columns = ("task_key", "batch", "kind", "source_id", "page", "max_page", "url", "title")
+    values = ",".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(tasks))
+    cur.execute(
+        f"""
+        INSERT INTO crawl_task ({", ".join(columns)})
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE task_key = task_key
+        """,
+        [task.get(c) for task in tasks for c in columns],
+    )
+    return cur.rowcount
+
+
+def claim_tasks(cur, batch: str, owner: str, lease_seconds: float, limit: int, max_attempts: int) -> List[Dict]:
+    """
+    batch 에서 대기 중이거나 lease 가 만료된 작업을 최대 limit 개 잡는다 (트랜잭션 안에서 호출)
+    - LIST 작업을 먼저 (ENUM 순서) - 다음 목록 페이지가 상세 작업 뒤로 밀리지 않도록
+    """
+    cur.execute(
+        f"""
+        SELECT {TASK_COLUMNS} FROM crawl_task
+         WHERE batch = %s
+           AND (status = 'PENDING' OR (status = 'LEASED' AND lease_until < NOW(3)))
+           AND available_at <= NOW(3) AND attempts < %s
+         ORDER BY kind, id
+         LIMIT %s
+         FOR UPDATE SKIP LOCKED
+        """,
+        (batch, max_attempts, limit),
+    )
+    rows = list(cur.fetchall())
+    if rows:
+        placeholders = ",".join(["%s"] * len(rows))
+        cur.execute(
+            f"""
+            UPDATE crawl_task
+               SET status = 'LEASED', lease_owner = %s, lease_until = NOW(3) + INTERVAL %s SECOND,
+                   attempts = attempts + 1
+             WHERE id IN ({placeholders})
+            """,
+            [owner, lease_seconds] + [row["id"] for row in rows],
+        )
+    return rows
+
+
+def extend_leases(cur, owner: str, lease_seconds: float) -> int:
+    """heartbeat - owner 가 잡고 있는 작업의 lease 연장"""
+    cur.execute(
+        """
+        UPDATE crawl_task SET lease_until = NOW(3) + INTERVAL %s SECOND
+         WHERE lease_owner = %s AND status = 'LEASED'
+        """,
+        (lease_seconds, owner),
+    )
+    return cur.rowcount
+
+
+def complete_tasks(cur, owner: str, task_ids: List[int]) -> int:
+    """완료 표시 (lease 를 잃고 다른 워커가 가져간 작업은 그 워커가 마무리)"""
+    if not task_ids:
+        return 0
+    placeholders = ",".join(["%s"] * len(task_ids))
+    cur.execute(
+        f"""
+        UPDATE crawl_task SET status = 'DONE', lease_owner = NULL, lease_until = NULL
+         WHERE id IN ({placeholders}) AND lease_owner = %s
+        """,
+        list(task_ids) + [owner],
+    )
+    return cur.rowcount
+
+
+def fail_task(cur, owner: str, task_id: int, error_msg: str, retry_in: float, max_attempts: int):
+    """실패 - retry_in 초 뒤 다시 대기 (max_attempts 번 시도했으면 FAILED)"""
+    cur.execute(
+        """
+        UPDATE crawl_task
+           SET status = IF(attempts >= %s, 'FAILED', 'PENDING'), lease_owner = NULL, lease_until = NULL,
+               available_at = NOW(3) + INTERVAL %s SECOND, last_error = %s
+         WHERE id = %s AND lease_owner = %s
+        """,
+        (max_attempts, retry_in, (error_msg or "")[:500], task_id, owner),
+    )
+
+
+def reap_tasks(cur, max_attempts: int) -> int:
+    """lease 가 만료됐는데 시도 횟수를 다 쓴 작업을 FAILED 로 정리"""
+    cur.execute(
+        """
+        UPDATE crawl_task SET status = 'FAILED', lease_owner = NULL, last_error = 'lease expired'
+         WHERE status = 'LEASED' AND lease_until < NOW(3) AND attempts >= %s
+        """,
+        (max_attempts,),
+    )
+    return cur.rowcount
+
+
+def count_tasks(cur, batch: str) -> Dict[str, int]:
+    """batch 의 상태별 작업 수"""
+    cur.execute("SELECT status, COUNT(*) AS n FROM crawl_task WHERE batch = %s GROUP BY status", (batch,))
+    return {row["status"]: row["n"] for row in cur.fetchall()}
+
+
+# ---------------------------------------------------------
+# 알림 fan-out (crawler/notify.py)
+#  - 사용자 관심 카테고리/키워드 조회 (user_ids 를 주면 해당 사용자만)
+#  - user_pref_change: 설정이 바뀐 사용자 기록 (트리거가 채움) - id 이후 변경분만 다시 읽는다
+# ---------------------------------------------------------
+NOTIFICATION_CHUNK = 1000   # notification 다중 행 INSERT 1회당 행 수
+
+
+def _user_filter(user_ids: Optional[List[int]]):
+    if user_ids is None:
+        return "", []
+    return f" WHERE user_id IN ({','.join(['%s'] * len(user_ids))})", list(user_ids)
+
+
+def fetch_user_interests(cur, user_ids: Optional[List[int]] = None) -> List[Dict]:
+    where, args = _user_filter(user_ids)
+    cur.execute(f"SELECT user_id, category_id, weight FROM user_interest_category{where}", args)
+    return list(cur.fetchall())
+
+
+def fetch_user_keywords(cur, user_ids: Optional[List[int]] = None) -> List[Dict]:
+    where, args = _user_filter(user_ids)
+    cur.execute(f"SELECT user_id, keyword, match_type FROM user_keyword{where}", args)
+    return list(cur.fetchall())
+
+
+def fetch_pref_change_id(cur) -> int:
+    """현재 마지막 변경 기록 id (전체 로드 전에 읽어 두고 이후 변경분부터 반영)"""
+    cur.execute("SELECT COALESCE(MAX(id), 0) AS id FROM user_pref_change")
+    row = cur.fetchone()
+    return row["id"] if row else 0
+
+
+def fetch_pref_changes(cur, after_id: int, limit: int) -> List[Dict]:
+    cur.execute("SELECT id, user_id FROM user_pref_change WHERE id > %s ORDER BY id LIMIT %s", (after_id, limit))
+    return list(cur.fetchall())
+
+
+def insert_notifications(cur, rows: List[tuple], channel: str = "WS") -> int:
+    """
+    - rows: [(user_id, notice_id)] -> PENDING 알림 (scheduled_at = 지금)
+    - 같은 (user_id, notice_id) 는 건너뜀 (uq_notif_user_notice), 새로 넣은 행 수 반환
+    """
+    inserted = 0
+    for i in range(0, len(rows), NOTIFICATION_CHUNK):
+        chunk = rows[i:i + NOTIFICATION_CHUNK]
+        values = ",".join(["(%s, %s, NOW(), %s)"] * len(chunk))
+        cur.execute(
+            f"""
+            INSERT INTO notification (user_id, notice_id, scheduled_at, channel)
+            VALUES {values}
+            ON DUPLICATE KEY UPDATE notice_id = notice_id
+            """,
+            [v for user_id, notice_id in chunk for v in (user_id, notice_id, channel)],
+        )
+        inserted += max(cur.rowcount, 0)
+    return inserted
+
+
+# ---------------------------------------------------------
+# 공지 검색 (crawler/search.py)
+#  - ngram FULLTEXT 인덱스 ftx_notice_title / ftx_notice_title_content (BOOLEAN MODE)
+#  - 점수 = 제목 일치 * 3 + 제목+본문 일치 (분류기의 제목 가중치와 같은 비율)
+#  - keyset 페이지네이션: 정렬 키 (score 또는 날짜, id) 가 직전 페이지 마지막 행보다 작은 행만
+#    (OFFSET 처럼 앞 페이지 행을 다시 정렬/전송하지 않고, 페이지 사이에 새 공지가 들어와도 중복/누락 없음)
+#  - InnoDB FULLTEXT 는 upsert_notice 트랜잭션 커밋 시 반영되므로 별도 색인 작업 없음
+#  - 근사 중복 공지(canonical_id 가 있는 사본)는 결과에서 뺀다 - 대표 공지 하나만 나온다
+# ---------------------------------------------------------
+SEARCH_SNIPPET_CHARS = 160
+_SEARCH_SCORE = ("ROUND(MATCH(n.title) AGAINST (%s IN BOOLEAN MODE) * 3"
+                 " + MATCH(n.title, n.content) AGAINST (%s IN BOOLEAN MODE), 6)")
+_SEARCH_DATE = "COALESCE(n.posted_at, n.scraped_at)"
+
+
+def search_notices(cur, boolean_query: str, sort: str = "relevance", after: Optional[tuple] = None,
+                   limit: int = 20, categories: Optional[List[int]] = None,
+                   sources: Optional[List[int]] = None) -> List[Dict]:
+    """
+    - boolean_query: MATCH ... AGAINST (... IN BOOLEAN MODE) 식 (crawler/search.py 가 만든다)
+    - sort: relevance (score, id 내림차순) | recent (게시일, id 내림차순)
+    - after: 직전 페이지 마지막 행의 (정렬 키, id) - 없으면 첫 페이지
+    - 반환: [{id, source_id, title, url, posted_at, sort_key}] (본문은 읽지 않음)
+    """
+    key = _SEARCH_SCORE if sort == "relevance" else _SEARCH_DATE
+    args: list = [boolean_query, boolean_query] if sort == "relevance" else []
+    where = ["MATCH(n.title, n.content) AGAINST (%s IN BOOLEAN MODE)", "n.canonical_id IS NULL"]
+    args.append(boolean_query)
+    if sources:
+        where.append(f"n.source_id IN ({','.join(['%s'] * len(sources))})")
+        args.extend(sources)
+    if categories:
+        where.append("EXISTS (SELECT 1 FROM notice_category nc WHERE nc.notice_id = n.id"
+                     f" AND nc.category_id IN ({','.join(['%s'] * len(categories))}))")
+        args.extend(categories)
+    having = ""
+    if after is not None:
+        having = "HAVING sort_key < %s OR (sort_key = %s AND id < %s)"
+        args.extend([after[0], after[0], after[1]])
+    cur.execute(
+        f"""
+        SELECT n.id, n.source_id, n.title, n.url, n.posted_at, {key} AS sort_key
+          FROM notice n
+         WHERE {' AND '.join(where)}
+         {having}
+         ORDER BY sort_key DESC, n.id DESC
+         LIMIT %s
+        """,
+        args + [limit],
+    )
+    return list(cur.fetchall())
+
+
+def fetch_search_snippets(cur, notice_ids: List[int], term: str) -> Dict[int, str]:
+    """검색 결과 페이지의 본문 발췌 - term 이 처음 나오는 위치 앞뒤 (없으면 본문 앞부분)"""
+    if not notice_ids:
+        return {}
+    cur.execute(
+        f"""
+        SELECT id, SUBSTRING(content, GREATEST(LOCATE(%s, content) - 40, 1), %s) AS snippet
+          FROM notice
+         WHERE id IN ({','.join(['%s'] * len(notice_ids))})
+        """,
+        [term, SEARCH_SNIPPET_CHARS] + list(notice_ids),
+    )
+    return {row["id"]: row["snippet"] or "" for row in cur.fetchall()}
+
+
+def fetch_notice_categories(cur, notice_ids: List[int]) -> Dict[int, List[int]]:
+    if not notice_ids:
+        return {}
+    cur.execute(
+        f"SELECT notice_id, category_id FROM notice_category WHERE notice_id IN ({','.join(['%s'] * len(notice_ids))})",
+        list(notice_ids),
+    )
+    out: Dict[int, List[int]] = {}
+    for row in cur.fetchall():
+        out.setdefault(row["notice_id"], []).append(row["category_id"])
+    return out
+
+
+# ---------------------------------------------------------
+# 읽기 API (crawler/read_api.py)
+#  - 피드: 대표 공지(canonical_id IS NULL)를 (feed_at, id) 내림차순으로 - idx_notice_feed 를 순서대로 읽으며
+#    카테고리는 notice_category PK 로 확인 (카테고리 수가 적어 한 페이지에 읽는 행이 limit 의 수 배 정도)
+#    feed_at = COALESCE(posted_at, scraped_at) 저장 생성 칼럼 (게시일이 없는 공지도 피드에 나오도록)
+#  - keyset: 직전 페이지 마지막 행의 (feed_at, id) 보다 작은 행만 (search 의 recent 커서와 같은 키)
+#  - feed_epoch: 공지/분류를 저장하는 트랜잭션마다 1 증가 -> API 가 주기적으로 읽어 응답 캐시 무효화
+# ---------------------------------------------------------
+FEED_COLUMNS = "n.id, n.source_id, n.title, n.url, n.posted_at, n.feed_at"
+
+
+def fetch_feed(cur, categories: List[int], after: Optional[tuple] = None, limit: int = 20) -> List[Dict]:
+    """
+    - categories: 이 중 하나로 분류된 공지 (사용자 피드는 관심 카테고리 전체)
+    - after: 직전 페이지 마지막 행의 (feed_at, id) - 없으면 첫 페이지
+    - 반환: [{id, source_id, title, url, posted_at, feed_at}] (본문은 읽지 않음)
+    """
+    if not categories:
+        return []
+    args: list = list(categories)
+    keyset = ""
+    if after is not None:
+        keyset = "AND (n.feed_at < %s OR (n.feed_at = %s AND n.id < %s))"
+        args.extend([after[0], after[0], after[1]])
+    cur.execute(
+        f"""
+        SELECT {FEED_COLUMNS}
+          FROM notice n
+         WHERE n.canonical_id IS NULL
+           AND EXISTS (SELECT 1 FROM notice_category nc WHERE nc.notice_id = n.id
+                        AND nc.category_id IN ({','.join(['%s'] * len(categories))}))
+           {keyset}
+         ORDER BY n.feed_at DESC, n.id DESC
+         LIMIT %s
+        """,
+        args + [limit],
+    )
+    return list(cur.fetchall())
+
+
+def fetch_notice_detail(cur, notice_id: int) -> Optional[Dict]:
+    cur.execute(
+        f"""
+        SELECT {FEED_COLUMNS}, n.content, n.deadline_at, n.canonical_id
+          FROM notice n
+         WHERE n.id = %s
+        """,
+        (notice_id,),
+    )
+    return cur.fetchone()
+
+
+def fetch_user_categories(cur, user_id: int) -> List[int]:
+    """사용자 관심 카테고리 (가중치 높은 순)"""
+    cur.execute(
+        "SELECT category_id FROM user_interest_category WHERE user_id = %s ORDER BY weight DESC, category_id",
+        (user_id,),
+    )
+    return [row["category_id"] for row in cur.fetchall()]
+
+
+def fetch_feed_epoch(cur) -> int:
+    cur.execute("SELECT epoch FROM feed_epoch WHERE id = 1")
+    row = cur.fetchone()
+    return row["epoch"] if row else 0
+
+
+def bump_feed_epoch(cur):
+    """공지/분류를 바꾼 트랜잭션의 마지막 문장으로 (행 잠금은 커밋까지 잠깐)"""
+    cur.execute("UPDATE feed_epoch SET epoch = epoch + 1 WHERE id = 1")
+
+
+# ---------------------------------------------------------
+# 근사 중복 (crawler/near_dup.py)
+#  - notice.simhash: 본문 SimHash 지문, notice.canonical_id: 같은 글의 대표 공지 (대표면 NULL)
+# ---------------------------------------------------------
+def fetch_simhashes(cur, after_id: int, limit: int) -> List[Dict]:
+    """지문이 있는 대표 공지 [{id, simhash}] (id 순서, after_id 이후)"""
+    cur.execute(
+        """
+        SELECT id, simhash FROM notice
+         WHERE id > %s AND simhash IS NOT NULL AND canonical_id IS NULL
+         ORDER BY id
+         LIMIT %s
+        """,
+        (after_id, limit),
+    )
+    return list(cur.fetchall())
+
+
+def fetch_notice_labels(cur, notice_ids: List[int]) -> Dict[int, tuple]:
+    """공지별 저장된 분류 결과 {notice_id: (category_id, confidence, model_version)}"""
+    if not notice_ids:
+        return {}
+    cur.execute(
+        f"""
+        SELECT notice_id, category_id, confidence, model_version FROM notice_category
+         WHERE notice_id IN ({','.join(['%s'] * len(notice_ids))})
+        """,
+        list(notice_ids),
+    )
+    return {row["notice_id"]: (row["category_id"], float(row["confidence"]) if row["confidence"] is not None else None,
+                               row["model_version"]) for row in cur.fetchall()}
+
+
+# ---------------------------------------------------------
+# 재분류 (crawler/reclassify.py)
+#  - notice_category.classifier_rev: 분류 결과를 만든 분류기 revision (TextClassifier.revision_tag)
+#  - 대표 공지만 id 순서로 스트리밍 (서버 측 커서 - 결과를 클라이언트 메모리에 모으지 않음)
+#  - 저장은 공지 묶음마다 DELETE + 다중 행 INSERT (카테고리가 바뀌면 예전 행이 남지 않도록),
+#    같은 트랜잭션에서 근사 중복 사본에도 대표의 결과를 복사
+# ---------------------------------------------------------
+LAST_NOTICE_ID = 2 ** 63 - 1
+
+
+def open_reclassify_stream(conn, classifier_rev: Optional[str], from_id: int = 0, to_id: Optional[int] = None):
+    """
+    (from_id, to_id] 범위에서 classifier_rev 로 분류되지 않은 대표 공지를 읽는 서버 측 커서
+    ({id, title, content, prev_category_id} 행을 fetchmany 로 읽는다, classifier_rev 가 None 이면 전체)
+    스트리밍 중에는 같은 연결로 다른 문장을 실행할 수 없으므로 전용 연결을 쓴다.
+    """
+    cur = conn.cursor(pymysql.cursors.SSDictCursor)
+    # 클라이언트가 늦게 읽는 동안(분류 대기) 서버가 전송을 끊지 않도록
+    cur.execute("SET SESSION net_write_timeout = 3600")
+    rev_filter = ""
+    args: List = [from_id, to_id if to_id is not None else LAST_NOTICE_ID]
+    if classifier_rev is not None:
+        rev_filter = ("AND NOT EXISTS (SELECT 1 FROM notice_category c"
+                      " WHERE c.notice_id = n.id AND c.classifier_rev = %s)")
+        args.append(classifier_rev)
+    cur.execute(
+        f"""
+        SELECT n.id, n.title, n.content,
+               (SELECT MIN(c.category_id) FROM notice_category c WHERE c.notice_id = n.id) AS prev_category_id
+          FROM notice n
+         WHERE n.id > %s AND n.id <= %s AND n.canonical_id IS NULL
+           {rev_filter}
+         ORDER BY n.id
+        """,
+        args,
+    )
+    return cur
+
+
+def replace_notice_labels(cur, rows: List[tuple]) -> int:
+    """
+    rows: [(notice_id, category_id, confidence, model_version, classifier_rev)] 로 분류 결과 교체
+    반환: 결과를 함께 바꾼 근사 중복 사본 수
+    """
+    if not rows:
+        return 0
+    ids = [row[0] for row in rows]
+    placeholders = ",".join(["%s"] * len(ids))
+    cur.execute(f"DELETE FROM notice_category WHERE notice_id IN ({placeholders})", ids)
+    cur.execute(
+        f"""
+        INSERT INTO notice_category (notice_id, category_id, confidence, model_version, classifier_rev)
+        VALUES {','.join(['(%s, %s, %s, %s, %s)'] * len(rows))}
+        """,
+        [v for row in rows for v in row],
+    )
+    cur.execute(
+        f"""
+        DELETE c FROM notice_category c JOIN notice n ON n.id = c.notice_id
+         WHERE n.canonical_id IN ({placeholders})
+        """,
+        ids,
+    )
+    cur.execute(
+        f"""
+        INSERT INTO notice_category (notice_id, category_id, confidence, model_version, classifier_rev)
+        SELECT n.id, c.category_id, c.confidence, c.model_version, c.classifier_rev
+          FROM notice n JOIN notice_category c ON c.notice_id = n.canonical_id
+         WHERE n.canonical_id IN ({placeholders})
+        """,
+        ids,
+    )
+    copies = cur.rowcount
+    bump_feed_epoch(cur)
+    return copies
+
+
+# ---------------------------------------------------------
+# ML 학습 데이터 (crawler/train.py)
+#  - 분류된 대표 공지를 id 순서로 스트리밍 (재분류와 같은 서버 측 커서)
+#  - ML 모델과 무관하게 정해진 결과(키워드, OpenAI)만 사용 - ml-* / *+keyword 는 모델 자신의 예측이라
+#    그대로 학습하면 모델이 자기 출력을 다시 배운다. 기본값/오류/잠정 결과도 제외
+#  - 신뢰도가 낮은 결과는 제외
+#  - 검증용: id % holdout_every == 0 인 행 (학습/검증이 항상 같은 행으로 나뉜다)
+# ---------------------------------------------------------
+TRAINING_VERSIONS = ("keyword-local", "openai-backup")
+
+
+def _training_filter(versions: Sequence[str]) -> str:
+    if not versions:
+        raise ValueError("학습에 쓸 model_version 이 없습니다")
+    return f"""
+      FROM notice n JOIN notice_category c ON c.notice_id = n.id
+     WHERE n.canonical_id IS NULL AND c.confidence >= %s
+       AND c.model_version IN ({", ".join(["%s"] * len(versions))})
+    """
+
+
+def fetch_label_classes(cur, min_confidence: float, versions: Sequence[str] = TRAINING_VERSIONS) -> List[int]:
+    """학습 데이터에 나오는 category_id 목록 (partial_fit 에 처음부터 넘길 클래스)"""
+    cur.execute(f"SELECT DISTINCT c.category_id {_training_filter(versions)} ORDER BY c.category_id",
+                (min_confidence, *versions))
+    return [row["category_id"] for row in cur.fetchall()]
+
+
+def open_training_stream(conn, min_confidence: float, holdout_every: int, holdout: bool,
+                         versions: Sequence[str] = TRAINING_VERSIONS):
+    """{id, title, content, category_id} 를 id 순서로 읽는 서버 측 커서 (holdout: 검증 행만 / 학습 행만)"""
+    cur = conn.cursor(pymysql.cursors.SSDictCursor)
+    cur.execute("SET SESSION net_write_timeout = 3600")
+    cur.execute(
+        f"""
+        SELECT n.id, n.title, n.content, c.category_id
+        {_training_filter(versions)}
+           AND (n.id MOD %s = 0) = %s
+         ORDER BY n.id
+        """,
+        (min_confidence, *versions, holdout_every, holdout),
+    )
+    return cur
+
+
+# ---------------------------------------------------------
+# 배치 저장기
+#  - 공지 행은 다중 행 INSERT ... ON DUPLICATE KEY UPDATE, 분류 결과는 공지별 DELETE + INSERT
+#    (replace_notice_labels) 로 배치당 트랜잭션 1회에 저장한다.
+#  - 연결이 끊기면 재연결 후 배치 전체를 다시 실행 (UPSERT / 교체라 멱등)
+#  - 여러 워커가 같은 테이블에 쓰다 교착/잠금 대기 초과로 롤백되면 같은 연결로 다시 실행
+# ---------------------------------------------------------
+# 2006: MySQL server has gone away, 2013: Lost connection, 2055: Lost connection (SSL 등)
+RECONNECT_ERRORS = {2006, 2013, 2055}
+# 1213: Deadlock found, 1205: Lock wait timeout exceeded
+LOCK_ERRORS = {1213, 1205}
+
+DB_WRITE_SECONDS = histogram("crawler_db_write_seconds", "NoticeWriter 배치 1회 저장 시간(초, 재시도 포함)")
+DB_ROWS = counter("crawler_db_rows_total", "저장한 공지 행 수")
+DB_RECONNECTS = counter("crawler_db_reconnects_total", "배치 저장 중 재연결 횟수")
+DB_FAILURES = counter("crawler_db_failures_total", "재연결 후에도 실패한 배치 수")
+
+
+def _is_lock_conflict(e: Exception) -> bool:
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in LOCK_ERRORS
+
+
+def _is_disconnect(e: Exception) -> bool:
+    if isinstance(e, pymysql.err.InterfaceError):
+        return True
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in RECONNECT_ERRORS
+
+
+class NoticeWriter:
+    def __init__(self, batch_size: int = 100, flush_interval: float = 5.0,
+                 max_reconnect: int = 3, conn_factory: Callable = get_conn, classifier_rev: Optional[str] = None):
+        """
+        Args:
+            batch_size: 버퍼가 이 행 수에 도달하면 저장
+            flush_interval: 첫 행이 버퍼에 들어온 뒤 이 시간(초)이 지나면 저장
+            max_reconnect: 배치 저장 중 연결이 끊겼을 때 재연결 시도 횟수
+            conn_factory: autocommit 인자를 받는 연결 생성 함수
+            classifier_rev: notice_category.classifier_rev 에 기록할 분류기 revision (재분류 job 이 건너뛰는 기준)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_reconnect = max_reconnect
+        self._conn_factory = conn_factory
+        self.classifier_rev = classifier_rev
+        self._conn = None
+        self._rows: List[Dict] = []
+        self._first_at: Optional[float] = None
+        self.stats = {"rows": 0, "batches": 0, "reconnects": 0}
+
+    def add(self, source_id, url, title, content, posted_at, hash_,
+            category_id, conf, model_ver, on_saved: Optional[Callable[[int], None]] = None,
+            simhash: Optional[int] = None, canonical_id: Optional[int] = None, canonical_url: Optional[str] = None):
+        """
+        행을 버퍼에 추가 (조건을 만족하면 즉시 저장)
+        on_saved(notice_id) 는 해당 행이 커밋된 뒤 호출된다.
+        simhash / canonical_id: 근사 중복 지문 / 대표 공지 id (crawler/near_dup.py)
+        canonical_url: 대표 공지가 같은 배치에 있어 아직 id 가 없을 때 - 저장 후 url 로 찾아 연결
+        """
+        self._rows.append({
+            "notice": (source_id, url, title, content, posted_at, hash_, simhash, canonical_id),
+            # 오류 기본값 / OpenAI 답 없이 정한 잠정 결과는 revision 을 남기지 않는다 (재분류 대상)
+            "category": (category_id, conf, model_ver, None if is_provisional(model_ver) else self.classifier_rev),
+            "canonical_url": canonical_url,
+            "on_saved": on_saved,
+        })
+        if self._first_at is None:
+            self._first_at = time.monotonic()
+        if len(self._rows) >= self.batch_size or time.monotonic() - self._first_at >= self.flush_interval:
+            self.flush()
+
+    def flush_if_due(self):
+        """첫 행이 들어온 뒤 flush_interval 이 지났으면 저장 (입력이 끊겼을 때 호출)"""
+        if self._rows and time.monotonic() - self._first_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> Dict[str, int]:
+        """버퍼를 트랜잭션 1회로 저장하고 {url: notice_id} 반환"""
+        if not self._rows:
+            return {}
+        rows, self._rows, self._first_at = self._rows, [], None
+
+        started = time.perf_counter()
+        for attempt in range(self.max_reconnect + 1):
+            conn = self._connection()
+            try:
+                with conn.cursor() as cur:
+                    ids = self._write(cur, rows)
+                conn.commit()
+                break
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                lock_conflict = _is_lock_conflict(e)
+                if not (lock_conflict or _is_disconnect(e)) or attempt >= self.max_reconnect:
+                    DB_FAILURES.inc()
+                    raise
+                if lock_conflict:
+                    print(f"[DB] 잠금 충돌 - 배치 재시도 ({attempt + 1}/{self.max_reconnect}) err={e}")
+                    time.sleep(random.uniform(0.05, 0.2) * (attempt + 1))
+                    continue
+                print(f"[DB] 연결 끊김 - 재연결 후 배치 재시도 ({attempt + 1}/{self.max_reconnect}) err={e}")
+                self._reset()
+                self.stats["reconnects"] += 1
+                DB_RECONNECTS.inc()
+                time.sleep(0.5 * (attempt + 1))
+
+        DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+        DB_ROWS.inc(len(rows))
+        self.stats["rows"] += len(rows)
+        self.stats["batches"] += 1
+        for row in rows:
+            if row["on_saved"]:
+                row["on_saved"](ids[row["notice"][1]])
+        return ids
+
+    def _write(self, cur, rows: List[Dict]) -> Dict[str, int]:
+        values = ",".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+        cur.execute(
+            f"""
+            INSERT INTO notice (source_id, url, title, content, posted_at, hash, simhash, canonical_id)
+            VALUES {values}
+            ON DUPLICATE KEY UPDATE
+              title = VALUES(title),
+              content = VALUES(content),
+              posted_at = VALUES(posted_at),
+              hash = VALUES(hash),
+              simhash = VALUES(simhash),
+              canonical_id = VALUES(canonical_id)
+            """,
+            [v for row in rows for v in row["notice"]],
+        )
+
+        # 다중 행 INSERT 는 행별 id 를 돌려주지 않으므로 url 로 회수
+        urls = list({row["notice"][1] for row in rows})
+        placeholders = ",".join(["%s"] * len(urls))
+        cur.execute(f"SELECT id, url FROM notice WHERE url IN ({placeholders})", urls)
+        ids = {r["url"]: r["id"] for r in cur.fetchall()}
+
+        # 같은 배치 안의 대표 공지를 가리키는 중복 (드묾 - 행마다 UPDATE)
+        for row in rows:
+            canonical_id = ids.get(row["canonical_url"]) if row["canonical_url"] else None
+            if canonical_id is not None:
+                cur.execute("UPDATE notice SET canonical_id = %s WHERE id = %s", (canonical_id, ids[row["notice"][1]]))
+
+        # 기본 키가 (notice_id, category_id) 라 UPSERT 로는 카테고리가 바뀐 공지의 예전 행이 남는다
+        # -> 재분류와 같이 공지별로 지우고 다시 넣음 (같은 공지가 두 번 있으면 나중 행, 근사 중복 사본도 갱신)
+        labels = {ids[row["notice"][1]]: row["category"] for row in rows}
+        replace_notice_labels(cur, [(notice_id,) + label for notice_id, label in labels.items()])
+        return ids
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self._conn_factory(autocommit=False)
+        return self._conn
+
+    def _reset(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
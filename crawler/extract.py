@@ -0,0 +1,91 @@
+import os
+import re
+from typing import Iterable, List, Optional
+
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer
+
+# ---------------------------------------------------------
+# 목록/상세 페이지 본문 추출
+#  - 페이지 전체(헤더 메뉴, 푸터, 스크립트)를 트리로 만들지 않고
+#    SoupStrainer 로 필요한 영역만 파싱한다.
+#  - <br>/<p> 줄바꿈 처리를 트리 수정(replace_with/insert) 대신
+#    한 번의 순회로 처리한다. 결과 문자열은 기존 방식과 동일.
+#  - 파서: 기본 html.parser. HTML_PARSER=lxml 로 C 파서를 쓸 수 있으나
+#    닫히지 않은/중첩된 <p> 등을 다르게 복원해 본문이 달라질 수 있다
+#    (bench/bench_parse.py 로 파서별 결과 차이 확인)
+# ---------------------------------------------------------
+PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# bs4 4.11 미만에는 interesting_string_types 가 없음 (당시 get_text 기본값)
+_DEFAULT_STRING_TYPES = (NavigableString, CData)
+
+
+def class_strainer(*classes: str) -> SoupStrainer:
+    """
+    class 중 하나라도 일치하는 태그(와 그 하위)만 남기는 SoupStrainer
+    (파싱 중에는 class 값이 공백으로 나뉘기 전 문자열로 들어오므로 직접 분리)
+    """
+    wanted = frozenset(classes)
+
+    def match(value: Optional[str]) -> bool:
+        return value is not None and not wanted.isdisjoint(value.split())
+
+    return SoupStrainer(class_=match)
+
+
+def parse(html: str, strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+
+def _string_filter(tag):
+    """tag.get_text() 가 포함하는 문자열 타입 판정 함수 (bs4 _all_strings 와 동일 규칙)"""
+    types = getattr(tag, "interesting_string_types", None) or _DEFAULT_STRING_TYPES
+    if isinstance(types, type):
+        return lambda s: type(s) is types
+    return lambda s: type(s) in types
+
+
+def text_with_breaks(tag) -> str:
+    """
+    <br> 을 줄바꿈으로 바꾸고 <p> 앞뒤에 줄바꿈을 넣은 뒤 get_text().strip() 한 것과
+    같은 문자열을 트리 수정 없이 만든다.
+    """
+    accept = _string_filter(tag)
+    newline = "\n" if accept(NavigableString("\n")) else ""
+    parts: List[str] = []
+    _collect(tag, parts, accept, newline)
+    return "".join(parts).strip()
+
+
+def _collect(node, parts: List[str], accept, newline: str):
+    for child in node.contents:
+        if isinstance(child, NavigableString):
+            if accept(child):
+                parts.append(child)
+        elif child.name == "br":
+            parts.append(newline)
+        elif child.name == "p":
+            parts.append(newline)
+            _collect(child, parts, accept, newline)
+            parts.append(newline)
+        else:
+            _collect(child, parts, accept, newline)
+
+
+def find_date(tag) -> Optional[str]:
+    """영역 텍스트에서 첫 YYYY-MM-DD 반환"""
+    if tag is None:
+        return None
+    m = DATE_RE.search(tag.get_text(" ", strip=True))
+    return m.group(0) if m else None
+
+
+def iter_links(soup: BeautifulSoup, selector: str) -> Iterable:
+    """selector 에 맞는 <a> 중 href 가 있는 것만 (title, href)"""
+    for a in soup.select(selector):
+        href = a.get("href")
+        if not href:
+            continue
+        yield a.get_text(strip=True), href
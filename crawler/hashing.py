@@ -0,0 +1,9 @@
+import hashlib
+from typing import Optional
+
+
+def make_hash(title: str, content: Optional[str]) -> str:
+    """공지 내용 해시 (notice.hash, 분류 캐시 키 공용)"""
+    h = hashlib.sha256()
+    h.update((title + "|" + (content or "")).encode("utf-8"))
+    return h.hexdigest()
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+
+# ---------------------------------------------------------
+# 상세 페이지 응답 캐시 (로컬 SQLite 파일)
+#  - url 을 키로 본문과 ETag / Last-Modified 를 저장
+#  - TTL 안이면 요청 없이 캐시 본문 사용, 지나면 조건부 GET 으로 재검증
+#  - 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 항목부터 제거 (LRU)
+# ---------------------------------------------------------
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http_cache.sqlite3")
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and (time.time() - self.fetched_at) < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024 * 1024,
+                 ttl: float = 6 * 3600):
+        """
+        Args:
+            path: SQLite 파일 경로
+            max_bytes: 저장 본문(압축 후) 총 크기 상한
+            ttl: 재검증 없이 캐시를 그대로 쓰는 시간(초)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "revalidated": 0, "miss": 0, "evicted": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS response (
+              url           TEXT PRIMARY KEY,
+              body          BLOB NOT NULL,
+              etag          TEXT NULL,
+              last_modified TEXT NULL,
+              fetched_at    REAL NOT NULL,
+              last_access   REAL NOT NULL,
+              size          INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_response_access ON response (last_access)")
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM response WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE response SET last_access = ? WHERE url = ?", (time.time(), url))
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(zlib.decompress(body).decode("utf-8"), etag, last_modified, fetched_at)
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        blob = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM response WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO response (url, body, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, blob, etag, last_modified, now, now, len(blob)),
+            )
+            self._total += len(blob) - (old[0] if old else 0)
+            self._evict()
+
+    def record(self, outcome: str):
+        """조회 결과 집계 (fresh / revalidated / miss)"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def touch(self, url: str):
+        """304 응답 시 신선도 갱신"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE response SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+
+    def _evict(self):
+        """총 크기가 상한 이하가 될 때까지 LRU 순으로 제거 (lock 보유 상태에서 호출)"""
+        while self._total > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT url, size FROM response ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total = 0
+                return
+            for url, size in rows:
+                self._db.execute("DELETE FROM response WHERE url = ?", (url,))
+                self._total -= size
+                self.stats["evicted"] += 1
+                if self._total <= self.max_bytes:
+                    return
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# 전역 캐시 인스턴스
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_cache_config = {
+    "enabled": os.getenv("HTTP_CACHE", "1") != "0",
+    "path": os.getenv("HTTP_CACHE_PATH", DEFAULT_CACHE_PATH),
+    "max_bytes": int(float(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024),
+    "ttl": float(os.getenv("HTTP_CACHE_TTL", str(6 * 3600))),
+    "bypass": os.getenv("HTTP_CACHE_BYPASS", "0") == "1",
+}
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """전역 응답 캐시 반환 (비활성화 시 None)"""
+    global _cache
+    with _cache_lock:
+        if not _cache_config["enabled"]:
+            return None
+        if _cache is None:
+            _cache = ResponseCache(_cache_config["path"], _cache_config["max_bytes"], _cache_config["ttl"])
+        return _cache
+
+
+def cache_bypassed() -> bool:
+    return _cache_config["bypass"]
+
+
+def configure_response_cache(enabled: Optional[bool] = None, path: Optional[str] = None,
+                             max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                             bypass: Optional[bool] = None):
+    """
+    응답 캐시 설정 변경
+
+    Args:
+        enabled: 캐시 사용 여부
+        path: SQLite 파일 경로
+        max_bytes: 총 크기 상한
+        ttl: 신선도 유지 시간(초)
+        bypass: True 이면 캐시를 읽지 않고 항상 새로 받음 (받은 응답은 저장)
+    """
+    global _cache
+    with _cache_lock:
+        updates = {"enabled": enabled, "path": path, "max_bytes": max_bytes, "ttl": ttl, "bypass": bypass}
+        _cache_config.update({k: v for k, v in updates.items() if v is not None})
+        if _cache is not None and (path is not None or max_bytes is not None or ttl is not None or enabled is False):
+            _cache.close()
+            _cache = None
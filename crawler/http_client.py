@@ -0,0 +1,157 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# ---------------------------------------------------------
+# 공유 HTTP 클라이언트
+#  - 요청마다 requests.get 으로 새 TCP/TLS 연결을 맺지 않도록
+#    keep-alive 커넥션 풀을 가진 Session 하나를 워커 스레드가 공유한다.
+#  - Session 설정은 생성 시점에만 바꾸고 이후에는 읽기만 하므로
+#    여러 스레드에서 get() 을 동시에 호출해도 안전하다.
+# ---------------------------------------------------------
+DEFAULT_CONFIG = {
+    "pool_size": int(os.getenv("HTTP_POOL_SIZE", "8")),         # 호스트별 유지 커넥션 수
+    "pool_hosts": int(os.getenv("HTTP_POOL_HOSTS", "4")),       # 커넥션 풀을 유지할 호스트 수
+    "keep_alive": os.getenv("HTTP_KEEP_ALIVE", "1") != "0",
+    "connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    "read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", "15")),
+}
+
+
+class HttpStats:
+    """요청 수 / 실제 연결(핸드셰이크) 수 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.handshakes = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_handshake(self):
+        with self._lock:
+            self.handshakes += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            per_conn = self.requests / self.handshakes if self.handshakes else 0.0
+            return {
+                "requests": self.requests,
+                "handshakes": self.handshakes,
+                "requests_per_connection": round(per_conn, 2),
+            }
+
+
+def _counting_pools(stats: HttpStats) -> Dict:
+    """connect() 호출(=TCP/TLS 핸드셰이크)을 세는 커넥션 풀 클래스 생성"""
+
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            stats.record_handshake()
+            super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            stats.record_handshake()
+            super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class PooledAdapter(HTTPAdapter):
+    def __init__(self, stats: HttpStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pools(self._stats)
+
+
+class HttpClient:
+    def __init__(self, pool_size: int = 8, pool_hosts: int = 4, keep_alive: bool = True,
+                 connect_timeout: float = 5.0, read_timeout: float = 15.0,
+                 headers: Optional[Dict] = None):
+        """
+        Args:
+            pool_size: 호스트별 최대 커넥션 수 (초과 요청은 커넥션이 반납될 때까지 대기)
+            pool_hosts: 커넥션 풀을 캐시할 호스트 수
+            keep_alive: False 이면 요청마다 연결을 닫음 (비교/디버깅용)
+            connect_timeout: 연결 타임아웃(초)
+            read_timeout: 응답 읽기 타임아웃(초)
+            headers: 기본 요청 헤더
+        """
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.stats = HttpStats()
+        self.session = requests.Session()
+        # 재시도는 req_get 에서 처리하므로 어댑터 재시도는 끈다
+        adapter = PooledAdapter(
+            self.stats,
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(headers or {})
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout=None, **kwargs) -> requests.Response:
+        self.stats.record_request()
+        return self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# 전역 클라이언트 인스턴스
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+_client_config = dict(DEFAULT_CONFIG)
+_client_headers: Dict = {}
+
+
+def get_http_client() -> HttpClient:
+    """전역 HTTP 클라이언트 반환"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(headers=_client_headers, **_client_config)
+        return _client
+
+
+def configure_http_client(headers: Optional[Dict] = None, **config) -> HttpClient:
+    """
+    HTTP 클라이언트 설정 변경 (지정한 항목만 덮어쓰고 클라이언트는 새로 생성)
+
+    Args:
+        headers: 기본 요청 헤더
+        **config: pool_size, pool_hosts, keep_alive, connect_timeout, read_timeout
+    """
+    global _client
+    with _client_lock:
+        unknown = set(config) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"알 수 없는 HTTP 설정: {sorted(unknown)}")
+        _client_config.update({k: v for k, v in config.items() if v is not None})
+        if headers is not None:
+            _client_headers.clear()
+            _client_headers.update(headers)
+        if _client is not None:
+            _client.close()
+            _client = None
+    return get_http_client()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick (선택 의존성, C 구현)
+except ImportError:
+    ahocorasick = None
+
+# ---------------------------------------------------------
+# 다중 키워드 매칭
+#  - 키워드 목록을 한 번 컴파일해 두고, 텍스트 한 번 훑기로
+#    등장한 키워드 집합을 구한다. (부분 문자열 포함 여부 기준)
+#  - 백엔드
+#    * pyahocorasick 설치 시: C 구현 Aho-Corasick
+#    * 미설치 + 키워드가 많을 때: 순수 파이썬 Aho-Corasick
+#    * 미설치 + 키워드가 적을 때: 중복 제거한 키워드별 `in` 검사
+#      (CPython 에서는 수백 개 이하의 키워드는 C 레벨 부분 문자열
+#       검색이 파이썬 루프 기반 오토마톤보다 빠르다)
+# ---------------------------------------------------------
+PURE_PYTHON_AUTOMATON_MIN_PATTERNS = 500
+
+
+class AhoCorasick:
+    """순수 파이썬 Aho-Corasick 오토마톤 (겹치는 매칭 포함)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for idx, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state] += (idx,)
+
+        # 실패 링크 (BFS)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found: Set[int] = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class _ScanMatcher:
+    """키워드별 부분 문자열 검사 (소규모 키워드 집합용)"""
+
+    def __init__(self, patterns: List[str]):
+        self._patterns = [(idx, p) for idx, p in enumerate(patterns) if p]
+
+    def find(self, text: str) -> Set[int]:
+        return {idx for idx, p in self._patterns if p in text}
+
+
+class _CAutomatonMatcher:
+    def __init__(self, patterns: List[str]):
+        self._automaton = ahocorasick.Automaton()
+        for idx, p in enumerate(patterns):
+            if p:
+                self._automaton.add_word(p, idx)
+        self._empty = len(self._automaton) == 0
+        if not self._empty:
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> Set[int]:
+        if self._empty:
+            return set()
+        return {idx for _, idx in self._automaton.iter(text)}
+
+
+class KeywordMatcher:
+    def __init__(self, patterns: Iterable[str], backend: Optional[str] = None):
+        """
+        Args:
+            patterns: 키워드 목록 (소문자 변환 후 사용, 중복은 하나로 합침)
+            backend: "c" | "python" | "scan" | None(자동 선택)
+        """
+        self.patterns: List[str] = list(dict.fromkeys(p.lower() for p in patterns))
+        self.backend = backend or self._default_backend(len(self.patterns))
+        if self.backend == "c":
+            if ahocorasick is None:
+                raise ValueError("pyahocorasick 이 설치되어 있지 않습니다.")
+            self._impl = _CAutomatonMatcher(self.patterns)
+        elif self.backend == "python":
+            self._impl = AhoCorasick(self.patterns)
+        elif self.backend == "scan":
+            self._impl = _ScanMatcher(self.patterns)
+        else:
+            raise ValueError(f"알 수 없는 backend: {self.backend}")
+
+    @staticmethod
+    def _default_backend(n_patterns: int) -> str:
+        if ahocorasick is not None:
+            return "c"
+        if n_patterns >= PURE_PYTHON_AUTOMATON_MIN_PATTERNS:
+            return "python"
+        return "scan"
+
+    def find(self, text: str) -> Set[int]:
+        """text(소문자) 안에 등장한 키워드의 인덱스 집합 (self.patterns 기준)"""
+        return self._impl.find(text)
+
+    def find_keywords(self, text: str) -> Set[str]:
+        return {self.patterns[idx] for idx in self.find(text)}
+
+
+class KeywordScorer:
+    """
+    카테고리별 키워드 표를 컴파일해 제목/본문 각각 한 번씩만 훑어 점수 계산
+    - 점수 규칙은 TextClassifier.predict_with_keywords 와 동일
+      (키워드가 제목에 있으면 +title_weight, 본문에 있으면 +content_weight,
+       같은 카테고리 목록에 중복된 키워드는 중복 횟수만큼 가산)
+    """
+
+    def __init__(self, keyword_categories: Dict[int, List[str]],
+                 title_weight: int = 3, content_weight: int = 1, backend: Optional[str] = None):
+        self.source = keyword_categories
+        self.categories = list(keyword_categories)
+        # 키워드 표 내용 지문 (분류 캐시 revision 에 사용)
+        self.fingerprint = hashlib.sha256(
+            json.dumps([[c, list(k)] for c, k in keyword_categories.items()], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+        self.title_weight = title_weight
+        self.content_weight = content_weight
+
+        per_keyword: Dict[str, Dict[int, int]] = {}
+        for category_id, keywords in keyword_categories.items():
+            for keyword in keywords:
+                counts = per_keyword.setdefault(keyword.lower(), {})
+                counts[category_id] = counts.get(category_id, 0) + 1
+
+        self.matcher = KeywordMatcher(per_keyword, backend=backend)
+        self._weights = [tuple(per_keyword[p].items()) for p in self.matcher.patterns]
+
+    def score(self, title_text: str, content_text: str) -> Dict[int, int]:
+        """
+        소문자 제목/본문을 받아 {category_id: score} 반환
+        (점수 > 0 인 카테고리만, keyword_categories 순서 유지)
+        """
+        scores = dict.fromkeys(self.categories, 0)
+        for idx in self.matcher.find(title_text):
+            for category_id, count in self._weights[idx]:
+                scores[category_id] += self.title_weight * count
+        for idx in self.matcher.find(content_text):
+            for category_id, count in self._weights[idx]:
+                scores[category_id] += self.content_weight * count
+        return {category_id: score for category_id, score in scores.items() if score > 0}
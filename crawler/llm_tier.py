@@ -0,0 +1,212 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+try:
+    from .metrics import counter, histogram
+except ImportError:
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# OpenAI 백업 분류 호출 계층
+#  - AsyncOpenAI 클라이언트 하나를 전용 이벤트 루프 스레드에서 재사용
+#  - 신뢰도가 낮은 항목을 모아 동시에 요청 (동시 요청 수 상한)
+#  - 요청별 타임아웃, 지수 백오프 재시도, 실행(run) 단위 호출 예산
+#  - base_url 로 엔드포인트 교체 가능 (로컬 대역 서버로 테스트/벤치마크)
+# ---------------------------------------------------------
+DEFAULT_LLM_CONFIG = {
+    "max_inflight": int(os.getenv("OPENAI_MAX_INFLIGHT", "4")),   # 동시 요청 수
+    "timeout": float(os.getenv("OPENAI_TIMEOUT", "20")),          # 요청 타임아웃(초)
+    "max_retries": int(os.getenv("OPENAI_MAX_RETRIES", "2")),     # 재시도 횟수
+    "backoff": float(os.getenv("OPENAI_BACKOFF", "0.5")),         # 첫 재시도 대기(초), 이후 2배씩
+    "call_budget": int(os.getenv("OPENAI_CALL_BUDGET", "0")),     # 실행당 요청 수 상한 (0 이면 무제한)
+}
+
+# 재시도 대상 HTTP 상태 (요청 한도 초과 / 서버 오류)
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+LLM_SECONDS = histogram("crawler_llm_request_seconds", "OpenAI 요청 1회 지연(초, 성공 요청)")
+LLM_REQUESTS = counter("crawler_llm_requests_total",
+                       "OpenAI 요청 결과 수 (ok/retry/failure/budget_skipped)", ("outcome",))
+
+# 항목별 결과: 응답 텍스트 | 예외(재시도 후 실패) | None(예산 소진으로 요청 안 함)
+Completion = Union[str, Exception, None]
+
+
+class _LoopThread:
+    """백그라운드 이벤트 루프 (어느 스레드에서든 코루틴 실행)"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+_loop: Optional[_LoopThread] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> _LoopThread:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = _LoopThread()
+        return _loop
+
+
+class LLMStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0            # 실제 전송한 요청 수 (재시도 포함)
+        self.retries = 0
+        self.failures = 0         # 재시도 후에도 실패한 항목 수
+        self.budget_skipped = 0   # 예산 소진으로 요청하지 않은 항목 수
+        self.latency = 0.0        # 성공 요청 지연 합계(초)
+        self.succeeded = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            avg = self.latency / self.succeeded if self.succeeded else 0.0
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "budget_skipped": self.budget_skipped,
+                "avg_latency_ms": round(avg * 1000, 1),
+            }
+
+
+class OpenAITier:
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_url: Optional[str] = None,
+                 max_inflight: int = 4, timeout: float = 20.0, max_retries: int = 2,
+                 backoff: float = 0.5, call_budget: int = 0):
+        """
+        Args:
+            api_key: OpenAI API 키
+            model: 모델 이름
+            base_url: API 엔드포인트 (None 이면 OPENAI_BASE_URL 또는 기본값)
+            max_inflight: 동시에 진행 중일 수 있는 요청 수
+            timeout: 요청 타임아웃(초)
+            max_retries: 타임아웃/연결 오류/429/5xx 재시도 횟수
+            backoff: 첫 재시도 대기(초), 이후 2배씩 증가 (+지터)
+            call_budget: 실행당 요청 수 상한 (0 이면 무제한, reset() 으로 초기화)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.max_inflight = max(1, max_inflight)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.call_budget = call_budget
+        self.stats = LLMStats()
+        self._budget_lock = threading.Lock()
+        self._budget_used = 0
+        self._client = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, api_config: Dict) -> "OpenAITier":
+        """api_config (api_key, model, base_url, max_inflight, timeout, ...) 로 생성"""
+        options = {k: api_config.get(k, v) for k, v in DEFAULT_LLM_CONFIG.items()}
+        return cls(api_key=api_config["api_key"], model=api_config.get("model", "gpt-4o-mini"),
+                   base_url=api_config.get("base_url"), **options)
+
+    def reset(self, call_budget: Optional[int] = None):
+        """실행 시작 시 예산/통계 초기화"""
+        with self._budget_lock:
+            self._budget_used = 0
+            if call_budget is not None:
+                self.call_budget = call_budget
+        self.stats = LLMStats()
+
+    def _take_budget(self) -> bool:
+        with self._budget_lock:
+            if self.call_budget and self._budget_used >= self.call_budget:
+                return False
+            self._budget_used += 1
+            return True
+
+    def complete_many(self, message_lists: List[List[Dict]]) -> List[Completion]:
+        """
+        여러 요청을 동시에 보내고 입력 순서대로 결과 반환
+
+        Args:
+            message_lists: 요청별 chat messages
+
+        Returns:
+            [응답 텍스트 | 예외 | None(예산 소진), ...]
+        """
+        if not message_lists:
+            return []
+        return _get_loop().run(self._complete_all(message_lists))
+
+    def complete(self, messages: List[Dict]) -> Completion:
+        return self.complete_many([messages])[0]
+
+    async def _complete_all(self, message_lists: List[List[Dict]]) -> List[Completion]:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            # 재시도는 직접 처리 (예산/통계 집계를 위해 SDK 재시도는 끈다)
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                       timeout=self.timeout, max_retries=0)
+            self._slots = asyncio.Semaphore(self.max_inflight)
+        return await asyncio.gather(*(self._complete_one(m) for m in message_lists))
+
+    async def _complete_one(self, messages: List[Dict]) -> Completion:
+        from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+        for attempt in range(self.max_retries + 1):
+            if not self._take_budget():
+                self.stats.add(budget_skipped=1)
+                LLM_REQUESTS.inc(outcome="budget_skipped")
+                return None
+            try:
+                async with self._slots:
+                    self.stats.add(calls=1)
+                    started = time.perf_counter()
+                    response = await self._client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=10,
+                        temperature=0.1,
+                    )
+                elapsed = time.perf_counter() - started
+                self.stats.add(succeeded=1, latency=elapsed)
+                LLM_SECONDS.observe(elapsed)
+                LLM_REQUESTS.inc(outcome="ok")
+                return (response.choices[0].message.content or "").strip()
+            except (APITimeoutError, APIConnectionError, APIStatusError) as e:
+                retryable = not isinstance(e, APIStatusError) or e.status_code in RETRY_STATUS
+                if not retryable or attempt >= self.max_retries:
+                    self.stats.add(failures=1)
+                    LLM_REQUESTS.inc(outcome="failure")
+                    return e
+                self.stats.add(retries=1)
+                LLM_REQUESTS.inc(outcome="retry")
+                await asyncio.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+            except Exception as e:
+                self.stats.add(failures=1)
+                LLM_REQUESTS.inc(outcome="failure")
+                return e
+
+    def close(self):
+        """클라이언트 연결 정리"""
+        if self._client is not None:
+            client, self._client = self._client, None
+            try:
+                _get_loop().run(client.close())
+            except Exception:
+                pass
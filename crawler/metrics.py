@@ -0,0 +1,284 @@
+import bisect
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# ---------------------------------------------------------
+# 실행 지표 (카운터 / 히스토그램)
+#  - 프로세스 전역 레지스트리 하나에 단계별 처리 시간, 재시도/실패 수를 모은다.
+#  - snapshot(): 실행 요약용 JSON (히스토그램은 버킷으로 추정한 p50/p95 포함)
+#    snapshot(since=mark()) 는 mark() 이후 늘어난 값만 - 실행별 요약 (값을 지우지 않음)
+#  - render(): Prometheus 텍스트 형식 (serve() 로 /metrics 노출, 선택) - 카운터는 프로세스 동안 단조 증가
+# ---------------------------------------------------------
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))   # 0 이면 엔드포인트 끔
+
+# 처리 시간 버킷(초) - HTTP 요청/파싱/분류/DB 저장을 한 표로 볼 수 있는 범위
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {sorted(self.label_names)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def _label_key(self, key: LabelValues) -> str:
+        return ",".join(f"{n}={v}" for n, v in zip(self.label_names, key)) or "_"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def mark(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def snapshot(self, since: Optional[Dict[LabelValues, float]] = None) -> Dict[str, float]:
+        with self._lock:
+            items = sorted(self._values.items())
+        if since is None:
+            return {self._label_key(k): v for k, v in items}
+        return {self._label_key(k): v - since.get(k, 0) for k, v in items if v != since.get(k, 0)}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {v:g}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def mark(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        with self._lock:
+            return {k: (list(c), self._sums[k]) for k, c in self._counts.items()}
+
+    def _quantile(self, counts: List[int], q: float) -> float:
+        """버킷 경계 사이 선형 보간 (Prometheus histogram_quantile 과 같은 방식)"""
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self, since: Optional[Dict[LabelValues, Tuple[List[int], float]]] = None) -> Dict[str, Dict]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in sorted(self._counts.items())]
+        if since is not None:
+            deltas = []
+            for key, counts, total in items:
+                start_counts, start_total = since.get(key, ([0] * len(counts), 0.0))
+                counts = [c - s for c, s in zip(counts, start_counts)]
+                if any(counts):
+                    deltas.append((key, counts, total - start_total))
+            items = deltas
+        return {
+            self._label_key(key): {
+                "count": sum(counts),
+                "sum_s": round(total, 4),
+                "p50_ms": round(self._quantile(counts, 0.5) * 1000, 2),
+                "p95_ms": round(self._quantile(counts, 0.95) * 1000, 2),
+            }
+            for key, counts, total in items
+        }
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in sorted(self._counts.items())]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, doc: str, labels: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, doc, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(labels):
+                raise ValueError(f"지표 {name} 가 다른 종류/라벨로 이미 등록됨")
+            return metric
+
+    def counter(self, name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, doc, labels)
+
+    def histogram(self, name: str, doc: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, doc, labels, buckets=buckets)
+
+    def reset(self):
+        """모든 값 초기화 (등록된 지표는 유지) - 카운터가 줄어들므로 /metrics 를 노출하는 프로세스에서는 쓰지 않는다"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def mark(self) -> Dict[str, Dict]:
+        """현재 값 복사본 (실행 시작 시 - snapshot(since=...) 로 이후 증가분만 요약)"""
+        with self._lock:
+            metrics = list(self._metrics.items())
+        return {name: metric.mark() for name, metric in metrics}
+
+    def snapshot(self, since: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """지표별 값 (since 가 있으면 그 뒤로 늘어난 값만, 늘지 않은 라벨은 생략)"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        if since is None:
+            return {name: metric.snapshot() for name, metric in metrics}
+        return {name: metric.snapshot(since.get(name, {})) for name, metric in metrics}
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.doc}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리
+REGISTRY = Registry()
+
+
+def counter(name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, doc, labels)
+
+
+def histogram(name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, doc, labels, buckets)
+
+
+# ---------------------------------------------------------
+# /metrics 엔드포인트 (Prometheus 텍스트, /metrics.json 은 snapshot)
+# ---------------------------------------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        registry: Registry = self.server.registry
+        if self.path.split("?")[0] == "/metrics":
+            body, content_type = registry.render(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, content_type = json.dumps(registry.snapshot(), ensure_ascii=False), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def serve(port: Optional[int] = None, host: str = "0.0.0.0",
+          registry: Registry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """
+    백그라운드 스레드로 엔드포인트 시작
+    (port 가 None 이면 METRICS_PORT, 0 이면 시작 안 함, 이미 떠 있으면 그대로 사용)
+    """
+    global _server
+    if port is None:
+        port = METRICS_PORT
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            server.daemon_threads = True
+            server.registry = registry
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _server = server
+            print(f"[METRICS] http://{host}:{server.server_address[1]}/metrics")
+        return _server
@@ -0,0 +1,429 @@
+"""
+TF-IDF + 선형 모델 분류기 아티팩트 (디렉터리 형식)
+
+    python crawler/model_artifact.py crawler/model.pkl crawler/model
+
+model.pkl(TfidfVectorizer + LogisticRegression) 을 아래 파일로 변환한다.
+
+    meta.json      버전, 클래스, 벡터라이저 설정, 확률 계산 방식, 지문
+    terms.npy      정렬된 어휘 (고정 길이 유니코드 배열)
+    columns.npy    terms 순서 -> 특징 열 번호
+    idf.npy        열별 idf
+    coef.npy       (특징 수, 클래스 수) 가중치 - 행 단위로 모아 읽도록 전치 저장
+    intercept.npy  클래스별 절편
+
+crawler/train.py 가 스트리밍 학습으로 만드는 해시 특징 아티팩트(featurizer: "hashing")는
+어휘 없이 토큰의 crc32 % n_features 를 열 번호로 쓰므로 coef.npy / intercept.npy 만 있다.
+
+배열은 np.load(mmap_mode="r") 로 열기 때문에 여러 워커 프로세스가 같은 파일을
+페이지 캐시로 공유하고, 로드 시 pickle 해제/sklearn import 비용이 없다.
+추론은 numpy 만 사용하며 결과는 sklearn transform + predict_proba 와 같다
+(변환 시 샘플 문서로 검증).
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+META_FILE = "meta.json"
+ARRAY_FILES = ("terms", "columns", "idf", "coef", "intercept")
+HASHED_ARRAY_FILES = ("coef", "intercept")
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"   # sklearn 기본값
+FORMAT_VERSION = 1
+
+# 변환 가능한 벡터라이저 설정 (그 밖의 값이면 변환 거부)
+_SUPPORTED_VECTORIZER = {
+    "analyzer": "word",
+    "input": "content",
+    "preprocessor": None,
+    "tokenizer": None,
+    "strip_accents": None,
+}
+
+
+def is_artifact(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(os.path.join(path, META_FILE))
+
+
+def read_meta(path: str) -> Dict:
+    """meta.json 만 읽음 (배열은 열지 않음)"""
+    with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LinearTextModel:
+    """아티팩트 디렉터리 기반 추론기 (TfidfVectorizer.transform + predict_proba 대체)"""
+
+    def __init__(self, path: str, mmap: bool = True):
+        import numpy as np
+
+        self.path = path
+        self.meta = read_meta(path)
+        if self.meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 아티팩트 형식: {self.meta.get('format')}")
+        mode = "r" if mmap else None
+        self.featurizer = self.meta.get("featurizer", "vocabulary")
+        names = HASHED_ARRAY_FILES if self.featurizer == "hashing" else ARRAY_FILES
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in names}
+        self.terms = arrays.get("terms")
+        self.columns = arrays.get("columns")
+        self.idf = arrays.get("idf")
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.classes_ = np.array(self.meta["classes"])
+        self.version = self.meta["version"]
+        self.fingerprint = self.meta["fingerprint"]
+
+        vec = self.meta["vectorizer"]
+        self._hashing = HashingFeaturizer(**vec) if self.featurizer == "hashing" else None
+        if self._hashing is not None:
+            return
+        self._token_re = re.compile(vec["token_pattern"])
+        self._lowercase = vec["lowercase"]
+        self._ngram_range = tuple(vec["ngram_range"])
+        self._stop_words = frozenset(vec["stop_words"]) if vec["stop_words"] else None
+        self._binary = vec["binary"]
+        self._sublinear_tf = vec["sublinear_tf"]
+        self._use_idf = vec["use_idf"]
+        self._norm = vec["norm"]
+
+    def _analyze(self, text: str) -> List[str]:
+        return _analyze(text, self._token_re, self._lowercase, self._stop_words, self._ngram_range)
+
+    def _features(self, text: str):
+        """(열 번호, tf-idf 값) - 열 번호 오름차순"""
+        import numpy as np
+
+        if self._hashing is not None:
+            return self._hashing.features(text)
+        tokens = self._analyze(text)
+        if not tokens:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        words = np.array(tokens)
+        pos = np.searchsorted(self.terms, words)
+        pos[pos >= len(self.terms)] = 0
+        found = self.terms[pos] == words
+        cols, counts = np.unique(self.columns[pos[found]], return_counts=True)
+
+        values = np.ones(len(cols)) if self._binary else counts.astype(np.float64)
+        if self._sublinear_tf:
+            values = np.log(values) + 1
+        if self._use_idf:
+            values = values * self.idf[cols]
+        if self._norm == "l2":
+            norm = np.sqrt(np.dot(values, values))
+        elif self._norm == "l1":
+            norm = np.abs(values).sum()
+        else:
+            norm = 0.0
+        if norm > 0:
+            values = values / norm
+        return cols, values
+
+    def decision_function(self, texts: Sequence[str]):
+        import numpy as np
+
+        scores = np.empty((len(texts), self.coef.shape[1]))
+        for row, text in enumerate(texts):
+            cols, values = self._features(text)
+            scores[row] = values @ self.coef[cols] + self.intercept
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]):
+        import numpy as np
+
+        scores = self.decision_function(texts)
+        mode = self.meta["proba"]
+        if mode == "softmax":
+            return _softmax(scores)
+        if mode == "binary_softmax":
+            return _softmax(np.hstack([-scores, scores]))
+        # ovr / binary_ovr: 시그모이드 후 (이진이면 [1-p, p]) 행 정규화
+        prob = 1.0 / (1.0 + np.exp(-scores))
+        if mode == "binary_ovr":
+            return np.hstack([1 - prob, prob])
+        return prob / prob.sum(axis=1, keepdims=True)
+
+
+def _analyze(text: str, token_re, lowercase: bool, stop_words, ngram_range) -> List[str]:
+    """sklearn 'word' analyzer 와 동일 (전처리 -> 토큰화 -> 불용어 -> n-gram)"""
+    if lowercase:
+        text = text.lower()
+    tokens = token_re.findall(text)
+    if stop_words is not None:
+        tokens = [w for w in tokens if w not in stop_words]
+    min_n, max_n = ngram_range
+    if max_n == 1:
+        return tokens
+    original = tokens
+    if min_n == 1:
+        tokens = list(original)
+        min_n += 1
+    else:
+        tokens = []
+    for n in range(min_n, min(max_n + 1, len(original) + 1)):
+        for i in range(len(original) - n + 1):
+            tokens.append(" ".join(original[i:i + n]))
+    return tokens
+
+
+class HashingFeaturizer:
+    """
+    어휘 없는 특징 변환 - 토큰(n-gram) 의 crc32 % n_features 열에 tf 를 모은다
+    (sublinear_tf 면 1 + log(tf), 행 L2 정규화). 학습(crawler/train.py)과 추론이 같은 코드를 쓴다.
+    어휘/idf 를 모으지 않으므로 데이터를 한 번 흘려 보내며 학습할 수 있다.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, ngram_range: Sequence[int] = (1, 2),
+                 token_pattern: str = DEFAULT_TOKEN_PATTERN, lowercase: bool = True,
+                 sublinear_tf: bool = True, norm: Optional[str] = "l2"):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self._token_re = re.compile(token_pattern)
+
+    def params(self) -> Dict:
+        """meta.json 의 vectorizer 항목 (HashingFeaturizer(**params) 로 복원)"""
+        return {"n_features": self.n_features, "ngram_range": list(self.ngram_range),
+                "token_pattern": self.token_pattern, "lowercase": self.lowercase,
+                "sublinear_tf": self.sublinear_tf, "norm": self.norm}
+
+    def features(self, text: str):
+        """(열 번호, 값) - 열 번호 오름차순"""
+        import numpy as np
+
+        tokens = _analyze(text, self._token_re, self.lowercase, None, self.ngram_range)
+        if not tokens:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.int64, count=len(tokens))
+        cols, counts = np.unique(hashes % self.n_features, return_counts=True)
+        values = counts.astype(np.float64)
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        if self.norm == "l2":
+            values = values / np.sqrt(np.dot(values, values))
+        elif self.norm == "l1":
+            values = values / values.sum()
+        return cols, values
+
+    def transform(self, texts: Sequence[str]):
+        """texts -> scipy CSR 행렬 (학습용)"""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            cols, values = self.features(text)
+            indices.append(cols)
+            data.append(values)
+            indptr.append(indptr[-1] + len(cols))
+        return csr_matrix(
+            (np.concatenate(data) if data else np.empty(0), np.concatenate(indices) if indices else np.empty(0, np.int64),
+             np.array(indptr)),
+            shape=(len(texts), self.n_features),
+        )
+
+
+def _softmax(scores):
+    import numpy as np
+
+    shifted = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _sample_texts(terms: Sequence[str], n: int = 64, seed: int = 0) -> List[str]:
+    """검증용 문서 (어휘 단어 조합 + 문장부호/대소문자/미등록어 섞기)"""
+    import random
+
+    rng = random.Random(seed)
+    pool = [t for t in terms if " " not in t] or list(terms)
+    texts = ["", "!!!", "Notice 안내 2024-03-01 (공지)"]
+    for _ in range(n):
+        words = [rng.choice(pool) for _ in range(rng.randint(1, 40))]
+        words += ["OOVtoken", "모집!", "AI/SW"][: rng.randint(0, 3)]
+        rng.shuffle(words)
+        texts.append(" ".join(w.upper() if rng.random() < 0.1 else w for w in words))
+    return texts
+
+
+def convert_pickle(pickle_path: str, out_dir: str, check_texts: Optional[Sequence[str]] = None) -> Dict:
+    """
+    model.pkl -> 아티팩트 디렉터리 변환 (sklearn 결과와 동일한지 검증 후 저장)
+
+    Returns:
+        meta
+    """
+    import pickle
+
+    import numpy as np
+
+    with open(pickle_path, "rb") as f:
+        model_data = pickle.load(f)
+    vectorizer, model = model_data["vectorizer"], model_data["model"]
+
+    params = vectorizer.get_params()
+    for key, expected in _SUPPORTED_VECTORIZER.items():
+        if params.get(key) != expected:
+            raise ValueError(f"지원하지 않는 벡터라이저 설정: {key}={params.get(key)!r}")
+    if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+        raise ValueError(f"지원하지 않는 모델: {type(model).__name__}")
+
+    vocabulary: Dict[str, int] = vectorizer.vocabulary_
+    terms = sorted(vocabulary)
+    stop_words = vectorizer.get_stop_words()
+    idf = np.asarray(getattr(vectorizer, "idf_", np.ones(len(vocabulary))), dtype=np.float64)
+    arrays = {
+        "terms": np.array(terms),
+        "columns": np.array([vocabulary[t] for t in terms], dtype=np.int32),
+        "idf": idf,
+        "coef": np.ascontiguousarray(np.asarray(model.coef_, dtype=np.float64).T),
+        "intercept": np.asarray(model.intercept_, dtype=np.float64),
+    }
+    meta = {
+        "format": FORMAT_VERSION,
+        "version": model_data.get("version", "ml-1.0"),
+        "classes": [c.item() if hasattr(c, "item") else c for c in model.classes_],
+        "vectorizer": {
+            "token_pattern": params["token_pattern"],
+            "lowercase": params["lowercase"],
+            "ngram_range": list(params["ngram_range"]),
+            "stop_words": sorted(stop_words) if stop_words else None,
+            "binary": params["binary"],
+            "sublinear_tf": params.get("sublinear_tf", False),
+            "use_idf": params.get("use_idf", False),
+            "norm": params.get("norm"),
+        },
+        "proba": None,
+        "source": os.path.basename(pickle_path),
+    }
+
+    with _staged_dir(out_dir) as staging:
+        digest = hashlib.sha256()
+        for name in ARRAY_FILES:
+            np.save(os.path.join(staging, f"{name}.npy"), arrays[name])
+            digest.update(arrays[name].tobytes())
+        digest.update(json.dumps(meta, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        meta["fingerprint"] = digest.hexdigest()[:16]
+
+        # 확률 계산 방식은 sklearn 결과와 맞는 것으로 결정하고, 특징/확률을 함께 검증
+        texts = list(check_texts) if check_texts else _sample_texts(terms)
+        expected_x = vectorizer.transform(texts).toarray()
+        expected = model.predict_proba(vectorizer.transform(texts))
+        binary = len(meta["classes"]) == 2
+        for mode in (("binary_ovr", "binary_softmax") if binary else ("softmax", "ovr")):
+            meta["proba"] = mode
+            _write_meta(staging, meta)
+            artifact = LinearTextModel(staging, mmap=False)
+            for row, text in enumerate(texts):
+                cols, values = artifact._features(text)
+                dense = np.zeros(expected_x.shape[1])
+                dense[cols] = values
+                if not np.allclose(dense, expected_x[row], rtol=1e-9, atol=1e-12):
+                    raise ValueError(f"특징 벡터 불일치: {text[:40]!r}")
+            if np.allclose(artifact.predict_proba(texts), expected, rtol=1e-9, atol=1e-12):
+                return meta
+        raise ValueError("predict_proba 결과를 재현하지 못했습니다 (지원하지 않는 모델 설정)")
+
+
+def save_hashed(out_dir: str, featurizer: HashingFeaturizer, model, version: str,
+                extra: Optional[Dict] = None, check_texts: Optional[Sequence[str]] = None) -> Dict:
+    """
+    해시 특징 선형 모델(SGDClassifier 등, coef_/intercept_/classes_) -> 아티팩트 디렉터리
+    (check_texts 로 sklearn predict_proba 와 같은 결과인지 검증 후 meta.json 기록)
+    """
+    import numpy as np
+
+    if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+        raise ValueError(f"지원하지 않는 모델: {type(model).__name__}")
+    arrays = {
+        "coef": np.ascontiguousarray(np.asarray(model.coef_, dtype=np.float64).T),
+        "intercept": np.asarray(model.intercept_, dtype=np.float64),
+    }
+    classes = [c.item() if hasattr(c, "item") else c for c in model.classes_]
+    meta = {
+        "format": FORMAT_VERSION,
+        "featurizer": "hashing",
+        "version": version,
+        "classes": classes,
+        "vectorizer": featurizer.params(),
+        # SGDClassifier(loss="log_loss") 의 predict_proba 는 OvR 시그모이드 후 행 정규화
+        "proba": "binary_ovr" if len(classes) == 2 else "ovr",
+        "source": type(model).__name__,
+        **(extra or {}),
+    }
+
+    with _staged_dir(out_dir) as staging:
+        digest = hashlib.sha256()
+        for name in HASHED_ARRAY_FILES:
+            np.save(os.path.join(staging, f"{name}.npy"), arrays[name])
+            digest.update(arrays[name].tobytes())
+        digest.update(json.dumps(meta, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        meta["fingerprint"] = digest.hexdigest()[:16]
+        _write_meta(staging, meta)
+
+        if check_texts:
+            texts = list(check_texts)
+            expected = model.predict_proba(featurizer.transform(texts))
+            if not np.allclose(LinearTextModel(staging, mmap=False).predict_proba(texts), expected,
+                               rtol=1e-9, atol=1e-12):
+                raise ValueError("predict_proba 결과를 재현하지 못했습니다")
+    return meta
+
+
+@contextmanager
+def _staged_dir(out_dir: str):
+    """
+    out_dir 옆 임시 디렉터리에 쓰고, 블록이 끝나면 rename 으로 out_dir 자리에 넣는다 (예외면 임시 디렉터리 삭제)
+
+    실행 중인 크롤러가 mmap 으로 연 *.npy 를 덮어쓰지 않도록 파일 단위로 쓰지 않는다 -
+    기존 out_dir 은 옆으로 옮긴 뒤 지우므로 열려 있던 매핑은 예전 파일을 계속 본다.
+    (옮기는 사이 out_dir 이 잠깐 없을 수 있으니 실행 중에 교체할 때는 train.activate 링크 사용)
+    """
+    out_dir = os.path.realpath(out_dir)     # 링크(crawler/model)면 가리키는 디렉터리를 교체
+    parent, name = os.path.split(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{name}.tmp-", dir=parent)
+    try:
+        yield staging
+        os.chmod(staging, 0o755)   # mkdtemp 는 0700
+        if os.path.lexists(out_dir):
+            old = tempfile.mkdtemp(prefix=f".{name}.old-", dir=parent)
+            os.replace(out_dir, old)           # 빈 디렉터리 자리로 rename
+            os.replace(staging, out_dir)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(staging, out_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _write_meta(out_dir: str, meta: Dict):
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> Tuple[str, Dict]:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="model.pkl 을 mmap 가능한 아티팩트 디렉터리로 변환")
+    parser.add_argument("pickle_path")
+    parser.add_argument("out_dir")
+    args = parser.parse_args(argv)
+    meta = convert_pickle(args.pickle_path, args.out_dir)
+    print(f"변환 완료: {args.out_dir} version={meta['version']} classes={len(meta['classes'])} "
+          f"proba={meta['proba']} fingerprint={meta['fingerprint']}")
+    return args.out_dir, meta
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+try:
+    from .db import get_conn, fetch_simhashes, fetch_notice_labels
+    from .metrics import counter, histogram
+except ImportError:
+    from db import get_conn, fetch_simhashes, fetch_notice_labels
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# 근사 중복 공지 탐지 (SimHash + LSH 밴딩)
+#  - 같은 공지가 여러 게시판(0704/0705/070808/리크루트)에 url 만 다르게 올라오고,
+#    줄바꿈/공백/머리말 같은 작은 차이 때문에 make_hash 로는 같은 글로 잡히지 않는다.
+#  - 본문 단어 2-gram 을 64비트로 해시해 비트별 다수결 -> SimHash 지문
+#    (비슷한 글은 해밍 거리가 작다)
+#  - 지문을 max_distance + 1 개 구간(band)으로 나눠 구간 값별 버킷에 넣어 두면,
+#    거리 max_distance 이하인 지문은 비둘기집 원리로 적어도 한 구간이 같으므로
+#    버킷 후보만 비교하면 된다 (전체 공지 수와 무관하게 후보 수에 비례)
+#  - 색인에는 대표(canonical) 공지만 넣는다. 중복 공지는 대표 공지 id 를 canonical_id 로
+#    기록하고 대표의 분류 결과를 그대로 써서 재분류/알림을 생략한다.
+# ---------------------------------------------------------
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "1") != "0"
+MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "4"))        # 같은 글로 볼 최대 해밍 거리 (64비트 중)
+MIN_TOKENS = int(os.getenv("NEAR_DUP_MIN_TOKENS", "30"))           # 이보다 짧은 본문은 지문 없음 ("첨부 참조" 등)
+REFRESH_INTERVAL = float(os.getenv("NEAR_DUP_REFRESH_INTERVAL", "30"))  # 다른 프로세스가 저장한 공지 반영 주기(초)
+LOAD_CHUNK = 10000
+BITS = 64
+
+NEAR_DUP_LOOKUP_SECONDS = histogram("crawler_near_dup_lookup_seconds", "근사 중복 색인 조회 시간(초)")
+NEAR_DUP_ITEMS = counter("crawler_near_dup_total", "근사 중복 판정 수 (outcome: duplicate/canonical/no_fingerprint)",
+                         ("outcome",))
+
+_WORD_RE = re.compile(r"\w+")
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+def simhash(text: str, min_tokens: int = MIN_TOKENS) -> Optional[int]:
+    """본문 -> 64비트 SimHash (단어 2-gram, 단어 수가 min_tokens 미만이면 None)"""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < max(min_tokens, 2):
+        return None
+    digests = b"".join(hashlib.blake2b(f"{a} {b}".encode(), digest_size=8).digest()
+                       for a, b in zip(words, words[1:]))
+    np = _numpy()
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    majority = bits.sum(axis=0) * 2 > len(words) - 1
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+class SimHashIndex:
+    """SimHash 지문 LSH 색인 - key(공지 id 등) -> 지문"""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width, extra = divmod(BITS, bands)
+        self._bands: List[Tuple[int, int]] = []       # (shift, mask) - 앞 구간이 1비트씩 더 넓다
+        shift = BITS
+        for i in range(bands):
+            w = width + (1 if i < extra else 0)
+            shift -= w
+            self._bands.append((shift, (1 << w) - 1))
+        self._tables: List[Dict[int, List[Hashable]]] = [{} for _ in self._bands]
+        self._hashes: Dict[Hashable, int] = {}
+        self.stats = {"lookups": 0, "candidates": 0}
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._hashes
+
+    def add(self, key: Hashable, h: int):
+        if key in self._hashes:
+            if self._hashes[key] == h:
+                return
+            self.remove(key)
+        self._hashes[key] = h
+        for (shift, mask), table in zip(self._bands, self._tables):
+            table.setdefault((h >> shift) & mask, []).append(key)
+
+    def remove(self, key: Hashable):
+        h = self._hashes.pop(key, None)
+        if h is None:
+            return
+        for (shift, mask), table in zip(self._bands, self._tables):
+            band = (h >> shift) & mask
+            keys = table.get(band)
+            if keys is not None:
+                try:
+                    keys.remove(key)
+                except ValueError:
+                    pass
+                if not keys:
+                    del table[band]
+
+    def find(self, h: int, exclude: Optional[Hashable] = None) -> Optional[Tuple[Hashable, int]]:
+        """거리 max_distance 이하인 가장 가까운 (key, 거리) - 같은 거리면 먼저 들어간 key"""
+        best: Optional[Tuple[Hashable, int]] = None
+        seen = set()
+        for (shift, mask), table in zip(self._bands, self._tables):
+            for key in table.get((h >> shift) & mask, ()):
+                if key in seen or key == exclude:
+                    continue
+                seen.add(key)
+                distance = (self._hashes[key] ^ h).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        self.stats["lookups"] += 1
+        self.stats["candidates"] += len(seen)
+        return best
+
+
+class NearDupDetector:
+    """
+    파이프라인용 근사 중복 판정
+    - fingerprint(job): 파싱 단계에서 job["simhash"] 계산
+    - classify(jobs, classify_fn): 분류 단계 - 대표 공지가 있으면 그 분류를 쓰고 나머지만 classify_fn 으로 분류
+    - writer_args(job): 저장 단계 - NoticeWriter.add 의 simhash / canonical_id / canonical_url
+    - saved(job, notice_id): 커밋 후 - 대표 공지를 색인에 반영
+    - discard(job): 처리 중 실패한 항목 - 커밋 전 대표 후보를 색인에서 뺀다
+    아직 커밋 전인 대표 공지(같은 실행에서 먼저 처리된 사본)는 url 로 색인에 두고,
+    저장 시 같은 배치면 NoticeWriter 가 url 로 id 를 찾아 연결한다.
+    """
+
+    def __init__(self, conn_factory: Callable = get_conn, max_distance: int = MAX_DISTANCE,
+                 min_tokens: int = MIN_TOKENS, refresh_interval: float = REFRESH_INTERVAL):
+        self.conn_factory = conn_factory
+        self.min_tokens = min_tokens
+        self.refresh_interval = refresh_interval
+        self.index = SimHashIndex(max_distance)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}               # 이번 실행의 대표 url -> {"label", "notice_id"}
+        self._labels: Dict[int, tuple] = {}               # 이번 실행에서 저장한 대표 공지의 분류 결과
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self.stats = {"loaded": 0, "duplicates": 0, "canonical": 0, "no_fingerprint": 0, "errors": 0}
+
+    # ---- 색인 적재 ----
+    def load(self) -> int:
+        """저장된 대표 공지 지문을 id 순서로 읽는다 (처음에는 전체, 이후에는 마지막 id 이후만)"""
+        loaded = 0
+        with self.conn_factory() as conn, conn.cursor() as cur:
+            while True:
+                rows = fetch_simhashes(cur, self._last_id, LOAD_CHUNK)
+                with self._lock:
+                    for row in rows:
+                        self.index.add(row["id"], int(row["simhash"]))
+                if rows:
+                    self._last_id = rows[-1]["id"]
+                    loaded += len(rows)
+                if len(rows) < LOAD_CHUNK:
+                    break
+        self._refreshed_at = time.monotonic()
+        self.stats["loaded"] += loaded
+        return loaded
+
+    def start(self):
+        """실행 시작 시 전체 적재 (실패해도 크롤링은 계속 - 이번 실행의 공지끼리만 비교)"""
+        try:
+            print(f"[NEAR_DUP] 대표 공지 지문 {self.load()}개 적재")
+        except Exception as e:
+            self.stats["errors"] += 1
+            self._refreshed_at = time.monotonic()
+            print(f"[WARN] 근사 중복 색인 적재 실패 err={e}")
+
+    def _refresh_if_due(self):
+        if self.refresh_interval and time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            try:
+                self.load()
+            except Exception as e:
+                # 다른 프로세스의 공지를 못 봐도 이번 배치는 계속 (중복이 대표로 남을 뿐)
+                self.stats["errors"] += 1
+                self._refreshed_at = time.monotonic()
+                print(f"[WARN] 근사 중복 색인 갱신 실패 err={e}")
+
+    # ---- 파이프라인 단계 ----
+    def fingerprint(self, job: Dict):
+        job["simhash"] = simhash(job["content"], self.min_tokens)
+
+    def classify(self, jobs: List[Dict], classify_fn: Callable[[List[Tuple[str, str]]], List[tuple]]) -> List[tuple]:
+        """jobs 의 분류 결과 (중복이면 대표 공지 결과, 대표 결과를 모르면 classify_fn 으로 분류)"""
+        self._refresh_if_due()
+        canonical_ids = []
+        for job in jobs:
+            job["canonical"] = None
+            h = job.get("simhash")
+            if h is None:
+                self.stats["no_fingerprint"] += 1
+                NEAR_DUP_ITEMS.inc(outcome="no_fingerprint")
+                continue
+            own = job["prev"]["id"] if job.get("prev") else None
+            started = time.perf_counter()
+            with self._lock:
+                found = self.index.find(h, exclude=own)
+                if found is None:
+                    self._pending[job["url"]] = {"label": None, "notice_id": None}
+                    self.index.add(job["url"], h)
+            NEAR_DUP_LOOKUP_SECONDS.observe(time.perf_counter() - started)
+            if found is None:
+                self.stats["canonical"] += 1
+                NEAR_DUP_ITEMS.inc(outcome="canonical")
+                continue
+            job["canonical"] = found[0]
+            self.stats["duplicates"] += 1
+            NEAR_DUP_ITEMS.inc(outcome="duplicate")
+            if isinstance(found[0], int) and found[0] not in self._labels:
+                canonical_ids.append(found[0])
+
+        if canonical_ids:
+            try:
+                with self.conn_factory() as conn, conn.cursor() as cur:
+                    self._labels.update(fetch_notice_labels(cur, canonical_ids))
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[WARN] 대표 공지 분류 조회 실패 - 직접 분류 err={e}")
+
+        labels: List[Optional[tuple]] = [self._canonical_label(job) for job in jobs]
+        # 같은 배치 안의 대표 공지를 가리키는 중복은 대표가 분류된 뒤에 채운다
+        batch_canonical = {job["url"] for job in jobs if job["canonical"] is None}
+        todo = [i for i, label in enumerate(labels) if label is None and jobs[i]["canonical"] not in batch_canonical]
+        if todo:
+            for i, label in zip(todo, classify_fn([(jobs[i]["title"], jobs[i]["content"]) for i in todo])):
+                labels[i] = label
+                pending = self._pending.get(jobs[i]["url"]) if jobs[i]["canonical"] is None else None
+                if pending is not None:
+                    pending["label"] = label
+        for i, job in enumerate(jobs):
+            if labels[i] is None:
+                labels[i] = self._canonical_label(job)
+            job["label"] = labels[i]
+        return labels
+
+    def _canonical_label(self, job: Dict) -> Optional[tuple]:
+        canonical = job.get("canonical")
+        if canonical is None:
+            return None
+        if isinstance(canonical, int):
+            return self._labels.get(canonical)
+        pending = self._pending.get(canonical)
+        return pending["label"] if pending is not None else None
+
+    def writer_args(self, job: Dict) -> Dict:
+        """NoticeWriter.add 인자 - 대표가 커밋 전이면 url 로 넘겨 같은 배치에서 연결"""
+        canonical = job.get("canonical")
+        args = {"simhash": job.get("simhash"), "canonical_id": None, "canonical_url": None}
+        if isinstance(canonical, int):
+            args["canonical_id"] = canonical
+        elif canonical is not None:
+            with self._lock:
+                pending = self._pending.get(canonical)
+            if pending is not None and pending["notice_id"]:
+                args["canonical_id"] = pending["notice_id"]
+            else:
+                args["canonical_url"] = canonical
+        return args
+
+    def saved(self, job: Dict, notice_id: int):
+        """커밋 후 - 대표 공지면 url 대신 id 로 색인, 중복이 된 공지는 색인에서 뺀다"""
+        with self._lock:
+            pending = self._pending.get(job["url"]) if job.get("canonical") is None else None
+            if pending is not None:
+                # url -> id 는 실행 끝까지 둔다 (커밋 전에 분류된 중복이 저장될 때 찾는다)
+                pending["notice_id"] = notice_id
+                self.index.remove(job["url"])
+                self.index.add(notice_id, job["simhash"])
+                self._labels[notice_id] = job["label"]
+            else:
+                self.index.remove(notice_id)
+
+    def discard(self, job: Dict):
+        """저장하지 못한 대표 후보는 색인에서 뺀다 (다음 사본이 대표가 되도록)"""
+        with self._lock:
+            pending = self._pending.get(job["url"]) if job.get("canonical") is None else None
+            if pending is not None and pending["notice_id"] is None:
+                del self._pending[job["url"]]
+                self.index.remove(job["url"])
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            lookups = self.index.stats["lookups"]
+            return dict(self.stats, indexed=len(self.index),
+                        avg_candidates=round(self.index.stats["candidates"] / lookups, 2) if lookups else 0.0)
@@ -0,0 +1,330 @@
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .db import (get_conn, fetch_user_interests, fetch_user_keywords, fetch_pref_change_id,
+                     fetch_pref_changes, insert_notifications)
+    from .keyword_matcher import KeywordMatcher
+    from .stages import Stage
+    from .metrics import counter, histogram
+except ImportError:
+    from db import (get_conn, fetch_user_interests, fetch_user_keywords, fetch_pref_change_id,
+                    fetch_pref_changes, insert_notifications)
+    from keyword_matcher import KeywordMatcher
+    from stages import Stage
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# 알림 fan-out
+#  - 새로 저장된 공지마다 알림 받을 사용자를 찾아 notification 에 다중 행 INSERT
+#  - 사용자 설정은 메모리 색인으로 들고 있는다
+#      관심 카테고리  category_id -> {user_id: weight}
+#      CONTAINS 키워드 모든 사용자의 키워드를 하나의 다중 패턴 오토마톤(KeywordMatcher)으로 컴파일
+#                     -> 공지 본문을 한 번 훑어 등장한 키워드 -> 사용자
+#      EXACT 키워드    단어 단위 일치 - 공지의 단어 집합과 사전 조회
+#    (사용자 수/키워드 수와 무관하게 공지 1건당 본문 1회 스캔)
+#  - 설정 변경은 user_pref_change(트리거 기록)를 주기적으로 읽어 바뀐 사용자만 다시 반영
+#    새 키워드는 오토마톤을 다시 만들지 않고 따로 검사하다가 일정 수 이상 쌓이면 재컴파일
+#  - 전체 다시 읽기는 full_reload_interval 마다 (트리거 밖에서 바뀐 설정 대비)
+# ---------------------------------------------------------
+NOTIFY_ENABLED = os.getenv("NOTIFY_ENABLED", "1") != "0"
+REFRESH_INTERVAL = float(os.getenv("NOTIFY_REFRESH_INTERVAL", "30"))           # 변경분 확인 주기(초)
+FULL_RELOAD_INTERVAL = float(os.getenv("NOTIFY_FULL_RELOAD_INTERVAL", "3600"))  # 전체 다시 읽기 주기(초)
+REFRESH_LIMIT = 5000          # 한 번에 읽는 변경 기록 수 (넘으면 전체 다시 읽기)
+REBUILD_PENDING = 256         # 오토마톤 밖에서 검사하는 새 키워드가 이만큼 쌓이면 재컴파일
+
+NOTIFY_MATCH_SECONDS = histogram("crawler_notify_match_seconds", "공지 1건 알림 대상 매칭 시간(초)")
+NOTIFY_TARGETS = counter("crawler_notify_targets_total", "알림 대상 수 (reason: category/keyword)", ("reason",))
+NOTIFY_ROWS = counter("crawler_notifications_total", "새로 저장한 notification 행 수")
+NOTIFY_REFRESHES = counter("crawler_notify_refresh_total", "관심사 색인 갱신 수 (kind: full/incremental/compile)",
+                           ("kind",))
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _discard(index: Dict[str, Set[int]], key: str, user_id: int):
+    users = index.get(key)
+    if users is not None:
+        users.discard(user_id)
+        if not users:
+            del index[key]
+
+
+class InterestIndex:
+    """사용자 관심 카테고리/키워드 메모리 색인 (단일 스레드에서 갱신/조회)"""
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: KeywordMatcher 백엔드 ("c" | "python" | "scan" | None 자동)
+        """
+        self.backend = backend
+        self._categories: Dict[int, Dict[int, int]] = {}
+        self._contains: Dict[str, Set[int]] = {}
+        self._exact: Dict[str, Set[int]] = {}            # 한 단어 키워드
+        self._exact_phrases: Dict[str, Set[int]] = {}    # 여러 단어 키워드 ("a b")
+        self._users: Dict[int, Tuple[tuple, tuple, tuple]] = {}
+        self._matcher: Optional[KeywordMatcher] = None
+        self._compiled: Set[str] = set()
+        self._pending: Dict[str, None] = {}              # 오토마톤에 없는 CONTAINS 키워드 (순서 유지 집합)
+        self.compiles = 0
+
+    # ---- 갱신 ----
+    def load_rows(self, interests: Iterable[Dict], keywords: Iterable[Dict]):
+        """fetch_user_interests / fetch_user_keywords 결과로 전체 구성"""
+        grouped = self._group(interests, keywords)
+        for user_id, (cats, kws) in grouped.items():
+            self.set_user(user_id, cats, kws)
+        self.compile()
+
+    def update_users(self, user_ids: Iterable[int], interests: Iterable[Dict], keywords: Iterable[Dict]):
+        """user_ids 의 설정을 새 값으로 교체 (행이 없는 사용자는 제거)"""
+        grouped = self._group(interests, keywords)
+        for user_id in user_ids:
+            cats, kws = grouped.get(user_id, ((), ()))
+            self.set_user(user_id, cats, kws)
+        if self._needs_compile():
+            self.compile()
+
+    @staticmethod
+    def _group(interests: Iterable[Dict], keywords: Iterable[Dict]) -> Dict[int, Tuple[list, list]]:
+        grouped: Dict[int, Tuple[list, list]] = {}
+        for row in interests:
+            grouped.setdefault(row["user_id"], ([], []))[0].append((row["category_id"], row["weight"]))
+        for row in keywords:
+            grouped.setdefault(row["user_id"], ([], []))[1].append((row["keyword"], row["match_type"]))
+        return grouped
+
+    def set_user(self, user_id: int, interests: Iterable[Tuple[int, int]], keywords: Iterable[Tuple[str, str]]):
+        """
+        - interests: [(category_id, weight)] - weight 가 0 이하면 알림 받지 않음
+        - keywords: [(keyword, "CONTAINS" | "EXACT")]
+        """
+        self.remove_user(user_id)
+        cats = tuple((c, w) for c, w in interests if w is None or w > 0)
+        contains: List[str] = []
+        exact: List[str] = []
+        for keyword, match_type in keywords:
+            if match_type == "EXACT":
+                phrase = " ".join(_words(keyword or ""))
+                if phrase:
+                    target = self._exact_phrases if " " in phrase else self._exact
+                    target.setdefault(phrase, set()).add(user_id)
+                    exact.append(phrase)
+                continue
+            kw = (keyword or "").strip().lower()
+            if not kw:
+                continue
+            users = self._contains.get(kw)
+            if users is None:
+                users = self._contains[kw] = set()
+                if kw not in self._compiled:
+                    self._pending[kw] = None
+            users.add(user_id)
+            contains.append(kw)
+        for category_id, weight in cats:
+            self._categories.setdefault(category_id, {})[user_id] = weight
+        if cats or contains or exact:
+            self._users[user_id] = (cats, tuple(contains), tuple(exact))
+
+    def remove_user(self, user_id: int):
+        prev = self._users.pop(user_id, None)
+        if prev is None:
+            return
+        cats, contains, exact = prev
+        for category_id, _ in cats:
+            users = self._categories.get(category_id)
+            if users is not None:
+                users.pop(user_id, None)
+                if not users:
+                    del self._categories[category_id]
+        # 사용자가 없어진 키워드도 오토마톤에는 다음 재컴파일까지 남는다 (매칭돼도 대상 없음)
+        for kw in contains:
+            _discard(self._contains, kw, user_id)
+            if kw not in self._contains:
+                self._pending.pop(kw, None)
+        for phrase in exact:
+            _discard(self._exact_phrases if " " in phrase else self._exact, phrase, user_id)
+
+    def _needs_compile(self) -> bool:
+        stale = len(self._compiled) - (len(self._contains) - len(self._pending))
+        return (self._matcher is None or len(self._pending) >= REBUILD_PENDING
+                or stale > max(REBUILD_PENDING, len(self._compiled) // 4))
+
+    def compile(self):
+        """현재 CONTAINS 키워드 전체로 오토마톤 다시 만들기"""
+        self._matcher = KeywordMatcher(self._contains, backend=self.backend)
+        self._compiled = set(self._matcher.patterns)
+        self._pending.clear()
+        self.compiles += 1
+        NOTIFY_REFRESHES.inc(kind="compile")
+
+    # ---- 조회 ----
+    def match(self, title: str, content: str, category_id: Optional[int] = None) -> Dict[int, str]:
+        """알림 대상 {user_id: reason} - 관심 카테고리가 우선, 그 밖에는 keyword"""
+        targets: Dict[int, str] = dict.fromkeys(self._categories.get(category_id, ()), "category")
+        text = f"{title or ''}\n{content or ''}".lower()
+
+        found = self._matcher.find_keywords(text) if self._matcher is not None else set()
+        found.update(kw for kw in self._pending if kw in text)
+        for kw in found:
+            for user_id in self._contains.get(kw, ()):
+                targets.setdefault(user_id, "keyword")
+
+        if self._exact or self._exact_phrases:
+            words = _WORD_RE.findall(text)
+            present = set(words)
+            # 공지 단어 집합과 EXACT 키워드 사전 중 작은 쪽을 돌며 조회
+            small, large = (present, self._exact) if len(present) <= len(self._exact) else (list(self._exact), present)
+            for word in small:
+                if word in large:
+                    for user_id in self._exact[word]:
+                        targets.setdefault(user_id, "keyword")
+            if self._exact_phrases:
+                joined = f" {' '.join(words)} "
+                for phrase, users in self._exact_phrases.items():
+                    if f" {phrase} " in joined:
+                        for user_id in users:
+                            targets.setdefault(user_id, "keyword")
+        return targets
+
+    def snapshot(self) -> Dict:
+        return {
+            "users": len(self._users),
+            "categories": len(self._categories),
+            "contains_keywords": len(self._contains),
+            "exact_keywords": len(self._exact) + len(self._exact_phrases),
+            "pending_keywords": len(self._pending),
+            "compiles": self.compiles,
+            "backend": self._matcher.backend if self._matcher is not None else None,
+        }
+
+
+class NotificationFanout:
+    def __init__(self, conn_factory: Callable = get_conn, refresh_interval: float = REFRESH_INTERVAL,
+                 full_reload_interval: float = FULL_RELOAD_INTERVAL, batch_size: int = 64,
+                 queue_size: int = 256, backend: Optional[str] = None):
+        """
+        파이프라인 저장 단계 뒤에 붙는 알림 단계 (전용 워커 스레드 1개)
+
+        Args:
+            conn_factory: autocommit 인자를 받는 연결 생성 함수 (연결 1개를 계속 사용)
+            refresh_interval: 설정 변경분 확인 주기(초)
+            full_reload_interval: 설정 전체 다시 읽기 주기(초)
+            batch_size: 한 번에 모아 매칭/저장하는 최대 공지 수
+            backend: KeywordMatcher 백엔드 (None 이면 자동)
+        """
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self.backend = backend
+        self.index = InterestIndex(backend)
+        self._conn_factory = conn_factory
+        self._conn = None
+        self._last_change = 0
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self.stage = Stage("notify", self._handle, workers=1, queue_size=queue_size,
+                           batch_size=batch_size, batch_wait=0.2, on_error=self._on_error)
+        self.stats = {"notices": 0, "targets": 0, "notifications": 0, "refreshes": 0, "errors": 0}
+
+    def start(self):
+        self.stage.start()
+
+    def submit(self, notice_id: int, title: str, content: str, category_id: Optional[int]):
+        """커밋된 새 공지 하나 (큐가 가득 차면 대기)"""
+        self.stage.put((notice_id, title, content, category_id))
+
+    # ---- 색인 ----
+    def load(self, cur):
+        """설정 전체 다시 읽기 (읽는 동안 바뀐 사용자는 다음 refresh 에서 다시 반영)"""
+        change_id = fetch_pref_change_id(cur)
+        index = InterestIndex(self.backend)
+        index.load_rows(fetch_user_interests(cur), fetch_user_keywords(cur))
+        self.index, self._last_change = index, change_id
+        self._loaded_at = self._refreshed_at = time.monotonic()
+        NOTIFY_REFRESHES.inc(kind="full")
+        snap = index.snapshot()
+        print(f"[NOTIFY] index users={snap['users']} keywords={snap['contains_keywords'] + snap['exact_keywords']} "
+              f"backend={snap['backend']}")
+
+    def refresh(self, cur) -> int:
+        """user_pref_change 에 기록된 사용자만 다시 읽어 반영 -> 반영한 사용자 수"""
+        self._refreshed_at = time.monotonic()
+        changes = fetch_pref_changes(cur, self._last_change, REFRESH_LIMIT)
+        if not changes:
+            return 0
+        if len(changes) >= REFRESH_LIMIT:
+            self.load(cur)
+            return len(changes)
+        user_ids = sorted({row["user_id"] for row in changes})
+        self.index.update_users(user_ids, fetch_user_interests(cur, user_ids), fetch_user_keywords(cur, user_ids))
+        self._last_change = changes[-1]["id"]
+        self.stats["refreshes"] += 1
+        NOTIFY_REFRESHES.inc(kind="incremental")
+        return len(user_ids)
+
+    def _refresh_if_due(self, cur):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= self.full_reload_interval:
+            self.load(cur)
+        elif now - self._refreshed_at >= self.refresh_interval:
+            self.refresh(cur)
+
+    # ---- 처리 ----
+    def _handle(self, items: List[tuple], emit):
+        self._execute(self._refresh_if_due)
+        rows = []
+        for notice_id, title, content, category_id in items:
+            started = time.perf_counter()
+            targets = self.index.match(title, content, category_id)
+            NOTIFY_MATCH_SECONDS.observe(time.perf_counter() - started)
+            for user_id, reason in targets.items():
+                rows.append((user_id, notice_id))
+                NOTIFY_TARGETS.inc(reason=reason)
+        inserted = self._execute(lambda cur: insert_notifications(cur, rows)) if rows else 0
+        NOTIFY_ROWS.inc(inserted)
+        self.stats["notices"] += len(items)
+        self.stats["targets"] += len(rows)
+        self.stats["notifications"] += inserted
+
+    def _on_error(self, work, e: Exception):
+        self.stats["errors"] += 1
+        ids = [item[0] for item in work] if work else []
+        print(f"[WARN] 알림 fan-out 실패 notices={ids[:5]}{'...' if len(ids) > 5 else ''} err={e}")
+
+    # ---- 연결 ----
+    def _execute(self, fn):
+        """fn(cur) 실행 (실패하면 재연결 후 1회 재시도)"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = self._conn_factory(autocommit=True)
+                    with self._conn.cursor() as cur:
+                        return fn(cur)
+                except Exception:
+                    self._reset()
+                    if attempt:
+                        raise
+
+    def _reset(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def close(self):
+        """남은 공지를 모두 처리하고 종료"""
+        self.stage.finish()
+        with self._lock:
+            self._reset()
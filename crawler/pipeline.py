@@ -1,18 +1,45 @@
 # pipeline.py
+import json
+import multiprocessing
+import os
+import signal
+import threading
 import time
-import random
-import hashlib
-from typing import Optional, Dict, Iterable, Tuple, List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Optional, Dict, Iterable, Tuple, List
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
 try:
-    from .db import get_conn, upsert_notice, insert_notice_category
-    from .text_classifier import classify, configure_classifier
+    from .db import get_conn, fetch_known_hashes, NoticeWriter, start_crawl_job, finish_crawl_job
+    from .text_classifier import classify_batch, configure_classifier, get_classifier
+    from .hashing import make_hash
+    from .throttle import get_throttle, configure_throttle, parse_retry_after, throttle_snapshot, CircuitOpenError
+    from .http_client import get_http_client, configure_http_client
+    from .http_cache import get_response_cache, cache_bypassed, configure_response_cache
+    from .extract import class_strainer, parse, text_with_breaks, find_date, iter_links
+    from .stages import Stage, StagedPipeline
+    from .metrics import REGISTRY, counter, histogram, serve as serve_metrics
+    from .checkpoint import CrawlCheckpoint
+    from .notify import NotificationFanout, NOTIFY_ENABLED
+    from .near_dup import NearDupDetector, NEAR_DUP_ENABLED
+    from .classify_service import ClassifyClient, SERVICE_URL as CLASSIFY_SERVICE_URL
 except ImportError:
-    from db import get_conn, upsert_notice, insert_notice_category
-    from text_classifier import classify, configure_classifier
+    from db import get_conn, fetch_known_hashes, NoticeWriter, start_crawl_job, finish_crawl_job
+    from text_classifier import classify_batch, configure_classifier, get_classifier
+    from hashing import make_hash
+    from throttle import get_throttle, configure_throttle, parse_retry_after, throttle_snapshot, CircuitOpenError
+    from http_client import get_http_client, configure_http_client
+    from http_cache import get_response_cache, cache_bypassed, configure_response_cache
+    from extract import class_strainer, parse, text_with_breaks, find_date, iter_links
+    from stages import Stage, StagedPipeline
+    from metrics import REGISTRY, counter, histogram, serve as serve_metrics
+    from checkpoint import CrawlCheckpoint
+    from notify import NotificationFanout, NOTIFY_ENABLED
+    from near_dup import NearDupDetector, NEAR_DUP_ENABLED
+    from classify_service import ClassifyClient, SERVICE_URL as CLASSIFY_SERVICE_URL
 
 # ---------------------------------------------------------
 # 소스 정의
@@ -20,6 +47,9 @@ except ImportError:
 #  - board: code, menu_dvs_cd 필요
 #  - recruit: menu_dvs_cd 필요
 #  - source_id는 DB seed와 일치해야 함
+#  - throttle (선택): 이 소스 요청에만 쓸 스로틀/재시도 설정
+#      {"rps": 1.0, "max_inflight": 2, "max_retry": 3, "cooldown": 60, ...}
+#    (throttle.DEFAULT_POLICY 항목, 같은 설정의 소스끼리 예산/차단기를 공유)
 # ---------------------------------------------------------
 SOURCES: List[Dict] = [
     # _prog/_board/
@@ -31,48 +61,133 @@ SOURCES: List[Dict] = [
     {"source_id": 5, "name": "리크루트-07080401", "type": "recruit", "menu_dvs_cd": "07080401"},
 ]
 
+# 사이트 주소 (벤치마크/테스트에서는 로컬 대역 서버 주소로 교체)
+CNU_BASE_URL = os.getenv("CNU_BASE_URL", "https://plus.cnu.ac.kr").rstrip("/")
+
 # ---------------------------------------------------------
 # 공통 유틸
 # ---------------------------------------------------------
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (CNU-InfoMate/0.2; +https://plus.cnu.ac.kr)"
 }
-RETRY_STATUS = {500, 502, 503, 504}
+# 서버 과부하/일시 오류 - 재시도하고 스로틀 간격을 넓힌다
+RETRY_STATUS = {429, 500, 502, 503, 504}
 
-def delay():
-    time.sleep(random.uniform(0.8, 1.8))
+HTTP_SECONDS = histogram("crawler_http_request_seconds", "HTTP 요청 1회 시간(초, 스로틀 대기 제외)")
+HTTP_REQUESTS = counter("crawler_http_requests_total", "HTTP 요청 수 (status: 응답 코드 또는 error)", ("status",))
+HTTP_RETRIES = counter("crawler_http_retries_total", "HTTP 재시도 수")
+HTTP_FAILURES = counter("crawler_http_failures_total", "재시도 후에도 실패한 요청 수")
+HTTP_BACKOFF_SECONDS = counter("crawler_http_backoff_seconds_total", "재시도 전 대기 시간 합계(초)")
+ITEMS = counter("crawler_items_total", "공지 처리 결과 수", ("outcome",))
 
-def req_get(url: str, params: Optional[Dict] = None, timeout: int = 15, max_retry: int = 2) -> Optional[requests.Response]:
-    """5xx/일부 네트워크 에러 재시도"""
+def req_get(url: str, params: Optional[Dict] = None, timeout=None, max_retry: Optional[int] = None,
+            headers: Optional[Dict] = None, throttle: Optional[Dict] = None) -> Optional[requests.Response]:
+    """
+    429/5xx/네트워크 에러 재시도 (호스트 스로틀 예산 안에서 공유 커넥션 풀로 요청)
+    - 결과를 스로틀에 알려 요청 간격을 조절하고, 재시도 전에는 Retry-After 또는
+      지수 백오프(+jitter) 만큼 대기 (슬롯은 잡지 않음)
+    - 호스트 차단기가 열려 있으면 요청 없이 바로 None
+    - 그 밖의 4xx 는 재시도하지 않음
+    timeout 미지정 시 클라이언트의 (connect, read) 타임아웃 사용
+    max_retry 미지정 시 스로틀 설정(max_retry) 사용, throttle 은 소스별 스로틀 설정
+    """
+    host_throttle = get_throttle(url, throttle)
+    client = get_http_client()
+    req_headers = {**DEFAULT_HEADERS, **(headers or {})}
+    if max_retry is None:
+        max_retry = host_throttle.max_retry
     for attempt in range(max_retry + 1):
+        retry_after = None
         try:
-            res = requests.get(url, params=params, headers=DEFAULT_HEADERS, timeout=timeout)
-            if res.status_code in RETRY_STATUS and attempt < max_retry:
-                delay()
-                continue
+            with host_throttle.slot():
+                started = time.perf_counter()
+                try:
+                    res = client.get(url, params=params, headers=req_headers, timeout=timeout)
+                except Exception:
+                    HTTP_REQUESTS.inc(status="error")
+                    host_throttle.record(None, ok=False)
+                    raise
+                finally:
+                    HTTP_SECONDS.observe(time.perf_counter() - started)
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS.inc(status=res.status_code)
+            if res.status_code in RETRY_STATUS:
+                retry_after = parse_retry_after(res.headers.get("Retry-After"))
+                host_throttle.record(elapsed, ok=False, retry_after=retry_after)
+                # 오래 기다리라는 응답이면 재시도하지 않음 (스로틀이 그동안 차단기를 열어 둠)
+                if attempt < max_retry and (retry_after is None
+                                            or retry_after <= host_throttle.policy["max_retry_after"]):
+                    HTTP_RETRIES.inc()
+                    _backoff(host_throttle, attempt, retry_after)
+                    continue
+            else:
+                host_throttle.record(elapsed, ok=True)
             res.raise_for_status()
             res.encoding = 'utf-8'
             return res
+        except CircuitOpenError as e:
+            HTTP_REQUESTS.inc(status="circuit_open")
+            HTTP_FAILURES.inc()
+            print(f"[SKIP] GET url={url} params={params} {e}")
+            return None
+        except requests.HTTPError as e:
+            # 재시도 대상이 아닌 상태 코드 (404 등) 또는 재시도 소진
+            HTTP_FAILURES.inc()
+            print(f"[ERR] GET fail url={url} params={params} err={e}")
+            return None
         except Exception as e:
             if attempt >= max_retry:
+                HTTP_FAILURES.inc()
                 print(f"[ERR] GET fail url={url} params={params} err={e}")
                 return None
-            delay()
+            HTTP_RETRIES.inc()
+            _backoff(host_throttle, attempt, retry_after)
     return None
 
-def make_hash(title: str, content: Optional[str]) -> str:
-    h = hashlib.sha256()
-    h.update((title + "|" + (content or "")).encode("utf-8"))
-    return h.hexdigest()
+def _backoff(host_throttle, attempt: int, retry_after: Optional[float]):
+    wait = host_throttle.backoff(attempt, retry_after)
+    HTTP_BACKOFF_SECONDS.inc(wait)
+    time.sleep(wait)
+
+def fetch_cached(url: str, throttle: Optional[Dict] = None) -> Optional[str]:
+    """
+    상세 페이지 본문 조회 (로컬 응답 캐시 + 조건부 GET)
+    - TTL 안의 캐시는 요청 없이 사용
+    - 그 외에는 If-None-Match / If-Modified-Since 로 재검증, 304 면 캐시 본문 사용
+    """
+    cache = get_response_cache()
+    if cache is None:
+        res = req_get(url, throttle=throttle)
+        return res.text if res else None
+
+    entry = None if cache_bypassed() else cache.get(url)
+    if entry and entry.is_fresh(cache.ttl):
+        cache.record("fresh")
+        return entry.body
+
+    res = req_get(url, headers=entry.conditional_headers() if entry else None, throttle=throttle)
+    if not res:
+        return None
+    if res.status_code == 304 and entry:
+        cache.record("revalidated")
+        cache.touch(url)
+        return entry.body
+
+    cache.record("miss")
+    cache.put(url, res.text, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+    return res.text
 
 # ---------------------------------------------------------
 # 어댑터: _prog/_board
 # ---------------------------------------------------------
 class BoardAdapter:
-    BASE = "https://plus.cnu.ac.kr/_prog/_board/"
+    BASE = f"{CNU_BASE_URL}/_prog/_board/"
+    # 파싱 대상 영역 (목록: 제목 셀, 상세: 본문/작성 정보)
+    LIST_STRAINER = class_strainer("title")
+    DETAIL_STRAINER = class_strainer("board_viewDetail", "board_view", "view_info")
 
     @staticmethod
-    def fetch_page(code: str, menu_dvs_cd: str, page: int) -> Optional[str]:
+    def fetch_page(code: str, menu_dvs_cd: str, page: int, throttle: Optional[Dict] = None) -> Optional[str]:
         params = {
             "code": code,
             "site_dvs_cd": "kr",
@@ -83,173 +198,639 @@ class BoardAdapter:
             "ntt_tag": "",
             "GotoPage": page,
         }
-        res = req_get(BoardAdapter.BASE, params=params)
+        res = req_get(BoardAdapter.BASE, params=params, throttle=throttle)
         return res.text if res else None
 
     @staticmethod
     def parse_list(html: str) -> Iterable[Tuple[str, str]]:
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.select("td.title a"):
-            href = a.get("href")
-            if not href:
-                continue
-            title = a.get_text(strip=True)
-            url = urljoin(BoardAdapter.BASE, href)
-            yield title, url
+        soup = parse(html, BoardAdapter.LIST_STRAINER)
+        for title, href in iter_links(soup, "td.title a"):
+            yield title, urljoin(BoardAdapter.BASE, href)
 
     @staticmethod
-    def fetch_detail(url: str) -> Tuple[str, Optional[str]]:
-        res = req_get(url)
-        if not res:
-            return "", None
-        soup = BeautifulSoup(res.text, "html.parser")
-        # 본문 - 형식 보존 (줄바꿈, 띄어쓰기 유지)
+    def parse_detail(html: str) -> Tuple[str, Optional[str]]:
+        soup = parse(html, BoardAdapter.DETAIL_STRAINER)
+        # 본문 - 형식 보존 (<br>, <p> 를 줄바꿈으로, 띄어쓰기 유지)
         detail_div = soup.find("div", class_="board_viewDetail")
-        if detail_div:
-            # <br> 태그를 줄바꿈으로 변환
-            for br in detail_div.find_all("br"):
-                br.replace_with("\n")
-            # <p> 태그를 줄바꿈으로 변환
-            for p in detail_div.find_all("p"):
-                p.insert_before("\n")
-                p.insert_after("\n")
-            content = detail_div.get_text().strip()
-        else:
-            content = ""
-        
+        content = text_with_breaks(detail_div) if detail_div else ""
         # 게시일(YYYY-MM-DD) 추출 시도
-        date_text = None
         info = soup.select_one(".board_view .top_info, .view_info, .board_view .viewtop, .board_view .info")
-        if info:
-            import re
-            m = re.search(r"\d{4}-\d{2}-\d{2}", info.get_text(" ", strip=True))
-            if m:
-                date_text = m.group(0)
-        return content, date_text
+        return content, find_date(info)
+
+    @staticmethod
+    def fetch_detail(url: str, throttle: Optional[Dict] = None) -> Tuple[str, Optional[str]]:
+        html = fetch_cached(url, throttle)
+        if not html:
+            return "", None
+        return BoardAdapter.parse_detail(html)
 
 # ---------------------------------------------------------
 # 어댑터: _prog/recruit
 # ---------------------------------------------------------
 class RecruitAdapter:
-    BASE = "https://plus.cnu.ac.kr/_prog/recruit/"
+    BASE = f"{CNU_BASE_URL}/_prog/recruit/"
+    LIST_STRAINER = class_strainer("title", "subject")
+    DETAIL_STRAINER = class_strainer("board_viewDetail", "view_con", "content", "bbs_view",
+                                     "board_view", "view_info", "meta")
 
     @staticmethod
-    def fetch_page(menu_dvs_cd: str, page: int) -> Optional[str]:
+    def fetch_page(menu_dvs_cd: str, page: int, throttle: Optional[Dict] = None) -> Optional[str]:
         params = {
             "menu_dvs_cd": menu_dvs_cd,
             "site_dvs_cd": "kr",
             "GotoPage": page,
         }
-        res = req_get(RecruitAdapter.BASE, params=params)
+        res = req_get(RecruitAdapter.BASE, params=params, throttle=throttle)
         return res.text if res else None
 
     @staticmethod
     def parse_list(html: str) -> Iterable[Tuple[str, str]]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse(html, RecruitAdapter.LIST_STRAINER)
         # 다양한 마크업에 대응
-        for a in soup.select("td.title a, .title a, .subject a"):
-            href = a.get("href")
-            if not href:
-                continue
-            title = a.get_text(strip=True)
-            url = urljoin(RecruitAdapter.BASE, href)
-            yield title, url
+        for title, href in iter_links(soup, "td.title a, .title a, .subject a"):
+            yield title, urljoin(RecruitAdapter.BASE, href)
 
     @staticmethod
-    def fetch_detail(url: str) -> Tuple[str, Optional[str]]:
-        res = req_get(url)
-        if not res:
-            return "", None
-        soup = BeautifulSoup(res.text, "html.parser")
+    def parse_detail(html: str) -> Tuple[str, Optional[str]]:
+        soup = parse(html, RecruitAdapter.DETAIL_STRAINER)
         content_area = soup.select_one(".board_viewDetail, .view_con, .content, .bbs_view")
-        if content_area:
-            # <br> 태그를 줄바꿈으로 변환
-            for br in content_area.find_all("br"):
-                br.replace_with("\n")
-            # <p> 태그를 줄바꿈으로 변환
-            for p in content_area.find_all("p"):
-                p.insert_before("\n")
-                p.insert_after("\n")
-            content = content_area.get_text().strip()
-        else:
-            content = ""
-        
+        content = text_with_breaks(content_area) if content_area else ""
         # 게시일(YYYY-MM-DD) 추출 시도
-        date_text = None
         info = soup.select_one(".board_view .top_info, .bbs_view .info, .view_info, .meta")
-        if info:
-            import re
-            m = re.search(r"\d{4}-\d{2}-\d{2}", info.get_text(" ", strip=True))
-            if m:
-                date_text = m.group(0)
-        return content, date_text
+        return content, find_date(info)
+
+    @staticmethod
+    def fetch_detail(url: str, throttle: Optional[Dict] = None) -> Tuple[str, Optional[str]]:
+        html = fetch_cached(url, throttle)
+        if not html:
+            return "", None
+        return RecruitAdapter.parse_detail(html)
 
 # ---------------------------------------------------------
 # 파이프라인
 # ---------------------------------------------------------
-def run(pages: int = 5, confidence_threshold: float = 0.7, api_config: Dict = None):
+def _adapter_for(src: Dict):
+    return BoardAdapter if src["type"] == "board" else RecruitAdapter
+
+def _fetch_list_page(src: Dict, page: int) -> Optional[str]:
+    if src["type"] == "board":
+        return BoardAdapter.fetch_page(src["code"], src["menu_dvs_cd"], page, throttle=src.get("throttle"))
+    return RecruitAdapter.fetch_page(src["menu_dvs_cd"], page, throttle=src.get("throttle"))
+
+def _parse_detail(source_type: str, html: str) -> Tuple[str, Optional[str]]:
+    """파싱 프로세스 풀에서 실행 (모듈 수준 함수여야 pickle 가능)"""
+    adapter = BoardAdapter if source_type == "board" else RecruitAdapter
+    return adapter.parse_detail(html)
+
+def _ignore_sigint():
+    # Ctrl-C 는 부모 프로세스가 처리하고, 파싱 워커는 남은 작업을 끝까지 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _log_saved(sid, page, cat_id, conf, ver, title, nid):
+    print(f"[OK] src={sid} p={page} notice={nid} cat={cat_id} conf={conf:.2f} ver={ver} {title[:40]}...")
+
+def _log_queues(snapshot: Dict[str, Dict]):
+    depths = " ".join(f"{name}={s['depth']}/{s['capacity']}" for name, s in snapshot.items())
+    print(f"[QUEUE] {depths}")
+
+class _RunTracker:
+    """
+    실행 요약 집계 + 목록 페이지별 남은 항목 수 추적
+    (여러 단계 스레드에서 호출되므로 lock 으로 보호)
+    - 페이지의 모든 항목이 저장/생략되면 [PAGE DONE]
+    - 목록 단계가 끝난 소스의 모든 페이지가 끝나면 [DONE] + on_source_done(sid, source)
+    - 페이지가 끝날 때마다 on_page_done(sid, page) (체크포인트 기록용)
+    """
+
+    def __init__(self, on_source_done: Optional[Callable[[int, Dict], None]] = None,
+                 on_page_done: Optional[Callable[[int, int], None]] = None):
+        self._lock = threading.Lock()
+        self.summary = {"new": 0, "changed": 0, "unchanged": 0, "skipped": 0, "cancelled": 0}
+        self._pages: Dict[Tuple[int, int], Dict[str, int]] = {}
+        self._sources: Dict[int, Dict] = {}
+        self._on_source_done = on_source_done
+        self._on_page_done = on_page_done
+
+    def count(self, sid: int, key: str):
+        ITEMS.inc(outcome=key)
+        with self._lock:
+            self.summary[key] += 1
+            counts = self._sources[sid]["counts"]
+            counts[key] = counts.get(key, 0) + 1
+
+    def start_source(self, src: Dict):
+        with self._lock:
+            self._sources[src["source_id"]] = {
+                "name": src["name"], "open": 0, "listed": False, "finished": False,
+                "job_id": None, "started": time.monotonic(), "pages": 0, "counts": {}, "errors": [],
+            }
+
+    def set_job_id(self, sid: int, job_id: Optional[int]):
+        with self._lock:
+            self._sources[sid]["job_id"] = job_id
+
+    def error(self, sid: int, message: str):
+        """소스 실행을 FAILED 로 남길 오류 (목록 요청 실패, 항목 처리 예외 등)"""
+        with self._lock:
+            self._sources[sid]["errors"].append(message)
+
+    def open_page(self, sid: int, page: int, n_items: int):
+        with self._lock:
+            self._sources[sid]["open"] += 1
+            self._sources[sid]["pages"] += 1
+            self._pages[(sid, page)] = {"remaining": n_items, "saved": 0, "unchanged": 0}
+            done = self._close_page(sid, page) if n_items == 0 else None
+        self._notify(sid, done, page if n_items == 0 else None)
+
+    def item_done(self, sid: int, page: int, outcome: str):
+        """outcome: saved | unchanged | skipped | cancelled"""
+        with self._lock:
+            state = self._pages[(sid, page)]
+            state["remaining"] -= 1
+            if outcome in ("saved", "unchanged"):
+                state[outcome] += 1
+            closed = state["remaining"] == 0
+            done = self._close_page(sid, page) if closed else None
+        self._notify(sid, done, page if closed else None)
+
+    def source_listed(self, sid: int):
+        with self._lock:
+            self._sources[sid]["listed"] = True
+            done = self._maybe_done(sid)
+        self._notify(sid, done)
+
+    def finish_all(self, reason: str):
+        """실행 종료 시 아직 끝나지 않은 소스 마감 (저장 실패/즉시 종료 등)"""
+        with self._lock:
+            pending = []
+            for sid, source in self._sources.items():
+                if not source["finished"]:
+                    source["finished"] = True
+                    source["errors"].append(reason)
+                    pending.append((sid, dict(source)))
+        for sid, source in pending:
+            self._notify(sid, source)
+
+    def _close_page(self, sid: int, page: int) -> Optional[Dict]:
+        state = self._pages.pop((sid, page))
+        unchanged_note = f" unchanged={state['unchanged']}" if state["unchanged"] else ""
+        print(f"[PAGE DONE] source={sid} page={page or 'retry'} items={state['saved']}{unchanged_note}")
+        self._sources[sid]["open"] -= 1
+        return self._maybe_done(sid)
+
+    def _maybe_done(self, sid: int) -> Optional[Dict]:
+        source = self._sources[sid]
+        if source["listed"] and source["open"] == 0 and not source["finished"]:
+            source["finished"] = True
+            print(f"[DONE] source={sid}:{source['name']}")
+            return dict(source)
+        return None
+
+    def _notify(self, sid: int, source: Optional[Dict], page: Optional[int] = None):
+        # DB 기록은 lock 밖에서 (다른 단계 스레드를 막지 않도록)
+        if page is not None and self._on_page_done is not None:
+            self._on_page_done(sid, page)
+        if source is not None and self._on_source_done is not None:
+            self._on_source_done(sid, source)
+
+def run(pages: int = 5, confidence_threshold: float = 0.7, api_config: Dict = None,
+        workers: int = 4, rps: float = 2.0, incremental: bool = False, refresh_cache: Optional[bool] = None,
+        db_batch_size: int = 100, db_flush_interval: float = 5.0, llm_budget: Optional[int] = None,
+        parse_workers: Optional[int] = None, classify_batch_size: int = 32, queue_size: int = 64,
+        queue_log_interval: float = 10.0, conn_factory: Callable = get_conn,
+        metrics_port: Optional[int] = None, summary_path: Optional[str] = None, resume: bool = True,
+        notify: Optional[bool] = None, near_dup: Optional[bool] = None, classify_url: Optional[str] = None):
     """
     크롤링 파이프라인 실행
     
+    단계별 워커와 크기 제한 큐로 연결된 생산자/소비자 구조로 처리한다.
+    
+        목록 요청(소스별) -> 상세 요청(workers) -> 파싱(프로세스 풀)
+        -> 분류(마이크로 배치) -> DB 저장(NoticeWriter)
+    
+    하류 큐가 가득 차면 상류 단계가 대기하므로 (backpressure) 느린 단계가
+    메모리를 무한히 쌓지 않는다. 서버 부하는 호스트별 스로틀(동시 요청 수 +
+    초당 요청 수)로 제한하고, [OK] 로그는 해당 행이 커밋된 뒤 출력된다.
+    
+    Ctrl-C 를 누르면 새 목록/상세 요청을 멈추고, 이미 받은 페이지는 파싱/분류/
+    저장까지 마친 뒤 종료한다 (한 번 더 누르면 즉시 종료).
+    
+    증분 모드에서는 이미 저장된 url 은 상세 요청을 건너뛰고, 목록 전체가
+    저장된 url 뿐인 페이지에서 해당 소스의 페이징을 멈춘다.
+    (notice.url 이 소스별 high-water mark 역할)
+    
+    소스별 실행 기록은 crawl_job 에 남기고 (RUNNING -> SUCCESS/FAILED + stats),
+    단계별 처리 시간/재시도/실패 지표는 metrics 레지스트리에 모은다
+    (실행 시작 시 초기화, metrics_port 로 /metrics 노출).
+    
+    소스별로 모든 항목이 커밋된 마지막 페이지를 페이지마다 crawl_progress 에
+    기록한다. 이전 실행이 중간에 끝났으면 그 다음 페이지부터 이어받고,
+    상세 요청 실패/처리 예외/중단으로 남은 url 은 crawl_retry 에 모아 다음
+    실행에서 목록보다 먼저 처리한다.
+    
+    새로 저장된 공지는 커밋 후 알림 단계(NotificationFanout)로 넘겨 관심
+    카테고리/키워드가 맞는 사용자의 notification 행을 만든다.
+    
+    다른 게시판에 올라온 같은 공지(본문 SimHash 거리가 가까운 글)는 대표 공지의
+    canonical_id 로 연결하고, 대표의 분류 결과를 그대로 써서 재분류/알림을 생략한다.
+    
+    classify_url 이 있으면 분류는 상주 분류 서비스(classify_service)에 맡긴다
+    (모델을 이 프로세스에 올리지 않음). confidence_threshold/api_config 가 서비스 설정과 다르면
+    시작할 때 ValueError, OpenAI 예산(llm_budget)은 서비스 쪽 설정을 따른다.
+    
     Args:
         pages: 크롤링할 페이지 수
         confidence_threshold: 분류 신뢰도 임계값 (기본값: 0.7)
-        api_config: API 백업 설정 (예: {'url': 'http://api.example.com/classify', 'headers': {...}})
+        api_config: OpenAI 백업 설정 (예: {'api_key': ..., 'model': 'gpt-4o-mini', 'base_url': ..., 'max_inflight': 4})
+        workers: 상세 요청 워커 수 (호스트별 동시 요청 수 상한으로도 사용)
+        rps: 호스트별 초당 요청 수 상한
+        incremental: 증분 크롤링 여부
+        refresh_cache: True 이면 상세 페이지 응답 캐시를 읽지 않고 새로 받음 (None 이면 HTTP_CACHE_BYPASS 설정)
+        db_batch_size: DB 배치 저장 행 수
+        db_flush_interval: DB 배치 최대 대기 시간(초)
+        llm_budget: 이번 실행의 OpenAI 요청 수 상한 (None 이면 api_config/OPENAI_CALL_BUDGET 설정)
+        parse_workers: 파싱 프로세스 수 (None 이면 min(4, CPU 수), 0 이면 스레드에서 직접 파싱)
+        classify_batch_size: 분류 단계가 한 번에 모으는 최대 항목 수
+        queue_size: 단계 사이 큐 크기
+        queue_log_interval: 단계별 큐 깊이 로그 주기(초, 0 이면 끔)
+        conn_factory: DB 연결 생성 함수 (autocommit 인자, 기본 get_conn)
+        metrics_port: Prometheus 텍스트 엔드포인트 포트 (None 이면 METRICS_PORT, 0 이면 끔)
+        summary_path: 실행 요약 JSON 저장 경로 (None 이면 CRAWL_SUMMARY_PATH, 없으면 저장 안 함)
+        resume: 이전 실행의 체크포인트/재시도 목록을 이어받을지 여부 (False 면 1페이지부터, 기록은 계속 남김)
+        notify: 새 공지 알림 fan-out 여부 (None 이면 NOTIFY_ENABLED 설정)
+        near_dup: 근사 중복 공지 연결 여부 (None 이면 NEAR_DUP_ENABLED 설정)
+        classify_url: 분류 서비스 주소 (None 이면 CLASSIFY_SERVICE_URL, 빈 값이면 프로세스 안에서 분류)
+
+    Returns:
+        실행 요약 {'new', 'changed', 'unchanged', 'skipped', 'cancelled', 'seconds',
+                   'stages': {단계: {'processed', 'errors', 'p50_ms', 'p95_ms', ...}},
+                   'metrics': 지표 snapshot (단계/HTTP/분류 계층/DB/OpenAI),
+                   'near_dup': 근사 중복 판정 수/색인 크기 (near_dup 사용 시),
+                   'classify_cache': 이번 실행의 분류 캐시 hits/misses/hit_rate (프로세스 안 분류 시)}
     """
-    # 분류기 설정
-    if api_config or confidence_threshold != 0.7:
-        configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
-        print(f"[CONFIG] 분류기 설정 - 임계값: {confidence_threshold}, API: {'설정됨' if api_config else '미설정'}")
-    
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            for src in SOURCES:
-                sid = src["source_id"]
-                sname = src["name"]
-                stype = src["type"]
-                print(f"\n[START] source={sid}:{sname} pages={pages}")
-
-                for page in range(1, pages + 1):
-                    delay()
-                    if stype == "board":
-                        html = BoardAdapter.fetch_page(src["code"], src["menu_dvs_cd"], page)
-                    else:
-                        html = RecruitAdapter.fetch_page(src["menu_dvs_cd"], page)
+    # 분류기 설정 (분류 서비스를 쓰면 revision 만 받아 옴 - 서비스가 떠 있지 않으면 여기서 실패)
+    classify_url = CLASSIFY_SERVICE_URL if classify_url is None else classify_url
+    classify_client = ClassifyClient(classify_url) if classify_url else None
+    if classify_client is not None:
+        try:
+            classify_client.check_config(confidence_threshold, api_config)
+        except Exception:
+            classify_client.close()
+            raise
+        classify_fn, classifier_rev = classify_client.classify_batch, classify_client.revision_tag
+        print(f"[CONFIG] 분류 서비스 사용 - {classify_url} rev={classifier_rev}")
+    else:
+        if api_config or confidence_threshold != 0.7:
+            configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
+            print(f"[CONFIG] 분류기 설정 - 임계값: {confidence_threshold}, API: {'설정됨' if api_config else '미설정'}")
+        get_classifier().reset_api_budget(llm_budget)
+        classify_fn, classifier_rev = classify_batch, get_classifier().revision_tag
+    # 분류 캐시 통계는 프로세스 누적이므로 시작 시점 값을 빼서 이번 실행분만 요약
+    # (분류 서비스를 쓰면 캐시/OpenAI 통계는 서비스 프로세스 쪽 - /health, /metrics)
+    label_cache = get_classifier().cache if classify_client is None else None
+    label_cache_start = dict(label_cache.stats) if label_cache is not None else None
 
+    configure_throttle(max_inflight=workers, rps=rps)
+    http = configure_http_client(pool_size=workers)
+
+    if parse_workers is None:
+        parse_workers = min(4, os.cpu_count() or 1)
+
+    # 지표는 프로세스 동안 누적 (/metrics 카운터가 줄지 않도록) - 요약은 시작 시점 이후 증가분
+    metrics_start = REGISTRY.mark()
+    serve_metrics(metrics_port)
+    started = time.perf_counter()
+
+    # 소스별 crawl_job 기록 (실패해도 크롤링은 계속)
+    def start_job(cur, sid: int) -> Optional[int]:
+        try:
+            return start_crawl_job(cur, sid)
+        except Exception as e:
+            print(f"[WARN] crawl_job 기록 실패 source={sid} err={e}")
+            return None
+
+    def finish_source(sid: int, source: Dict):
+        counts, errors = source["counts"], source["errors"]
+        failed = bool(errors) or counts.get("cancelled", 0) > 0
+        if not failed:
+            # 끝까지 마친 소스만 완료 처리 (실패/중단이면 마지막 위치에서 이어받음)
+            checkpoint.source_done(sid)
+        if source["job_id"] is None:
+            return
+        error_msg = None
+        if failed:
+            notes = errors[:5] + ([f"(+{len(errors) - 5} more)"] if len(errors) > 5 else [])
+            if counts.get("cancelled"):
+                notes.append(f"cancelled={counts['cancelled']}")
+            error_msg = "; ".join(notes)
+        stats = {"pages": source["pages"], "counts": counts,
+                 "seconds": round(time.monotonic() - source["started"], 3)}
+        try:
+            with conn_factory() as conn, conn.cursor() as cur:
+                finish_crawl_job(cur, source["job_id"], "FAILED" if failed else "SUCCESS", error_msg, stats)
+        except Exception as e:
+            print(f"[WARN] crawl_job 종료 기록 실패 source={sid} err={e}")
+
+    checkpoint = CrawlCheckpoint(conn_factory=conn_factory)
+    tracker = _RunTracker(on_source_done=finish_source, on_page_done=checkpoint.page_done)
+    stop = threading.Event()
+    writer = NoticeWriter(batch_size=db_batch_size, flush_interval=db_flush_interval,
+                          conn_factory=conn_factory, classifier_rev=classifier_rev)
+    # fork 는 다른 스레드가 잡고 있던 lock 을 자식에 복제하므로 spawn 사용
+    process_pool = (
+        ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_ignore_sigint)
+        if parse_workers > 0 else None
+    )
+    parse_pool = process_pool
+    fanout = NotificationFanout(conn_factory=conn_factory) if (NOTIFY_ENABLED if notify is None else notify) else None
+    dedup = NearDupDetector(conn_factory=conn_factory) if (NEAR_DUP_ENABLED if near_dup is None else near_dup) else None
+
+    # 실패한 상세 url 은 재시도 목록으로 (재시도 항목은 원래 목록 페이지 번호로 기록)
+    def retry_later(job: Dict, reason: str):
+        checkpoint.retry_later(job["src"]["source_id"], job["url"], job["title"],
+                               job.get("retry_page", job["page"]), reason)
+
+    def retry_done(job: Dict):
+        if job.get("retry_page") is not None:
+            checkpoint.retry_done(job["url"])
+
+    # 1) 목록 요청: 소스 하나를 한 워커가 페이지 순서대로 처리
+    #    (이전 실행의 재시도 목록을 먼저 page=0 으로 내보내고, 체크포인트 다음 페이지부터 시작)
+    def emit_retries(src: Dict, cur, emit) -> set:
+        sid = src["source_id"]
+        retries = checkpoint.pending_retries(sid)
+        if not retries:
+            return set()
+        known = fetch_known_hashes(cur, [r["url"] for r in retries])
+        jobs = [
+            {"src": src, "page": 0, "retry_page": r["page"], "title": r["title"], "url": r["url"],
+             "prev": known.get(r["url"])}
+            for r in retries
+        ]
+        print(f"[RETRY] source={sid} urls={len(jobs)}")
+        tracker.open_page(sid, 0, len(jobs))
+        for job in jobs:
+            emit(job)
+        return {job["url"] for job in jobs}
+
+    def list_source(src: Dict, emit):
+        sid = src["source_id"]
+        adapter = _adapter_for(src)
+        tracker.start_source(src)
+        try:
+            with conn_factory() as conn, conn.cursor() as cur:
+                job_id = start_job(cur, sid)
+                tracker.set_job_id(sid, job_id)
+                first_page = checkpoint.resume_page(sid, job_id, resume=resume)
+                resumed = f" resume_from={first_page}" if first_page > 1 else ""
+                print(f"\n[START] source={sid}:{src['name']} pages={pages}{resumed}")
+                retry_urls = emit_retries(src, cur, emit) if resume else set()
+                for page in range(first_page, pages + 1):
+                    if stop.is_set():
+                        tracker.error(sid, f"page {page}: stopped before listing")
+                        break
+                    html = _fetch_list_page(src, page)
                     if not html:
                         print(f"[SKIP] source={sid} page={page} fetch failed")
+                        tracker.error(sid, f"page {page}: list fetch failed")
                         continue
 
-                    count_on_page = 0
-                    parser = BoardAdapter.parse_list if stype == "board" else RecruitAdapter.parse_list
-                    fetcher = BoardAdapter.fetch_detail if stype == "board" else RecruitAdapter.fetch_detail
+                    items = list(adapter.parse_list(html))
+                    # 목록 페이지 단위로 저장된 (id, hash) 를 한 번에 조회
+                    known = fetch_known_hashes(cur, [url for _, url in items])
+                    jobs = [
+                        {"src": src, "page": page, "title": title, "url": url, "prev": known.get(url)}
+                        for title, url in items
+                        if not (incremental and url in known) and url not in retry_urls
+                    ]
+                    tracker.open_page(sid, page, len(jobs))
+                    for job in jobs:
+                        emit(job)
+
+                    if incremental and known:
+                        print(f"[KNOWN] source={sid} page={page} skipped={len(known)}")
+                    if incremental and not jobs:
+                        print(f"[STOP] source={sid} page={page} 새 공지 없음 - 페이징 중단")
+                        break
+        finally:
+            tracker.source_listed(sid)
 
-                    for title, url in parser(html):
-                        delay()
-                        content, posted_at = fetcher(url)
-                        if not content or content.strip() == "":
-                            print(f"[SKIP] no content {url}")
-                            continue
+    # 2) 상세 요청 (중단 요청 후에는 남은 요청을 보내지 않음)
+    def fetch_detail(job: Dict, emit):
+        if stop.is_set():
+            retry_later(job, "cancelled")
+            tracker.count(job["src"]["source_id"], "cancelled")
+            tracker.item_done(job["src"]["source_id"], job["page"], "cancelled")
+            return
+        job["html"] = fetch_cached(job["url"], job["src"].get("throttle"))
+        emit(job)
 
-                        nid = upsert_notice(
-                            cur,
-                            sid,
-                            url,
-                            title,
-                            content,
-                            posted_at,
-                            make_hash(title, content),
-                        )
+    # 3) 파싱 + 변경 여부 판단 (해시가 같으면 저장/재분류 생략)
+    def parse_html(source_type: str, html: str) -> Tuple[str, Optional[str]]:
+        nonlocal parse_pool
+        pool = parse_pool
+        if pool is not None:
+            try:
+                return pool.submit(_parse_detail, source_type, html).result()
+            except BrokenProcessPool as e:
+                if parse_pool is pool:
+                    print(f"[WARN] 파싱 프로세스 풀 사용 불가 - 스레드에서 직접 파싱 err={e}")
+                    parse_pool = None
+        return _parse_detail(source_type, html)
 
-                        cat_id, conf, ver = classify(title, content)
-                        insert_notice_category(cur, nid, cat_id, conf, ver)
+    def parse_detail(job: Dict, emit):
+        sid, page, title, url = job["src"]["source_id"], job["page"], job["title"], job["url"]
+        html = job.pop("html")
+        if not html:
+            # 상세 요청 실패 (재시도 후에도) - 다음 실행에서 다시 시도
+            print(f"[SKIP] detail fetch failed {url}")
+            retry_later(job, "detail fetch failed")
+            tracker.count(sid, "skipped")
+            tracker.item_done(sid, page, "skipped")
+            return
+        content, posted_at = parse_html(job["src"]["type"], html)
+        if not content or content.strip() == "":
+            print(f"[SKIP] no content {url}")
+            retry_done(job)
+            tracker.count(sid, "skipped")
+            tracker.item_done(sid, page, "skipped")
+            return
 
-                        count_on_page += 1
-                        print(f"[OK] src={sid} p={page} notice={nid} cat={cat_id} conf={conf:.2f} ver={ver} {title[:40]}...")
+        content_hash = make_hash(title, content)
+        prev = job["prev"]
+        if prev and prev["hash"] == content_hash:
+            retry_done(job)
+            tracker.count(sid, "unchanged")
+            tracker.item_done(sid, page, "unchanged")
+            return
+        tracker.count(sid, "changed" if prev else "new")
+        job.update(content=content, posted_at=posted_at, hash=content_hash)
+        if dedup is not None:
+            dedup.fingerprint(job)
+        emit(job)
+
+    # 4) 분류 (큐에 쌓인 항목을 모아 일괄 분류, 근사 중복은 대표 공지의 분류를 사용)
+    def classify_jobs(jobs: List[Dict], emit):
+        if dedup is not None:
+            labels = dedup.classify(jobs, classify_fn)
+        else:
+            labels = classify_fn([(job["title"], job["content"]) for job in jobs])
+        for job, label in zip(jobs, labels):
+            job["label"] = label
+            emit(job)
+
+    # 5) DB 저장 (커밋 후 [OK] 로그 + 페이지 완료 집계)
+    def on_saved(job: Dict, nid: int):
+        sid, page = job["src"]["source_id"], job["page"]
+        cat_id, conf, ver = job["label"]
+        _log_saved(sid, page, cat_id, conf, ver, job["title"], nid)
+        if dedup is not None:
+            dedup.saved(job, nid)
+        if fanout is not None and job["prev"] is None and job.get("canonical") is None:
+            fanout.submit(nid, job["title"], job["content"], cat_id)
+        retry_done(job)
+        tracker.item_done(sid, page, "saved")
+
+    def store(job: Dict, emit):
+        cat_id, conf, ver = job["label"]
+        writer.add(
+            job["src"]["source_id"],
+            job["url"],
+            job["title"],
+            job["content"],
+            job["posted_at"],
+            job["hash"],
+            cat_id,
+            conf,
+            ver,
+            on_saved=partial(on_saved, job),
+            **(dedup.writer_args(job) if dedup is not None else {}),
+        )
+
+    def on_item_error(work, e: Exception):
+        # 처리 중 예외가 난 항목은 생략 처리 (페이지 완료 집계가 멈추지 않도록)
+        for job in (work if isinstance(work, list) else [work]):
+            sid = job["src"]["source_id"]
+            print(f"[ERR] {job['url']} err={e}")
+            if dedup is not None:
+                dedup.discard(job)
+            retry_later(job, str(e))
+            tracker.error(sid, f"{job['url']}: {e}")
+            tracker.count(sid, "skipped")
+            tracker.item_done(sid, job["page"], "skipped")
+
+    def on_store_error(work, e: Exception):
+        # 재연결 후에도 저장 실패 - 더 받아 와도 저장할 수 없으므로 중단
+        print(f"[ERR] stage=store err={e} - 새 요청을 멈추고 종료합니다")
+        stop.set()
+
+    pipeline = StagedPipeline([
+        Stage("list", list_source, workers=len(SOURCES), queue_size=len(SOURCES)),
+        Stage("fetch", fetch_detail, workers=workers, queue_size=queue_size, on_error=on_item_error),
+        Stage("parse", parse_detail, workers=max(1, parse_workers), queue_size=queue_size,
+              on_error=on_item_error),
+        Stage("classify", classify_jobs, workers=1, queue_size=queue_size,
+              batch_size=classify_batch_size, batch_wait=0.05, on_error=on_item_error),
+        Stage("store", store, workers=1, queue_size=queue_size,
+              idle_timeout=0.5, on_idle=writer.flush_if_due, on_error=on_store_error),
+    ])
+
+    # 캐시 우회는 이번 실행에만 (같은 프로세스의 다음 run() 은 원래 설정)
+    previous_bypass = cache_bypassed()
+    if refresh_cache is not None:
+        configure_response_cache(bypass=refresh_cache)
+    interrupted = False
+    try:
+        if dedup is not None:
+            dedup.start()
+        if fanout is not None:
+            fanout.start()
+        pipeline.start()
+        pipeline.monitor(queue_log_interval, _log_queues)
+        for src in SOURCES:
+            pipeline.put(src)
+        pipeline.finish()
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n[INTERRUPT] 새 요청을 멈추고 진행 중인 항목을 저장한 뒤 종료합니다 (다시 누르면 즉시 종료)")
+        stop.set()
+        pipeline.finish()
+    finally:
+        try:
+            writer.close()
+        finally:
+            if fanout is not None:
+                fanout.close()
+            if process_pool is not None:
+                process_pool.shutdown()
+            if classify_client is not None:
+                classify_client.close()
+            tracker.finish_all("interrupted" if interrupted else "stopped before completion")
+            checkpoint.close()
+            configure_response_cache(bypass=previous_bypass)
 
-                    print(f"[PAGE DONE] source={sid} page={page} items={count_on_page}")
+    stage_stats = pipeline.snapshot()
+    if fanout is not None:
+        stage_stats["notify"] = fanout.stage.snapshot()
+    summary = dict(tracker.summary, seconds=round(time.perf_counter() - started, 3),
+                   stages=stage_stats, metrics=REGISTRY.snapshot(since=metrics_start))
+    if dedup is not None:
+        summary["near_dup"] = dedup.snapshot()
+    if label_cache is not None:
+        summary["classify_cache"] = label_cache.stats_since(label_cache_start)
+    print(f"[SUMMARY] new={summary['new']} changed={summary['changed']} "
+          f"unchanged={summary['unchanged']} skipped={summary['skipped']} cancelled={summary['cancelled']}"
+          f"{' (interrupted)' if interrupted else ''}")
+    stages = " ".join(f"{name}={s['processed']}" + (f"(err={s['errors']})" if s["errors"] else "")
+                      for name, s in summary["stages"].items())
+    print(f"[STAGES] {stages}")
+    busy = summary["metrics"].get("crawler_stage_seconds", {})
+    busy = sorted(((key.split("=", 1)[1], h["sum_s"]) for key, h in busy.items()), key=lambda x: -x[1])
+    tiers = summary["metrics"].get("crawler_classify_seconds", {})
+    print(f"[TIME] wall={summary['seconds']:.1f}s busy(워커 합계) "
+          + " ".join(f"{name}={sec:.1f}s" for name, sec in busy)
+          + (" | classify " + " ".join(f"{k.split('=', 1)[1]}={h['sum_s']:.2f}s" for k, h in tiers.items())
+             if tiers else ""))
+    print(f"[DB] rows={writer.stats['rows']} batches={writer.stats['batches']} "
+          f"reconnects={writer.stats['reconnects']}")
+    print(f"[CHECKPOINT] writes={checkpoint.stats['checkpoints']} retry_queued={checkpoint.stats['queued']} "
+          f"retry_cleared={checkpoint.stats['cleared']}"
+          + (f" errors={checkpoint.stats['errors']}" if checkpoint.stats["errors"] else ""))
+    if fanout is not None:
+        print(f"[NOTIFY] notices={fanout.stats['notices']} targets={fanout.stats['targets']} "
+              f"notifications={fanout.stats['notifications']} refreshes={fanout.stats['refreshes']}"
+              + (f" errors={fanout.stats['errors']}" if fanout.stats["errors"] else ""))
+    if dedup is not None:
+        nd = summary["near_dup"]
+        print(f"[NEAR_DUP] duplicates={nd['duplicates']} canonical={nd['canonical']} "
+              f"no_fingerprint={nd['no_fingerprint']} indexed={nd['indexed']} avg_candidates={nd['avg_candidates']}"
+              + (f" errors={nd['errors']}" if nd["errors"] else ""))
+    if label_cache is not None:
+        cc = summary["classify_cache"]
+        print(f"[CLASSIFY CACHE] hits={cc['hits']} misses={cc['misses']} hit_rate={cc['hit_rate']:.2%}")
+    llm_stats = get_classifier().api_stats() if classify_client is None else None
+    if llm_stats is not None:
+        print(f"[LLM] calls={llm_stats['calls']} retries={llm_stats['retries']} failures={llm_stats['failures']} "
+              f"budget_skipped={llm_stats['budget_skipped']} avg_latency={llm_stats['avg_latency_ms']}ms")
+    for key, t in throttle_snapshot().items():
+        print(f"[THROTTLE] {key} interval={t['interval_s']}s error_rate={t['error_rate']:.2f} "
+              f"latency={t['latency_ms']}ms state={t['state']} failures={t['failures']} "
+              f"circuit_opened={t['opened']} rejected={t['rejected']}")
+    stats = http.stats.snapshot()
+    print(f"[HTTP] requests={stats['requests']} handshakes={stats['handshakes']} "
+          f"req/conn={stats['requests_per_connection']:.2f}")
+    cache = get_response_cache()
+    if cache is not None:
+        print(f"[CACHE] fresh={cache.stats['fresh']} revalidated={cache.stats['revalidated']} "
+              f"miss={cache.stats['miss']} evicted={cache.stats['evicted']}")
 
-                print(f"[DONE] source={sid}:{sname}")
+    summary_path = summary_path or os.getenv("CRAWL_SUMMARY_PATH")
+    if summary_path:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"[SUMMARY] {summary_path}")
+    return summary
 
 if __name__ == "__main__":
     import os
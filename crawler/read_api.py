@@ -0,0 +1,481 @@
+import asyncio
+import json
+import os
+import re
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pymysql
+
+try:
+    from .db import (get_conn, fetch_feed, fetch_notice_detail, fetch_user_categories, fetch_feed_epoch,
+                     fetch_notice_categories, fetch_notice_labels, fetch_pref_change_id, _is_disconnect)
+    from .search import encode_cursor, decode_cursor
+    from .metrics import REGISTRY, counter, histogram
+except ImportError:
+    from db import (get_conn, fetch_feed, fetch_notice_detail, fetch_user_categories, fetch_feed_epoch,
+                    fetch_notice_categories, fetch_notice_labels, fetch_pref_change_id, _is_disconnect)
+    from search import encode_cursor, decode_cursor
+    from metrics import REGISTRY, counter, histogram
+
+# ---------------------------------------------------------
+# 앱용 읽기 API (asyncio)
+#  GET /feed/category/{category_id}?limit=&cursor=   카테고리 피드 (최신순)
+#  GET /feed/user/{user_id}?limit=&cursor=           관심 카테고리(user_interest_category) 피드
+#  GET /notices/{id}                                  공지 상세 (본문/분류 결과)
+#  GET /health, /metrics
+#  - 페이지: (feed_at, id) keyset 커서 - search 의 recent 커서와 같은 형식, 깊은 페이지도 같은 비용
+#  - DB: 연결 POOL_SIZE 개를 큐로 돌려 쓰고 질의는 같은 수의 스레드에서 실행 (이벤트 루프를 막지 않음)
+#  - 응답 캐시: 요청(경로+질의) -> JSON 본문, CACHE_TTL 초 + 세대(feed_epoch) 가 바뀌면 무효
+#      feed_epoch 는 NoticeWriter / 재분류가 저장 트랜잭션마다 올리고, API 가 EPOCH_POLL_INTERVAL 마다 읽는다
+#      사용자 피드는 관심 카테고리 변경(user_pref_change) 도 세대에 포함
+#      같은 요청이 동시에 캐시를 놓치면 DB 질의는 1번만 (나머지는 결과를 기다림)
+# ---------------------------------------------------------
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8080"))
+POOL_SIZE = int(os.getenv("API_DB_POOL_SIZE", "8"))
+CACHE_TTL = float(os.getenv("API_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "10000"))
+EPOCH_POLL_INTERVAL = float(os.getenv("API_EPOCH_POLL_INTERVAL", "1.0"))
+DEFAULT_LIMIT = int(os.getenv("API_FEED_LIMIT", "20"))
+MAX_LIMIT = 100
+MAX_REQUEST_LINE = 8192
+
+API_SECONDS = histogram("crawler_api_seconds", "읽기 API 요청 처리 시간(초)", ("route",))
+API_REQUESTS = counter("crawler_api_requests_total", "읽기 API 요청 수 (route, status)", ("route", "status"))
+API_CACHE = counter("crawler_api_cache_total", "응답 캐시 조회 (outcome: hit/miss/shared)", ("outcome",))
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------
+# DB 연결 풀
+# ---------------------------------------------------------
+class ConnectionPool:
+    """
+    pymysql 연결 size 개 + 같은 수의 스레드 - run(fn, ...) 은 빈 연결을 기다렸다가
+    스레드에서 fn(cur, ...) 실행 (연결이 끊겼으면 새 연결로 한 번 더)
+    """
+
+    def __init__(self, conn_factory: Callable = get_conn, size: int = POOL_SIZE):
+        self.conn_factory = conn_factory
+        self.size = max(1, size)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="api-db")
+        self._idle: Optional[asyncio.Queue] = None
+        self.stats = {"queries": 0, "reconnects": 0, "waits": 0}
+
+    def _queue(self) -> asyncio.Queue:
+        if self._idle is None:
+            # 연결은 처음 쓸 때 만든다 (None 자리 = 아직 없음)
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._idle.put_nowait(None)
+        return self._idle
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _call(self, conn, fn: Callable, args: tuple):
+        """스레드에서 실행 -> (다시 풀에 넣을 연결, 결과) (실패하면 연결을 닫고 예외)"""
+        for attempt in range(2):
+            if conn is None:
+                conn = self.conn_factory()
+            try:
+                with conn.cursor() as cur:
+                    return conn, fn(cur, *args)
+            except Exception as e:
+                self._discard(conn)
+                conn = None
+                if attempt or not _is_disconnect(e):
+                    raise
+                self.stats["reconnects"] += 1
+
+    async def run(self, fn: Callable, *args):
+        idle = self._queue()
+        if idle.empty():
+            self.stats["waits"] += 1
+        conn = await idle.get()
+        try:
+            conn, result = await asyncio.get_running_loop().run_in_executor(self._executor, self._call, conn, fn, args)
+        except BaseException:
+            # 실패한 연결은 _call 이 닫았으므로 빈 자리만 돌려준다 (다음 사용 때 새로 연결)
+            idle.put_nowait(None)
+            raise
+        idle.put_nowait(conn)
+        self.stats["queries"] += 1
+        return result
+
+    def close(self):
+        if self._idle is not None:
+            while not self._idle.empty():
+                conn = self._idle.get_nowait()
+                if conn is not None:
+                    conn.close()
+        self._executor.shutdown(wait=True)
+
+
+# ---------------------------------------------------------
+# 응답 캐시
+# ---------------------------------------------------------
+class ResponseCache:
+    """
+    key -> (세대, 만료 시각, 본문) LRU (이벤트 루프 한 스레드에서만 사용)
+    get 은 세대가 다르거나 만료된 항목을 없는 것으로 본다.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[object, asyncio.Future]] = {}   # key -> (세대, 읽는 중인 결과)
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    def get(self, key: str, generation) -> Optional[bytes]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[0] != generation or item[1] < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item[2]
+
+    def put(self, key: str, generation, body: bytes):
+        self._items[key] = (generation, time.monotonic() + self.ttl, body)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    async def get_or_load(self, key: str, generation, load: Callable[[], Awaitable[bytes]]) -> bytes:
+        if self.ttl <= 0:
+            return await load()
+        body = self.get(key, generation)
+        if body is not None:
+            self.stats["hits"] += 1
+            API_CACHE.inc(outcome="hit")
+            return body
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] == generation:
+            self.stats["shared"] += 1
+            API_CACHE.inc(outcome="shared")
+            return await asyncio.shield(inflight[1])
+        self.stats["misses"] += 1
+        API_CACHE.inc(outcome="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (generation, future)
+        try:
+            body = await load()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()      # 기다리는 요청이 없어도 경고가 남지 않도록
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result(body)
+            self.put(key, generation, body)
+            return body
+        finally:
+            if self._inflight.get(key, (None, None))[1] is future:
+                del self._inflight[key]
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ---------------------------------------------------------
+# API
+# ---------------------------------------------------------
+def _limit(query: Dict[str, List[str]]) -> int:
+    try:
+        limit = int(query.get("limit", [DEFAULT_LIMIT])[0])
+    except ValueError:
+        raise HttpError(400, "limit 은 정수")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _cursor(query: Dict[str, List[str]]) -> Optional[tuple]:
+    cursor = query.get("cursor", [None])[0]
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, "recent")
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+def _dumps(payload: Dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _feed_page(cur, categories: List[int], after: Optional[tuple], limit: int) -> Dict:
+    """피드 한 페이지 (스레드에서 실행 - 질의 2번을 같은 연결로)"""
+    rows = fetch_feed(cur, categories, after=after, limit=limit + 1)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    labels = fetch_notice_categories(cur, [row["id"] for row in rows])
+    items = [{"id": row["id"], "source_id": row["source_id"], "title": row["title"], "url": row["url"],
+              "posted_at": row["posted_at"], "categories": labels.get(row["id"], [])} for row in rows]
+    next_cursor = encode_cursor("recent", rows[-1]["feed_at"], rows[-1]["id"]) if more else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _user_feed_page(cur, user_id: int, after: Optional[tuple], limit: int) -> Dict:
+    categories = fetch_user_categories(cur, user_id)
+    page = _feed_page(cur, categories, after, limit) if categories else {"items": [], "next_cursor": None}
+    page["categories"] = categories
+    return page
+
+
+def _notice_detail(cur, notice_id: int) -> Optional[Dict]:
+    row = fetch_notice_detail(cur, notice_id)
+    if row is None:
+        return None
+    label = fetch_notice_labels(cur, [notice_id]).get(notice_id)
+    row = dict(row)
+    row.pop("feed_at", None)
+    row["category"] = ({"category_id": label[0], "confidence": label[1], "model_version": label[2]}
+                       if label else None)
+    return row
+
+
+def _generations(cur) -> Tuple[int, int]:
+    return fetch_feed_epoch(cur), fetch_pref_change_id(cur)
+
+
+_ROUTES = [
+    ("feed_category", re.compile(r"^/feed/category/(\d+)$")),
+    ("feed_user", re.compile(r"^/feed/user/(\d+)$")),
+    ("notice", re.compile(r"^/notices/(\d+)$")),
+]
+
+
+def _match(path: str) -> Tuple[str, int]:
+    for route, pattern in _ROUTES:
+        m = pattern.match(path)
+        if m:
+            return route, int(m.group(1))
+    raise HttpError(404, f"없는 경로: {path}")
+
+
+class ReadAPI:
+    """라우팅 + 캐시 + 풀 (HTTP 와 무관 - handle(path) -> (status, 본문))"""
+
+    def __init__(self, conn_factory: Callable = get_conn, pool_size: int = POOL_SIZE, cache_ttl: float = CACHE_TTL,
+                 cache_max_entries: int = CACHE_MAX_ENTRIES, epoch_poll_interval: float = EPOCH_POLL_INTERVAL):
+        self.pool = ConnectionPool(conn_factory, pool_size)
+        self.cache = ResponseCache(cache_ttl, cache_max_entries)
+        self.epoch_poll_interval = epoch_poll_interval
+        self.feed_epoch = 0
+        self.pref_change_id = 0
+        self.stats = {"requests": 0, "errors": 0, "epoch_changes": 0}
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """세대를 한 번 읽고 (DB 연결 확인 겸) 감시 시작"""
+        self.feed_epoch, self.pref_change_id = await self.pool.run(_generations)
+        if self.cache.ttl > 0 and self.epoch_poll_interval > 0:
+            self._watcher = asyncio.create_task(self._watch_generations())
+
+    async def _watch_generations(self):
+        while True:
+            await asyncio.sleep(self.epoch_poll_interval)
+            try:
+                epoch, pref_change_id = await self.pool.run(_generations)
+            except Exception as e:
+                print(f"[API] feed_epoch 조회 실패 err={e}")
+                continue
+            if (epoch, pref_change_id) != (self.feed_epoch, self.pref_change_id):
+                self.stats["epoch_changes"] += 1
+                self.feed_epoch, self.pref_change_id = epoch, pref_change_id
+
+    async def handle(self, target: str) -> Tuple[int, bytes, str]:
+        """요청 대상(경로+질의) -> (status, 본문, route)"""
+        started = time.perf_counter()
+        parts = urlsplit(target)
+        route, status = "unknown", 200
+        try:
+            if parts.path == "/health":
+                route, body = "health", _dumps(self.health())
+            elif parts.path == "/metrics":
+                route, body = "metrics", REGISTRY.render().encode("utf-8")
+            else:
+                route, target_id = _match(parts.path)
+                body = await self._dispatch(route, target_id, parts.path, parse_qs(parts.query))
+        except HttpError as e:
+            status, body = e.status, _dumps({"error": str(e)})
+        except pymysql.err.Error as e:
+            status, body = 503, _dumps({"error": f"DB 오류: {e}"})
+            self.stats["errors"] += 1
+        except Exception:
+            # 코드 오류는 DB 장애로 보이지 않도록 500 + 로그
+            print(f"[API] 처리 실패 target={target}\n{traceback.format_exc()}")
+            status, body = 500, _dumps({"error": "내부 오류"})
+            self.stats["errors"] += 1
+        self.stats["requests"] += 1
+        API_SECONDS.observe(time.perf_counter() - started, route=route)
+        API_REQUESTS.inc(route=route, status=str(status))
+        return status, body, route
+
+    async def _dispatch(self, route: str, target_id: int, path: str, query: Dict[str, List[str]]) -> bytes:
+        if route == "notice":
+            async def load():
+                detail = await self.pool.run(_notice_detail, target_id)
+                if detail is None:
+                    raise HttpError(404, f"공지 없음: {target_id}")
+                return _dumps(detail)
+            return await self.cache.get_or_load(path, self.feed_epoch, load)
+
+        limit, after = _limit(query), _cursor(query)
+        key = f"{path}?limit={limit}&cursor={query.get('cursor', [''])[0]}"
+        if route == "feed_category":
+            async def load():
+                return _dumps(await self.pool.run(_feed_page, [target_id], after, limit))
+            return await self.cache.get_or_load(key, self.feed_epoch, load)
+
+        async def load():
+            return _dumps(await self.pool.run(_user_feed_page, target_id, after, limit))
+        return await self.cache.get_or_load(key, (self.feed_epoch, self.pref_change_id), load)
+
+    def health(self) -> Dict:
+        return {"feed_epoch": self.feed_epoch, "pref_change_id": self.pref_change_id,
+                "cache_entries": len(self.cache), "cache": dict(self.cache.stats),
+                "pool": dict(self.pool.stats, size=self.pool.size), **self.stats}
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+        self.pool.close()
+
+
+# ---------------------------------------------------------
+# HTTP/1.1 (keep-alive, GET 만)
+# ---------------------------------------------------------
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool,
+                    content_type: str = "application/json; charset=utf-8"):
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+        f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+    )
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+    """요청 1개 -> (method, target, version, headers), 연결이 닫혔으면 None (형식 오류는 HttpError 400)"""
+    # 한도를 넘는 줄은 readline 이 ValueError (StreamReader limit) - 호출자가 400 으로 처리
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    if len(request_line) > MAX_REQUEST_LINE:
+        raise HttpError(400, "요청 줄이 너무 깁니다")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length") or "0"
+    if not length.isdigit():
+        raise HttpError(400, f"잘못된 Content-Length: {length[:20]}")
+    if int(length):
+        await reader.readexactly(int(length))
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "잘못된 요청 줄")
+    return method, target, version, headers
+
+
+async def _serve_connection(api: ReadAPI, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except (HttpError, ValueError, asyncio.LimitOverrunError) as e:
+                # 요청 경계를 알 수 없으므로 400 을 보내고 연결을 닫는다
+                message = str(e) if isinstance(e, HttpError) else "요청 줄/헤더가 너무 깁니다"
+                API_REQUESTS.inc(route="unknown", status="400")
+                _write_response(writer, 400, _dumps({"error": message}), keep_alive=False)
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+            if method != "GET":
+                status, body = 405, _dumps({"error": "GET 만 지원"})
+            else:
+                status, body, route = await api.handle(target)
+            content_type = "text/plain; version=0.0.4; charset=utf-8" if target == "/metrics" \
+                else "application/json; charset=utf-8"
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            _write_response(writer, status, body, keep_alive, content_type)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = API_HOST, port: int = API_PORT, conn_factory: Callable = get_conn,
+                pool_size: int = POOL_SIZE, cache_ttl: float = CACHE_TTL,
+                epoch_poll_interval: float = EPOCH_POLL_INTERVAL,
+                ready: Optional[Callable[[str], None]] = None):
+    """API 서버 실행 (취소될 때까지) - ready(url) 은 소켓을 연 뒤 호출"""
+    api = ReadAPI(conn_factory, pool_size, cache_ttl, epoch_poll_interval=epoch_poll_interval)
+    await api.start()
+    server = await asyncio.start_server(lambda r, w: _serve_connection(api, r, w), host, port, backlog=1024)
+    url = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"[API] {url} pool={api.pool.size} cache_ttl={cache_ttl}s epoch_poll={epoch_poll_interval}s")
+    if ready is not None:
+        ready(url)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await api.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="앱용 읽기 API (피드 / 사용자 피드 / 공지 상세)")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL, help="응답 캐시 TTL(초, 0 이면 끔)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, pool_size=args.pool_size, cache_ttl=args.cache_ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from .db import get_conn, open_reclassify_stream, replace_notice_labels
+    from .text_classifier import configure_classifier, get_classifier, is_provisional
+    from .metrics import counter, histogram
+except ImportError:
+    from db import get_conn, open_reclassify_stream, replace_notice_labels
+    from text_classifier import configure_classifier, get_classifier, is_provisional
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# 저장된 공지 재분류 (모델 교체 / confidence_threshold 변경 후)
+#  - notice_category.classifier_rev 가 현재 분류기 revision_tag 와 다른 대표 공지만
+#    id 순서로 서버 측 커서에서 batch_size 개씩 읽는다 (전체를 메모리에 올리지 않음)
+#  - 묶음마다 프로세스 풀에서 classify_batch (키워드 1회 훑기 + ML 벡터화/predict_proba 1회)
+#  - 결과는 읽은 순서대로 묶음마다 트랜잭션 1회로 교체 (근사 중복 사본도 같이)
+#    -> 커밋된 마지막 id 까지는 모두 끝난 것이므로 --from-id 로 이어서 실행할 수 있고,
+#       그냥 다시 실행해도 이미 현재 revision 인 행은 건너뛴다
+#  - 분류 캐시는 쓰지 않는다 (revision 이 바뀌어 적중하지 않고 캐시 LRU 만 밀어냄)
+# ---------------------------------------------------------
+BATCH_SIZE = int(os.getenv("RECLASSIFY_BATCH_SIZE", "1000"))
+PROGRESS_INTERVAL = float(os.getenv("RECLASSIFY_PROGRESS_INTERVAL", "10"))
+INFLIGHT_PER_WORKER = 2    # 워커당 분류 중인 묶음 수 (스트림을 읽는 속도 제한)
+
+RECLASSIFY_ITEMS = counter("crawler_reclassify_notices_total", "재분류한 공지 수 (outcome: changed/same)",
+                           ("outcome",))
+RECLASSIFY_BATCH_SECONDS = histogram("crawler_reclassify_write_seconds", "재분류 묶음 1회 저장 시간(초)")
+
+_worker_rev: Optional[str] = None
+
+
+def _init_worker(confidence_threshold: float, api_config: Optional[Dict], llm_budget: Optional[int]):
+    """풀 프로세스마다 분류기 1개 (부모와 같은 설정 -> 같은 revision)"""
+    global _worker_rev
+    classifier = configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
+    classifier.cache = None
+    classifier.reset_api_budget(llm_budget)
+    _worker_rev = classifier.revision_tag
+
+
+def _classify_chunk(items: List[Tuple[str, str]]) -> Tuple[str, List[tuple]]:
+    return _worker_rev, get_classifier().classify_batch(items)
+
+
+def reclassify(conn_factory: Callable = get_conn, from_id: int = 0, to_id: Optional[int] = None,
+               batch_size: int = BATCH_SIZE, workers: Optional[int] = None, confidence_threshold: float = 0.7,
+               api_config: Optional[Dict] = None, llm_budget: Optional[int] = None, force: bool = False,
+               progress_interval: float = PROGRESS_INTERVAL) -> Dict:
+    """
+    (from_id, to_id] 범위의 대표 공지를 현재 분류기로 다시 분류해 notice_category 교체
+
+    Args:
+        conn_factory: autocommit 인자를 받는 연결 생성 함수 (스트림용 / 저장용 연결 2개)
+        from_id / to_id: 공지 id 범위 (이어서 실행할 때는 직전 출력의 last_id 를 from_id 로)
+        batch_size: 한 번에 읽고 분류/저장하는 공지 수
+        workers: 분류 프로세스 수 (기본값: CPU 수, 0 이면 이 프로세스에서 분류)
+        confidence_threshold / api_config: 분류기 설정 (크롤러와 같아야 저장된 revision 과 맞는다)
+        llm_budget: OpenAI 요청 수 상한 (전체, 워커 수로 나눠 적용 / None 이면 설정값, 0 이면 무제한)
+        force: revision 이 같은 행도 다시 분류
+
+    Returns:
+        {'scanned', 'changed', 'copies', 'last_id', 'seconds', 'notices_per_s', 'classifier_rev'}
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    classifier = configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
+    classifier.cache = None
+    rev = classifier.revision_tag
+    worker_budget = math.ceil(llm_budget / max(workers, 1)) if llm_budget else llm_budget
+    classifier.reset_api_budget(worker_budget)
+
+    # fork 는 부모의 스레드/연결 상태를 복제하므로 spawn (pipeline 의 파싱 풀과 같음)
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker, initargs=(confidence_threshold, api_config, worker_budget))
+        if workers > 0 else None
+    )
+    stats = {"scanned": 0, "changed": 0, "copies": 0, "last_id": from_id}
+    started = time.perf_counter()
+    last_log = time.monotonic()
+    pending: deque = deque()   # (행 목록, future 또는 분류 결과) - 읽은 순서대로 저장
+    write_conn = None
+
+    def write(rows: List[Dict], result):
+        nonlocal last_log
+        worker_rev, labels = result.result() if pool is not None else result
+        if worker_rev != rev:
+            raise RuntimeError(f"분류기 revision 불일치 (모델 파일이 바뀌었나?) {worker_rev} != {rev}")
+        t = time.perf_counter()
+        values = [(row["id"], cat_id, conf, ver, None if is_provisional(ver) else rev)
+                  for row, (cat_id, conf, ver) in zip(rows, labels)]
+        try:
+            with write_conn.cursor() as cur:
+                copies = replace_notice_labels(cur, values)
+            write_conn.commit()
+        except Exception:
+            write_conn.rollback()
+            raise
+        RECLASSIFY_BATCH_SECONDS.observe(time.perf_counter() - t)
+        changed = sum(1 for row, label in zip(rows, labels) if row["prev_category_id"] != label[0])
+        RECLASSIFY_ITEMS.inc(changed, outcome="changed")
+        RECLASSIFY_ITEMS.inc(len(rows) - changed, outcome="same")
+        stats["scanned"] += len(rows)
+        stats["changed"] += changed
+        stats["copies"] += max(copies, 0)
+        stats["last_id"] = rows[-1]["id"]
+        if progress_interval and time.monotonic() - last_log >= progress_interval:
+            last_log = time.monotonic()
+            elapsed = time.perf_counter() - started
+            print(f"[RECLASSIFY] scanned={stats['scanned']} changed={stats['changed']} "
+                  f"last_id={stats['last_id']} {stats['scanned'] / elapsed:.0f}/s")
+
+    try:
+        write_conn = conn_factory(autocommit=False)
+        with conn_factory() as stream_conn:
+            cur = open_reclassify_stream(stream_conn, None if force else rev, from_id, to_id)
+            try:
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    items = [(row["title"], row["content"] or "") for row in rows]
+                    if pool is not None:
+                        pending.append((rows, pool.submit(_classify_chunk, items)))
+                    else:
+                        pending.append((rows, (rev, classifier.classify_batch(items))))
+                    while len(pending) > max(workers, 1) * INFLIGHT_PER_WORKER - 1:
+                        write(*pending.popleft())
+                while pending:
+                    write(*pending.popleft())
+            finally:
+                cur.close()
+    except BaseException:
+        for _, result in pending:
+            if pool is not None:
+                result.cancel()
+        print(f"[RECLASSIFY] 중단 - 이어서 실행: --from-id {stats['last_id']}")
+        raise
+    finally:
+        if write_conn is not None:
+            write_conn.close()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    stats.update(seconds=round(elapsed, 3), notices_per_s=round(stats["scanned"] / elapsed, 1) if elapsed else 0.0,
+                 classifier_rev=rev)
+    print(f"[RECLASSIFY] done scanned={stats['scanned']} changed={stats['changed']} copies={stats['copies']} "
+          f"last_id={stats['last_id']} {stats['notices_per_s']}/s ({stats['seconds']}s) rev={rev}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="저장된 공지 재분류 (모델/임계값 변경 후)")
+    parser.add_argument("--from-id", type=int, default=0, help="이 id 다음부터 (중단된 실행의 last_id)")
+    parser.add_argument("--to-id", type=int, help="이 id 까지 (기본: 끝까지)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, help="분류 프로세스 수 (기본: CPU 수, 0 이면 단일 프로세스)")
+    parser.add_argument("--threshold", type=float, default=0.7,
+                        help="confidence_threshold (크롤러와 같은 값 - 다르면 revision 이 달라 모든 행을 다시 분류)")
+    parser.add_argument("--llm-budget", type=int, help="OpenAI 요청 수 상한 (기본: OPENAI_CALL_BUDGET)")
+    parser.add_argument("--force", action="store_true", help="현재 revision 으로 분류된 행도 다시 분류")
+    args = parser.parse_args(argv)
+
+    # 크롤러와 같은 OpenAI 설정 (api_config 가 다르면 revision 도 다름)
+    api_config = None
+    if os.getenv("OPENAI_API_KEY"):
+        api_config = {"api_key": os.getenv("OPENAI_API_KEY"), "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")}
+    reclassify(from_id=args.from_id, to_id=args.to_id, batch_size=args.batch_size, workers=args.workers,
+               confidence_threshold=args.threshold, api_config=api_config, llm_budget=args.llm_budget,
+               force=args.force)
+
+
+if __name__ == "__main__":
+    main()
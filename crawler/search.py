@@ -0,0 +1,156 @@
+import base64
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+try:
+    from .db import get_conn, search_notices, fetch_search_snippets, fetch_notice_categories
+    from .metrics import counter, histogram
+except ImportError:
+    from db import get_conn, search_notices, fetch_search_snippets, fetch_notice_categories
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# 공지 검색
+#  - notice(title, content) 의 ngram FULLTEXT 인덱스를 BOOLEAN MODE 로 조회
+#      검색어 "장학금 신청 -대학원" -> +"장학금" +"신청" -"대학원"
+#      (ngram 인덱스에서 "..." 구는 연속된 ngram 일치 = 부분 문자열 일치라 한글 조사/복합어도 찾는다)
+#  - 필터: 카테고리(notice_category), 소스
+#  - 정렬: relevance (제목 일치 가중) | recent (게시일)
+#  - 페이지: keyset 커서 (직전 페이지 마지막 행의 정렬 키, id) - 깊은 페이지도 OFFSET 없이 같은 비용
+#  - 공지 저장(upsert_notice) 트랜잭션이 커밋되면 InnoDB 가 색인을 갱신하므로 별도 색인 작업 없음
+# ---------------------------------------------------------
+NGRAM_TOKEN_SIZE = int(os.getenv("SEARCH_NGRAM_TOKEN_SIZE", "2"))  # 서버 ngram_token_size 와 맞춘다
+DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+MAX_LIMIT = 100
+MAX_TERMS = 8
+SORTS = ("relevance", "recent")
+
+SEARCH_SECONDS = histogram("crawler_search_seconds", "검색 1회 처리 시간(초)")
+SEARCH_QUERIES = counter("crawler_search_queries_total", "검색 요청 수 (sort: relevance/recent)", ("sort",))
+
+# BOOLEAN MODE 연산자 문자 - 검색어 안에 있으면 제거 (각 검색어는 "..." 로 감싼다)
+_OPERATOR_RE = re.compile(r'[+\-<>()~*"@]')
+
+
+def parse_query(q: str) -> Dict[str, List[str]]:
+    """
+    검색어 -> {"include": [...], "exclude": [...]}
+    - 공백으로 나누고 '-' 로 시작하는 단어는 제외어
+    - ngram 크기보다 짧은 단어는 색인에 없으므로 버린다 (MAX_TERMS 개까지)
+    """
+    include, exclude = [], []
+    for raw in (q or "").split():
+        negative = raw.startswith("-")
+        term = _OPERATOR_RE.sub("", raw).strip()
+        if len(term) < NGRAM_TOKEN_SIZE:
+            continue
+        target = exclude if negative else include
+        if term not in target and len(include) + len(exclude) < MAX_TERMS:
+            target.append(term)
+    return {"include": include, "exclude": exclude}
+
+
+def boolean_query(terms: Dict[str, List[str]]) -> str:
+    return " ".join([f'+"{t}"' for t in terms["include"]] + [f'-"{t}"' for t in terms["exclude"]])
+
+
+def encode_cursor(sort: str, sort_key, notice_id: int) -> str:
+    payload = json.dumps({"s": sort, "k": str(sort_key) if sort == "recent" else sort_key, "id": notice_id},
+                         separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """커서 -> (정렬 키, id) - 형식이 틀리거나 다른 정렬의 커서면 ValueError"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key, notice_id = payload["k"], int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"잘못된 커서: {cursor!r}") from e
+    if payload.get("s") != sort:
+        raise ValueError(f"다른 정렬({payload.get('s')})의 커서")
+    return key, notice_id
+
+
+def search(cur, q: str, categories: Optional[List[int]] = None, sources: Optional[List[int]] = None,
+           sort: str = "relevance", limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> Dict:
+    """
+    공지 검색 한 페이지
+
+    Args:
+        cur: DB 커서 (DictCursor)
+        q: 검색어 (공백 구분 AND, '-단어' 제외)
+        categories / sources: category_id / source_id 필터 (여러 개면 OR)
+        sort: relevance | recent
+        limit: 페이지 크기 (최대 MAX_LIMIT)
+        cursor: 직전 결과의 next_cursor
+
+    Returns:
+        {"items": [{id, source_id, title, url, posted_at, score, categories, snippet}],
+         "next_cursor": 다음 페이지 커서 (마지막 페이지면 None), "terms": 사용한 검색어}
+    """
+    if sort not in SORTS:
+        raise ValueError(f"sort 는 {SORTS} 중 하나: {sort!r}")
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    after = decode_cursor(cursor, sort) if cursor else None
+    terms = parse_query(q)
+    if not terms["include"]:
+        return {"items": [], "next_cursor": None, "terms": terms}
+
+    started = time.perf_counter()
+    rows = search_notices(cur, boolean_query(terms), sort=sort, after=after, limit=limit + 1,
+                          categories=categories, sources=sources)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    ids = [row["id"] for row in rows]
+    snippets = fetch_search_snippets(cur, ids, terms["include"][0])
+    categories_by_notice = fetch_notice_categories(cur, ids)
+    items = [
+        {
+            "id": row["id"],
+            "source_id": row["source_id"],
+            "title": row["title"],
+            "url": row["url"],
+            "posted_at": row["posted_at"],
+            "score": row["sort_key"] if sort == "relevance" else None,
+            "categories": categories_by_notice.get(row["id"], []),
+            "snippet": snippets.get(row["id"], ""),
+        }
+        for row in rows
+    ]
+    SEARCH_SECONDS.observe(time.perf_counter() - started)
+    SEARCH_QUERIES.inc(sort=sort)
+    next_cursor = encode_cursor(sort, rows[-1]["sort_key"], rows[-1]["id"]) if more else None
+    return {"items": items, "next_cursor": next_cursor, "terms": terms}
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="공지 검색 (ngram FULLTEXT)")
+    parser.add_argument("query")
+    parser.add_argument("--category", type=int, action="append", help="카테고리 id (여러 번 지정 가능)")
+    parser.add_argument("--source", type=int, action="append", help="소스 id (여러 번 지정 가능)")
+    parser.add_argument("--sort", choices=SORTS, default="relevance")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--cursor", help="이전 출력의 next_cursor")
+    args = parser.parse_args(argv)
+
+    with get_conn() as conn, conn.cursor() as cur:
+        page = search(cur, args.query, categories=args.category, sources=args.source, sort=args.sort,
+                      limit=args.limit, cursor=args.cursor)
+    for item in page["items"]:
+        score = f"{item['score']:.3f}" if item["score"] is not None else "-"
+        print(f"[{item['id']}] score={score} src={item['source_id']} cat={item['categories']} "
+              f"{item['posted_at']} {item['title']}")
+        print(f"    {item['snippet'][:120]!r}")
+    print(f"next_cursor={page['next_cursor']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    from .metrics import counter, histogram
+except ImportError:
+    from metrics import counter, histogram
+
+# ---------------------------------------------------------
+# 단계(stage) 파이프라인
+#  - 각 단계는 크기 제한이 있는 입력 큐와 자체 워커 스레드를 가진다.
+#  - 하류 큐가 가득 차면 상류 워커의 put 이 대기한다 (backpressure).
+#  - 종료는 앞 단계부터 차례로: 입력 큐 끝에 종료 표시를 넣고 워커가
+#    남은 항목을 모두 처리한 뒤 다음 단계를 닫는다 (drain).
+# ---------------------------------------------------------
+_STOP = object()
+
+# 단계별로 보관하는 최근 처리 시간 표본 수 (p50/p95 계산용)
+LATENCY_SAMPLES = 2048
+
+STAGE_SECONDS = histogram("crawler_stage_seconds", "단계 handler 1회 처리 시간(초, 배치 단계는 배치 단위)", ("stage",))
+STAGE_ITEMS = counter("crawler_stage_items_total", "단계별 처리 항목 수", ("stage",))
+STAGE_ERRORS = counter("crawler_stage_errors_total", "단계 handler 예외 수", ("stage",))
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """nearest-rank 백분위수 (values 가 비어 있으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(q / 100.0 * len(ordered))
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
+
+
+class Stage:
+    def __init__(self, name: str, handler: Callable, workers: int = 1, queue_size: int = 64,
+                 batch_size: int = 1, batch_wait: float = 0.0,
+                 idle_timeout: Optional[float] = None, on_idle: Optional[Callable[[], None]] = None,
+                 on_error: Optional[Callable] = None):
+        """
+        Args:
+            name: 단계 이름 (큐 깊이/통계 표시용)
+            handler: handler(item, emit) - batch_size > 1 이면 item 대신 항목 리스트.
+                     emit(x) 로 다음 단계에 0개 이상 전달
+            workers: 워커 스레드 수
+            queue_size: 입력 큐 크기
+            batch_size: 한 번에 모아 처리할 최대 항목 수
+            batch_wait: 첫 항목 이후 배치를 채우려고 기다리는 최대 시간(초)
+            idle_timeout: 입력이 이 시간(초) 동안 없으면 on_idle() 호출
+            on_error: on_error(item 또는 리스트, exc) - 없으면 로그만 출력
+                      (on_idle 실패 시 item 은 None)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.idle_timeout = idle_timeout
+        self.on_idle = on_idle
+        self.on_error = on_error
+        self.downstream: Optional["Stage"] = None
+        self.processed = 0
+        self.errors = 0
+        # handler 1회 처리 시간(초) - batch_size > 1 이면 배치 단위
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._closing = False
+
+    def put(self, item):
+        """입력 큐에 추가 (가득 차 있으면 자리가 날 때까지 대기)"""
+        self.queue.put(item)
+
+    def _emit(self, item):
+        if self.downstream is not None:
+            self.downstream.put(item)
+
+    def start(self):
+        for i in range(self.workers):
+            # 두 번째 Ctrl-C 로 프로세스를 바로 끝낼 수 있도록 daemon 스레드 사용
+            t = threading.Thread(target=self._run, name=f"stage-{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _get(self):
+        if self.idle_timeout is None:
+            return self.queue.get()
+        while True:
+            try:
+                return self.queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                if self.on_idle is not None:
+                    try:
+                        self.on_idle()
+                    except Exception as e:
+                        self._fail(None, e)
+
+    def _next_batch(self):
+        """(항목 리스트, 종료 표시를 받았는지)"""
+        first = self._get()
+        if first is _STOP:
+            return [], True
+        items = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(items) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _run(self):
+        while True:
+            items, stop = self._next_batch()
+            if items:
+                work = items if self.batch_size > 1 else items[0]
+                started = time.perf_counter()
+                try:
+                    self.handler(work, self._emit)
+                except Exception as e:
+                    self._fail(work, e)
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.processed += len(items)
+                    self._latencies.append(elapsed)
+                STAGE_SECONDS.observe(elapsed, stage=self.name)
+                STAGE_ITEMS.inc(len(items), stage=self.name)
+            if stop:
+                return
+
+    def _fail(self, work, e: Exception):
+        with self._lock:
+            self.errors += 1
+        STAGE_ERRORS.inc(stage=self.name)
+        if self.on_error is not None:
+            self.on_error(work, e)
+        else:
+            print(f"[ERR] stage={self.name} err={e}")
+
+    def finish(self):
+        """남은 입력을 모두 처리하고 워커 종료 (여러 번 호출해도 안전)"""
+        if not self._closing:
+            self._closing = True
+            for _ in self._threads:
+                self.queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "depth": self.queue.qsize(),
+                "capacity": self.queue.maxsize,
+                "processed": self.processed,
+                "errors": self.errors,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            }
+
+
+class StagedPipeline:
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.downstream = downstream
+        self._finished = threading.Event()
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def put(self, item):
+        """첫 단계 입력"""
+        self.stages[0].put(item)
+
+    def finish(self):
+        """앞 단계부터 차례로 drain 후 종료"""
+        for stage in self.stages:
+            stage.finish()
+        self._finished.set()
+
+    def depths(self) -> Dict[str, int]:
+        """단계별 입력 큐 깊이"""
+        return {stage.name: stage.queue.qsize() for stage in self.stages}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {stage.name: stage.snapshot() for stage in self.stages}
+
+    def monitor(self, interval: float, report: Callable[[Dict[str, Dict]], None]) -> Optional[threading.Thread]:
+        """finish() 전까지 interval 초마다 report(snapshot()) 호출"""
+        if interval <= 0:
+            return None
+
+        def loop():
+            while not self._finished.wait(interval):
+                report(self.snapshot())
+
+        t = threading.Thread(target=loop, name="stage-monitor", daemon=True)
+        t.start()
+        return t
@@ -1,15 +1,61 @@
 import os
+import hashlib
 import pickle
-import numpy as np
-import requests
-import json
 import re
-from typing import Tuple, Optional, Dict, List
+import threading
+import time
+from typing import TYPE_CHECKING, Tuple, Optional, Dict, List
 import warnings
-from dotenv import load_dotenv
 warnings.filterwarnings('ignore')
 
-load_dotenv()
+try:
+    from .keyword_matcher import KeywordScorer
+    from .classify_cache import ClassificationCache, get_classification_cache
+    from .model_artifact import LinearTextModel, is_artifact, read_meta
+    from .metrics import counter, histogram
+except ImportError:
+    from keyword_matcher import KeywordScorer
+    from classify_cache import ClassificationCache, get_classification_cache
+    from model_artifact import LinearTextModel, is_artifact, read_meta
+    from metrics import counter, histogram
+
+if TYPE_CHECKING:
+    from llm_tier import OpenAITier
+
+# 계층별 처리 시간 (배치 1회) / 최종 결정 계층별 항목 수
+CLASSIFY_SECONDS = histogram("crawler_classify_seconds", "분류 계층 1회 처리 시간(초, 배치 단위)", ("tier",))
+CLASSIFY_ITEMS = counter("crawler_classify_items_total",
+                         "최종 결정 계층별 분류 항목 수 (keyword/ml/openai/fallback/error/cache)", ("tier",))
+
+# 잠정 결과 표시 - OpenAI 계층을 시도했지만 답을 받지 못한 항목 (요청 실패/예산 소진)
+# API 가 돌아오면 다시 분류해야 하므로 error-fallback 처럼 캐시하지 않고 classifier_rev 도 남기지 않는다
+PROVISIONAL_SUFFIX = "+pending"
+
+def is_provisional(version: str) -> bool:
+    """다시 분류해야 하는 결과인지 (오류 기본값 / OpenAI 답 없이 정한 잠정 결과)"""
+    return version == "error-fallback" or version.endswith(PROVISIONAL_SUFFIX)
+
+# 버전 태그 -> 결정 계층
+def _tier_of(version: str) -> str:
+    if version == "keyword-local":
+        return "keyword"
+    if version == "openai-backup":
+        return "openai"
+    if version in ("keyword-final", "default-fallback") or version.endswith(PROVISIONAL_SUFFIX):
+        return "fallback"
+    if version == "error-fallback":
+        return "error"
+    return "ml"
+
+# numpy / sklearn / dotenv / OpenAI 계층(asyncio) 은 실제로 필요할 때 import (짧게 실행되는 워커의 시작 비용 절감)
+_env_loaded = False
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
 # 12개 카테고리 분류 코드
 CATEGORY_CODES = {
@@ -34,26 +80,36 @@ CATEGORY_NAMES = [
 ]
 
 class TextClassifier:
-    def __init__(self, model_path: str = None, confidence_threshold: float = 0.7, api_config: Dict = None):
+    def __init__(self, model_path: str = None, confidence_threshold: float = 0.7, api_config: Dict = None,
+                 cache: Optional[ClassificationCache] = None):
         """
         텍스트 분류 모델 초기화
         
         Args:
-            model_path: 학습된 모델이 저장된 경로
+            model_path: 학습된 모델 경로 (model.pkl 또는 model_artifact 디렉터리).
+                        지문만 먼저 읽고, 실제 로드는 ML 단계가 처음 필요할 때 한다.
             confidence_threshold: API 백업을 사용할 신뢰도 임계값
-            api_config: API 설정 (url, headers 등)
+            api_config: OpenAI 설정 (api_key, model, base_url, max_inflight, timeout,
+                        max_retries, backoff, call_budget)
+            cache: 분류 결과 캐시 (None 이면 사용 안 함)
         """
         self.model = None
         self.vectorizer = None
         self.model_version = "ml-1.0"
+        self.model_fingerprint = None
+        self._pending_model_path: Optional[str] = None
+        self._model_lock = threading.Lock()
         self.confidence_threshold = confidence_threshold
         self.api_config = api_config or {}
+        self.cache = cache
+        self._llm: Optional['OpenAITier'] = None
         
-        # 강화된 키워드 분류 시스템
+        # 강화된 키워드 분류 시스템 (매처는 첫 사용 시 컴파일)
         self.keyword_categories = self._build_keyword_categories()
+        self._scorer = None
         
         if model_path and os.path.exists(model_path):
-            self.load_model(model_path)
+            self._defer_model(model_path)
     
     def _build_keyword_categories(self) -> Dict[int, List[str]]:
         """강화된 키워드 카테고리 구축"""
@@ -106,22 +162,79 @@ class TextClassifier:
             ]
         }
 
+    @staticmethod
+    def _model_fingerprint(model_path: str) -> str:
+        """모델 지문 (아티팩트는 meta.json 값, pickle 은 파일 내용 해시)"""
+        if is_artifact(model_path):
+            return read_meta(model_path)['fingerprint']
+        with open(model_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    
+    def _defer_model(self, model_path: str):
+        """지문만 읽어 두고 로드는 _ensure_model() 에서"""
+        try:
+            self.model_fingerprint = self._model_fingerprint(model_path)
+            self._pending_model_path = model_path
+        except Exception as e:
+            print(f"모델 로드 실패: {e}")
+    
+    def _ensure_model(self) -> bool:
+        """ML 단계 직전 지연 로드 (모델이 준비됐으면 True)"""
+        if self._pending_model_path is not None:
+            # 로드 중에 다른 스레드가 모델 없이 ML 단계를 건너뛰지 않도록
+            with self._model_lock:
+                if self._pending_model_path is not None:
+                    self.load_model(self._pending_model_path)
+        return self.model is not None
+    
     def load_model(self, model_path: str):
-        """저장된 모델과 벡터라이저 로드"""
+        """
+        저장된 모델 로드 (이전 모델의 분류 캐시는 무효화)
+        
+        - 디렉터리(model_artifact): 배열을 mmap 으로 열어 프로세스 간 공유
+        - 파일(model.pkl): 모델과 벡터라이저를 unpickle
+        """
+        previous = self.model_fingerprint
+        self._pending_model_path = None
         try:
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            if is_artifact(model_path):
+                self.model = LinearTextModel(model_path)
+                self.vectorizer = None
+                self.model_version = self.model.version
+                self.model_fingerprint = self.model.fingerprint
+            else:
+                with open(model_path, 'rb') as f:
+                    raw = f.read()
+                model_data = pickle.loads(raw)
                 self.model = model_data['model']
                 self.vectorizer = model_data['vectorizer']
                 self.model_version = model_data.get('version', 'ml-1.0')
+                self.model_fingerprint = hashlib.sha256(raw).hexdigest()[:16]
             print(f"모델 로드 완료: {model_path}")
         except Exception as e:
             print(f"모델 로드 실패: {e}")
             self.model = None
             self.vectorizer = None
+            self.model_fingerprint = None
+        
+        if self.cache is not None and previous is not None and previous != self.model_fingerprint:
+            self.cache.invalidate(self.revision)
     
+    @property
+    def revision(self) -> str:
+        """분류 결과를 결정하는 설정 식별자 (모델 지문, 임계값, 키워드 표, API 사용 여부)"""
+        model = f"model@{self.model_fingerprint}" if self.model_fingerprint is not None else "none"
+        api = self.api_config.get('model', 'gpt-4o-mini') if self.api_config.get('api_key') else "none"
+        return f"{model}|{self.confidence_threshold}|{self._keyword_scorer().fingerprint}|{api}"
+
+    @property
+    def revision_tag(self) -> str:
+        """revision 의 짧은 해시 (notice_category.classifier_rev 에 저장)"""
+        return hashlib.sha256(self.revision.encode()).hexdigest()[:16]
+
     def save_model(self, model_path: str):
-        """모델과 벡터라이저 저장"""
+        """모델과 벡터라이저 저장 (pickle 형식, 아티팩트 변환은 model_artifact.convert_pickle)"""
+        self._ensure_model()
         if self.model is None or self.vectorizer is None:
             raise ValueError("저장할 모델이 없습니다.")
         
@@ -147,46 +260,41 @@ class TextClassifier:
     
     def predict_with_ml(self, text: str) -> Tuple[int, float]:
         """머신러닝 모델을 사용한 예측"""
-        if self.model is None or self.vectorizer is None:
+        return self.predict_with_ml_batch([text])[0]
+    
+    def predict_with_ml_batch(self, texts: List[str]) -> List[Tuple[int, float]]:
+        """머신러닝 모델 일괄 예측 (희소 행렬 변환 1회 + predict_proba 1회)"""
+        if not self._ensure_model():
             raise ValueError("모델이 로드되지 않았습니다.")
+        import numpy as np
         
-        # 텍스트 벡터화
-        text_vector = self.vectorizer.transform([text])
+        if isinstance(self.model, LinearTextModel):
+            probabilities = self.model.predict_proba(texts)
+        else:
+            # 텍스트 벡터화
+            text_vectors = self.vectorizer.transform(texts)
+            probabilities = self.model.predict_proba(text_vectors)
         
-        # 예측 및 확률 계산
-        prediction = self.model.predict(text_vector)[0]
-        probabilities = self.model.predict_proba(text_vector)[0]
-        confidence = float(np.max(probabilities))
+        # 예측 클래스는 확률 최댓값의 클래스 (predict 와 동일)
+        best = np.argmax(probabilities, axis=1)
+        classes = self.model.classes_
         
-        return int(prediction), confidence
+        return [(int(classes[b]), float(probabilities[row, b])) for row, b in enumerate(best)]
+    
+    def _keyword_scorer(self) -> KeywordScorer:
+        """키워드 표를 다중 패턴 매처로 컴파일 (keyword_categories 가 바뀌면 재컴파일)"""
+        if self._scorer is None or self._scorer.source is not self.keyword_categories:
+            self._scorer = KeywordScorer(self.keyword_categories, title_weight=3, content_weight=1)
+        return self._scorer
     
     def predict_with_keywords(self, title: str, content: str) -> Tuple[int, float]:
         """강화된 키워드 기반 예측"""
         title_text = (title or "").lower()
         content_text = (content or "").lower()
         
-        # 점수 계산 시스템
-        category_scores = {}
-        
-        for category_id, keywords in self.keyword_categories.items():
-            score = 0
-            title_matches = 0
-            content_matches = 0
-            
-            for keyword in keywords:
-                keyword = keyword.lower()
-                # 제목에서 키워드 매치 (가중치 3배)
-                if keyword in title_text:
-                    title_matches += 1
-                    score += 3
-                
-                # 본문에서 키워드 매치 (가중치 1배)
-                if keyword in content_text:
-                    content_matches += 1
-                    score += 1
-            
-            if score > 0:
-                category_scores[category_id] = score
+        # 점수 계산 시스템 (제목 매치 가중치 3배, 본문 매치 가중치 1배)
+        # 제목/본문을 각각 한 번만 훑어 모든 카테고리 점수를 계산
+        category_scores = self._keyword_scorer().score(title_text, content_text)
         
         if not category_scores:
             return CATEGORY_CODES["ETC"], 0.1
@@ -200,25 +308,35 @@ class TextClassifier:
         
         return best_category, confidence
     
-    def predict_with_openai(self, title: str, content: str) -> Tuple[int, float]:
-        """OpenAI API를 사용한 백업 분류"""
-        if not self.api_config.get('api_key'):
-            raise ValueError("OpenAI API key가 설정되지 않았습니다.")
+    def _openai_tier(self) -> 'OpenAITier':
+        """OpenAI 호출 계층 (클라이언트는 분류기 수명 동안 재사용)"""
+        if self._llm is None:
+            try:
+                from .llm_tier import OpenAITier
+            except ImportError:
+                from llm_tier import OpenAITier
+            self._llm = OpenAITier.from_config(self.api_config)
+        return self._llm
+    
+    def reset_api_budget(self, call_budget: Optional[int] = None):
+        """실행 단위 OpenAI 호출 예산/통계 초기화"""
+        if self.api_config.get('api_key'):
+            self._openai_tier().reset(call_budget)
+    
+    def api_stats(self) -> Optional[Dict]:
+        """OpenAI 호출 통계 (호출 계층을 쓰지 않았으면 None)"""
+        return self._llm.stats.snapshot() if self._llm is not None else None
+    
+    def _openai_messages(self, title: str, content: str) -> List[Dict]:
+        # 카테고리 정보 문자열 생성
+        category_info = []
+        for name, code in CATEGORY_CODES.items():
+            korean_name = CATEGORY_NAMES[code - 1]
+            category_info.append(f"{code}: {korean_name} ({name})")
         
-        try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=self.api_config['api_key'])
-            
-            # 카테고리 정보 문자열 생성
-            category_info = []
-            for name, code in CATEGORY_CODES.items():
-                korean_name = CATEGORY_NAMES[code - 1]
-                category_info.append(f"{code}: {korean_name} ({name})")
-            
-            categories_text = "\n".join(category_info)
-            
-            prompt = f"""다음 텍스트를 분석하여 가장 적절한 카테고리로 분류해주세요.
+        categories_text = "\n".join(category_info)
+        
+        prompt = f"""다음 텍스트를 분석하여 가장 적절한 카테고리로 분류해주세요.
 
 제목: {title or ''}
 내용: {content or ''}
@@ -232,46 +350,66 @@ class TextClassifier:
 
 카테고리 번호:"""
 
-            response = client.chat.completions.create(
-                model=self.api_config.get('model', 'gpt-4o-mini'),
-                messages=[
-                    {"role": "system", "content": "당신은 텍스트 분류 전문가입니다. 주어진 텍스트를 정확히 분류하고 카테고리 번호만 반환하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=10,
-                temperature=0.1
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 숫자 추출
-            category_id = None
-            for char in result_text:
-                if char.isdigit():
-                    num = int(char)
-                    if 1 <= num <= 12:
-                        category_id = num
-                        break
-            
-            if category_id is None:
-                # 두 자리 숫자도 체크
-                import re
-                match = re.search(r'\b(1[0-2]|[1-9])\b', result_text)
-                if match:
-                    category_id = int(match.group(1))
-            
-            if category_id is None or not (1 <= category_id <= 12):
-                print(f"OpenAI 분류 결과 파싱 실패: {result_text}")
-                return CATEGORY_CODES["ETC"], 0.3
-            
-            # OpenAI 응답은 보통 높은 신뢰도로 가정
-            confidence = 0.85
-            
-            return category_id, confidence
-            
-        except Exception as e:
-            print(f"OpenAI API 분류 오류: {e}")
-            return CATEGORY_CODES["ETC"], 0.2
+        return [
+            {"role": "system", "content": "당신은 텍스트 분류 전문가입니다. 주어진 텍스트를 정확히 분류하고 카테고리 번호만 반환하세요."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_openai_category(self, result_text: str) -> Tuple[int, float]:
+        # 숫자 추출
+        category_id = None
+        for char in result_text:
+            if char.isdigit():
+                num = int(char)
+                if 1 <= num <= 12:
+                    category_id = num
+                    break
+        
+        if category_id is None:
+            # 두 자리 숫자도 체크
+            match = re.search(r'\b(1[0-2]|[1-9])\b', result_text)
+            if match:
+                category_id = int(match.group(1))
+        
+        if category_id is None or not (1 <= category_id <= 12):
+            print(f"OpenAI 분류 결과 파싱 실패: {result_text}")
+            return CATEGORY_CODES["ETC"], 0.3
+        
+        # OpenAI 응답은 보통 높은 신뢰도로 가정
+        confidence = 0.85
+        
+        return category_id, confidence
+    
+    def predict_with_openai(self, title: str, content: str) -> Tuple[int, float]:
+        """OpenAI API를 사용한 백업 분류"""
+        result = self.predict_with_openai_many([(title, content)])[0]
+        if result is None:
+            raise RuntimeError("OpenAI 응답을 받지 못했습니다 (호출 예산 소진 또는 요청 실패).")
+        return result
+    
+    def predict_with_openai_many(self, items: List[Tuple[str, str]]) -> List[Optional[Tuple[int, float]]]:
+        """
+        OpenAI 백업 분류를 동시에 요청 (동시 요청 수/타임아웃/재시도/예산은 OpenAITier 설정)
+        
+        Returns:
+            입력 순서대로 [(category_id, confidence) | None(예산 소진으로 요청 안 함 / 재시도 후에도 실패), ...]
+        """
+        if not self.api_config.get('api_key'):
+            raise ValueError("OpenAI API key가 설정되지 않았습니다.")
+        
+        completions = self._openai_tier().complete_many(
+            [self._openai_messages(title, content) for title, content in items]
+        )
+        results: List[Optional[Tuple[int, float]]] = []
+        for completion in completions:
+            if completion is None:
+                results.append(None)
+            elif isinstance(completion, Exception):
+                print(f"OpenAI API 분류 오류: {completion}")
+                results.append(None)
+            else:
+                results.append(self._parse_openai_category(completion))
+        return results
     
     def classify(self, title: str, content: str) -> Tuple[int, float, str]:
         """
@@ -288,52 +426,143 @@ class TextClassifier:
         Returns:
             (category_id, confidence, version)
         """
-        try:
-            # 1단계: 로컬 키워드 분류
-            category_id, confidence = self.predict_with_keywords(title, content)
+        return self.classify_batch([(title, content)])[0]
+    
+    def classify_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[int, float, str]]:
+        """
+        여러 건을 한 번에 분류 (classify 와 같은 계층/버전 태그)
+        
+        키워드 단계는 전체에 적용하고, 신뢰도가 낮은 나머지만 모아
+        벡터화 1회 + predict_proba 1회로 ML 단계를 처리한다.
+        
+        Args:
+            items: [(title, content), ...]
             
+        Returns:
+            입력 순서대로 [(category_id, confidence, version), ...]
+        """
+        if self.cache is None:
+            return self._classify_batch_uncached(items)
+        
+        # 캐시에 없는 항목만 분류
+        revision = self.revision
+        keys = [ClassificationCache.make_key(title, content, revision) for title, content in items]
+        cached = self.cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if cached:
+            CLASSIFY_ITEMS.inc(len(items) - len(missing), tier="cache")
+        fresh = self._classify_batch_uncached([items[i] for i in missing]) if missing else []
+        
+        results = [cached.get(key) for key in keys]
+        for i, label in zip(missing, fresh):
+            results[i] = label
+        self.cache.put_many(
+            {keys[i]: label for i, label in zip(missing, fresh) if not is_provisional(label[2])},
+            revision,
+        )
+        return results
+    
+    def _classify_batch_uncached(self, items: List[Tuple[str, str]]) -> List[Tuple[int, float, str]]:
+        results: List[Optional[Tuple[int, float, str]]] = [None] * len(items)
+        keyword_results: Dict[int, Tuple[int, float]] = {}
+        
+        # 1단계: 로컬 키워드 분류
+        started = time.perf_counter()
+        for i, (title, content) in enumerate(items):
+            try:
+                category_id, confidence = self.predict_with_keywords(title, content)
+            except Exception as e:
+                print(f"분류 오류: {e}")
+                results[i] = (CATEGORY_CODES["ETC"], 0.1, "error-fallback")
+                continue
             if confidence >= self.confidence_threshold:
-                return category_id, confidence, "keyword-local"
+                results[i] = (category_id, confidence, "keyword-local")
+            else:
+                keyword_results[i] = (category_id, confidence)
+        CLASSIFY_SECONDS.observe(time.perf_counter() - started, tier="keyword")
+        
+        # 2단계: ML 모델 분류 (있는 경우) - 남은 항목을 한 번에
+        pending = list(keyword_results)
+        if pending and self._ensure_model():
+            started = time.perf_counter()
+            try:
+                texts = [self.preprocess_text(*items[i]) for i in pending]
+                ml_results = self.predict_with_ml_batch(texts)
+            except Exception as e:
+                print(f"분류 오류: {e}")
+                for i in pending:
+                    results[i] = (CATEGORY_CODES["ETC"], 0.1, "error-fallback")
+                ml_results = []
             
-            # 2단계: ML 모델 분류 (있는 경우)
-            if self.model is not None and self.vectorizer is not None:
-                text = self.preprocess_text(title, content)
-                ml_category_id, ml_confidence = self.predict_with_ml(text)
-                
+            for i, (ml_category_id, ml_confidence) in zip(pending, ml_results):
+                category_id, confidence = keyword_results[i]
                 if ml_confidence >= self.confidence_threshold:
-                    return ml_category_id, ml_confidence, self.model_version
-                
+                    results[i] = (ml_category_id, ml_confidence, self.model_version)
                 # 키워드와 ML 결과가 일치하면 신뢰도 증가
-                if ml_category_id == category_id:
+                elif ml_category_id == category_id:
                     combined_confidence = min((confidence + ml_confidence) / 2 + 0.1, 0.95)
-                    return category_id, combined_confidence, f"{self.model_version}+keyword"
-            
-            # 3단계: OpenAI API 백업 분류 (설정된 경우)
-            if self.api_config.get('api_key') and confidence < self.confidence_threshold:
-                try:
-                    api_category_id, api_confidence = self.predict_with_openai(title, content)
-                    if api_confidence >= self.confidence_threshold:
-                        return api_category_id, api_confidence, "openai-backup"
-                except Exception as e:
-                    print(f"OpenAI API 백업 실패: {e}")
+                    results[i] = (category_id, combined_confidence, f"{self.model_version}+keyword")
+            CLASSIFY_SECONDS.observe(time.perf_counter() - started, tier="ml")
+        
+        # 3단계: OpenAI API 백업 분류 (설정된 경우) - 남은 항목을 동시에 요청
+        fallback = [i for i in pending if results[i] is None]
+        api_results: Dict[int, Tuple[int, float]] = {}
+        api_tried = bool(fallback and self.api_config.get('api_key'))
+        if api_tried:
+            started = time.perf_counter()
+            try:
+                answers = self.predict_with_openai_many([items[i] for i in fallback])
+                api_results = {i: answer for i, answer in zip(fallback, answers) if answer is not None}
+            except Exception as e:
+                print(f"OpenAI API 백업 실패: {e}")
+            CLASSIFY_SECONDS.observe(time.perf_counter() - started, tier="openai")
+        
+        # 최종
+        for i in fallback:
+            results[i] = self._classify_fallback(*keyword_results[i], api_results.get(i), api_tried=api_tried)
+        for _, _, version in results:
+            CLASSIFY_ITEMS.inc(tier=_tier_of(version))
+        return results
+    
+    def _classify_fallback(self, category_id: int, confidence: float,
+                           api_result: Optional[Tuple[int, float]] = None,
+                           api_tried: bool = False) -> Tuple[int, float, str]:
+        """
+        OpenAI 백업 결과(있으면)와 키워드 결과로 최종 결과 결정
+        
+        api_tried 인데 api_result 가 없으면 (요청 실패/예산 소진) 잠정 결과 (버전에 PROVISIONAL_SUFFIX)
+        """
+        try:
+            if api_result is not None:
+                api_category_id, api_confidence = api_result
+                if api_confidence >= self.confidence_threshold:
+                    return api_category_id, api_confidence, "openai-backup"
+            suffix = PROVISIONAL_SUFFIX if api_tried and api_result is None else ""
             
             # 최종: 키워드 결과 또는 기본값 반환
             if confidence > 0.1:
-                return category_id, confidence, "keyword-final"
+                return category_id, confidence, "keyword-final" + suffix
             else:
-                return CATEGORY_CODES["ETC"], 0.1, "default-fallback"
+                return CATEGORY_CODES["ETC"], 0.1, "default-fallback" + suffix
         
         except Exception as e:
             print(f"분류 오류: {e}")
             return CATEGORY_CODES["ETC"], 0.1, "error-fallback"
 
-# 전역 분류기 인스턴스
+# 전역 분류기 인스턴스 (생성/교체는 _classifier_lock 안에서)
 _classifier = None
+_classifier_lock = threading.RLock()
 
 def get_classifier(confidence_threshold: float = 0.7, api_config: Dict = None) -> TextClassifier:
     """전역 분류기 인스턴스 반환"""
     global _classifier
-    if _classifier is None:
+    classifier = _classifier
+    if classifier is not None:
+        return classifier
+    with _classifier_lock:
+        if _classifier is not None:
+            return _classifier
+        _load_env()
         # API 설정이 없으면 환경변수에서 로드
         if api_config is None:
             openai_key = os.getenv('OPENAI_API_KEY')
@@ -343,20 +572,35 @@ def get_classifier(confidence_threshold: float = 0.7, api_config: Dict = None) -
                     'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
                 }
         
-        # 모델 파일 경로 확인
-        model_path = os.path.join(os.path.dirname(__file__), 'model.pkl')
+        # 모델 경로: CLASSIFIER_MODEL_PATH > crawler/model/ (아티팩트) > crawler/model.pkl
+        model_path = os.getenv('CLASSIFIER_MODEL_PATH')
+        if not model_path:
+            base = os.path.dirname(os.path.abspath(__file__))
+            artifact_dir = os.path.join(base, 'model')
+            model_path = artifact_dir if is_artifact(artifact_dir) else os.path.join(base, 'model.pkl')
         _classifier = TextClassifier(
             model_path=model_path,
             confidence_threshold=confidence_threshold,
-            api_config=api_config
+            api_config=api_config,
+            cache=get_classification_cache()
         )
-    return _classifier
+        return _classifier
 
 def configure_classifier(confidence_threshold: float = 0.7, api_config: Dict = None):
-    """분류기 설정 업데이트"""
+    """
+    분류기 설정 업데이트
+    
+    새 인스턴스를 만든 뒤 교체한다 - 동시에 get_classifier() 를 부르는 스레드는
+    이전 인스턴스나 새 인스턴스 중 하나를 받고, None 이 된 사이에 기본 설정으로
+    분류기를 따로 만들지 않는다.
+    """
     global _classifier
-    _classifier = None  # 기존 인스턴스 초기화
-    return get_classifier(confidence_threshold, api_config)
+    with _classifier_lock:
+        previous, _classifier = _classifier, None
+        classifier = get_classifier(confidence_threshold, api_config)
+    if previous is not None and previous._llm is not None:
+        previous._llm.close()
+    return classifier
 
 def classify(title: str, content: str) -> Tuple[int, float, str]:
     """
@@ -372,6 +616,19 @@ def classify(title: str, content: str) -> Tuple[int, float, str]:
     classifier = get_classifier()
     return classifier.classify(title, content)
 
+def classify_batch(items: List[Tuple[str, str]]) -> List[Tuple[int, float, str]]:
+    """
+    여러 건 일괄 분류 (classify 와 같은 결과를 입력 순서대로 반환)
+    
+    Args:
+        items: [(title, content), ...]
+        
+    Returns:
+        [(category_id, confidence, version), ...]
+    """
+    classifier = get_classifier()
+    return classifier.classify_batch(items)
+
 # Colab에서 모델을 학습하고 저장하는 예제 함수
 def train_and_save_model_example():
     """
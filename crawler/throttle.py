@@ -0,0 +1,246 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    from .metrics import counter
+except ImportError:
+    from metrics import counter
+
+# ---------------------------------------------------------
+# 호스트 단위 요청 예산 (politeness budget)
+#  - 요청마다 고정 sleep 을 두는 대신, 호스트별로
+#    동시 요청 수와 초당 요청 수를 함께 제한한다.
+#  - 여러 워커 스레드가 같은 인스턴스를 공유한다.
+#  - 요청 간격은 서버 상태에 맞춰 조절한다 (adaptive)
+#      간격 = 최소 간격(1/rps) + max_interval * 오류율^2 (+ 평균 응답이 slow_latency 를 넘으면 그 응답 시간)
+#      오류율(429/5xx/네트워크 오류)과 응답 시간은 지수 이동 평균이라
+#      서버가 느려지면 점점 넓어지고, 회복되면 최소 간격까지 다시 좁혀진다.
+#  - Retry-After 를 따르고, 재시도 대기는 지수 백오프 + full jitter
+#  - 연속 실패가 쌓이면 차단기(circuit breaker)가 열려 cooldown 동안
+#    요청을 보내지 않고 바로 실패시킨다 (워커가 대기하며 묶이지 않도록).
+#    cooldown 이 지나면 요청 하나로 상태를 확인(half-open)하고 성공하면 닫는다.
+# ---------------------------------------------------------
+DEFAULT_MAX_INFLIGHT = 4
+DEFAULT_RPS = 2.0
+
+DEFAULT_POLICY = {
+    "max_retry": int(os.getenv("HTTP_MAX_RETRY", "2")),                 # req_get 재시도 횟수
+    "max_interval": float(os.getenv("THROTTLE_MAX_INTERVAL", "10")),    # 간격 상한(초) - 오류율 100% 일 때
+    "slow_latency": float(os.getenv("THROTTLE_SLOW_LATENCY", "2.0")),   # 이보다 느린 평균 응답이면 간격을 넓힘(초)
+    "backoff_base": float(os.getenv("THROTTLE_BACKOFF_BASE", "0.5")),   # 재시도 대기 = U(0, base * 2^attempt)
+    "backoff_max": float(os.getenv("THROTTLE_BACKOFF_MAX", "30")),
+    "max_retry_after": float(os.getenv("THROTTLE_MAX_RETRY_AFTER", "60")),  # 이보다 긴 Retry-After 는 차단기로 처리
+    "failure_threshold": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),  # 연속 실패 수
+    "cooldown": float(os.getenv("CIRCUIT_COOLDOWN", "30")),             # 차단 유지 시간(초)
+}
+
+# 지수 이동 평균 가중치 (최근 요청 약 1/가중치 개의 영향이 큼)
+ERROR_EWMA = 0.2
+LATENCY_EWMA = 0.3
+
+CIRCUIT_OPENED = counter("crawler_circuit_opened_total", "차단기가 열린 횟수", ("host",))
+CIRCUIT_REJECTED = counter("crawler_circuit_rejected_total", "차단기가 열려 보내지 않은 요청 수", ("host",))
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit open for {host} (retry in {retry_in:.1f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date) -> 대기 시간(초)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostThrottle:
+    def __init__(self, max_inflight: int = DEFAULT_MAX_INFLIGHT, rps: float = DEFAULT_RPS,
+                 host: str = "", **policy):
+        """
+        Args:
+            max_inflight: 동시에 진행 중일 수 있는 요청 수 상한
+            rps: 초당 요청 시작 수 상한 = 가장 좁힐 수 있는 간격 (0 이하이면 제한 없음)
+            host: 로그/지표 표시용 이름
+            policy: DEFAULT_POLICY 항목 덮어쓰기 (max_retry, max_interval, slow_latency,
+                    backoff_base, backoff_max, max_retry_after, failure_threshold, cooldown)
+        """
+        unknown = set(policy) - set(DEFAULT_POLICY)
+        if unknown:
+            raise ValueError(f"알 수 없는 스로틀 설정: {sorted(unknown)}")
+        self.max_inflight = max_inflight
+        self.rps = rps
+        self.host = host
+        self.policy = {**DEFAULT_POLICY, **policy}
+        self.max_retry = int(self.policy["max_retry"])
+        self.min_interval = 1.0 / rps if rps > 0 else 0.0
+        self.interval = self.min_interval
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._latency: Optional[float] = None
+        self._error_rate = 0.0
+        # 차단기: closed -> (연속 실패) open -> (cooldown) half-open -> closed/open
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self.stats = {"failures": 0, "opened": 0, "rejected": 0}
+
+    def _wait_turn(self):
+        """요청 시작 간격을 현재 간격(최소 1/rps) 이상으로 벌린다."""
+        with self._lock:
+            interval = self.interval
+            if interval <= 0 and self._next_at == 0.0:
+                return
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + interval
+        wait = start_at - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def _admit(self):
+        """차단기 확인 - 열려 있으면 CircuitOpenError (cooldown 이 지났으면 요청 하나만 통과)"""
+        with self._lock:
+            if self._open_until == 0.0:
+                return
+            now = time.monotonic()
+            if now >= self._open_until and not self._probing:
+                self._probing = True
+                return
+            self.stats["rejected"] += 1
+            retry_in = max(0.0, self._open_until - now)
+        CIRCUIT_REJECTED.inc(host=self.host)
+        raise CircuitOpenError(self.host, retry_in)
+
+    @contextmanager
+    def slot(self):
+        """요청 하나를 보내는 동안 슬롯을 점유한다. (차단기가 열려 있으면 바로 CircuitOpenError)"""
+        self._admit()
+        self._slots.acquire()
+        try:
+            self._wait_turn()
+            yield
+        finally:
+            self._slots.release()
+
+    def record(self, latency: Optional[float], ok: bool, retry_after: Optional[float] = None):
+        """
+        요청 결과 반영 (요청 간격 재계산 + 차단기 상태 갱신)
+        - ok: 서버가 정상 응답 (2xx/3xx/404 등) / False: 429, 5xx, 네트워크 오류
+        - retry_after: 429/503 의 Retry-After(초) - 그 시간 동안 이 호스트의 다음 요청을 미룬다
+        """
+        opened = False
+        with self._lock:
+            now = time.monotonic()
+            self._error_rate += ERROR_EWMA * ((0.0 if ok else 1.0) - self._error_rate)
+            if latency is not None:
+                self._latency = latency if self._latency is None else (
+                    LATENCY_EWMA * latency + (1 - LATENCY_EWMA) * self._latency)
+            self._adjust_interval()
+            if ok:
+                self._failures = 0
+                if self._open_until:
+                    print(f"[CIRCUIT] closed host={self.host}")
+                self._open_until, self._probing = 0.0, False
+                return
+
+            self._failures += 1
+            self.stats["failures"] += 1
+            if retry_after is not None and retry_after <= self.policy["max_retry_after"]:
+                self._next_at = max(self._next_at, now + retry_after)
+            cooldown = self.policy["cooldown"]
+            if retry_after is not None and retry_after > self.policy["max_retry_after"]:
+                # 오래 기다리라는 응답 - 워커를 재우지 않고 그 시간 동안 차단
+                cooldown = max(cooldown, retry_after)
+            elif not self._probing and self._failures < self.policy["failure_threshold"]:
+                return
+            self._open_until, self._probing = now + cooldown, False
+            self.stats["opened"] += 1
+            opened = True
+        if opened:
+            CIRCUIT_OPENED.inc(host=self.host)
+            print(f"[CIRCUIT] open host={self.host} failures={self._failures} cooldown={cooldown:g}s")
+
+    def _adjust_interval(self):
+        max_interval = self.policy["max_interval"]
+        interval = self.min_interval + max_interval * self._error_rate ** 2
+        if self._latency is not None and self._latency > self.policy["slow_latency"]:
+            interval += self._latency
+        self.interval = min(max(max_interval, self.min_interval), interval)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """재시도 전 대기 시간(초) - Retry-After 가 있으면 그 값, 없으면 지수 백오프 + full jitter"""
+        if retry_after is not None:
+            return min(retry_after, self.policy["max_retry_after"])
+        cap = min(self.policy["backoff_max"], self.policy["backoff_base"] * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "interval_s": round(self.interval, 3),
+                "error_rate": round(self._error_rate, 3),
+                "latency_ms": round((self._latency or 0.0) * 1000, 1),
+                "state": "open" if self._open_until else "closed",
+                **self.stats,
+            }
+
+
+_throttles: Dict[str, HostThrottle] = {}
+_throttles_lock = threading.Lock()
+_config = {"max_inflight": DEFAULT_MAX_INFLIGHT, "rps": DEFAULT_RPS}
+
+
+def _throttle_key(host: str, overrides: Optional[Dict]) -> str:
+    if not overrides:
+        return host
+    return host + "|" + ",".join(f"{k}={v}" for k, v in sorted(overrides.items()))
+
+
+def get_throttle(url: str, overrides: Optional[Dict] = None) -> HostThrottle:
+    """
+    url 의 호스트에 해당하는 공유 스로틀 반환
+    overrides(SOURCES 의 "throttle" 설정)가 있으면 같은 설정끼리 별도 스로틀/차단기를 공유
+    """
+    host = urlsplit(url).netloc
+    key = _throttle_key(host, overrides)
+    with _throttles_lock:
+        throttle = _throttles.get(key)
+        if throttle is None:
+            throttle = HostThrottle(host=key, **{**_config, **(overrides or {})})
+            _throttles[key] = throttle
+        return throttle
+
+
+def configure_throttle(max_inflight: Optional[int] = None, rps: Optional[float] = None):
+    """호스트 스로틀 설정 변경 (기존 인스턴스는 초기화)"""
+    with _throttles_lock:
+        if max_inflight is not None:
+            _config["max_inflight"] = max_inflight
+        if rps is not None:
+            _config["rps"] = rps
+        _throttles.clear()
+
+
+def throttle_snapshot() -> Dict[str, Dict]:
+    """스로틀별 현재 간격/평균 응답 시간/차단기 상태"""
+    with _throttles_lock:
+        throttles = dict(_throttles)
+    return {key: throttle.snapshot() for key, throttle in throttles.items()}
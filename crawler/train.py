@@ -0,0 +1,185 @@
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    from .db import TRAINING_VERSIONS, get_conn, fetch_label_classes, open_training_stream
+    from .model_artifact import HashingFeaturizer, save_hashed
+    from .text_classifier import TextClassifier
+except ImportError:
+    from db import TRAINING_VERSIONS, get_conn, fetch_label_classes, open_training_stream
+    from model_artifact import HashingFeaturizer, save_hashed
+    from text_classifier import TextClassifier
+
+# ---------------------------------------------------------
+# ML 계층 스트리밍 학습 (out-of-core)
+#  - 분류된 공지를 서버 측 커서로 chunk_size 개씩 읽어 해시 특징(HashingFeaturizer) 으로 바꾸고
+#    SGDClassifier(loss="log_loss").partial_fit 으로 갱신 -> 어휘/idf/전체 행렬을 메모리에 두지 않는다
+#    (메모리 = chunk 1개 + n_features x 클래스 수 가중치, 공지 수와 무관)
+#  - id % holdout_every == 0 인 행은 학습에서 빼고 마지막에 정확도만 잰다
+#  - 결과는 models/<version>/ 아티팩트 (TextClassifier.load_model / CLASSIFIER_MODEL_PATH 로 사용),
+#    --activate 면 crawler/model 링크를 새 버전으로 바꾼다 (실행 중인 크롤러는 재시작 시 반영)
+#  - 모델이 바뀌면 분류기 revision 이 바뀌므로 저장된 공지는 crawler/reclassify.py 로 다시 분류
+# ---------------------------------------------------------
+_BASE = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.getenv("TRAIN_MODELS_DIR", os.path.join(_BASE, "models"))
+ACTIVE_MODEL_DIR = os.path.join(_BASE, "model")      # get_classifier 의 기본 아티팩트 경로
+CHUNK_SIZE = int(os.getenv("TRAIN_CHUNK_SIZE", "2000"))
+N_FEATURES = int(os.getenv("TRAIN_N_FEATURES", str(2 ** 18)))
+MIN_CONFIDENCE = float(os.getenv("TRAIN_MIN_CONFIDENCE", "0.7"))
+# 학습에 쓰는 분류 결과 (model_version) - 기본은 ML 모델과 무관한 키워드/OpenAI 결과
+LABEL_VERSIONS = tuple(v.strip() for v in os.getenv("TRAIN_LABEL_VERSIONS", ",".join(TRAINING_VERSIONS)).split(",")
+                       if v.strip())
+HOLDOUT_EVERY = 10
+CHECK_TEXTS = 200      # 아티팩트 검증에 쓰는 검증 행 수
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) / 1024 for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _chunks(conn_factory: Callable, min_confidence: float, holdout_every: int, holdout: bool, chunk_size: int,
+            label_versions: Sequence[str]):
+    with conn_factory() as conn:
+        cur = open_training_stream(conn, min_confidence, holdout_every, holdout, label_versions)
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cur.close()
+
+
+def activate(path: str, link: str = ACTIVE_MODEL_DIR):
+    """link(crawler/model) 가 path 를 가리키도록 교체 (심볼릭 링크를 만들어 rename - 중간 상태 없음)"""
+    if os.path.exists(link) and not os.path.islink(link):
+        raise ValueError(f"{link} 가 링크가 아닌 디렉터리입니다 - 옮긴 뒤 다시 실행하세요")
+    tmp = f"{link}.tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(os.path.abspath(path), tmp)
+    os.replace(tmp, link)
+
+
+def train(conn_factory: Callable = get_conn, out_root: str = MODELS_DIR, version: Optional[str] = None,
+          n_features: int = N_FEATURES, chunk_size: int = CHUNK_SIZE, epochs: int = 1,
+          min_confidence: float = MIN_CONFIDENCE, holdout_every: int = HOLDOUT_EVERY, alpha: float = 1e-5,
+          activate_model: bool = False, progress_interval: float = 10.0,
+          label_versions: Sequence[str] = LABEL_VERSIONS) -> Dict:
+    """
+    DB 의 분류 결과로 해시 특징 선형 모델을 학습해 아티팩트로 저장
+
+    Args:
+        conn_factory: 연결 생성 함수 (학습/검증 스트림마다 연결 1개)
+        out_root / version: 아티팩트 경로 out_root/version (version 기본값 ml-hash-<시각>, model_version 에 기록됨)
+        n_features: 해시 특징 수 (가중치 크기 = n_features x 클래스 수)
+        chunk_size: partial_fit 1회 행 수
+        epochs: 학습 데이터를 흘려 보내는 횟수 (매번 DB 에서 다시 읽음)
+        min_confidence: 이보다 신뢰도가 낮은 분류 결과는 학습에서 제외
+        holdout_every: id % holdout_every == 0 인 행을 검증용으로
+        alpha: SGD 정규화 강도
+        activate_model: 저장 후 crawler/model 링크를 새 아티팩트로 교체
+        label_versions: 학습에 쓰는 notice_category.model_version 목록
+            (기본값: keyword-local, openai-backup - ML 모델 자신의 예측은 넣지 않는다)
+
+    Returns:
+        {'path', 'version', 'rows', 'rows_per_s', 'holdout', 'accuracy', 'classes', 'peak_rss_mb', 'fingerprint'}
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    with conn_factory() as conn, conn.cursor() as cur:
+        classes = fetch_label_classes(cur, min_confidence, label_versions)
+    if len(classes) < 2:
+        raise ValueError(f"학습 데이터의 카테고리가 {len(classes)}개뿐입니다 (min_confidence={min_confidence})")
+
+    version = version or f"ml-hash-{time.strftime('%Y%m%d-%H%M%S')}"
+    featurizer = HashingFeaturizer(n_features=n_features)
+    preprocess = TextClassifier().preprocess_text
+    model = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=42)
+    rng = random.Random(42)
+
+    rows_seen, started = 0, time.perf_counter()
+    last_log = time.monotonic()
+    for epoch in range(1, epochs + 1):
+        for rows in _chunks(conn_factory, min_confidence, holdout_every, False, chunk_size, label_versions):
+            rng.shuffle(rows)    # 저장 순서(게시판/시기) 로 몰린 묶음 완화
+            x = featurizer.transform([preprocess(row["title"], row["content"] or "") for row in rows])
+            model.partial_fit(x, [row["category_id"] for row in rows], classes=classes)
+            rows_seen += len(rows)
+            if progress_interval and time.monotonic() - last_log >= progress_interval:
+                last_log = time.monotonic()
+                print(f"[TRAIN] epoch={epoch} rows={rows_seen} "
+                      f"{rows_seen / (time.perf_counter() - started):.0f} rows/s")
+    train_seconds = time.perf_counter() - started
+    if rows_seen == 0:
+        raise ValueError("학습 행이 없습니다")
+
+    correct = holdout = 0
+    check_texts: List[str] = []
+    for rows in _chunks(conn_factory, min_confidence, holdout_every, True, chunk_size, label_versions):
+        texts = [preprocess(row["title"], row["content"] or "") for row in rows]
+        predicted = model.predict(featurizer.transform(texts))
+        correct += sum(int(p == row["category_id"]) for p, row in zip(predicted, rows))
+        holdout += len(rows)
+        check_texts.extend(texts[:CHECK_TEXTS - len(check_texts)])
+    accuracy = correct / holdout if holdout else None
+
+    path = os.path.join(out_root, version)
+    training = {"rows": rows_seen, "epochs": epochs, "holdout": holdout,
+                "accuracy": round(accuracy, 4) if accuracy is not None else None,
+                "min_confidence": min_confidence, "label_versions": list(label_versions), "alpha": alpha,
+                "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    meta = save_hashed(path, featurizer, model, version, extra={"training": training},
+                       check_texts=check_texts or None)
+    if activate_model:
+        activate(path)
+
+    summary = {
+        "path": path,
+        "version": version,
+        "rows": rows_seen,
+        "rows_per_s": round(rows_seen / train_seconds, 1),
+        "holdout": holdout,
+        "accuracy": training["accuracy"],
+        "classes": len(classes),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "fingerprint": meta["fingerprint"],
+    }
+    print(f"[TRAIN] done rows={rows_seen} {summary['rows_per_s']} rows/s holdout={holdout} "
+          f"accuracy={summary['accuracy']} classes={len(classes)} peak_rss={summary['peak_rss_mb']}MB -> {path}"
+          + (" (활성화됨)" if activate_model else ""))
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="DB 의 분류 결과로 ML 계층 스트리밍 학습 (해시 특징 + SGD)")
+    parser.add_argument("--out-root", default=MODELS_DIR)
+    parser.add_argument("--version", help="아티팩트 버전 (기본: ml-hash-<시각>)")
+    parser.add_argument("--n-features", type=int, default=N_FEATURES)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    parser.add_argument("--label-versions", default=",".join(LABEL_VERSIONS),
+                        help="학습에 쓰는 model_version (쉼표 구분, 기본: TRAIN_LABEL_VERSIONS 또는 keyword-local,openai-backup)")
+    parser.add_argument("--activate", action="store_true", help="crawler/model 링크를 새 아티팩트로 교체")
+    args = parser.parse_args(argv)
+
+    train(out_root=args.out_root, version=args.version, n_features=args.n_features, chunk_size=args.chunk_size,
+          epochs=args.epochs, min_confidence=args.min_confidence, activate_model=args.activate,
+          label_versions=tuple(v.strip() for v in args.label_versions.split(",") if v.strip()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+import hashlib
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from .db import (get_conn, fetch_known_hashes, NoticeWriter, enqueue_tasks, claim_tasks, extend_leases,
+                     complete_tasks, fail_task, reap_tasks, count_tasks)
+    from .pipeline import (SOURCES, ITEMS, _adapter_for, _fetch_list_page, _parse_detail, _ignore_sigint,
+                           _log_saved, _log_queues, fetch_cached)
+    from .text_classifier import classify_batch, configure_classifier, get_classifier
+    from .hashing import make_hash
+    from .throttle import configure_throttle, throttle_snapshot
+    from .http_client import configure_http_client
+    from .stages import Stage, StagedPipeline
+    from .metrics import REGISTRY, counter, serve as serve_metrics
+    from .notify import NotificationFanout, NOTIFY_ENABLED
+    from .near_dup import NearDupDetector, NEAR_DUP_ENABLED
+    from .classify_service import ClassifyClient, SERVICE_URL as CLASSIFY_SERVICE_URL
+except ImportError:
+    from db import (get_conn, fetch_known_hashes, NoticeWriter, enqueue_tasks, claim_tasks, extend_leases,
+                    complete_tasks, fail_task, reap_tasks, count_tasks)
+    from pipeline import (SOURCES, ITEMS, _adapter_for, _fetch_list_page, _parse_detail, _ignore_sigint,
+                          _log_saved, _log_queues, fetch_cached)
+    from text_classifier import classify_batch, configure_classifier, get_classifier
+    from hashing import make_hash
+    from throttle import configure_throttle, throttle_snapshot
+    from http_client import configure_http_client
+    from stages import Stage, StagedPipeline
+    from metrics import REGISTRY, counter, serve as serve_metrics
+    from notify import NotificationFanout, NOTIFY_ENABLED
+    from near_dup import NearDupDetector, NEAR_DUP_ENABLED
+    from classify_service import ClassifyClient, SERVICE_URL as CLASSIFY_SERVICE_URL
+
+# ---------------------------------------------------------
+# 작업 큐 모드 (여러 프로세스/호스트가 한 크롤링 회차를 나눠 처리)
+#  - seed: 소스별 1페이지 LIST 작업을 crawl_task 에 등록
+#  - work: 워커마다 작업을 SKIP LOCKED 로 잡아(lease) 처리
+#      LIST   목록 요청/파싱 -> 글마다 DETAIL 작업 + 다음 페이지 LIST 작업 등록 (같은 트랜잭션에서 완료)
+#      DETAIL 상세 요청 -> 파싱 -> 분류 -> 저장, 커밋된 뒤 완료 표시
+#  - 처리 중인 작업은 heartbeat 로 lease 를 연장하고, 워커가 죽어 lease 가 만료되면
+#    다른 워커가 다시 가져간다 (UPSERT 라 같은 글을 두 번 저장해도 결과는 같음)
+#  - 같은 작업은 task_key(batch/종류/대상) 로 한 번만 등록되므로 여러 워커가
+#    같은 목록을 보고 같은 상세 url 을 넣어도 요청은 한 번만 나간다.
+#  - 호스트 스로틀은 프로세스마다 따로 있으므로 rps 는 (전체 예산 / 워커 프로세스 수) 로 준다.
+# ---------------------------------------------------------
+LEASE_SECONDS = float(os.getenv("TASK_LEASE_SECONDS", "60"))       # 잡은 작업의 lease (heartbeat 는 1/3 주기)
+MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "5"))            # 이 횟수만큼 잡았던 작업은 FAILED
+RETRY_DELAY = float(os.getenv("TASK_RETRY_DELAY", "30"))           # 실패한 작업을 다시 잡기까지 대기(초)
+COMPLETE_BATCH = 32                                                # 완료 표시를 모아 보내는 개수
+
+TASK_EVENTS = counter("crawler_tasks_total", "작업 큐 처리 수 (event: claimed/enqueued/done/failed)", ("event",))
+
+
+def task_key(batch: str, kind: str, source_id: int, page: Optional[int] = None, url: Optional[str] = None) -> str:
+    target = url if kind == "DETAIL" else str(page)
+    return hashlib.sha256(f"{batch}|{kind}|{source_id}|{target}".encode("utf-8")).hexdigest()
+
+
+def make_task(batch: str, kind: str, source_id: int, page: Optional[int] = None, max_page: Optional[int] = None,
+              url: Optional[str] = None, title: Optional[str] = None) -> Dict:
+    return {"task_key": task_key(batch, kind, source_id, page, url), "batch": batch, "kind": kind,
+            "source_id": source_id, "page": page, "max_page": max_page, "url": url,
+            "title": title[:500] if title else title}
+
+
+class TaskQueue:
+    def __init__(self, batch: str, conn_factory: Callable = get_conn, owner: Optional[str] = None,
+                 lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS,
+                 retry_delay: float = RETRY_DELAY):
+        """
+        Args:
+            batch: 크롤링 회차 이름 (같은 회차의 작업만 잡는다)
+            conn_factory: autocommit 인자를 받는 연결 생성 함수 (autocommit=False 연결 1개를 계속 사용)
+            owner: lease 소유자 이름 (기본: 호스트:pid:임의값)
+            lease_seconds: 잡은 작업을 다른 워커가 가져가지 못하는 시간(초)
+            max_attempts: 작업을 잡을 수 있는 최대 횟수
+            retry_delay: 실패한 작업을 다시 잡기까지 대기(초)
+        """
+        self.batch = batch
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._conn_factory = conn_factory
+        self._conn = None
+        # 연결은 여러 단계 스레드와 heartbeat 스레드가 함께 쓰므로 lock 하나로 보호
+        self._lock = threading.Lock()
+        self._completed: List[int] = []
+        self._heartbeat: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self.stats = {"claimed": 0, "enqueued": 0, "done": 0, "failed": 0, "errors": 0}
+
+    # ---- 등록 ----
+    def seed(self, pages: int, sources: Optional[List[Dict]] = None) -> int:
+        """소스별 1페이지 LIST 작업 등록 (다음 페이지는 처리하면서 pages 까지 이어서 등록)"""
+        return self.enqueue([make_task(self.batch, "LIST", src["source_id"], 1, pages)
+                             for src in (sources or SOURCES)])
+
+    def enqueue(self, tasks: List[Dict]) -> int:
+        n = self._transaction(lambda cur: enqueue_tasks(cur, tasks))
+        self._count("enqueued", n)
+        return n
+
+    def expand(self, task: Dict, children: List[Dict]) -> int:
+        """task 에서 나온 작업 등록 + task 완료를 한 트랜잭션으로 (중간에 죽으면 task 를 다시 처리)"""
+        def run(cur):
+            n = enqueue_tasks(cur, children)
+            complete_tasks(cur, self.owner, [task["id"]])
+            return n
+
+        n = self._transaction(run)
+        self._count("enqueued", n)
+        self._count("done")
+        return n
+
+    # ---- 잡기 / 완료 / 실패 ----
+    def claim(self, limit: int) -> List[Dict]:
+        """대기 중(또는 lease 만료) 작업을 최대 limit 개 잡는다 (모아 둔 완료 표시를 먼저 보냄)"""
+        self.flush()
+        tasks = self._transaction(
+            lambda cur: claim_tasks(cur, self.batch, self.owner, self.lease_seconds, limit, self.max_attempts))
+        self._count("claimed", len(tasks))
+        return tasks
+
+    def complete(self, task_id: int):
+        """완료 표시 (COMPLETE_BATCH 개씩 모아서, 또는 다음 claim/heartbeat 때 기록)"""
+        with self._lock:
+            self._completed.append(task_id)
+            due = len(self._completed) >= COMPLETE_BATCH
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            ids, self._completed = self._completed, []
+        if not ids:
+            return
+        try:
+            self._transaction(lambda cur: complete_tasks(cur, self.owner, ids))
+        except Exception:
+            with self._lock:
+                self._completed = ids + self._completed
+            raise
+        self._count("done", len(ids))
+
+    def fail(self, task: Dict, reason: str, retry_in: Optional[float] = None):
+        """실패 - retry_delay 뒤 다시 대기 (시도 횟수를 다 썼으면 FAILED)"""
+        retry_in = self.retry_delay if retry_in is None else retry_in
+        self._transaction(lambda cur: fail_task(cur, self.owner, task["id"], reason, retry_in, self.max_attempts))
+        self._count("failed")
+
+    def reap(self) -> int:
+        """lease 가 만료됐는데 시도 횟수를 다 쓴 작업 정리"""
+        return self._transaction(lambda cur: reap_tasks(cur, self.max_attempts))
+
+    def counts(self) -> Dict[str, int]:
+        return self._transaction(lambda cur: count_tasks(cur, self.batch))
+
+    def known_hashes(self, urls: List[str]) -> Dict[str, Dict]:
+        return self._transaction(lambda cur: fetch_known_hashes(cur, urls)) if urls else {}
+
+    # ---- heartbeat ----
+    def start_heartbeat(self):
+        """lease_seconds / 3 마다 잡고 있는 작업의 lease 연장 + 모아 둔 완료 표시 기록"""
+        def loop():
+            while not self._closed.wait(self.lease_seconds / 3):
+                try:
+                    self.flush()
+                    self._transaction(lambda cur: extend_leases(cur, self.owner, self.lease_seconds))
+                except Exception as e:
+                    print(f"[WARN] lease 연장 실패 owner={self.owner} err={e}")
+
+        self._heartbeat = threading.Thread(target=loop, name="task-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    # ---- 연결 ----
+    def _count(self, event: str, n: int = 1):
+        if n:
+            with self._lock:
+                self.stats[event] += n
+            TASK_EVENTS.inc(n, event=event)
+
+    def _transaction(self, fn):
+        """fn(cur) 를 트랜잭션 1회로 실행 (실패하면 재연결 후 1회 재시도, 그래도 실패하면 예외)"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = self._conn_factory(autocommit=False)
+                        with self._conn.cursor() as cur:
+                            # 잡을 행만 잠그도록 (REPEATABLE READ 의 gap lock 없이)
+                            cur.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+                    with self._conn.cursor() as cur:
+                        result = fn(cur)
+                    self._conn.commit()
+                    return result
+                except Exception:
+                    self._reset()
+                    if attempt:
+                        self.stats["errors"] += 1
+                        raise
+
+    def _reset(self):
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def close(self):
+        self._closed.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._reset()
+
+
+def run_worker(batch: str, workers: int = 4, rps: float = 2.0, incremental: bool = False,
+               confidence_threshold: float = 0.7, api_config: Dict = None,
+               parse_workers: Optional[int] = None, classify_batch_size: int = 32, queue_size: int = 64,
+               db_batch_size: int = 100, db_flush_interval: float = 5.0,
+               conn_factory: Callable = get_conn, lease_seconds: float = LEASE_SECONDS,
+               poll_interval: float = 1.0, exit_when_empty: bool = True,
+               queue_log_interval: float = 10.0, metrics_port: Optional[int] = None,
+               notify: Optional[bool] = None, near_dup: Optional[bool] = None,
+               classify_url: Optional[str] = None) -> Dict:
+    """
+    작업 큐 워커 실행 - batch 의 작업을 잡아 pipeline.run() 과 같은 단계로 처리한다.
+
+        작업(LIST: 목록 요청+작업 등록 / DETAIL: 상세 요청, workers) -> 파싱 -> 분류 -> DB 저장
+
+    같은 batch 로 여러 프로세스/호스트에서 실행하면 작업을 나눠 가진다.
+    증분 모드에서는 이미 저장된 url 의 DETAIL 작업을 만들지 않고, 새 글이 없는
+    목록 페이지에서 다음 페이지 작업을 멈춘다.
+    DETAIL 작업은 해당 행이 커밋된 뒤 완료 표시하므로, 저장 전에 워커가 죽으면
+    lease 만료 후 다른 워커가 다시 처리한다.
+    근사 중복 색인은 다른 워커가 저장한 대표 공지를 NEAR_DUP_REFRESH_INTERVAL 마다 읽어 온다.
+    classify_url 이 있으면 워커마다 모델을 올리지 않고 상주 분류 서비스 하나를 같이 쓴다
+    (confidence_threshold/api_config 가 서비스 설정과 다르면 시작할 때 ValueError).
+
+    Args:
+        batch: 크롤링 회차 이름 (seed 와 같은 이름)
+        workers: 작업 단계 워커 수 (호스트별 동시 요청 수 상한, 한 번에 잡는 작업 수)
+        rps: 이 프로세스의 호스트별 초당 요청 수 상한
+        incremental: 증분 크롤링 여부
+        parse_workers: 파싱 프로세스 수 (None 이면 min(4, CPU 수), 0 이면 스레드에서 직접 파싱)
+        conn_factory: DB 연결 생성 함수 (autocommit 인자, 기본 get_conn)
+        lease_seconds: 작업 lease (heartbeat 는 1/3 주기)
+        poll_interval: 잡을 작업이 없을 때 다시 확인하는 간격(초)
+        exit_when_empty: batch 에 대기/처리 중 작업이 하나도 없으면 종료 (False 면 계속 대기)
+        notify: 새 공지 알림 fan-out 여부 (None 이면 NOTIFY_ENABLED 설정)
+        near_dup: 근사 중복 공지 연결 여부 (None 이면 NEAR_DUP_ENABLED 설정)
+        classify_url: 분류 서비스 주소 (None 이면 CLASSIFY_SERVICE_URL, 빈 값이면 프로세스 안에서 분류)
+
+    Returns:
+        {'owner', 'saved', 'unchanged', 'skipped', 'failed', 'seconds', 'tasks': 이 워커 처리 수,
+         'queue': batch 상태별 작업 수, 'stages': 단계별 처리 통계, 'metrics': 이번 실행의 지표 증가분,
+         'classify_cache': 이번 실행의 분류 캐시 hits/misses}
+    """
+    classify_url = CLASSIFY_SERVICE_URL if classify_url is None else classify_url
+    classify_client = ClassifyClient(classify_url) if classify_url else None
+    if classify_client is not None:
+        try:
+            classify_client.check_config(confidence_threshold, api_config)
+        except Exception:
+            classify_client.close()
+            raise
+        classify_fn, classifier_rev = classify_client.classify_batch, classify_client.revision_tag
+    else:
+        if api_config or confidence_threshold != 0.7:
+            configure_classifier(confidence_threshold=confidence_threshold, api_config=api_config)
+        classify_fn, classifier_rev = classify_batch, get_classifier().revision_tag
+    label_cache = get_classifier().cache if classify_client is None else None
+    label_cache_start = dict(label_cache.stats) if label_cache is not None else None
+    configure_throttle(max_inflight=workers, rps=rps)
+    configure_http_client(pool_size=workers)
+    if parse_workers is None:
+        parse_workers = min(4, os.cpu_count() or 1)
+
+    metrics_start = REGISTRY.mark()   # 요약은 시작 시점 이후 증가분 (/metrics 카운터는 누적)
+    serve_metrics(metrics_port)
+    started = time.perf_counter()
+
+    sources = {src["source_id"]: src for src in SOURCES}
+    task_queue = TaskQueue(batch, conn_factory=conn_factory, lease_seconds=lease_seconds)
+    summary = {"saved": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    summary_lock = threading.Lock()
+    stop = threading.Event()
+    writer = NoticeWriter(batch_size=db_batch_size, flush_interval=db_flush_interval, conn_factory=conn_factory,
+                          classifier_rev=classifier_rev)
+    process_pool = (
+        ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_ignore_sigint)
+        if parse_workers > 0 else None
+    )
+    parse_pool = process_pool
+    fanout = NotificationFanout(conn_factory=conn_factory) if (NOTIFY_ENABLED if notify is None else notify) else None
+    dedup = NearDupDetector(conn_factory=conn_factory) if (NEAR_DUP_ENABLED if near_dup is None else near_dup) else None
+    # 요청 단계에 들어간 작업 수를 workers 개로 제한 - 남는 작업은 다른 워커가 잡도록 미리 많이 잡지 않음
+    slots = threading.Semaphore(workers)
+    drained = threading.Event()
+
+    def take_slots() -> int:
+        if not slots.acquire(timeout=poll_interval):
+            return 0
+        n = 1
+        while n < workers and slots.acquire(blocking=False):
+            n += 1
+        return n
+
+    def release_slots(n: int):
+        for _ in range(n):
+            slots.release()
+
+    def done(job: Dict, outcome: str):
+        ITEMS.inc(outcome=outcome)
+        with summary_lock:
+            summary[outcome] += 1
+        task_queue.complete(job["task"]["id"])
+
+    def failed(job: Dict, reason: str, retry_in: Optional[float] = None):
+        with summary_lock:
+            summary["failed"] += 1
+        try:
+            task_queue.fail(job["task"], reason, retry_in)
+        except Exception as e:
+            # 기록하지 못한 작업은 lease 가 만료되면 다시 잡힌다
+            print(f"[WARN] 작업 실패 기록 실패 task={job['task']['id']} err={e}")
+
+    # 1) LIST: 목록 요청 + 하위 작업 등록 / DETAIL: 상세 요청
+    def list_page(job: Dict):
+        task, src = job["task"], job["src"]
+        sid, page = src["source_id"], task["page"]
+        html = _fetch_list_page(src, page)
+        if not html:
+            print(f"[SKIP] source={sid} page={page} fetch failed")
+            failed(job, "list fetch failed")
+            return
+        items = list(_adapter_for(src).parse_list(html))
+        known = task_queue.known_hashes([url for _, url in items])
+        children = [make_task(batch, "DETAIL", sid, page, url=url, title=title)
+                    for title, url in items if not (incremental and url in known)]
+        if task["max_page"] and page < task["max_page"] and not (incremental and not children):
+            children.append(make_task(batch, "LIST", sid, page + 1, task["max_page"]))
+        elif incremental and not children:
+            print(f"[STOP] source={sid} page={page} 새 공지 없음 - 페이징 중단")
+        added = task_queue.expand(task, children)
+        print(f"[LIST] source={sid} page={page} items={len(items)} enqueued={added}")
+
+    def fetch(job: Dict, emit):
+        try:
+            if stop.is_set():
+                failed(job, "cancelled", retry_in=0)
+            elif job["task"]["kind"] == "LIST":
+                list_page(job)
+            else:
+                job["html"] = fetch_cached(job["url"], job["src"].get("throttle"))
+                emit(job)
+        finally:
+            release_slots(1)
+
+    # 2) 파싱 + 변경 여부 판단
+    def parse_html(source_type: str, html: str) -> Tuple[str, Optional[str]]:
+        nonlocal parse_pool
+        pool = parse_pool
+        if pool is not None:
+            try:
+                return pool.submit(_parse_detail, source_type, html).result()
+            except BrokenProcessPool as e:
+                if parse_pool is pool:
+                    print(f"[WARN] 파싱 프로세스 풀 사용 불가 - 스레드에서 직접 파싱 err={e}")
+                    parse_pool = None
+        return _parse_detail(source_type, html)
+
+    def parse_detail(job: Dict, emit):
+        html = job.pop("html")
+        if not html:
+            print(f"[SKIP] detail fetch failed {job['url']}")
+            failed(job, "detail fetch failed")
+            return
+        content, posted_at = parse_html(job["src"]["type"], html)
+        if not content or content.strip() == "":
+            print(f"[SKIP] no content {job['url']}")
+            done(job, "skipped")
+            return
+        content_hash = make_hash(job["title"], content)
+        if job["prev"] and job["prev"]["hash"] == content_hash:
+            done(job, "unchanged")
+            return
+        job.update(content=content, posted_at=posted_at, hash=content_hash)
+        if dedup is not None:
+            dedup.fingerprint(job)
+        emit(job)
+
+    # 3) 분류 (근사 중복은 대표 공지의 분류를 사용)
+    def classify_jobs(jobs: List[Dict], emit):
+        if dedup is not None:
+            labels = dedup.classify(jobs, classify_fn)
+        else:
+            labels = classify_fn([(job["title"], job["content"]) for job in jobs])
+        for job, label in zip(jobs, labels):
+            job["label"] = label
+            emit(job)
+
+    # 4) DB 저장 (커밋 후 완료 표시)
+    def on_saved(job: Dict, nid: int):
+        cat_id, conf, ver = job["label"]
+        _log_saved(job["src"]["source_id"], job["page"], cat_id, conf, ver, job["title"], nid)
+        if dedup is not None:
+            dedup.saved(job, nid)
+        if fanout is not None and job["prev"] is None and job.get("canonical") is None:
+            fanout.submit(nid, job["title"], job["content"], cat_id)
+        done(job, "saved")
+
+    def store(job: Dict, emit):
+        cat_id, conf, ver = job["label"]
+        writer.add(job["src"]["source_id"], job["url"], job["title"], job["content"], job["posted_at"],
+                   job["hash"], cat_id, conf, ver, on_saved=partial(on_saved, job),
+                   **(dedup.writer_args(job) if dedup is not None else {}))
+
+    def flush_idle():
+        # 잡을 작업이 없으면 저장을 미루지 않음 (완료 표시가 늦으면 다른 워커도 종료를 기다림)
+        if drained.is_set():
+            writer.flush()
+        else:
+            writer.flush_if_due()
+
+    def on_item_error(work, e: Exception):
+        for job in (work if isinstance(work, list) else [work]):
+            print(f"[ERR] task={job['task']['id']} {job['url'] or job['task']['kind']} err={e}")
+            if dedup is not None and job.get("url"):
+                dedup.discard(job)
+            failed(job, str(e))
+
+    def on_store_error(work, e: Exception):
+        # 저장하지 못한 작업은 완료 표시가 없으므로 lease 만료 후 다시 처리된다
+        print(f"[ERR] stage=store err={e} - 새 작업을 잡지 않고 종료합니다")
+        stop.set()
+
+    pipeline = StagedPipeline([
+        Stage("fetch", fetch, workers=workers, queue_size=workers * 2, on_error=on_item_error),
+        Stage("parse", parse_detail, workers=max(1, parse_workers), queue_size=queue_size,
+              on_error=on_item_error),
+        Stage("classify", classify_jobs, workers=1, queue_size=queue_size,
+              batch_size=classify_batch_size, batch_wait=0.05, on_error=on_item_error),
+        Stage("store", store, workers=1, queue_size=queue_size,
+              idle_timeout=0.5, on_idle=flush_idle, on_error=on_store_error),
+    ])
+
+    def to_job(task: Dict, known: Dict[str, Dict]) -> Optional[Dict]:
+        src = sources.get(task["source_id"])
+        job = {"task": task, "src": src, "page": task["page"], "title": task["title"] or "",
+               "url": task["url"], "prev": known.get(task["url"])}
+        if src is None:
+            failed(job, f"unknown source_id={task['source_id']}")
+            return None
+        return job
+
+    print(f"[WORKER] batch={batch} owner={task_queue.owner} workers={workers} rps={rps}"
+          + (f" classify={classify_url} rev={classifier_rev}" if classify_client is not None else ""))
+    interrupted = False
+    try:
+        if dedup is not None:
+            dedup.start()
+        if fanout is not None:
+            fanout.start()
+        pipeline.start()
+        pipeline.monitor(queue_log_interval, _log_queues)
+        task_queue.start_heartbeat()
+        while not stop.is_set():
+            n = take_slots()
+            if not n:
+                continue
+            try:
+                tasks = task_queue.claim(n)
+                if not tasks:
+                    task_queue.reap()
+                    counts = task_queue.counts()
+            except Exception as e:
+                print(f"[WARN] 작업 큐 조회 실패 err={e}")
+                release_slots(n)
+                stop.wait(poll_interval)
+                continue
+            release_slots(n - len(tasks))
+            if tasks:
+                drained.clear()
+                # 잡은 상세 작업의 저장된 (id, hash) 를 한 번에 조회
+                known = task_queue.known_hashes([t["url"] for t in tasks if t["kind"] == "DETAIL"])
+                for task in tasks:
+                    job = to_job(task, known)
+                    if job is None:
+                        release_slots(1)
+                    else:
+                        pipeline.put(job)
+                continue
+            drained.set()
+            if exit_when_empty and not counts.get("PENDING") and not counts.get("LEASED"):
+                break
+            stop.wait(poll_interval)
+        pipeline.finish()
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n[INTERRUPT] 새 작업을 잡지 않고 진행 중인 작업을 저장한 뒤 종료합니다")
+        stop.set()
+        pipeline.finish()
+    finally:
+        try:
+            writer.close()
+        finally:
+            if fanout is not None:
+                fanout.close()
+            if process_pool is not None:
+                process_pool.shutdown()
+            if classify_client is not None:
+                classify_client.close()
+            try:
+                task_queue.flush()
+                queue_counts = task_queue.counts()
+            except Exception as e:
+                print(f"[WARN] 작업 큐 마무리 실패 err={e}")
+                queue_counts = {}
+            task_queue.close()
+
+    result = dict(summary, owner=task_queue.owner, seconds=round(time.perf_counter() - started, 3),
+                  tasks=dict(task_queue.stats), queue=queue_counts, stages=pipeline.snapshot(),
+                  metrics=REGISTRY.snapshot(since=metrics_start), interrupted=interrupted)
+    if fanout is not None:
+        result["stages"]["notify"] = fanout.stage.snapshot()
+        result["notify"] = dict(fanout.stats)
+    if dedup is not None:
+        result["near_dup"] = dedup.snapshot()
+    if label_cache is not None:
+        result["classify_cache"] = label_cache.stats_since(label_cache_start)
+    print(f"[SUMMARY] owner={task_queue.owner} saved={summary['saved']} unchanged={summary['unchanged']} "
+          f"skipped={summary['skipped']} failed={summary['failed']} seconds={result['seconds']}")
+    print("[TASKS] " + " ".join(f"{k}={v}" for k, v in task_queue.stats.items())
+          + " | batch " + " ".join(f"{k}={v}" for k, v in sorted(queue_counts.items())))
+    print(f"[DB] rows={writer.stats['rows']} batches={writer.stats['batches']} "
+          f"reconnects={writer.stats['reconnects']}")
+    if fanout is not None:
+        print(f"[NOTIFY] notices={fanout.stats['notices']} targets={fanout.stats['targets']} "
+              f"notifications={fanout.stats['notifications']}")
+    if dedup is not None:
+        print(f"[NEAR_DUP] duplicates={result['near_dup']['duplicates']} canonical={result['near_dup']['canonical']} "
+              f"indexed={result['near_dup']['indexed']}")
+    if label_cache is not None:
+        cc = result["classify_cache"]
+        print(f"[CLASSIFY CACHE] hits={cc['hits']} misses={cc['misses']} hit_rate={cc['hit_rate']:.2%}")
+    for key, t in throttle_snapshot().items():
+        print(f"[THROTTLE] {key} interval={t['interval_s']}s error_rate={t['error_rate']:.2f} "
+              f"latency={t['latency_ms']}ms state={t['state']} circuit_opened={t['opened']}")
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="DB 작업 큐로 여러 워커가 나눠 크롤링")
+    parser.add_argument("command", choices=("seed", "work", "status"))
+    parser.add_argument("--batch", required=True, help="크롤링 회차 이름 (예: 2024-05-01)")
+    parser.add_argument("--pages", type=int, default=5, help="seed: 소스별 목록 페이지 수")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=2.0, help="이 프로세스의 호스트별 초당 요청 수")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--forever", action="store_true", help="작업이 없어도 종료하지 않고 대기")
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        task_queue = TaskQueue(args.batch)
+        try:
+            print(f"[SEED] batch={args.batch} pages={args.pages} enqueued={task_queue.seed(args.pages)}")
+        finally:
+            task_queue.close()
+    elif args.command == "status":
+        task_queue = TaskQueue(args.batch)
+        try:
+            counts = task_queue.counts()
+        finally:
+            task_queue.close()
+        print(f"[STATUS] batch={args.batch} " + " ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    else:
+        api_config = None
+        if os.getenv("OPENAI_API_KEY"):
+            api_config = {"api_key": os.getenv("OPENAI_API_KEY"), "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")}
+        run_worker(args.batch, workers=args.workers, rps=args.rps, incremental=args.incremental,
+                   api_config=api_config, parse_workers=args.parse_workers, exit_when_empty=not args.forever)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,8 +42,17 @@ CREATE TABLE IF NOT EXISTS notice (
   scraped_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   deadline_at  DATETIME NULL,
   hash         CHAR(64) NULL,
+  simhash      BIGINT UNSIGNED NULL,            -- 본문 SimHash 지문 (crawler/near_dup.py)
+  canonical_id BIGINT NULL,                     -- 근사 중복이면 대표 공지 id (대표는 NULL)
+  feed_at      DATETIME AS (COALESCE(posted_at, scraped_at)) STORED,   -- 피드 정렬 키 (crawler/read_api.py)
   CONSTRAINT uq_notice_url UNIQUE (url),
   INDEX idx_notice_source_posted (source_id, posted_at),
+  INDEX idx_notice_url_hash (url, hash),          -- 해시 비교용 커버링 인덱스
+  FULLTEXT INDEX ftx_notice_title (title) WITH PARSER ngram,                     -- 검색 (crawler/search.py)
+  FULLTEXT INDEX ftx_notice_title_content (title, content) WITH PARSER ngram,
+  INDEX idx_notice_canonical (canonical_id),
+  INDEX idx_notice_feed (canonical_id, feed_at, id),   -- 피드 keyset (대표 공지만, 최신순)
+  CONSTRAINT fk_notice_canonical FOREIGN KEY (canonical_id) REFERENCES notice(id) ON DELETE SET NULL,
   CONSTRAINT fk_notice_source FOREIGN KEY (source_id) REFERENCES source(id)
 );
 
@@ -52,6 +61,7 @@ CREATE TABLE IF NOT EXISTS notice_category (
   category_id   BIGINT NOT NULL,
   confidence    DECIMAL(5,4) NULL,
   model_version VARCHAR(50) NULL,
+  classifier_rev CHAR(16) NULL,           -- 분류기 revision (TextClassifier.revision_tag), 재분류 시 같은 값이면 건너뜀
   PRIMARY KEY (notice_id, category_id),
   INDEX idx_nc_category (category_id),
   CONSTRAINT fk_nc_notice FOREIGN KEY (notice_id) REFERENCES notice(id) ON DELETE CASCADE,
@@ -100,6 +110,7 @@ CREATE TABLE IF NOT EXISTS notification (
   sent_at       DATETIME NULL,
   status        ENUM('PENDING','SENT','FAILED','CANCELLED') NOT NULL DEFAULT 'PENDING',
   channel       ENUM('WS','WEB_PUSH') NOT NULL DEFAULT 'WS',
+  CONSTRAINT uq_notif_user_notice UNIQUE (user_id, notice_id),   -- 같은 공지 알림 중복 방지 (fan-out 재실행)
   INDEX idx_notif_status_time (status, scheduled_at),
   CONSTRAINT fk_notif_user FOREIGN KEY (user_id) REFERENCES app_user(id) ON DELETE CASCADE,
   CONSTRAINT fk_notif_notice FOREIGN KEY (notice_id) REFERENCES notice(id) ON DELETE CASCADE
@@ -112,9 +123,100 @@ CREATE TABLE IF NOT EXISTS crawl_job (
   finished_at DATETIME NULL,
   status      ENUM('RUNNING','SUCCESS','FAILED') NOT NULL DEFAULT 'RUNNING',
   error_msg   TEXT NULL,
+  stats       JSON NULL,                          -- 처리 수/단계별 시간 요약 (pipeline.run)
+  INDEX idx_cj_source_started (source_id, started_at),
   CONSTRAINT fk_cj_source FOREIGN KEY (source_id) REFERENCES source(id)
 );
 
+-- 소스별 체크포인트 (중단된 실행을 마지막 커밋 페이지 다음부터 이어받음)
+CREATE TABLE IF NOT EXISTS crawl_progress (
+  source_id   BIGINT PRIMARY KEY,
+  last_page   INT NOT NULL DEFAULT 0,            -- 1..last_page 까지 커밋 완료
+  status      ENUM('RUNNING','DONE') NOT NULL DEFAULT 'RUNNING',
+  job_id      BIGINT NULL,                       -- 마지막으로 기록한 crawl_job.id
+  updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_cp_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 실패한 상세 요청 (다음 실행에서 목록보다 먼저 처리, 성공하면 삭제)
+CREATE TABLE IF NOT EXISTS crawl_retry (
+  url         VARCHAR(600) PRIMARY KEY,
+  source_id   BIGINT NOT NULL,
+  title       VARCHAR(500) NOT NULL,
+  page        INT NOT NULL,
+  attempts    INT NOT NULL DEFAULT 1,
+  last_error  VARCHAR(500) NULL,
+  created_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX idx_cr_source_updated (source_id, updated_at),
+  CONSTRAINT fk_cr_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 분산 크롤링 작업 큐 (crawler/work_queue.py - 여러 워커가 SKIP LOCKED 로 나눠 가짐)
+CREATE TABLE IF NOT EXISTS crawl_task (
+  id           BIGINT PRIMARY KEY AUTO_INCREMENT,
+  task_key     CHAR(64) NOT NULL,                  -- sha256(batch/kind/대상) - 같은 작업 중복 등록 방지
+  batch        VARCHAR(50) NOT NULL,               -- 크롤링 회차
+  kind         ENUM('LIST','DETAIL') NOT NULL,
+  source_id    BIGINT NOT NULL,
+  page         INT NULL,                           -- 목록 페이지 (DETAIL 은 나온 목록 페이지)
+  max_page     INT NULL,                           -- LIST: 이 페이지까지 다음 페이지 작업을 이어서 등록
+  url          VARCHAR(600) NULL,
+  title        VARCHAR(500) NULL,
+  status       ENUM('PENDING','LEASED','DONE','FAILED') NOT NULL DEFAULT 'PENDING',
+  attempts     INT NOT NULL DEFAULT 0,
+  lease_owner  VARCHAR(100) NULL,
+  lease_until  DATETIME(3) NULL,
+  available_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  last_error   VARCHAR(500) NULL,
+  created_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT uq_task_key UNIQUE (task_key),
+  INDEX idx_task_claim (status, available_at),
+  INDEX idx_task_owner (lease_owner, status),
+  INDEX idx_task_batch (batch, status),
+  CONSTRAINT fk_task_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 피드 변경 세대 (NoticeWriter / 재분류가 저장 트랜잭션마다 1 증가, 읽기 API 가 바뀌면 응답 캐시를 비움)
+CREATE TABLE IF NOT EXISTS feed_epoch (
+  id          TINYINT PRIMARY KEY,
+  epoch       BIGINT NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3)
+);
+INSERT IGNORE INTO feed_epoch (id, epoch) VALUES (1, 0);
+
+-- 알림 설정 변경 기록 (crawler/notify.py 가 id 이후 바뀐 사용자만 다시 읽어 색인 갱신)
+-- 외래키 연쇄 삭제는 트리거를 실행하지 않으므로 사용자 삭제도 따로 기록
+CREATE TABLE IF NOT EXISTS user_pref_change (
+  id          BIGINT PRIMARY KEY AUTO_INCREMENT,
+  user_id     BIGINT NOT NULL,
+  changed_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_upc_changed (changed_at)
+);
+
+DROP TRIGGER IF EXISTS trg_uk_ins;
+DROP TRIGGER IF EXISTS trg_uk_upd;
+DROP TRIGGER IF EXISTS trg_uk_del;
+DROP TRIGGER IF EXISTS trg_uic_ins;
+DROP TRIGGER IF EXISTS trg_uic_upd;
+DROP TRIGGER IF EXISTS trg_uic_del;
+DROP TRIGGER IF EXISTS trg_user_del;
+CREATE TRIGGER trg_uk_ins AFTER INSERT ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uk_upd AFTER UPDATE ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uk_del AFTER DELETE ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.user_id);
+CREATE TRIGGER trg_uic_ins AFTER INSERT ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uic_upd AFTER UPDATE ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uic_del AFTER DELETE ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.user_id);
+CREATE TRIGGER trg_user_del AFTER DELETE ON app_user FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.id);
+
 -- 4) 시드 데이터
 INSERT IGNORE INTO category(code,name) VALUES
  ('IT','IT/개발'),('ACADEMIC','학사/수업'),('SCHOLAR','장학금'),
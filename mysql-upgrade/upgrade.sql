@@ -0,0 +1,233 @@
+-- 기존 DB 업그레이드 (mysql-init/00_init.sql 은 빈 데이터 볼륨에서만 실행됨)
+--
+--   docker exec -i cnu_mysql mysql -uroot -p"$DB_PASSWORD" < mysql-upgrade/upgrade.sql
+--
+-- 여러 번 실행해도 됨: 칼럼/인덱스/제약은 information_schema 에 없을 때만 추가하고,
+-- 테이블은 CREATE TABLE IF NOT EXISTS, 트리거는 지우고 다시 만든다.
+-- 00_init.sql 에 스키마를 바꾸면 여기에도 같은 변경을 추가할 것.
+
+USE cnu_info;
+SET time_zone = '+09:00';
+
+-- ---------------------------------------------------------
+-- 도우미 (끝에서 지움)
+-- ---------------------------------------------------------
+DROP PROCEDURE IF EXISTS _upgrade_alter;
+DROP PROCEDURE IF EXISTS _add_column;
+DROP PROCEDURE IF EXISTS _add_index;
+DROP PROCEDURE IF EXISTS _add_constraint;
+
+DELIMITER //
+
+CREATE PROCEDURE _upgrade_alter(IN tbl VARCHAR(64), IN ddl TEXT)
+BEGIN
+  SET @upgrade_ddl = CONCAT('ALTER TABLE ', tbl, ' ', ddl);
+  PREPARE upgrade_stmt FROM @upgrade_ddl;
+  EXECUTE upgrade_stmt;
+  DEALLOCATE PREPARE upgrade_stmt;
+END //
+
+-- 칼럼이 없으면 ALTER TABLE tbl <ddl>
+CREATE PROCEDURE _add_column(IN tbl VARCHAR(64), IN col VARCHAR(64), IN ddl TEXT)
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = tbl AND COLUMN_NAME = col) THEN
+    CALL _upgrade_alter(tbl, ddl);
+  END IF;
+END //
+
+-- 인덱스(UNIQUE/FULLTEXT 포함)가 없으면 ALTER TABLE tbl <ddl>
+CREATE PROCEDURE _add_index(IN tbl VARCHAR(64), IN idx VARCHAR(64), IN ddl TEXT)
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = tbl AND INDEX_NAME = idx) THEN
+    CALL _upgrade_alter(tbl, ddl);
+  END IF;
+END //
+
+-- 제약(외래키/UNIQUE)이 없으면 ALTER TABLE tbl <ddl>
+CREATE PROCEDURE _add_constraint(IN tbl VARCHAR(64), IN cname VARCHAR(64), IN ddl TEXT)
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM information_schema.TABLE_CONSTRAINTS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = tbl AND CONSTRAINT_NAME = cname) THEN
+    CALL _upgrade_alter(tbl, ddl);
+  END IF;
+END //
+
+DELIMITER ;
+
+-- ---------------------------------------------------------
+-- notice
+-- ---------------------------------------------------------
+-- 해시 비교용 커버링 인덱스 (crawler/db.py fetch_known_hashes)
+CALL _add_index('notice', 'idx_notice_url_hash', 'ADD INDEX idx_notice_url_hash (url, hash)');
+
+-- 검색용 ngram FULLTEXT (crawler/search.py) - 서버 설정이 docker-compose.yml 과 다르면 잘못된 토큰으로
+-- 색인되므로 인덱스를 만들기 전에 멈춘다. 큰 테이블은 오래 걸리므로 하나씩 만든다.
+DROP PROCEDURE IF EXISTS _upgrade_notice_fulltext;
+DELIMITER //
+CREATE PROCEDURE _upgrade_notice_fulltext()
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'notice'
+                   AND INDEX_NAME IN ('ftx_notice_title', 'ftx_notice_title_content')
+                 HAVING COUNT(DISTINCT INDEX_NAME) = 2) THEN
+    IF @@ngram_token_size <> 2 OR @@innodb_ft_enable_stopword THEN
+      SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'ngram FULLTEXT: 서버를 --ngram-token-size=2 --innodb-ft-enable-stopword=OFF 로 띄운 뒤 다시 실행';
+    END IF;
+    CALL _add_index('notice', 'ftx_notice_title', 'ADD FULLTEXT INDEX ftx_notice_title (title) WITH PARSER ngram');
+    CALL _add_index('notice', 'ftx_notice_title_content',
+                    'ADD FULLTEXT INDEX ftx_notice_title_content (title, content) WITH PARSER ngram');
+  END IF;
+END //
+DELIMITER ;
+CALL _upgrade_notice_fulltext();
+DROP PROCEDURE _upgrade_notice_fulltext;
+
+-- 근사 중복 (crawler/near_dup.py) - 본문 SimHash 지문, 대표 공지 id (대표는 NULL)
+CALL _add_column('notice', 'simhash', 'ADD COLUMN simhash BIGINT UNSIGNED NULL');
+CALL _add_column('notice', 'canonical_id', 'ADD COLUMN canonical_id BIGINT NULL');
+CALL _add_index('notice', 'idx_notice_canonical', 'ADD INDEX idx_notice_canonical (canonical_id)');
+CALL _add_constraint('notice', 'fk_notice_canonical',
+                     'ADD CONSTRAINT fk_notice_canonical FOREIGN KEY (canonical_id) REFERENCES notice(id) ON DELETE SET NULL');
+
+-- 피드 정렬 키 (crawler/read_api.py) - STORED 생성 칼럼이라 추가할 때 테이블을 다시 씀
+CALL _add_column('notice', 'feed_at', 'ADD COLUMN feed_at DATETIME AS (COALESCE(posted_at, scraped_at)) STORED');
+CALL _add_index('notice', 'idx_notice_feed', 'ADD INDEX idx_notice_feed (canonical_id, feed_at, id)');
+
+-- ---------------------------------------------------------
+-- notice_category
+-- ---------------------------------------------------------
+-- 분류기 revision (crawler/reclassify.py) - 기존 행은 NULL 이라 첫 재분류 대상
+CALL _add_column('notice_category', 'classifier_rev', 'ADD COLUMN classifier_rev CHAR(16) NULL');
+
+-- ---------------------------------------------------------
+-- notification
+-- ---------------------------------------------------------
+-- 같은 공지 알림 중복 방지 (fan-out 재실행) - 제약이 없던 동안 쌓인 중복은 가장 먼저 만든 행만 남긴다
+DROP PROCEDURE IF EXISTS _upgrade_notification;
+DELIMITER //
+CREATE PROCEDURE _upgrade_notification()
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM information_schema.TABLE_CONSTRAINTS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'notification'
+                   AND CONSTRAINT_NAME = 'uq_notif_user_notice') THEN
+    DELETE n FROM notification n
+      JOIN notification m ON m.user_id = n.user_id AND m.notice_id = n.notice_id AND m.id < n.id;
+    ALTER TABLE notification ADD CONSTRAINT uq_notif_user_notice UNIQUE (user_id, notice_id);
+  END IF;
+END //
+DELIMITER ;
+CALL _upgrade_notification();
+DROP PROCEDURE _upgrade_notification;
+
+-- ---------------------------------------------------------
+-- crawl_job
+-- ---------------------------------------------------------
+-- 실행 요약 JSON (pipeline.run -> finish_crawl_job)
+CALL _add_column('crawl_job', 'stats', 'ADD COLUMN stats JSON NULL');
+CALL _add_index('crawl_job', 'idx_cj_source_started', 'ADD INDEX idx_cj_source_started (source_id, started_at)');
+
+-- ---------------------------------------------------------
+-- 추가된 테이블 (00_init.sql 과 같은 정의)
+-- ---------------------------------------------------------
+-- 소스별 체크포인트 (중단된 실행을 마지막 커밋 페이지 다음부터 이어받음)
+CREATE TABLE IF NOT EXISTS crawl_progress (
+  source_id   BIGINT PRIMARY KEY,
+  last_page   INT NOT NULL DEFAULT 0,            -- 1..last_page 까지 커밋 완료
+  status      ENUM('RUNNING','DONE') NOT NULL DEFAULT 'RUNNING',
+  job_id      BIGINT NULL,                       -- 마지막으로 기록한 crawl_job.id
+  updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_cp_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 실패한 상세 요청 (다음 실행에서 목록보다 먼저 처리, 성공하면 삭제)
+CREATE TABLE IF NOT EXISTS crawl_retry (
+  url         VARCHAR(600) PRIMARY KEY,
+  source_id   BIGINT NOT NULL,
+  title       VARCHAR(500) NOT NULL,
+  page        INT NOT NULL,
+  attempts    INT NOT NULL DEFAULT 1,
+  last_error  VARCHAR(500) NULL,
+  created_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX idx_cr_source_updated (source_id, updated_at),
+  CONSTRAINT fk_cr_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 분산 크롤링 작업 큐 (crawler/work_queue.py - 여러 워커가 SKIP LOCKED 로 나눠 가짐)
+CREATE TABLE IF NOT EXISTS crawl_task (
+  id           BIGINT PRIMARY KEY AUTO_INCREMENT,
+  task_key     CHAR(64) NOT NULL,                  -- sha256(batch/kind/대상) - 같은 작업 중복 등록 방지
+  batch        VARCHAR(50) NOT NULL,               -- 크롤링 회차
+  kind         ENUM('LIST','DETAIL') NOT NULL,
+  source_id    BIGINT NOT NULL,
+  page         INT NULL,                           -- 목록 페이지 (DETAIL 은 나온 목록 페이지)
+  max_page     INT NULL,                           -- LIST: 이 페이지까지 다음 페이지 작업을 이어서 등록
+  url          VARCHAR(600) NULL,
+  title        VARCHAR(500) NULL,
+  status       ENUM('PENDING','LEASED','DONE','FAILED') NOT NULL DEFAULT 'PENDING',
+  attempts     INT NOT NULL DEFAULT 0,
+  lease_owner  VARCHAR(100) NULL,
+  lease_until  DATETIME(3) NULL,
+  available_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  last_error   VARCHAR(500) NULL,
+  created_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT uq_task_key UNIQUE (task_key),
+  INDEX idx_task_claim (status, available_at),
+  INDEX idx_task_owner (lease_owner, status),
+  INDEX idx_task_batch (batch, status),
+  CONSTRAINT fk_task_source FOREIGN KEY (source_id) REFERENCES source(id)
+);
+
+-- 피드 변경 세대 (NoticeWriter / 재분류가 저장 트랜잭션마다 1 증가, 읽기 API 가 바뀌면 응답 캐시를 비움)
+CREATE TABLE IF NOT EXISTS feed_epoch (
+  id          TINYINT PRIMARY KEY,
+  epoch       BIGINT NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3)
+);
+INSERT IGNORE INTO feed_epoch (id, epoch) VALUES (1, 0);
+
+-- 알림 설정 변경 기록 (crawler/notify.py 가 id 이후 바뀐 사용자만 다시 읽어 색인 갱신)
+-- 외래키 연쇄 삭제는 트리거를 실행하지 않으므로 사용자 삭제도 따로 기록
+CREATE TABLE IF NOT EXISTS user_pref_change (
+  id          BIGINT PRIMARY KEY AUTO_INCREMENT,
+  user_id     BIGINT NOT NULL,
+  changed_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_upc_changed (changed_at)
+);
+
+-- ---------------------------------------------------------
+-- 트리거 (00_init.sql 과 같음 - 지우고 다시 생성)
+-- ---------------------------------------------------------
+DROP TRIGGER IF EXISTS trg_uk_ins;
+DROP TRIGGER IF EXISTS trg_uk_upd;
+DROP TRIGGER IF EXISTS trg_uk_del;
+DROP TRIGGER IF EXISTS trg_uic_ins;
+DROP TRIGGER IF EXISTS trg_uic_upd;
+DROP TRIGGER IF EXISTS trg_uic_del;
+DROP TRIGGER IF EXISTS trg_user_del;
+CREATE TRIGGER trg_uk_ins AFTER INSERT ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uk_upd AFTER UPDATE ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uk_del AFTER DELETE ON user_keyword FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.user_id);
+CREATE TRIGGER trg_uic_ins AFTER INSERT ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uic_upd AFTER UPDATE ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (NEW.user_id);
+CREATE TRIGGER trg_uic_del AFTER DELETE ON user_interest_category FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.user_id);
+CREATE TRIGGER trg_user_del AFTER DELETE ON app_user FOR EACH ROW
+  INSERT INTO user_pref_change (user_id) VALUES (OLD.id);
+
+-- ---------------------------------------------------------
+-- 정리
+-- ---------------------------------------------------------
+DROP PROCEDURE _upgrade_alter;
+DROP PROCEDURE _add_column;
+DROP PROCEDURE _add_index;
+DROP PROCEDURE _add_constraint;